@@ -0,0 +1,316 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+import numpy as np
+from candle_store import CandleStore, exchange_time_ms, timeframe_to_ms
+from market_data_engine import create_async_exchange_client
+from rate_limiter import get_limiter
+
+logger = logging.getLogger("BROski.Backfill")
+
+
+class HistoricalBackfill:
+    """
+    Downloads long candle histories into the candle store.
+
+    Only the parts of the requested date range the store does not hold yet are
+    downloaded, split into fixed-size chunks that are fetched concurrently within
+    the shared rate limit. Every chunk the exchange returned in full is saved as a
+    checkpoint file, so an interrupted run picks up where it stopped; empty or
+    short responses are not saved and are fetched again on the next run. Once all
+    chunks are in, they are deduplicated and merged into the candle store.
+    """
+
+    def __init__(self, config, candle_store=None, checkpoint_dir="data/backfill",
+                 chunk_size=1000, max_concurrency=4):
+        """
+        Initialize the backfill
+
+        Args:
+            config (dict): Bot configuration (config.json)
+            candle_store (CandleStore): Target store, created from config if omitted
+            checkpoint_dir (str): Where finished chunks are kept until the merge
+            chunk_size (int): Candles requested per API call
+            max_concurrency (int): Maximum number of chunks fetched at once
+        """
+        self.config = config
+        self.candle_store = candle_store or CandleStore.from_config(config)
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self._empty_chunks = {}
+
+    def _create_exchange(self):
+        """Create the async exchange client (throttled by the shared limiter instead of ccxt)"""
+        return create_async_exchange_client(self.config)
+
+    def _checkpoint_path(self, symbol, timeframe, chunk_start):
+        return self.checkpoint_dir / symbol.replace('/', '_') / timeframe / f"{chunk_start}.npy"
+
+    def _missing_ranges(self, symbol, timeframe, start_ms, end_ms):
+        """
+        Parts of [start_ms, end_ms) the candle store holds no candles for
+
+        Covers history older than the first stored candle, gaps between stored
+        candles and candles newer than the last one. The newer range starts at the
+        last stored candle so a candle that was still forming when stored is refreshed.
+
+        Returns:
+            list: (start_ms, end_ms) ranges to download
+        """
+        timestamps = self.candle_store.read(symbol, timeframe)['timestamp']
+        if len(timestamps) == 0:
+            return [(start_ms, end_ms)]
+
+        period = timeframe_to_ms(timeframe)
+        first, last = int(timestamps[0]), int(timestamps[-1])
+        ranges = []
+        if start_ms < first:
+            ranges.append((start_ms, min(first, end_ms)))
+
+        # Interior gaps: consecutive stored candles more than one period apart
+        for i in np.flatnonzero(np.diff(timestamps) > period):
+            gap_start, gap_end = max(int(timestamps[i]) + period, start_ms), min(int(timestamps[i + 1]), end_ms)
+            if gap_start < gap_end:
+                ranges.append((gap_start, gap_end))
+
+        if last + period < end_ms:
+            ranges.append((max(last, start_ms), end_ms))
+        return ranges
+
+    def _chunks(self, timeframe, start_ms, end_ms):
+        """Split [start_ms, end_ms) into windows of chunk_size candles"""
+        step = self.chunk_size * timeframe_to_ms(timeframe)
+        first = start_ms - start_ms % timeframe_to_ms(timeframe)
+        return [(chunk_start, min(chunk_start + step, end_ms)) for chunk_start in range(first, end_ms, step)]
+
+    async def _fetch_chunk(self, exchange, limiter, semaphore, symbol, timeframe, chunk_start, chunk_end):
+        """
+        Fetch one chunk and save it as a checkpoint
+
+        A chunk is only saved once the exchange returned candles up to the end of
+        its window (or up to its newest candle). Missing candles inside such a
+        window do not exist on the exchange; an empty or short response may be a
+        transient failure and is fetched again on the next run instead.
+
+        Returns:
+            int: Number of candles fetched, or None if the chunk failed
+        """
+        path = self._checkpoint_path(symbol, timeframe, chunk_start)
+        if path.exists():
+            return 0
+
+        period = timeframe_to_ms(timeframe)
+        rows = []
+        since = chunk_start
+        newest = None
+        try:
+            async with semaphore:
+                # The exchange may return fewer candles than asked, so keep paging until the window is covered
+                while since < chunk_end:
+                    await limiter.acquire_async('public')
+                    ohlcv = await exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=self.chunk_size)
+                    if not ohlcv:
+                        break
+                    rows.extend(candle for candle in ohlcv if chunk_start <= candle[0] < chunk_end)
+                    newest = int(ohlcv[-1][0])
+                    if newest <= since or newest + period >= chunk_end:
+                        break
+                    since = newest + 1
+        except Exception as e:
+            logger.error(f"Error fetching {symbol} {timeframe} chunk at {chunk_start}: {str(e)}")
+            return None
+
+        if newest is None or (newest + period < chunk_end and newest + period <= exchange_time_ms(exchange)):
+            if not rows:
+                self._empty_chunks.setdefault(timeframe, set()).add(chunk_start)
+            logger.warning(f"Incomplete {symbol} {timeframe} chunk at {chunk_start} ({len(rows)} candles), "
+                           f"it will be fetched again")
+            return None
+
+        self._save_checkpoint(path, rows)
+        return len(rows)
+
+    def _save_checkpoint(self, path, rows):
+        """Save the candles of one chunk"""
+        data = np.asarray(rows, dtype=np.float64).reshape(-1, 6)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a killed run never leaves a half-written checkpoint
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            np.save(f, data)
+        os.replace(temp_path, path)
+
+    def _checkpoint_before_listing(self, symbol, timeframe, chunks):
+        """
+        Save the empty chunks that lie before the first candle the exchange has
+
+        Some exchanges answer requests for time before a pair was listed with an
+        empty page rather than the first candles after it. Such a chunk never gets
+        a complete response, but if every candle fetched or stored for the series
+        is newer than the chunk, there is no data for it to retry.
+
+        Returns:
+            int: Number of chunks saved
+        """
+        empty = self._empty_chunks.pop(timeframe, set())
+        if not empty:
+            return 0
+
+        firsts = []
+        for chunk_start, _ in chunks:
+            path = self._checkpoint_path(symbol, timeframe, chunk_start)
+            if path.exists():
+                data = np.load(path)
+                if len(data):
+                    firsts.append(int(data[0, 0]))
+        stored = self.candle_store.read(symbol, timeframe)['timestamp']
+        if len(stored):
+            firsts.append(int(stored[0]))
+        if not firsts:
+            return 0
+
+        listed = min(firsts)
+        before = [chunk_start for chunk_start, chunk_end in chunks if chunk_end <= listed
+                  and not self._checkpoint_path(symbol, timeframe, chunk_start).exists()]
+        # Every unfinished chunk before the first candle must have come back empty
+        if not before or not empty.issuperset(before):
+            return 0
+
+        for chunk_start in before:
+            self._save_checkpoint(self._checkpoint_path(symbol, timeframe, chunk_start), [])
+        logger.info(f"No {symbol} {timeframe} candles exist before {listed}, skipping {len(before)} chunks")
+        return len(before)
+
+    async def backfill_async(self, symbol, timeframes, start_ms, end_ms):
+        """
+        Fetch every chunk for every timeframe concurrently and merge the results
+
+        Returns:
+            dict: Timeframe -> number of candles added to the store
+        """
+        chunks = {}
+        self._empty_chunks = {}
+        for timeframe in timeframes:
+            ranges = self._missing_ranges(symbol, timeframe, start_ms, end_ms)
+            chunks[timeframe] = [chunk for range_start, range_end in ranges
+                                 for chunk in self._chunks(timeframe, range_start, range_end)]
+            done = sum(self._checkpoint_path(symbol, timeframe, chunk_start).exists()
+                       for chunk_start, _ in chunks[timeframe])
+            logger.info(f"{symbol} {timeframe}: {len(ranges)} missing ranges, {len(chunks[timeframe])} chunks, "
+                        f"{done} already downloaded")
+
+        if not any(chunks.values()):
+            logger.info(f"{symbol} is already stored for the whole range, nothing to download")
+            return {timeframe: 0 for timeframe in timeframes}
+
+        exchange = self._create_exchange()
+        limiter = get_limiter(self.config['exchange'].get('name', 'mexc').lower(), exchange, self.config)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [self._fetch_chunk(exchange, limiter, semaphore, symbol, timeframe, chunk_start, chunk_end)
+                 for timeframe in timeframes for chunk_start, chunk_end in chunks[timeframe]]
+
+        try:
+            start = time.perf_counter()
+            fetched = 0
+            failed = 0
+            for completed, task in enumerate(asyncio.as_completed(tasks), 1):
+                result = await task
+                if result is None:
+                    failed += 1
+                else:
+                    fetched += result
+                if completed % 25 == 0 or completed == len(tasks):
+                    logger.info(f"Downloaded {completed}/{len(tasks)} chunks ({fetched} candles)")
+            logger.info(f"Download finished in {time.perf_counter() - start:.1f}s")
+        finally:
+            await exchange.close()
+
+        for timeframe in timeframes:
+            failed -= self._checkpoint_before_listing(symbol, timeframe, chunks[timeframe])
+
+        if failed:
+            # Keep the checkpoints so a second run only fetches the missing chunks
+            logger.error(f"{failed} chunks failed, run the backfill again to resume")
+            return {timeframe: 0 for timeframe in timeframes}
+
+        return {timeframe: self._merge_checkpoints(symbol, timeframe, chunks[timeframe]) for timeframe in timeframes}
+
+    def _merge_checkpoints(self, symbol, timeframe, chunks):
+        """Merge the downloaded chunks of one timeframe into the candle store"""
+        paths = [self._checkpoint_path(symbol, timeframe, chunk_start) for chunk_start, _ in chunks]
+        arrays = [np.load(path) for path in paths if path.exists()]
+        arrays = [array for array in arrays if len(array)]
+
+        added = 0
+        if arrays:
+            added = self.candle_store.merge(symbol, timeframe, np.concatenate(arrays))
+
+        for path in paths:
+            if path.exists():
+                path.unlink()
+
+        logger.info(f"Stored {added} new {timeframe} candles for {symbol} "
+                    f"({self.candle_store.length(symbol, timeframe)} total)")
+        return added
+
+    def backfill(self, symbol, timeframes, start, end=None):
+        """
+        Download the candles of a date range that are missing from the candle store
+
+        Args:
+            symbol (str): Trading pair in format BASE/QUOTE
+            timeframes (list): Timeframes to download
+            start (datetime): First candle time
+            end (datetime): Last candle time (defaults to now)
+
+        Returns:
+            dict: Timeframe -> number of candles added to the store
+        """
+        end = end or datetime.now()
+        start_ms = int(start.timestamp() * 1000)
+        end_ms = int(end.timestamp() * 1000)
+        return asyncio.run(self.backfill_async(symbol, timeframes, start_ms, end_ms))
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description='BROski Historical Candle Backfill')
+    parser.add_argument('--symbol', type=str, help='Trading pair (default: from config.json)')
+    parser.add_argument('--timeframes', nargs='+', default=['1h'], help='Timeframes to download')
+    parser.add_argument('--days', type=int, default=365, help='Days of history to download')
+    parser.add_argument('--start', type=str, help='Start date YYYY-MM-DD (overrides --days)')
+    parser.add_argument('--end', type=str, help='End date YYYY-MM-DD (default: now)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Chunks fetched at once')
+    args = parser.parse_args()
+
+    with open("config.json", 'r') as f:
+        config = json.load(f)
+
+    symbol = args.symbol or f"{config['trading']['base_symbol']}/{config['trading']['quote_symbol']}"
+    end = datetime.strptime(args.end, "%Y-%m-%d") if args.end else datetime.now()
+    start = datetime.strptime(args.start, "%Y-%m-%d") if args.start else end - timedelta(days=args.days)
+
+    backfill = HistoricalBackfill(config, max_concurrency=args.concurrency)
+    try:
+        results = backfill.backfill(symbol, args.timeframes, start, end)
+    except KeyboardInterrupt:
+        print("\nInterrupted. Run the same command again to resume.")
+        sys.exit(1)
+
+    for timeframe, added in results.items():
+        print(f"{symbol} {timeframe}: {added} new candles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import json
+import time
+import logging
+import argparse
+import numpy as np
+import pandas as pd
+import indicators
+from risk_manager import RiskManager
+from strategies.signals import signal_strength
+
+logger = logging.getLogger("BROski.Backtester")
+
+# Rows scanned at once when looking for a stop loss or take profit hit
+_SCAN_WINDOW = 256
+
+_DAY_MS = 86_400_000
+
+
+def _day_numbers(df):
+    """Calendar day of every candle as an integer, for the daily trade limit"""
+    times = df['timestamp'] if 'timestamp' in df.columns else df.index
+    if pd.api.types.is_numeric_dtype(times) and not isinstance(times, pd.RangeIndex):
+        # Exchange timestamps in milliseconds
+        return np.asarray(times, dtype=np.int64) // _DAY_MS
+    if pd.api.types.is_datetime64_any_dtype(times):
+        return np.asarray(times).astype('datetime64[D]').astype(np.int64)
+    # Without candle times every candle counts as its own day
+    return np.arange(len(df))
+
+
+def strategy_signals(strategy, df):
+    """
+    Signals for every bar of df from a StrategyManager strategy
+
+    Args:
+        strategy: Strategy instance with a generate_signals_batch method
+        df (pd.DataFrame): OHLCV data
+
+    Returns:
+        tuple: (signals with 1 = buy, -1 = sell, 0 = none; signal strength 0-1 or None)
+    """
+    if not hasattr(strategy, 'generate_signals_batch'):
+        raise ValueError(f"Strategy {type(strategy).__name__} cannot be backtested")
+
+    batch = strategy.generate_signals_batch(df)
+    return batch['type'], signal_strength(batch)
+
+
+class Backtester:
+    """
+    Backtesting engine for BROski strategies.
+
+    Signals for every bar are computed up front with array operations. The
+    simulation then jumps from signal to signal: each open position's exit (sell
+    signal, stop loss or take profit) is found with a vectorized scan of the
+    candles after the entry, so the cost grows with the number of trades rather
+    than the number of candles. Positions are long only, like the live bot, and
+    use the RiskManager's sizing, stop loss, take profit and daily trade limit.
+    """
+
+    def __init__(self, config, fee_rate=0.001, slippage=0.0005, initial_balance=1000.0):
+        """
+        Initialize the backtester
+
+        Args:
+            config (dict): Bot configuration (trading and risk_management sections)
+            fee_rate (float): Trading fee as a fraction of the order cost, paid on entry and exit
+            slippage (float): Price impact on every fill as a fraction of the price
+            initial_balance (float): Starting quote balance
+        """
+        self.config = config
+        self.risk_manager = RiskManager(config)
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.initial_balance = initial_balance
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a backtester using the backtest section of config.json"""
+        backtest_config = config.get("backtest", {})
+        return cls(
+            config,
+            fee_rate=backtest_config.get("fee_rate", 0.001),
+            slippage=backtest_config.get("slippage", 0.0005),
+            initial_balance=backtest_config.get("initial_balance", 1000.0)
+        )
+
+    def _find_exit(self, entry, stop_loss, take_profit, end, high, low):
+        """
+        First bar after `entry` (up to `end`) where the stop loss or take profit is hit
+
+        Returns:
+            tuple: (bar, reason), bar is None if neither is hit
+        """
+        start = entry + 1
+        window = _SCAN_WINDOW
+        while start < end:
+            stop = min(start + window, end)
+            hit = (low[start:stop] <= stop_loss) | (high[start:stop] >= take_profit)
+            if hit.any():
+                bar = start + int(np.argmax(hit))
+                # With both levels inside one candle, assume the stop loss came first
+                return bar, 'stop_loss' if low[bar] <= stop_loss else 'take_profit'
+            start = stop
+            window *= 2
+        return None, None
+
+    def run(self, df, signals, strength=None):
+        """
+        Simulate trading a signal array over df
+
+        Args:
+            df (pd.DataFrame): OHLCV data, oldest first
+            signals (np.ndarray): 1 = buy, -1 = sell, 0 = no signal, per bar
+            strength (np.ndarray): Optional signal strength 0-1 per bar, used for position sizing
+
+        Returns:
+            dict: trades (list), equity (pd.Series) and stats (dict)
+        """
+        open_ = indicators.as_array(df['open'])
+        high = indicators.as_array(df['high'])
+        low = indicators.as_array(df['low'])
+        close = indicators.as_array(df['close'])
+        days = _day_numbers(df)
+
+        buys = np.flatnonzero(np.asarray(signals) > 0)
+        sells = np.flatnonzero(np.asarray(signals) < 0)
+        stop_pct = self.risk_manager.stop_loss_percentage / 100
+        take_pct = self.risk_manager.take_profit_percentage / 100
+
+        entries, exits, entry_prices, exit_prices, quantities, reasons = [], [], [], [], [], []
+        daily_entries = {}
+        bar = -1
+
+        while True:
+            # Next buy signal after the previous exit
+            position = int(np.searchsorted(buys, bar, side='right'))
+            if position >= len(buys):
+                break
+            entry = int(buys[position])
+            bar = entry
+
+            day = days[entry]
+            if daily_entries.get(day, 0) >= self.risk_manager.max_daily_trades:
+                continue
+            daily_entries[day] = daily_entries.get(day, 0) + 1
+
+            entry_price = close[entry] * (1 + self.slippage)
+            size = self.risk_manager.calculate_position_size(
+                close[entry], 'buy', None if strength is None else float(strength[entry])
+            )
+            stop_loss = entry_price * (1 - stop_pct)
+            take_profit = entry_price * (1 + take_pct)
+
+            # The position closes at the next sell signal unless a stop is hit first
+            next_sell = int(np.searchsorted(sells, entry, side='right'))
+            sell_bar = int(sells[next_sell]) if next_sell < len(sells) else None
+            scan_end = sell_bar if sell_bar is not None else len(df)
+            exit_bar, reason = self._find_exit(entry, stop_loss, take_profit, scan_end, high, low)
+
+            if reason == 'stop_loss':
+                # A candle that opens below the stop fills at the open
+                exit_price = min(stop_loss, open_[exit_bar])
+            elif reason == 'take_profit':
+                exit_price = max(take_profit, open_[exit_bar])
+            elif sell_bar is not None:
+                exit_bar, reason = sell_bar, 'signal'
+                exit_price = close[exit_bar]
+            else:
+                exit_bar, reason = len(df) - 1, 'end_of_data'
+                exit_price = close[exit_bar]
+
+            entries.append(entry)
+            exits.append(exit_bar)
+            entry_prices.append(entry_price)
+            exit_prices.append(exit_price * (1 - self.slippage))
+            quantities.append(size / entry_price)
+            reasons.append(reason)
+            bar = exit_bar
+
+        entries, exits = np.array(entries, dtype=np.int64), np.array(exits, dtype=np.int64)
+        entry_prices, exit_prices = np.array(entry_prices), np.array(exit_prices)
+        quantities = np.array(quantities)
+        entry_costs = quantities * entry_prices
+        exit_values = quantities * exit_prices
+        fees = (entry_costs + exit_values) * self.fee_rate
+        pnl = exit_values - entry_costs - fees
+
+        # Cash moves at entries and exits, the open position is marked to the close
+        cash_flow = np.zeros(len(df))
+        np.add.at(cash_flow, entries, -entry_costs * (1 + self.fee_rate))
+        np.add.at(cash_flow, exits, exit_values * (1 - self.fee_rate))
+        holdings = np.zeros(len(df) + 1)
+        np.add.at(holdings, entries, quantities)
+        np.add.at(holdings, exits, -quantities)
+        equity = self.initial_balance + np.cumsum(cash_flow) + np.cumsum(holdings[:-1]) * close
+
+        return {
+            'trades': self._trades(df, entries, exits, entry_prices, exit_prices, quantities, fees, pnl, reasons),
+            'equity': pd.Series(equity, index=df.index),
+            'stats': self._stats(pnl, fees, equity)
+        }
+
+    def run_strategy(self, strategy, df):
+        """
+        Backtest a StrategyManager strategy over df
+
+        Returns:
+            dict: trades, equity and stats, see run
+        """
+        signals, strength = strategy_signals(strategy, df)
+        return self.run(df, signals, strength)
+
+    def _trades(self, df, entries, exits, entry_prices, exit_prices, quantities, fees, pnl, reasons):
+        """Trade records in the format of the bot's trade history"""
+        times = df['timestamp'] if 'timestamp' in df.columns else df.index
+        entry_times = list(times[entries]) if len(entries) else []
+        exit_times = list(times[exits]) if len(exits) else []
+        return [
+            {
+                'entry_time': entry_times[i],
+                'exit_time': exit_times[i],
+                'entry_price': float(entry_prices[i]),
+                'exit_price': float(exit_prices[i]),
+                'amount': float(quantities[i]),
+                'fees': float(fees[i]),
+                'pnl': float(pnl[i]),
+                'pnl_percentage': float((exit_prices[i] / entry_prices[i] - 1) * 100),
+                'exit_reason': reasons[i]
+            }
+            for i in range(len(entries))
+        ]
+
+    def _stats(self, pnl, fees, equity):
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
+        drawdown = 1 - equity / np.maximum.accumulate(equity) if len(equity) else np.zeros(1)
+
+        if len(losses):
+            profit_factor = float(wins.sum() / -losses.sum())
+        else:
+            profit_factor = float('inf') if len(wins) else 0.0
+
+        return {
+            'trades': len(pnl),
+            'win_rate': float(len(wins) / len(pnl) * 100) if len(pnl) else 0.0,
+            'total_pnl': float(pnl.sum()),
+            'return_percentage': float((equity[-1] / self.initial_balance - 1) * 100) if len(equity) else 0.0,
+            'max_drawdown_percentage': float(drawdown.max() * 100),
+            'profit_factor': profit_factor,
+            'average_trade': float(pnl.mean()) if len(pnl) else 0.0,
+            'fees': float(fees.sum())
+        }
+
+
+if __name__ == "__main__":
+    from candle_store import CandleStore
+    from strategy_manager import StrategyManager
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description="Backtest a BROski strategy on stored candles")
+    parser.add_argument('--strategy', type=str, help='Strategy name (default: active strategy)')
+    parser.add_argument('--symbol', type=str, help='Trading pair (default: from config.json)')
+    parser.add_argument('--timeframe', type=str, help="Timeframe (default: the strategy's timeframe)")
+    args = parser.parse_args()
+
+    with open("config.json", 'r') as f:
+        bot_config = json.load(f)
+
+    if args.strategy:
+        bot_config["strategies"]["active_strategy"] = args.strategy
+    manager = StrategyManager(bot_config)
+    if manager.active_strategy is None:
+        raise SystemExit(f"Could not load strategy {manager.active_strategy_name}")
+    strategy_config = bot_config["strategies"][manager.active_strategy_name]
+
+    trading = bot_config["trading"]
+    symbol = args.symbol or f"{trading['base_symbol']}/{trading['quote_symbol']}"
+    timeframe = args.timeframe or strategy_config.get("timeframe", "15m")
+    history = CandleStore.from_config(bot_config).to_dataframe(symbol, timeframe)
+    if history.empty:
+        raise SystemExit(f"No stored {timeframe} candles for {symbol}, run backfill.py first")
+
+    # With an ensemble configured the combined signals are tested
+    strategy = manager if manager.voting == "weighted" and len(manager.ensemble) > 1 else manager.active_strategy
+    start = time.perf_counter()
+    result = Backtester.from_config(bot_config).run_strategy(strategy, history)
+    logger.info(f"Backtested {manager.active_strategy_name} on {len(history)} {symbol} {timeframe} candles "
+                f"in {time.perf_counter() - start:.2f}s")
+    for key, value in result['stats'].items():
+        logger.info(f"  {key}: {value:.2f}" if isinstance(value, float) else f"  {key}: {value}")
@@ -6,6 +6,7 @@ import json
 from datetime import datetime
 from colorama import init, Fore, Style, Back
 from pathlib import Path
+from config_watcher import atomic_write_json
 
 # Initialize colorama for colored text
 init()
@@ -14,6 +15,7 @@ init()
 LOG_FILE = "logs/broski_bot.log"
 LOG_FILE_TRADING = "logs/trading_bot.log"
 REFRESH_RATE = 2  # seconds
+HISTORY_CANDLES = 1000  # Stored candles scanned by the signal history view
 
 class BotMonitor:
     """Simple real-time monitor for BROski Bot activity"""
@@ -60,6 +62,7 @@ class BotMonitor:
         print(f"  {Fore.GREEN}s{Style.RESET_ALL} - Toggle auto-scroll")
         print(f"  {Fore.GREEN}v{Style.RESET_ALL} - Toggle strategy view")
         print(f"  {Fore.GREEN}p{Style.RESET_ALL} - {Fore.GREEN}Show performance metrics{Style.RESET_ALL}")
+        print(f"  {Fore.GREEN}g{Style.RESET_ALL} - Show signal history from stored candles")
         print(f"  {Fore.CYAN}h{Style.RESET_ALL} - {Fore.CYAN}Enable HyperFocus mode{Style.RESET_ALL}")
         print(f"  {Fore.CYAN}r{Style.RESET_ALL} - {Fore.CYAN}Enable RSI strategy{Style.RESET_ALL}")
         print(f"  {Fore.CYAN}m{Style.RESET_ALL} - {Fore.CYAN}Enable MACD strategy{Style.RESET_ALL}")
@@ -298,6 +301,8 @@ class BotMonitor:
                             self._display_performance_panel()
                         else:
                             print("Performance view disabled")
+                    elif char == 'g':
+                        self._display_signal_history()
                     elif char == 'h' and not self.hyperfocus_enabled:  # HyperFocus mode
                         self._switch_strategy("hyperfocus_strategy")
                     elif char == 'r':  # RSI strategy
@@ -359,6 +364,8 @@ class BotMonitor:
                             self._display_performance_panel()
                         else:
                             print("Performance view disabled")
+                    elif command.lower() == 'g':
+                        self._display_signal_history()
                     elif command.lower() == 'h':  # HyperFocus mode
                         self._switch_strategy("hyperfocus_strategy")
                     elif command.lower() == 'r':  # RSI strategy
@@ -409,17 +416,16 @@ class BotMonitor:
                 config["strategies"]["active_strategy"] = strategy_name
                 
                 # Enable the new strategy and disable others
-                strategy_names = ["rsi_strategy", "macd_strategy", "ml_strategy", "hyperfocus_strategy"]
-                for strat in strategy_names:
+                from strategy_registry import get_strategy_registry
+                for strat in get_strategy_registry().names():
                     if strat in config["strategies"]:
                         config["strategies"][strat]["enabled"] = (strat == strategy_name)
                 
-                # Save the updated configuration
-                with open(config_path, 'w') as f:
-                    json.dump(config, f, indent=2)
+                # Save the updated configuration (the running bot picks it up before its next cycle)
+                atomic_write_json(config_path, config)
                 
                 print(f"{Fore.GREEN}Strategy changed from {old_strategy} to {strategy_name}{Style.RESET_ALL}")
-                print(f"{Fore.YELLOW}Please restart the bot for changes to take effect{Style.RESET_ALL}")
+                print(f"{Fore.YELLOW}A running bot switches before its next cycle{Style.RESET_ALL}")
                 
                 # Update the current strategy (for display purposes)
                 if strategy_name == "hyperfocus_strategy":
@@ -468,6 +474,42 @@ class BotMonitor:
         print(f"  {Fore.CYAN}m{Style.RESET_ALL} - Switch to MACD Strategy")
         print("=" * 60 + "\n")
     
+    def _display_signal_history(self, count=10):
+        """Show the active strategy's most recent signals on the stored candles"""
+        try:
+            from candle_store import CandleStore
+            from strategy_manager import StrategyManager
+            from strategies.signals import signal_records
+            
+            with open("config.json", 'r') as f:
+                config = json.load(f)
+            manager = StrategyManager(config)
+            if manager.active_strategy is None:
+                print(f"{Fore.RED}Could not load strategy {manager.active_strategy_name}{Style.RESET_ALL}")
+                return
+            
+            symbol = f"{config['trading']['base_symbol']}/{config['trading']['quote_symbol']}"
+            timeframe = config["strategies"][manager.active_strategy_name].get("timeframe", "15m")
+            df = CandleStore.from_config(config).to_dataframe(symbol, timeframe, limit=HISTORY_CANDLES)
+            if df.empty:
+                print(f"{Fore.YELLOW}No stored {timeframe} candles for {symbol} yet{Style.RESET_ALL}")
+                return
+            
+            # Every candle is evaluated in one pass
+            signals = signal_records(manager.active_strategy.generate_signals_batch(df), df)
+            
+            print("\n" + "=" * 60)
+            print(f"{Fore.CYAN}SIGNAL HISTORY - {manager.active_strategy_name} {symbol} {timeframe}{Style.RESET_ALL}")
+            print("=" * 60)
+            print(f"{len(signals)} signals in the last {len(df)} candles")
+            for signal in signals[-count:]:
+                color = Fore.GREEN if signal['type'] == 'buy' else Fore.RED
+                strength = f" strength {signal['strength']:.2f}" if 'strength' in signal else ""
+                print(f"{signal['timestamp']}  {color}{signal['type'].upper():4}{Style.RESET_ALL}  {signal['price']:.6f}{strength}")
+            print("=" * 60 + "\n")
+        except Exception as e:
+            print(f"{Fore.RED}Error loading signal history: {str(e)}{Style.RESET_ALL}")
+    
     def _display_performance_panel(self):
         """Display trading performance metrics"""
         print("\n" + "=" * 60)
@@ -5,10 +5,15 @@ import time
 import logging
 import traceback
 from pathlib import Path
-import ccxt
 import numpy as np
 import pandas as pd
 from datetime import datetime
+from market_data_hub import connect_market_data
+from candle_store import CandleStore
+from resampler import TimeframeResampler
+from exchange_connector import create_exchange_client
+from ticker_cache import get_ticker_cache
+import indicators
 
 # Set up logging
 os.makedirs("logs", exist_ok=True)
@@ -36,11 +41,15 @@ class TradingBot:
             self.config = json.load(f)
         
         # Exchange setup
-        self.exchange = ccxt.mexc({
-            'apiKey': self.config['exchange']['api_key'],
-            'secret': self.config['exchange']['api_secret'],
-            'enableRateLimit': True,
-        })
+        self.exchange = create_exchange_client(self.config)
+        
+        # Market data comes from the shared hub when it is running, orders always use our own session
+        self.market_data = connect_market_data(self.config) or self.exchange
+        self.ticker_cache = get_ticker_cache(
+            self.config['exchange'].get('name', 'mexc'),
+            self.market_data.fetch_ticker,
+            self.config.get("market_data", {}).get("ticker_ttl_seconds", 0.5)
+        )
         
         # Trading parameters
         self.base = self.config["trading"]["base_symbol"]
@@ -55,6 +64,12 @@ class TradingBot:
         self.strategy_config = self.config["strategies"][self.active_strategy]
         self.timeframe = self.strategy_config["timeframe"]
         
+        # Optionally download only one base timeframe and derive the strategy timeframe locally
+        self.resampler = None
+        base_timeframe = self.config.get("market_data", {}).get("base_timeframe")
+        if base_timeframe:
+            self.resampler = TimeframeResampler(CandleStore.from_config(self.config), base_timeframe)
+        
         # Risk management
         self.risk = self.config["risk_management"]
         
@@ -70,11 +85,15 @@ class TradingBot:
         """Fetch historical OHLCV data"""
         try:
             logger.info(f"Fetching {self.timeframe} candles for {self.symbol}...")
-            ohlcv = self.exchange.fetch_ohlcv(self.symbol, self.timeframe, limit=limit)
-            
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            if self.resampler is not None:
+                self.resampler.sync(self.market_data, self.symbol, self.timeframe, limit=limit)
+                df = self.resampler.get(self.symbol, self.timeframe, limit=limit)
+            else:
+                ohlcv = self.market_data.fetch_ohlcv(self.symbol, self.timeframe, limit=limit)
+                
+                df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+                df.set_index('timestamp', inplace=True)
             
             logger.info(f"Fetched {len(df)} candles")
             return df
@@ -88,15 +107,8 @@ class TradingBot:
             if self.active_strategy == "rsi_strategy":
                 # Calculate RSI
                 rsi_period = self.strategy_config["rsi_period"]
-                delta = df['close'].diff()
-                gain = delta.where(delta > 0, 0)
-                loss = -delta.where(delta < 0, 0)
-                
-                avg_gain = gain.rolling(window=rsi_period).mean()
-                avg_loss = loss.rolling(window=rsi_period).mean()
-                
-                rs = avg_gain / avg_loss
-                df['rsi'] = 100 - (100 / (1 + rs))
+                rsi_method = self.strategy_config.get("rsi_method", indicators.DEFAULT_RSI_METHOD)
+                df['rsi'] = indicators.get_indicator_cache().get(df, 'rsi', period=rsi_period, method=rsi_method)
                 
                 logger.info(f"Current RSI: {df['rsi'].iloc[-1]:.2f}")
                 
@@ -106,10 +118,10 @@ class TradingBot:
                 slow = self.strategy_config["slow_period"]
                 signal_period = self.strategy_config["signal_period"]
                 
-                df['ema_fast'] = df['close'].ewm(span=fast, adjust=False).mean()
-                df['ema_slow'] = df['close'].ewm(span=slow, adjust=False).mean()
+                df['ema_fast'] = indicators.ema(df['close'], fast)
+                df['ema_slow'] = indicators.ema(df['close'], slow)
                 df['macd_line'] = df['ema_fast'] - df['ema_slow']
-                df['signal_line'] = df['macd_line'].ewm(span=signal_period, adjust=False).mean()
+                df['signal_line'] = indicators.ema(df['macd_line'], signal_period)
                 df['macd_histogram'] = df['macd_line'] - df['signal_line']
                 
                 logger.info(f"Current MACD Line: {df['macd_line'].iloc[-1]:.6f}, Signal Line: {df['signal_line'].iloc[-1]:.6f}")
@@ -196,7 +208,7 @@ class TradingBot:
             return False
         
         try:
-            current_price = self.exchange.fetch_ticker(self.symbol)['last']
+            current_price = self.ticker_cache.get_price(self.symbol)
             base_balance, quote_balance = self.check_balance()
             
             if signal == "BUY":
@@ -8,6 +8,7 @@ import threading
 import webbrowser
 from pathlib import Path
 from datetime import datetime
+from config_watcher import atomic_write_json
 
 class BROskiDashboard:
     """
@@ -677,6 +678,12 @@ class BROskiDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open trade results: {str(e)}")
     
+    def _running_bot_note(self):
+        """Message suffix telling the user when a running bot picks up saved settings"""
+        if self.bot_process and self.bot_process.poll() is None:
+            return "\n\nThe running bot will apply the change before its next cycle."
+        return ""
+    
     def switch_strategy(self, strategy):
         """Switch to a different strategy"""
         try:
@@ -692,9 +699,8 @@ class BROskiDashboard:
                 if strat in config["strategies"]:
                     config["strategies"][strat]["enabled"] = (strat == strategy)
                     
-            # Save config
-            with open("config.json", 'w') as f:
-                json.dump(config, f, indent=2)
+            # Save config (a running bot picks it up before its next cycle)
+            atomic_write_json("config.json", config)
             
             # Update dashboard
             nice_names = {
@@ -704,17 +710,8 @@ class BROskiDashboard:
             }
             self.active_strategy_var.set(nice_names.get(strategy, strategy))
             
-            messagebox.showinfo("Strategy Changed", f"Trading strategy switched to {nice_names.get(strategy, strategy)}")
-            
-            # Restart bot if running
-            restart = False
-            if self.bot_process and self.bot_process.poll() is None:
-                restart = messagebox.askyesno("Restart Bot", 
-                    "The bot is currently running. Do you want to restart it with the new strategy?")
-                
-            if restart:
-                self.stop_bot()
-                self.root.after(1000, self.start_bot)  # Start after 1 second delay
+            messagebox.showinfo("Strategy Changed", f"Trading strategy switched to {nice_names.get(strategy, strategy)}"
+                                + self._running_bot_note())
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to switch strategy: {str(e)}")
@@ -730,9 +727,8 @@ class BROskiDashboard:
             current = config["trading"]["auto_trade"]
             config["trading"]["auto_trade"] = not current
             
-            # Save config
-            with open("config.json", 'w') as f:
-                json.dump(config, f, indent=2)
+            # Save config (a running bot picks it up before its next cycle)
+            atomic_write_json("config.json", config)
             
             # Update display
             auto_trade = config["trading"]["auto_trade"]
@@ -740,17 +736,7 @@ class BROskiDashboard:
             self.auto_trade_label.config(foreground="green" if auto_trade else "red")
             
             status = "enabled" if auto_trade else "disabled"
-            messagebox.showinfo("Auto-Trade", f"Auto-trading has been {status}.")
-            
-            # Ask about restarting the bot
-            restart = False
-            if self.bot_process and self.bot_process.poll() is None:
-                restart = messagebox.askyesno("Restart Bot", 
-                    "The bot is currently running. Do you want to restart it with the new settings?")
-                
-            if restart:
-                self.stop_bot()
-                self.root.after(1000, self.start_bot)  # Start after 1 second delay
+            messagebox.showinfo("Auto-Trade", f"Auto-trading has been {status}." + self._running_bot_note())
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to toggle auto-trade: {str(e)}")
@@ -772,24 +758,13 @@ class BROskiDashboard:
             # Update active strategy
             config["strategies"]["active_strategy"] = self.active_strategy_config_var.get()
             
-            # Save config
-            with open("config.json", 'w') as f:
-                json.dump(config, f, indent=2)
+            # Save config (a running bot picks it up before its next cycle)
+            atomic_write_json("config.json", config)
             
             # Update dashboard
             self.update_dashboard_info()
             
-            messagebox.showinfo("Saved", "Configuration saved successfully!")
-            
-            # Ask about restarting the bot
-            restart = False
-            if self.bot_process and self.bot_process.poll() is None:
-                restart = messagebox.askyesno("Restart Bot", 
-                    "The bot is currently running. Do you want to restart it with the new settings?")
-                
-            if restart:
-                self.stop_bot()
-                self.root.after(1000, self.start_bot)  # Start after 1 second delay
+            messagebox.showinfo("Saved", "Configuration saved successfully!" + self._running_bot_note())
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save configuration: {str(e)}")
@@ -0,0 +1,380 @@
+import time
+import shutil
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+logger = logging.getLogger("BROski.CandleStore")
+
+# Column layout of every stored series (one raw binary file per column)
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+DTYPES = {
+    'timestamp': np.dtype('<i8'),
+    'open': np.dtype('<f8'),
+    'high': np.dtype('<f8'),
+    'low': np.dtype('<f8'),
+    'close': np.dtype('<f8'),
+    'volume': np.dtype('<f8'),
+}
+
+TIMEFRAME_UNITS_MS = {
+    'm': 60 * 1000,
+    'h': 60 * 60 * 1000,
+    'd': 24 * 60 * 60 * 1000,
+    'w': 7 * 24 * 60 * 60 * 1000,
+}
+
+
+def timeframe_to_ms(timeframe):
+    """
+    Convert a ccxt timeframe string to milliseconds
+
+    Args:
+        timeframe (str): Timeframe string like '1m', '15m', '4h', '1d'
+
+    Returns:
+        int: Timeframe length in milliseconds
+    """
+    unit = timeframe[-1]
+    if unit not in TIMEFRAME_UNITS_MS or not timeframe[:-1].isdigit():
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return int(timeframe[:-1]) * TIMEFRAME_UNITS_MS[unit]
+
+
+def exchange_time_ms(exchange):
+    """
+    Current time in milliseconds as seen by an exchange client
+
+    ccxt clients expose milliseconds(); replaying clients (MockExchange) return
+    their simulated time from it. Anything else falls back to the local clock.
+    """
+    if hasattr(exchange, 'milliseconds'):
+        return int(exchange.milliseconds())
+    return int(time.time() * 1000)
+
+
+class CandleStore:
+    """
+    On-disk OHLCV candle store keyed by symbol and timeframe.
+
+    Every series is kept as one raw little-endian binary file per column
+    (data/candles/PI_USDT/15m/close.f8, ...), so columns can be opened as
+    read-only memory maps and new candles are appended without rewriting history.
+    """
+
+    def __init__(self, root="data/candles"):
+        """
+        Initialize the candle store
+
+        Args:
+            root (str): Directory that holds all stored series
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._history_exhausted = set()
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a candle store using the market_data section of config.json"""
+        if not isinstance(config, dict):
+            return cls()
+        
+        # Keep replayed mock candles away from the real history
+        default_dir = "data/mock_candles" if config.get("exchange", {}).get("name") == "mock" else "data/candles"
+        return cls(config.get("market_data", {}).get("candle_store_dir", default_dir))
+
+    def _series_dir(self, symbol, timeframe):
+        return self.root / symbol.replace('/', '_') / timeframe
+
+    def _column_path(self, symbol, timeframe, column):
+        return self._series_dir(symbol, timeframe) / f"{column}.{DTYPES[column].kind}{DTYPES[column].itemsize}"
+
+    def length(self, symbol, timeframe):
+        """
+        Number of complete candles stored for a series
+
+        Columns can disagree in length if a write was interrupted,
+        so the shortest column wins.
+        """
+        lengths = []
+        for column in COLUMNS:
+            path = self._column_path(symbol, timeframe, column)
+            if not path.exists():
+                return 0
+            lengths.append(path.stat().st_size // DTYPES[column].itemsize)
+        return min(lengths)
+
+    def _repair(self, symbol, timeframe):
+        """Truncate all columns to the same length after an interrupted write"""
+        length = self.length(symbol, timeframe)
+        for column in COLUMNS:
+            path = self._column_path(symbol, timeframe, column)
+            expected = length * DTYPES[column].itemsize
+            if path.exists() and path.stat().st_size != expected:
+                logger.warning(f"Truncating {path} to {length} candles")
+                with open(path, 'r+b') as f:
+                    f.truncate(expected)
+        return length
+
+    def last_timestamp(self, symbol, timeframe):
+        """
+        Get the timestamp (ms) of the newest stored candle
+
+        Returns:
+            int: Timestamp in milliseconds, or None if nothing is stored
+        """
+        length = self.length(symbol, timeframe)
+        if length == 0:
+            return None
+        path = self._column_path(symbol, timeframe, 'timestamp')
+        with open(path, 'rb') as f:
+            f.seek((length - 1) * DTYPES['timestamp'].itemsize)
+            return int(np.frombuffer(f.read(DTYPES['timestamp'].itemsize), dtype=DTYPES['timestamp'])[0])
+
+    def append(self, symbol, timeframe, ohlcv):
+        """
+        Append candles to a stored series
+
+        Candles older than the newest stored candle are ignored. A candle with the
+        same timestamp as the newest stored one replaces it, which keeps the still
+        forming candle up to date.
+
+        Args:
+            symbol (str): Trading pair in format BASE/QUOTE
+            timeframe (str): Timeframe string like '5m', '1h', etc.
+            ohlcv (list): Candles in ccxt format [[timestamp, open, high, low, close, volume], ...]
+
+        Returns:
+            int: Number of new candles added
+        """
+        if ohlcv is None or len(ohlcv) == 0:
+            return 0
+
+        data = np.asarray(ohlcv, dtype=np.float64)
+        data = data[np.argsort(data[:, 0], kind='stable')]
+        timestamps = data[:, 0].astype(np.int64)
+
+        # Keep only the last copy of each timestamp
+        keep = np.append(timestamps[1:] != timestamps[:-1], True)
+        data, timestamps = data[keep], timestamps[keep]
+
+        series_dir = self._series_dir(symbol, timeframe)
+        series_dir.mkdir(parents=True, exist_ok=True)
+        length = self._repair(symbol, timeframe)
+        last_ts = self.last_timestamp(symbol, timeframe)
+
+        if last_ts is not None:
+            # Overwrite the stored forming candle if it came back updated
+            same = timestamps == last_ts
+            if same.any():
+                row = data[same][-1]
+                for i, column in enumerate(COLUMNS):
+                    value = np.asarray([row[i]]).astype(DTYPES[column])
+                    with open(self._column_path(symbol, timeframe, column), 'r+b') as f:
+                        f.seek((length - 1) * DTYPES[column].itemsize)
+                        f.write(value.tobytes())
+
+            newer = timestamps > last_ts
+            data = data[newer]
+
+        if len(data) == 0:
+            return 0
+
+        for i, column in enumerate(COLUMNS):
+            with open(self._column_path(symbol, timeframe, column), 'ab') as f:
+                f.write(data[:, i].astype(DTYPES[column]).tobytes())
+
+        logger.debug(f"Appended {len(data)} candles to {symbol} ({timeframe})")
+        return len(data)
+
+    def merge(self, symbol, timeframe, ohlcv):
+        """
+        Merge candles from any time range into a stored series
+
+        Unlike append, this accepts candles older than or overlapping the stored
+        history. Overlapping timestamps are replaced by the new candles. When all
+        new candles are newer than the stored ones this is just an append;
+        otherwise the series is rewritten next to the old one and swapped in.
+
+        Args:
+            symbol (str): Trading pair in format BASE/QUOTE
+            timeframe (str): Timeframe string like '5m', '1h', etc.
+            ohlcv: Candles in ccxt format, as a list or an (N, 6) array
+
+        Returns:
+            int: Number of candles in the series that were not stored before
+        """
+        if ohlcv is None or len(ohlcv) == 0:
+            return 0
+
+        data = np.asarray(ohlcv, dtype=np.float64)
+        last_ts = self.last_timestamp(symbol, timeframe)
+        if last_ts is None or data[:, 0].min() >= last_ts:
+            return self.append(symbol, timeframe, data)
+
+        stored = self.read(symbol, timeframe)
+        existing = np.column_stack([np.asarray(stored[column], dtype=np.float64) for column in COLUMNS])
+        before = len(existing)
+
+        # New candles come last so the stable sort keeps them as the last copy of each timestamp
+        combined = np.concatenate([existing, data])
+        combined = combined[np.argsort(combined[:, 0], kind='stable')]
+        timestamps = combined[:, 0].astype(np.int64)
+        combined = combined[np.append(timestamps[1:] != timestamps[:-1], True)]
+        del stored, existing
+
+        series_dir = self._series_dir(symbol, timeframe)
+        temp_dir = series_dir.with_name(f"{timeframe}.tmp")
+        old_dir = series_dir.with_name(f"{timeframe}.old")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        temp_dir.mkdir(parents=True)
+
+        for i, column in enumerate(COLUMNS):
+            with open(temp_dir / self._column_path(symbol, timeframe, column).name, 'wb') as f:
+                f.write(combined[:, i].astype(DTYPES[column]).tobytes())
+
+        shutil.rmtree(old_dir, ignore_errors=True)
+        series_dir.rename(old_dir)
+        temp_dir.rename(series_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+        logger.debug(f"Merged {len(data)} candles into {symbol} ({timeframe}), {len(combined)} stored")
+        return len(combined) - before
+
+    def read(self, symbol, timeframe, limit=None, since=None):
+        """
+        Read a stored series as memory-mapped column arrays
+
+        Args:
+            symbol (str): Trading pair
+            timeframe (str): Timeframe string
+            limit (int): Only return the newest `limit` candles
+            since (int): Only return candles at or after this timestamp (ms)
+
+        Returns:
+            dict: Column name -> read-only numpy array (empty arrays if nothing is stored)
+        """
+        length = self.length(symbol, timeframe)
+        if length == 0:
+            return {column: np.empty(0, dtype=DTYPES[column]) for column in COLUMNS}
+
+        columns = {
+            column: np.memmap(self._column_path(symbol, timeframe, column),
+                              dtype=DTYPES[column], mode='r', shape=(length,))
+            for column in COLUMNS
+        }
+
+        start = 0
+        if since is not None:
+            start = int(np.searchsorted(columns['timestamp'], since, side='left'))
+        if limit is not None:
+            start = max(start, length - int(limit))
+
+        return {column: values[start:] for column, values in columns.items()}
+
+    def to_dataframe(self, symbol, timeframe, limit=None, since=None):
+        """
+        Read a stored series as the OHLCV DataFrame used across the bot
+
+        Returns:
+            pd.DataFrame: OHLCV data indexed by timestamp
+        """
+        columns = self.read(symbol, timeframe, limit=limit, since=since)
+        df = pd.DataFrame({column: np.array(columns[column]) for column in COLUMNS[1:]},
+                          index=pd.to_datetime(np.array(columns['timestamp']), unit='ms'))
+        df.index.name = 'timestamp'
+        df.attrs.update(symbol=symbol, timeframe=timeframe)
+        return df
+
+    def _history_shortfall(self, symbol, timeframe, limit):
+        """
+        Where older candles are needed for `limit` candles of history
+
+        Returns:
+            tuple: (first stored timestamp, timestamp to fetch from), or None if
+                enough history is stored or the exchange has no older candles
+        """
+        length = self.length(symbol, timeframe)
+        if length == 0 or length >= limit or (symbol, timeframe) in self._history_exhausted:
+            return None
+
+        first_ts = int(self.read(symbol, timeframe)['timestamp'][0])
+        logger.info(f"Extending {symbol} ({timeframe}) history by {limit - length} candles")
+        return first_ts, first_ts - (limit - length) * timeframe_to_ms(timeframe)
+
+    def _store_history(self, symbol, timeframe, older, limit):
+        """Merge fetched older candles and remember series the exchange has no more history for"""
+        added = self.merge(symbol, timeframe, older) if older else 0
+        if self.length(symbol, timeframe) < limit:
+            # The exchange has no older candles (e.g. a recent listing), don't ask again
+            self._history_exhausted.add((symbol, timeframe))
+        return added
+
+    def _extend_history(self, exchange, symbol, timeframe, limit, page_limit, max_pages):
+        """Fetch older candles when a caller needs more history than is stored"""
+        shortfall = self._history_shortfall(symbol, timeframe, limit)
+        if shortfall is None:
+            return 0
+        first_ts, since = shortfall
+
+        older = []
+        for _ in range(max_pages):
+            ohlcv = exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=page_limit)
+            ohlcv = [candle for candle in (ohlcv or []) if candle[0] < first_ts]
+            if not ohlcv:
+                break
+            older.extend(ohlcv)
+            newest = int(ohlcv[-1][0])
+            if newest <= since:
+                break
+            since = newest + 1
+
+        return self._store_history(symbol, timeframe, older, limit)
+
+    def sync(self, exchange, symbol, timeframe, limit=100, page_limit=1000, max_pages=50):
+        """
+        Bring a stored series up to date from the exchange
+
+        The first call backfills roughly `limit` candles. Later calls only fetch
+        candles from the newest stored timestamp onwards, plus older candles if
+        fewer than `limit` are stored.
+
+        Args:
+            exchange: ccxt exchange client (or anything with a compatible fetch_ohlcv)
+            symbol (str): Trading pair
+            timeframe (str): Timeframe string
+            limit (int): Number of candles to backfill when nothing is stored yet
+            page_limit (int): Maximum candles requested per API call
+            max_pages (int): Safety cap on API calls per sync
+
+        Returns:
+            int: Number of new candles stored
+        """
+        last_ts = self.last_timestamp(symbol, timeframe)
+
+        if last_ts is None:
+            since = exchange_time_ms(exchange) - limit * timeframe_to_ms(timeframe)
+            logger.info(f"Backfilling {limit} {timeframe} candles for {symbol}")
+        else:
+            # Re-request the newest stored candle so a forming candle gets finalised
+            since = last_ts
+            self._extend_history(exchange, symbol, timeframe, limit, page_limit, max_pages)
+
+        added = 0
+        for _ in range(max_pages):
+            ohlcv = exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=page_limit)
+            if not ohlcv:
+                break
+
+            added += self.append(symbol, timeframe, ohlcv)
+
+            newest = int(ohlcv[-1][0])
+            # Stop once caught up with the current candle (pages may be capped below page_limit)
+            if newest <= since or newest + timeframe_to_ms(timeframe) > exchange_time_ms(exchange):
+                break
+            since = newest
+
+        if added:
+            logger.debug(f"Synced {added} new {timeframe} candles for {symbol}")
+        return added
@@ -0,0 +1,146 @@
+import os
+import json
+import logging
+import tempfile
+
+logger = logging.getLogger("BROski.ConfigWatcher")
+
+# Sections every bot config needs
+REQUIRED_SECTIONS = ('exchange', 'trading', 'strategies')
+
+# Settings that must be positive numbers when present
+POSITIVE_SETTINGS = {
+    'trading': ('trade_amount', 'trade_interval_seconds', 'max_position_size'),
+    'risk_management': ('stop_loss_percentage', 'take_profit_percentage', 'max_daily_trades',
+                        'max_open_positions', 'max_exposure_percentage')
+}
+
+
+def atomic_write_json(path, data, indent=2):
+    """
+    Write JSON so that readers see either the old file or the new one, never half of it
+
+    The data goes to a temporary file in the same directory, which then
+    replaces the target in one rename.
+
+    Args:
+        path (str): File to write
+        data (dict): JSON-serialisable data
+        indent (int): JSON indentation
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".config_", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode & 0o777)
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def validate_config(config):
+    """
+    Check a bot configuration before it is applied
+
+    Args:
+        config (dict): Parsed config.json
+
+    Returns:
+        list: Problems found (empty if the config can be applied)
+    """
+    if not isinstance(config, dict):
+        return ["Configuration is not a JSON object"]
+
+    problems = [f"Missing section: {section}" for section in REQUIRED_SECTIONS
+                if not isinstance(config.get(section), dict)]
+    if problems:
+        return problems
+
+    trading = config['trading']
+    for key in ('base_symbol', 'quote_symbol'):
+        if not trading.get(key):
+            problems.append(f"Missing trading.{key}")
+
+    strategies = config['strategies']
+    active_strategy = strategies.get('active_strategy')
+    if not isinstance(strategies.get(active_strategy), dict):
+        problems.append(f"Active strategy {active_strategy} has no settings in strategies")
+
+    for section, keys in POSITIVE_SETTINGS.items():
+        values = config.get(section, {})
+        for key in keys:
+            value = values.get(key)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                problems.append(f"{section}.{key} must be a positive number, got {value!r}")
+
+    for name, settings in strategies.items():
+        if not isinstance(settings, dict):
+            continue
+        for key, value in settings.items():
+            if key.endswith('_period') and (isinstance(value, bool) or not isinstance(value, int) or value < 1):
+                problems.append(f"strategies.{name}.{key} must be a whole number of candles, got {value!r}")
+
+    return problems
+
+
+class ConfigWatcher:
+    """
+    Watches config.json for changes made while the bot is running.
+
+    The bot polls between cycles. A changed file is parsed and validated;
+    only a complete, valid config is returned, so a half-written or broken
+    file leaves the bot running on its current settings.
+    """
+
+    def __init__(self, path="config.json"):
+        """
+        Initialize the config watcher
+
+        Args:
+            path (str): Config file to watch
+        """
+        self.path = path
+        self.signature = self._signature()
+
+    def _signature(self):
+        """Modification time and size of the file, or None if it is missing"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def poll(self):
+        """
+        Check the config file for changes
+
+        Returns:
+            dict: The new configuration if the file changed and is valid, otherwise None
+        """
+        signature = self._signature()
+        if signature is None or signature == self.signature:
+            return None
+        self.signature = signature
+
+        try:
+            with open(self.path, 'r') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring config change, could not read {self.path}: {str(e)}")
+            return None
+
+        problems = validate_config(config)
+        if problems:
+            logger.error(f"Ignoring invalid config change in {self.path}: {'; '.join(problems)}")
+            return None
+
+        logger.info(f"Configuration change detected in {self.path}")
+        return config
@@ -6,12 +6,31 @@ from datetime import datetime
 import ccxt
 import json
 from pathlib import Path
+from candle_store import CandleStore, timeframe_to_ms
+from market_data_engine import MarketDataEngine
+from market_data_hub import connect_market_data
+from market_cache import MarketMetadataCache
+from resampler import TimeframeResampler
+from exchange_connector import create_exchange_client
+from rate_limiter import RateLimitedClient
+from ticker_cache import get_ticker_cache
+from order_book import LocalOrderBook
+from strategy_registry import get_strategy_registry
+import indicators as indicators_lib
 
 logger = logging.getLogger("BROski.DataFetcher")
 
 class DataFetcher:
-    def __init__(self, config=None):
-        """Initialize the data fetcher with configuration"""
+    def __init__(self, config=None, exchange=None, ticker_cache=None):
+        """
+        Initialize the data fetcher with configuration
+        
+        Args:
+            config (dict): Bot configuration (loaded from config.json if not given)
+            exchange: Exchange client to use instead of creating one (e.g. a shared MockExchange)
+            ticker_cache (TickerCache): Ticker cache to share (e.g. the exchange connector's),
+                otherwise the process-wide cache for this fetcher's exchange client
+        """
         if config:
             self.config = config
         else:
@@ -24,27 +43,100 @@ class DataFetcher:
                 raise FileNotFoundError("Config file not found")
         
         # Connect to exchange
-        self._initialize_exchange()
+        self.exchange = exchange
+        if self.exchange is None:
+            self._initialize_exchange()
+        
+        # Tickers are reused for a fraction of a second by everything sharing the cache
+        self.ticker_cache = ticker_cache or get_ticker_cache(
+            self.config['exchange'].get('name', 'mexc'),
+            lambda pair: self.exchange.fetch_ticker(pair),
+            self.config.get("market_data", {}).get("ticker_ttl_seconds", 0.5)
+        )
+        
+        # Clock used for cache expiry (replaced by the simulated clock when replaying)
+        self.clock = time.time
         
         # Cache for OHLCV data to reduce API calls
         self.ohlcv_cache = {}
         self.last_update_time = {}
         
+        # Locally maintained order books (opt-in), kept current from a level update feed
+        # when the exchange offers one, otherwise re-seeded from a snapshot when they get old
+        self.order_books = {}
+        self.use_local_order_book = self.config.get("market_data", {}).get("local_order_book", False)
+        self.order_book_refresh = self.config.get("market_data", {}).get("order_book_refresh_seconds", 5)
+        self.order_book_depth = self.config.get("market_data", {}).get("order_book_depth", 50)
+        
+        # Market list is kept on disk and refreshed in the background
+        self.market_cache = MarketMetadataCache.from_config(self.exchange, self.config)
+        
+        # Persistent candle history, only new candles are fetched after the first backfill
+        self.candle_store = CandleStore.from_config(self.config)
+        
+        # Optionally download only one base timeframe and derive the others locally
+        self.resampler = None
+        base_timeframe = self.config.get("market_data", {}).get("base_timeframe")
+        if base_timeframe:
+            self.resampler = TimeframeResampler(self.candle_store, base_timeframe, clock=lambda: self.clock())
+        
+        # Concurrent multi-pair fetching (disable with market_data.async_engine = false).
+        # Not needed when the shared hub or the mock exchange already serves the data locally.
+        self.engine = None
+        if (self.config.get("market_data", {}).get("async_engine", True)
+                and isinstance(self.exchange, (ccxt.Exchange, RateLimitedClient))):
+            self.engine = MarketDataEngine(self.config, candle_store=self.candle_store)
+        
         logger.info("DataFetcher initialized")
     
     def _initialize_exchange(self):
         """Initialize exchange connection"""
         try:
-            self.exchange = ccxt.mexc({
-                'apiKey': self.config['exchange']['api_key'],
-                'secret': self.config['exchange']['api_secret'],
-                'enableRateLimit': True,
-            })
+            # Share the market data hub's session when it is running
+            self.exchange = connect_market_data(self.config) or create_exchange_client(self.config)
             logger.info(f"Connected to {self.exchange.name} exchange")
         except Exception as e:
             logger.error(f"Failed to initialize exchange: {str(e)}")
             self.exchange = None
     
+    def get_trading_pairs(self):
+        """
+        Get the trading pairs to watch
+        
+        Returns:
+            list: trading.trading_pairs if configured, otherwise the single base/quote pair
+        """
+        pairs = self.config["trading"].get("trading_pairs")
+        if pairs:
+            return list(pairs)
+        
+        base = self.config["trading"]["base_symbol"]
+        quote = self.config["trading"]["quote_symbol"]
+        return [f"{base}/{quote}"]
+    
+    def strategy_names(self):
+        """The active strategy and the ensemble members in the config"""
+        strategies = self.config["strategies"]
+        names = [strategies["active_strategy"]] + list(strategies.get("ensemble", {}).get("strategies", []))
+        registry = get_strategy_registry()
+        return [name for i, name in enumerate(names) if name in registry and name not in names[:i]]
+    
+    def candle_limit(self):
+        """Candles to fetch per pair: 100, or more if a strategy needs a longer warm-up"""
+        return max(100, get_strategy_registry().warmup_candles(self.strategy_names(), self.config["strategies"]))
+    
+    def _prefetch_indicators(self, df):
+        """Compute the indicators the configured strategies read into the shared indicator cache"""
+        if df is None or df.empty:
+            return
+        cache = indicators_lib.get_indicator_cache()
+        try:
+            for name, params in get_strategy_registry().required_indicators(self.strategy_names(),
+                                                                            self.config["strategies"]):
+                cache.get(df, name, **params)
+        except Exception as e:
+            logger.error(f"Error prefetching indicators: {str(e)}")
+    
     def get_latest_data(self):
         """
         Fetch the latest market data according to configuration
@@ -56,26 +148,54 @@ class DataFetcher:
         
         market_data = {
             "pairs": {},
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.fromtimestamp(self.clock()).isoformat()
         }
         
-        # Get the trading pair from config
-        base = self.config["trading"]["base_symbol"]
-        quote = self.config["trading"]["quote_symbol"]
-        pair = f"{base}/{quote}"
+        pairs = self.get_trading_pairs()
         
         # Get active strategy and timeframe
         active_strategy = self.config["strategies"]["active_strategy"]
         timeframe = self.config["strategies"][active_strategy]["timeframe"]
+        extra_timeframes = self.config.get("market_data", {}).get("timeframes", [])
+        timeframes = [timeframe] + [tf for tf in extra_timeframes if tf != timeframe]
+        limit = self.candle_limit()
         
         try:
-            market_data["pairs"][pair] = {
-                "price": self._get_current_price(pair),
-                "ohlcv": self._get_ohlcv_data(pair, timeframe),
-                "indicators": self._calculate_indicators(pair, timeframe, active_strategy)
-            }
+            if self.engine is not None:
+                # All pairs and timeframes are fetched concurrently
+                if self.resampler is not None:
+                    base = self.resampler.base_timeframe
+                    ratio = max(self.resampler.ratio(tf) for tf in timeframes)
+                    fetched = self.engine.fetch(pairs, [base], limit=limit * ratio)
+                    for pair, pair_data in fetched["pairs"].items():
+                        frames = {tf: self.resampler.get(pair, tf, limit=limit) for tf in timeframes}
+                        pair_data["timeframes"] = frames
+                        pair_data["ohlcv"] = frames[timeframe]
+                else:
+                    fetched = self.engine.fetch(pairs, timeframes, limit=limit)
+                current_time = self.clock()
+                
+                for pair, pair_data in fetched["pairs"].items():
+                    self.ticker_cache.put(pair, pair_data["ticker"])
+                    for tf, df in pair_data["timeframes"].items():
+                        if not df.empty and not self._is_stale(df, tf):
+                            self.ohlcv_cache[f"{pair}_{tf}"] = df
+                            self.last_update_time[f"{pair}_{tf}"] = current_time
+                    
+                    self._prefetch_indicators(pair_data.get("ohlcv"))
+                    pair_data["indicators"] = self._calculate_indicators(pair, timeframe, active_strategy)
+                    market_data["pairs"][pair] = pair_data
+            else:
+                for pair in pairs:
+                    ohlcv = self._get_ohlcv_data(pair, timeframe, limit)
+                    self._prefetch_indicators(ohlcv)
+                    market_data["pairs"][pair] = {
+                        "price": self._get_current_price(pair),
+                        "ohlcv": ohlcv,
+                        "indicators": self._calculate_indicators(pair, timeframe, active_strategy)
+                    }
             
-            logger.info(f"Fetched data for {pair}")
+            logger.info(f"Fetched data for {', '.join(pairs)}")
             return market_data
             
         except Exception as e:
@@ -93,8 +213,7 @@ class DataFetcher:
             float: Current price
         """
         try:
-            ticker = self.exchange.fetch_ticker(pair)
-            price = ticker['last']
+            price = self.ticker_cache.get_price(pair)
             logger.debug(f"Current price for {pair}: {price}")
             return price
         except Exception as e:
@@ -114,7 +233,7 @@ class DataFetcher:
             pd.DataFrame: OHLCV data with columns: open, high, low, close, volume
         """
         cache_key = f"{pair}_{timeframe}"
-        current_time = time.time()
+        current_time = self.clock()
         
         # Check if we need to refresh the cache
         # For 1m, refresh every 30 sec; 5m, refresh every 2 min, etc.
@@ -132,29 +251,69 @@ class DataFetcher:
             cache_key not in self.last_update_time or 
             current_time - self.last_update_time.get(cache_key, 0) > refresh_time):
             
+            synced = True
             try:
-                logger.debug(f"Fetching OHLCV data for {pair} ({timeframe})")
-                ohlcv = self.exchange.fetch_ohlcv(pair, timeframe, limit=limit)
-                
-                # Convert to DataFrame
-                df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                df.set_index('timestamp', inplace=True)
-                
-                # Update cache
+                logger.debug(f"Syncing OHLCV data for {pair} ({timeframe})")
+                self._sync_candles(pair, timeframe, limit)
+            except Exception as e:
+                logger.error(f"Error fetching OHLCV data for {pair}: {str(e)}")
+                synced = False
+            
+            # Serve from the local store, even if the exchange is unreachable
+            if self.resampler is not None:
+                df = self.resampler.get(pair, timeframe, limit=limit)
+            else:
+                df = self.candle_store.to_dataframe(pair, timeframe, limit=limit)
+            if df.empty:
+                return df
+            
+            # Never trade on candles that stopped updating while the exchange was unreachable
+            if self._is_stale(df, timeframe):
+                logger.warning(f"Newest {pair} ({timeframe}) candle is from {df.index[-1]}, "
+                               f"ignoring stale data until the exchange is reachable")
+                return df.iloc[0:0]
+            
+            # Only a successful sync is cached, so a failed one is retried on the next call
+            if synced:
                 self.ohlcv_cache[cache_key] = df
                 self.last_update_time[cache_key] = current_time
-                
-                logger.debug(f"Fetched {len(df)} candles for {pair}")
-                return df
             
-            except Exception as e:
-                logger.error(f"Error fetching OHLCV data for {pair}: {str(e)}")
-                return pd.DataFrame()
+            logger.debug(f"Loaded {len(df)} candles for {pair}")
+            return df
         else:
             logger.debug(f"Using cached OHLCV data for {pair} ({timeframe})")
             return self.ohlcv_cache[cache_key]
     
+    def _is_stale(self, df, timeframe, max_periods=2):
+        """
+        Check whether the newest candle is too old to trade on
+        
+        The newest candle is normally the one still forming, so data whose newest
+        candle opened more than max_periods timeframes ago has stopped updating.
+        """
+        newest = df.index[-1].value // 1_000_000
+        return self.clock() * 1000 - newest > max_periods * timeframe_to_ms(timeframe)
+    
+    def _sync_candles(self, pair, timeframe, limit):
+        """
+        Download new candles for a pair
+        
+        With a base timeframe configured only the base series is downloaded, at most
+        once per refresh interval however many timeframes are read from it.
+        """
+        if self.resampler is None:
+            self.candle_store.sync(self.exchange, pair, timeframe, limit=limit)
+            return
+        
+        base = self.resampler.base_timeframe
+        base_key = f"{pair}_{base}_synced"
+        enough_history = self.candle_store.length(pair, base) >= limit * self.resampler.ratio(timeframe)
+        if enough_history and self.clock() - self.last_update_time.get(base_key, 0) < 30:
+            return
+        
+        self.resampler.sync(self.exchange, pair, timeframe, limit=limit)
+        self.last_update_time[base_key] = self.clock()
+    
     def _calculate_indicators(self, pair, timeframe, active_strategy):
         """
         Calculate technical indicators based on the active strategy
@@ -173,11 +332,15 @@ class DataFetcher:
             return {}
         
         indicators = {}
+        cache = indicators_lib.get_indicator_cache()
         
         if active_strategy == "rsi_strategy":
             # Calculate RSI
-            rsi_period = self.config["strategies"]["rsi_strategy"]["rsi_period"]
-            indicators["rsi"] = self._calculate_rsi(df, period=rsi_period)
+            rsi_config = self.config["strategies"]["rsi_strategy"]
+            indicators["rsi"] = self._calculate_rsi(
+                df, period=rsi_config["rsi_period"],
+                method=rsi_config.get("rsi_method", indicators_lib.DEFAULT_RSI_METHOD)
+            )
             
         elif active_strategy == "macd_strategy":
             # Calculate MACD
@@ -196,36 +359,32 @@ class DataFetcher:
         elif active_strategy == "ml_strategy":
             # For ML strategy, we might want other features
             indicators["rsi"] = self._calculate_rsi(df)
-            indicators["ma_5"] = df['close'].rolling(window=5).mean()
-            indicators["ma_20"] = df['close'].rolling(window=20).mean()
-            indicators["volatility"] = df['close'].pct_change().rolling(window=20).std()
+            indicators["ma_5"] = pd.Series(cache.get(df, 'sma', period=5), index=df.index)
+            indicators["ma_20"] = pd.Series(cache.get(df, 'sma', period=20), index=df.index)
+            indicators["volatility"] = pd.Series(
+                indicators_lib.rolling_std(cache.get(df, 'returns'), 20), index=df.index
+            )
             
         # Always add some basic indicators
-        indicators["sma_50"] = df['close'].rolling(window=50).mean().iloc[-1] if len(df) >= 50 else None
-        indicators["sma_200"] = df['close'].rolling(window=200).mean().iloc[-1] if len(df) >= 200 else None
+        indicators["sma_50"] = cache.get(df, 'sma', period=50)[-1] if len(df) >= 50 else None
+        indicators["sma_200"] = cache.get(df, 'sma', period=200)[-1] if len(df) >= 200 else None
         
         return indicators
     
-    def _calculate_rsi(self, df, period=14):
+    def _calculate_rsi(self, df, period=14, method=indicators_lib.DEFAULT_RSI_METHOD):
         """
         Calculate RSI (Relative Strength Index)
         
         Args:
             df (pd.DataFrame): OHLCV data
             period (int): RSI period
+            method (str): Smoothing, 'wilder' or 'sma'
             
         Returns:
             pd.Series: RSI values
         """
-        delta = df['close'].diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        rsi = pd.Series(indicators_lib.get_indicator_cache().get(df, 'rsi', period=period, method=method),
+                        index=df.index)
         
         current_rsi = rsi.iloc[-1] if not rsi.empty else None
         logger.debug(f"Current RSI: {current_rsi}")
@@ -245,20 +404,12 @@ class DataFetcher:
         Returns:
             tuple: (MACD line, Signal line, Histogram)
         """
-        # Calculate EMAs
-        ema_fast = df['close'].ewm(span=fast_period, adjust=False).mean()
-        ema_slow = df['close'].ewm(span=slow_period, adjust=False).mean()
-        
-        # Calculate MACD line
-        macd_line = ema_fast - ema_slow
-        
-        # Calculate Signal line
-        signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
-        
-        # Calculate Histogram
-        histogram = macd_line - signal_line
-        
-        return macd_line, signal_line, histogram
+        macd_line, signal_line, histogram = indicators_lib.get_indicator_cache().get(
+            df, 'macd', fast_period=fast_period, slow_period=slow_period, signal_period=signal_period
+        )
+        return (pd.Series(macd_line, index=df.index),
+                pd.Series(signal_line, index=df.index),
+                pd.Series(histogram, index=df.index))
     
     def get_historical_prices(self, pair, timeframe='1d', limit=30):
         """
@@ -285,9 +436,9 @@ class DataFetcher:
             dict: Market information including min/max orders, precision, etc.
         """
         try:
-            markets = self.exchange.load_markets()
-            if pair in markets:
-                return markets[pair]
+            market = self.market_cache.get_market(pair)
+            if market:
+                return market
             logger.warning(f"Market info not found for {pair}")
             return None
         except Exception as e:
@@ -305,9 +456,73 @@ class DataFetcher:
         Returns:
             dict: Order book with bids and asks
         """
+        if self.use_local_order_book:
+            book = self.get_local_order_book(pair)
+            return None if book is None else book.to_ccxt(limit)
+        
         try:
-            order_book = self.exchange.fetch_order_book(pair, limit=limit)
-            return order_book
+            return self.exchange.fetch_order_book(pair, limit=limit)
         except Exception as e:
             logger.error(f"Error fetching order book: {str(e)}")
             return None
+    
+    def get_local_order_book(self, pair):
+        """
+        Get the maintained order book for a trading pair
+        
+        The book is seeded from a REST snapshot. If the exchange client has a
+        level update feed (fetch_order_book_deltas, e.g. the mock exchange) each
+        call applies the updates since the book's nonce, and a gap in the
+        sequence re-seeds it. Without a feed the book is re-seeded once it is
+        older than order_book_refresh_seconds, unless update_order_book kept it
+        fresh in between.
+        
+        Args:
+            pair (str): Trading pair
+            
+        Returns:
+            LocalOrderBook: Book supporting best bid/ask, depth and VWAP queries
+        """
+        book = self.order_books.get(pair)
+        if book is not None and book.nonce is not None and hasattr(self.exchange, 'fetch_order_book_deltas'):
+            try:
+                update = self.exchange.fetch_order_book_deltas(pair, book.nonce, limit=self.order_book_depth)
+                if update['previous_nonce'] == book.nonce:
+                    if update['nonce'] != book.nonce:
+                        book.apply_deltas(update['bids'], update['asks'], nonce=update['nonce'],
+                                          timestamp=update.get('timestamp'))
+                    return book
+                logger.debug(f"Gap in {pair} order book updates, re-seeding from a snapshot")
+            except Exception as e:
+                logger.error(f"Error fetching order book updates: {str(e)}")
+        elif book is not None and book.age() < self.order_book_refresh:
+            return book
+        
+        try:
+            snapshot = self.exchange.fetch_order_book(pair, limit=self.order_book_depth)
+        except Exception as e:
+            logger.error(f"Error fetching order book: {str(e)}")
+            return book
+        
+        if book is None:
+            book = self.order_books[pair] = LocalOrderBook(pair, clock=lambda: self.clock())
+        book.apply_snapshot(snapshot)
+        return book
+    
+    def update_order_book(self, pair, bids=(), asks=(), nonce=None, timestamp=None):
+        """
+        Apply incremental level updates from a stream (or a replayed feed)
+        
+        Args:
+            pair (str): Trading pair
+            bids (list): [[price, size], ...], size 0 removes the level
+            asks (list): [[price, size], ...], size 0 removes the level
+            nonce (int): Update sequence number, stale updates are ignored
+            
+        Returns:
+            bool: False if there is no book for the pair yet or the update was stale
+        """
+        book = self.order_books.get(pair)
+        if book is None:
+            return False
+        return book.apply_deltas(bids, asks, nonce=nonce, timestamp=timestamp)
@@ -9,6 +9,10 @@ import ccxt
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
+from market_data_hub import connect_market_data
+from market_cache import MarketMetadataCache
+from config_watcher import ConfigWatcher
+import indicators
 
 # Ensure logs directory exists
 os.makedirs("logs", exist_ok=True)
@@ -30,6 +34,7 @@ class DirectBot:
     
     def __init__(self):
         self.config_file = "config.json"
+        self.config_watcher = ConfigWatcher(self.config_file)
         self.load_config()
         self.setup_exchange()
     
@@ -37,26 +42,35 @@ class DirectBot:
         """Load configuration from file"""
         try:
             with open(self.config_file, 'r') as f:
-                self.config = json.load(f)
-                
-            # Trading settings
-            self.base = self.config["trading"]["base_symbol"]
-            self.quote = self.config["trading"]["quote_symbol"]
-            self.symbol = f"{self.base}/{self.quote}"
-            self.auto_trade = self.config["trading"]["auto_trade"]
-            
-            # Strategy settings
-            self.strategy_name = self.config["strategies"]["active_strategy"]
+                self.apply_config(json.load(f))
             
             logger.info(f"Configuration loaded successfully")
-            logger.info(f"Trading pair: {self.symbol}")
-            logger.info(f"Strategy: {self.strategy_name}")
-            logger.info(f"Auto-trading: {'Enabled' if self.auto_trade else 'Disabled'}")
             
         except Exception as e:
             logger.error(f"Failed to load configuration: {str(e)}")
             sys.exit(1)
     
+    def apply_config(self, config):
+        """Take trading and strategy settings from a configuration, also while running"""
+        # The exchange connection is set up once, new exchange settings need a restart
+        if hasattr(self, 'config') and config.get('exchange') != self.config.get('exchange'):
+            logger.warning("Changes to the exchange settings take effect after a restart")
+            config = {**config, 'exchange': self.config['exchange']}
+        self.config = config
+        
+        # Trading settings
+        self.base = self.config["trading"]["base_symbol"]
+        self.quote = self.config["trading"]["quote_symbol"]
+        self.symbol = f"{self.base}/{self.quote}"
+        self.auto_trade = self.config["trading"].get("auto_trade", False)
+        
+        # Strategy settings
+        self.strategy_name = self.config["strategies"]["active_strategy"]
+        
+        logger.info(f"Trading pair: {self.symbol}")
+        logger.info(f"Strategy: {self.strategy_name}")
+        logger.info(f"Auto-trading: {'Enabled' if self.auto_trade else 'Disabled'}")
+    
     def setup_exchange(self):
         """Initialize exchange connection"""
         try:
@@ -66,10 +80,14 @@ class DirectBot:
                 'enableRateLimit': True,
             })
             
-            # Test connection with a basic call
-            self.exchange.load_markets()
+            # Load markets (from the disk cache when fresh, otherwise this tests the connection)
+            self.market_cache = MarketMetadataCache.from_config(self.exchange, self.config)
+            self.market_cache.load()
             logger.info("Exchange connection successful")
             
+            # Read prices and candles through the shared hub when it is running
+            self.market_data = connect_market_data(self.config) or self.exchange
+            
         except Exception as e:
             logger.error(f"Failed to initialize exchange: {str(e)}")
             sys.exit(1)
@@ -77,7 +95,7 @@ class DirectBot:
     def fetch_price(self):
         """Fetch current price"""
         try:
-            ticker = self.exchange.fetch_ticker(self.symbol)
+            ticker = self.market_data.fetch_ticker(self.symbol)
             price = ticker['last']
             logger.info(f"Current price for {self.symbol}: {price}")
             return price
@@ -89,7 +107,7 @@ class DirectBot:
         """Fetch OHLCV candles"""
         try:
             logger.info(f"Fetching {timeframe} candles for {self.symbol}...")
-            candles = self.exchange.fetch_ohlcv(self.symbol, timeframe, limit=limit)
+            candles = self.market_data.fetch_ohlcv(self.symbol, timeframe, limit=limit)
             
             # Convert to DataFrame for easier processing
             df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
@@ -106,15 +124,8 @@ class DirectBot:
         """Calculate RSI for trading signals"""
         try:
             # Calculate RSI
-            delta = df['close'].diff()
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            
-            avg_gain = gain.rolling(window=period).mean()
-            avg_loss = loss.rolling(window=period).mean()
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+            rsi_method = self.config["strategies"]["rsi_strategy"].get("rsi_method", indicators.DEFAULT_RSI_METHOD)
+            rsi = pd.Series(indicators.rsi(df['close'], period, rsi_method), index=df.index)
             
             # Get current RSI
             current_rsi = rsi.iloc[-1]
@@ -149,6 +160,11 @@ class DirectBot:
         
         try:
             while True:
+                # Pick up settings saved by the dashboard, monitor or optimizer
+                config = self.config_watcher.poll()
+                if config is not None:
+                    self.apply_config(config)
+                
                 # Fetch market data
                 df = self.fetch_candles()
                 
@@ -1,9 +1,9 @@
 import os
 import sys
 import json
-import ccxt
 from colorama import init, Fore, Style
 from pathlib import Path
+from exchange_connector import create_exchange_client
 
 # Initialize colorama
 init()
@@ -29,11 +29,7 @@ def connect_exchange(config):
         return None
     
     try:
-        exchange = ccxt.mexc({
-            'apiKey': config['exchange']['api_key'],
-            'secret': config['exchange']['api_secret'],
-            'enableRateLimit': True,
-        })
+        exchange = create_exchange_client(config)
         return exchange
     except Exception as e:
         print(f"{Fore.RED}Error connecting to exchange: {str(e)}{Style.RESET_ALL}")
@@ -5,29 +5,75 @@ import json
 import os
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from market_data_hub import connect_market_data
+from rate_limiter import get_limiter, rate_limited
+from market_cache import MarketMetadataCache
+from mock_exchange import MockExchange
+from ticker_cache import TickerCache, get_ticker_cache
 
 logger = logging.getLogger("BROski.ExchangeConnector")
 
+
+def create_exchange_client(config):
+    """
+    Create the exchange client named in the config
+    
+    Args:
+        config: Configuration with an exchange section ("mexc" or "mock")
+        
+    Returns:
+        A ccxt MEXC client throttled by the shared rate limiter, or the offline
+        MockExchange when the name is "mock"
+    """
+    if config['exchange'].get('name', 'mexc').lower() == 'mock':
+        return MockExchange.from_config(config)
+    
+    return rate_limited(ccxt.mexc({
+        'apiKey': config['exchange']['api_key'],
+        'secret': config['exchange']['api_secret'],
+        # Throttling is done by our shared token-bucket limiter instead
+        'enableRateLimit': False,
+    }), config)
+
 class ExchangeConnector:
     """
     Class responsible for connecting to and executing trades on cryptocurrency exchanges.
     Primary implementation for MEXC exchange with ccxt library.
     """
     
-    def __init__(self, config):
+    def __init__(self, config, exchange_client=None, clock=None):
         """
         Initialize the exchange connector with configuration.
         
         Args:
             config: Configuration object containing exchange settings
+            exchange_client: Client to use instead of creating one (e.g. a MockExchange
+                shared with the DataFetcher when replaying)
+            clock: Time source in seconds for order timestamps and ticker expiry
+                (e.g. the simulated clock when replaying), default time.time
         """
         self.config = config
-        self.exchange_client = None
+        self.exchange_client = exchange_client
         self.exchange_info = {}
         self.markets = {}
-        self.last_api_call_time = 0
-        self.min_time_between_calls = 0.1  # 100ms minimum between API calls to avoid rate limits
+        self.market_cache = None
+        self.rate_limiter = None
+        
+        # Time source for order timestamps (replaced by the simulated clock when replaying)
+        self.clock = clock or time.time
         self._initialize_exchange_client()
+        
+        # Public market data goes through the shared hub when it is running
+        self.market_data = connect_market_data(config) or self.exchange_client
+        
+        # Repeat ticker lookups within a fraction of a second share one request
+        ticker_ttl = self.config.get('market_data', {}).get('ticker_ttl_seconds', 0.5)
+        if clock is None:
+            self.ticker_cache = get_ticker_cache(self.config['exchange']['name'].lower(), self._fetch_ticker, ticker_ttl)
+        else:
+            # Tickers on a simulated clock must not leak into the process-wide cache
+            self.ticker_cache = TickerCache(self._fetch_ticker, ticker_ttl, clock)
+        
         self._load_market_info()
         logger.info(f"Exchange connector initialized for {self.config['exchange']['name']}")
     
@@ -37,20 +83,23 @@ class ExchangeConnector:
         """
         try:
             exchange_name = self.config['exchange']['name'].lower()
-            api_key = self.config['exchange']['api_key']
-            api_secret = self.config['exchange']['api_secret']
+            api_key = self.config['exchange'].get('api_key')
+            api_secret = self.config['exchange'].get('api_secret')
             
             # Verify we have the necessary credentials
-            if not api_key or not api_secret:
+            if self.exchange_client is None and (not api_key or not api_secret):
                 logger.error("API key or secret is missing in configuration")
                 raise ValueError("API key or secret is missing")
             
             # Initialize exchange-specific client
-            if exchange_name == "mexc":
+            if self.exchange_client is not None:
+                logger.info(f"Using the provided {self.exchange_client.name} client")
+            elif exchange_name == "mexc":
                 self.exchange_client = ccxt.mexc({
                     'apiKey': api_key,
                     'secret': api_secret,
-                    'enableRateLimit': True,
+                    # Throttling is done by our shared token-bucket limiter instead
+                    'enableRateLimit': False,
                     'options': {
                         'defaultType': 'spot'
                     }
@@ -61,13 +110,18 @@ class ExchangeConnector:
                     if hasattr(self.exchange_client, 'set_sandbox_mode'):
                         self.exchange_client.set_sandbox_mode(True)
                         logger.info("Exchange client set to testnet/sandbox mode")
+            elif exchange_name == "mock":
+                self.exchange_client = MockExchange.from_config(self.config)
+                logger.info("Using offline mock exchange")
             else:
                 raise ValueError(f"Unsupported exchange: {exchange_name}")
             
+            self.rate_limiter = get_limiter(exchange_name, self.exchange_client, self.config)
+            
             # Test connection
             self._respect_rate_limit()
             server_time = self.exchange_client.fetch_time()
-            time_diff = abs(server_time - int(time.time() * 1000))
+            time_diff = abs(server_time - int(self.clock() * 1000))
             
             logger.info(f"Connected to {exchange_name.upper()}. Server time diff: {time_diff}ms")
             
@@ -83,11 +137,13 @@ class ExchangeConnector:
     
     def _load_market_info(self):
         """
-        Load market information from the exchange
+        Load market information, from the disk cache when it is available
         """
         try:
-            self._respect_rate_limit()
-            self.markets = self.exchange_client.load_markets()
+            self.market_cache = MarketMetadataCache.from_config(self.exchange_client, self.config)
+            if not self.market_cache.cache_file.exists():
+                self._respect_rate_limit()
+            self.markets = self.market_cache.load()
             
             # Get trading pair from config
             base = self.config['trading']['base_symbol']
@@ -113,18 +169,27 @@ class ExchangeConnector:
             logger.error(f"Error loading market info: {e}")
             raise
     
-    def _respect_rate_limit(self):
+    def _respect_rate_limit(self, endpoint: str = 'public'):
         """
-        Ensure we don't exceed API rate limits by adding delays between calls
+        Wait for the shared rate limiter before an API call
+        
+        Args:
+            endpoint: Endpoint class of the call ('public', 'private' or 'order').
+                      Orders jump ahead of waiting public and private calls.
         """
-        current_time = time.time()
-        elapsed = current_time - self.last_api_call_time
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(endpoint)
+    
+    def get_rate_limit_metrics(self) -> Dict[str, Any]:
+        """
+        Get rate limiter wait-time metrics
         
-        if elapsed < self.min_time_between_calls:
-            sleep_time = self.min_time_between_calls - elapsed
-            time.sleep(sleep_time)
-            
-        self.last_api_call_time = time.time()
+        Returns:
+            Dict[str, Any]: Calls, waits and remaining tokens per endpoint class
+        """
+        if self.rate_limiter is None:
+            return {}
+        return self.rate_limiter.get_metrics()
     
     def get_trading_symbol(self) -> str:
         """
@@ -145,7 +210,7 @@ class ExchangeConnector:
             Dict[str, float]: Balance information for base and quote currencies
         """
         try:
-            self._respect_rate_limit()
+            self._respect_rate_limit('private')
             balance = self.exchange_client.fetch_balance()
             
             base = self.config['trading']['base_symbol']
@@ -190,8 +255,7 @@ class ExchangeConnector:
             if not symbol:
                 symbol = self.get_trading_symbol()
                 
-            self._respect_rate_limit()
-            ticker = self.exchange_client.fetch_ticker(symbol)
+            ticker = self.ticker_cache.get(symbol)
             
             logger.debug(f"Fetched ticker for {symbol}: Last price: {ticker['last']}")
             return ticker
@@ -199,6 +263,14 @@ class ExchangeConnector:
             logger.error(f"Error fetching ticker for {symbol}: {e}")
             return {}
     
+    def _fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        """
+        Fetch a ticker from the exchange, bypassing the ticker cache
+        """
+        if self.market_data is self.exchange_client:  # The hub does its own throttling
+            self._respect_rate_limit('public')
+        return self.market_data.fetch_ticker(symbol)
+    
     def get_price(self, symbol: Optional[str] = None) -> float:
         """
         Get current price for a symbol
@@ -245,9 +317,10 @@ class ExchangeConnector:
                 amount = position_size
                 
             # Apply exchange-specific precision rules
-            if symbol in self.markets:
+            symbol_info = self.market_cache.get_symbol_info(symbol) if self.market_cache else None
+            if symbol_info:
                 # Get precision for amount from exchange info
-                precision = self.markets[symbol].get('precision', {}).get('amount')
+                precision = symbol_info['precision']['amount']
                 if precision:
                     # Round amount to exchange precision
                     amount = round(amount, precision) if isinstance(precision, int) else amount
@@ -261,15 +334,15 @@ class ExchangeConnector:
                 # Simulated execution
                 execution_result = {
                     'success': True,
-                    'order_id': f"simulated_{int(time.time())}",
+                    'order_id': f"simulated_{int(self.clock())}",
                     'symbol': symbol,
                     'type': trade_type,
                     'side': trade_type.lower(),
                     'amount': amount,
                     'price': price,
                     'value': price * amount,
-                    'timestamp': int(time.time() * 1000),
-                    'datetime': datetime.now().isoformat(),
+                    'timestamp': int(self.clock() * 1000),
+                    'datetime': datetime.fromtimestamp(self.clock()).isoformat(),
                     'status': 'closed',
                     'simulated': True,
                     'exchange': self.config['exchange']['name']
@@ -279,7 +352,7 @@ class ExchangeConnector:
                 return execution_result
             
             # Execute actual trade on exchange
-            self._respect_rate_limit()
+            self._respect_rate_limit('order')
             
             # Prepare order parameters
             order_type = 'market'  # or 'limit'
@@ -305,8 +378,8 @@ class ExchangeConnector:
                 'amount': amount,
                 'price': price,
                 'value': price * amount,
-                'timestamp': int(time.time() * 1000),
-                'datetime': datetime.now().isoformat(),
+                'timestamp': int(self.clock() * 1000),
+                'datetime': datetime.fromtimestamp(self.clock()).isoformat(),
                 'status': response.get('status', ''),
                 'exchange': self.config['exchange']['name']
             }
@@ -339,8 +412,8 @@ class ExchangeConnector:
             'side': signal.get('type', '').lower(),
             'amount': signal.get('position_size', self.config['trading']['trade_amount']),
             'price': signal.get('price', 0),
-            'timestamp': int(time.time() * 1000),
-            'datetime': datetime.now().isoformat(),
+            'timestamp': int(self.clock() * 1000),
+            'datetime': datetime.fromtimestamp(self.clock()).isoformat(),
             'exchange': self.config['exchange']['name']
         }
     
@@ -352,7 +425,8 @@ class ExchangeConnector:
             trade: Trade execution result
         """
         try:
-            history_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+            history_dir = (self.config.get('logging', {}).get('log_directory')
+                           or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs'))
             os.makedirs(history_dir, exist_ok=True)
             history_file = os.path.join(history_dir, 'trade_history.json')
             
@@ -389,7 +463,7 @@ class ExchangeConnector:
             if not symbol:
                 symbol = self.get_trading_symbol()
                 
-            self._respect_rate_limit()
+            self._respect_rate_limit('private')
             orders = self.exchange_client.fetch_open_orders(symbol=symbol)
             
             logger.debug(f"Fetched {len(orders)} open orders for {symbol}")
@@ -413,7 +487,7 @@ class ExchangeConnector:
             if not symbol:
                 symbol = self.get_trading_symbol()
                 
-            self._respect_rate_limit()
+            self._respect_rate_limit('order')
             self.exchange_client.cancel_order(order_id, symbol)
             logger.info(f"Order {order_id} cancelled successfully")
             return True
@@ -463,6 +537,7 @@ class ExchangeConnector:
             time_diff = abs(exchange_time - local_time)
             
             # Fetch balance to test authentication
+            self._respect_rate_limit('private')
             balance = self.exchange_client.fetch_balance()
             
             return True, f"Connection successful! Time difference: {time_diff}ms"
@@ -489,8 +564,9 @@ class ExchangeConnector:
             if not symbol:
                 symbol = self.get_trading_symbol()
                 
-            self._respect_rate_limit()
-            ohlcv = self.exchange_client.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+            if self.market_data is self.exchange_client:  # The hub does its own throttling
+                self._respect_rate_limit('public')
+            ohlcv = self.market_data.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
             
             # Convert to readable format
             candles = []
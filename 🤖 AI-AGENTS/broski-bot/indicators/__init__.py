@@ -0,0 +1,58 @@
+"""
+Vectorized technical indicators shared by the bot, strategies, backtests and training.
+
+Every kernel takes array-likes (Series, lists or arrays) and returns float64
+arrays of the same length, with NaN where the indicator is not defined yet.
+The streaming classes compute the same values one candle at a time for the
+live loop, and get_indicator_cache() shares computed arrays between components.
+"""
+from indicators.kernels import (
+    DEFAULT_RSI_METHOD,
+    as_array,
+    sma,
+    ema,
+    wilder_smooth,
+    rolling_std,
+    returns,
+    rsi,
+    macd,
+    volume_ratio,
+    true_range,
+    atr,
+)
+from indicators.streaming import (
+    StreamingEMA,
+    StreamingWilder,
+    StreamingSMA,
+    StreamingRSI,
+    StreamingMACD,
+    RollingWindow,
+    IndicatorStream,
+    IndicatorStreams,
+)
+from indicators.cache import IndicatorCache, get_indicator_cache
+
+__all__ = [
+    "DEFAULT_RSI_METHOD",
+    "as_array",
+    "sma",
+    "ema",
+    "wilder_smooth",
+    "rolling_std",
+    "returns",
+    "rsi",
+    "macd",
+    "volume_ratio",
+    "true_range",
+    "atr",
+    "StreamingEMA",
+    "StreamingWilder",
+    "StreamingSMA",
+    "StreamingRSI",
+    "StreamingMACD",
+    "RollingWindow",
+    "IndicatorStream",
+    "IndicatorStreams",
+    "IndicatorCache",
+    "get_indicator_cache",
+]
@@ -0,0 +1,145 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from indicators import kernels
+
+# Columns each kernel reads, in argument order
+KERNEL_INPUTS = {
+    'sma': ('close',),
+    'ema': ('close',),
+    'wilder_smooth': ('close',),
+    'rolling_std': ('close',),
+    'returns': ('close',),
+    'rsi': ('close',),
+    'macd': ('close',),
+    'volume_ratio': ('volume',),
+    'true_range': ('high', 'low', 'close'),
+    'atr': ('high', 'low', 'close'),
+}
+
+_FINGERPRINT_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class _Flight:
+    """One in-progress indicator computation that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def series_fingerprint(df):
+    """
+    Cheap identity of the candles in an OHLCV DataFrame
+
+    Symbol and timeframe (from df.attrs), length and a hash of the candle times
+    and OHLCV values, so a forming candle that moved or a revised older candle
+    is a different series, and frames without attrs only match on equal candles.
+    """
+    if len(df) == 0:
+        return None
+    times = df['timestamp'] if 'timestamp' in df.columns else df.index
+    columns = [column for column in _FINGERPRINT_COLUMNS if column in df.columns]
+    values = df[columns].to_numpy(dtype=np.float64)
+    return (df.attrs.get('symbol'), df.attrs.get('timeframe'), len(df),
+            hash(np.asarray(times).tobytes()), hash(values.tobytes()))
+
+
+class IndicatorCache:
+    """
+    LRU cache of indicator arrays shared by the bot, strategies and tools.
+
+    Entries are keyed by the series fingerprint, indicator name and parameters, so
+    the same RSI(14) or MA(20) over the same candles is computed once per cycle
+    however many components ask for it. Threads asking for an indicator that is
+    being computed wait for that result instead of computing it again. Cached
+    arrays are read-only.
+    """
+
+    def __init__(self, max_entries=512):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Number of indicator results kept before the least recently used is dropped
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0}
+
+    def get(self, df, name, column=None, **params):
+        """
+        Get an indicator for the candles in df, computing it on a miss
+
+        Args:
+            df (pd.DataFrame): OHLCV data
+            name (str): Kernel name in indicators.kernels (e.g. 'rsi', 'macd', 'sma')
+            column (str): Input column for single-input kernels (default from KERNEL_INPUTS)
+            **params: Keyword arguments for the kernel (e.g. period=14)
+
+        Returns:
+            np.ndarray: Indicator values (a tuple of arrays for MACD)
+        """
+        key = (series_fingerprint(df), name, column, tuple(sorted(params.items())))
+
+        with self.lock:
+            result = self.entries.get(key)
+            if result is not None:
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return result
+
+            flight = self.in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.in_flight[key] = _Flight()
+                self.stats['misses'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            inputs = (column,) if column else KERNEL_INPUTS[name]
+            result = getattr(kernels, name)(*(df[input_column] for input_column in inputs), **params)
+            for array in (result if isinstance(result, tuple) else (result,)):
+                array.setflags(write=False)
+            flight.result = result
+
+            with self.lock:
+                self.entries[key] = result
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+                    self.stats['evictions'] += 1
+            return result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            flight.done.set()
+
+    def hit_rate(self):
+        """Share of lookups answered from the cache or another caller's computation"""
+        lookups = self.stats['hits'] + self.stats['coalesced'] + self.stats['misses']
+        return (self.stats['hits'] + self.stats['coalesced']) / lookups if lookups else 0.0
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+_cache = IndicatorCache()
+
+
+def get_indicator_cache():
+    """Get the indicator cache shared by every component in this process"""
+    return _cache
@@ -0,0 +1,255 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Smoothing used for RSI and ATR when a strategy doesn't configure one
+DEFAULT_RSI_METHOD = "wilder"
+
+# Largest power of the decay factor an EMA block may divide by (see _ewm)
+_MAX_EWM_SCALE_LOG10 = 200
+
+
+def as_array(values):
+    """
+    Convert a Series, list or array to a contiguous float64 array
+
+    No copy is made if the input already is one.
+    """
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _first_valid(values):
+    """Index of the first non-NaN value (len(values) if there is none)"""
+    valid = np.flatnonzero(~np.isnan(values))
+    return int(valid[0]) if len(valid) else len(values)
+
+
+def _ewm(values, alpha, previous):
+    """
+    Exponential smoothing y[t] = (1 - alpha) * y[t-1] + alpha * x[t], starting from `previous`
+
+    The recursion is evaluated in closed form one block at a time:
+    y[j] = d^(j+1) * previous + alpha * d^j * cumsum(x[i] * d^-i), where d = 1 - alpha.
+    Blocks are short enough that d^-i stays far from overflowing.
+    """
+    out = np.empty(len(values))
+    decay = 1.0 - alpha
+    if decay <= 0:
+        out[:] = values
+        return out
+
+    block = max(1, min(len(values), int(_MAX_EWM_SCALE_LOG10 / -np.log10(decay))))
+    scale = decay ** np.arange(block)
+    inverse = 1.0 / scale
+
+    for start in range(0, len(values), block):
+        x = values[start:start + block]
+        size = len(x)
+        acc = np.cumsum(x * inverse[:size])
+        y = scale[:size] * (decay * previous + alpha * acc)
+        out[start:start + size] = y
+        previous = y[-1]
+    return out
+
+
+def sma(values, period):
+    """
+    Simple moving average
+
+    Args:
+        values: Input series
+        period (int): Window length
+
+    Returns:
+        np.ndarray: Averages, NaN until the first full window
+    """
+    values = as_array(values)
+    out = np.full(len(values), np.nan)
+    start = _first_valid(values)
+    x = values[start:]
+    if period <= 0 or len(x) < period:
+        return out
+
+    # Centre on the first value so the running sum stays small for price series
+    csum = np.cumsum(x - x[0])
+    sums = csum[period - 1:].copy()
+    sums[1:] -= csum[:-period]
+    out[start + period - 1:] = sums / period + x[0]
+    return out
+
+
+def ema(values, period):
+    """
+    Exponential moving average with span `period`, seeded with the first value
+
+    Matches pandas' ewm(span=period, adjust=False).mean().
+
+    Args:
+        values: Input series
+        period (int): EMA span
+
+    Returns:
+        np.ndarray: EMA values (NaN only where the input starts with NaN)
+    """
+    values = as_array(values)
+    out = np.full(len(values), np.nan)
+    start = _first_valid(values)
+    if start < len(values):
+        out[start:] = _ewm(values[start:], 2.0 / (period + 1), values[start])
+    return out
+
+
+def wilder_smooth(values, period):
+    """
+    Wilder's smoothing (RMA): SMA of the first `period` values, then alpha = 1/period
+
+    Args:
+        values: Input series
+        period (int): Smoothing period
+
+    Returns:
+        np.ndarray: Smoothed values, NaN until the first full window
+    """
+    values = as_array(values)
+    out = np.full(len(values), np.nan)
+    start = _first_valid(values)
+    x = values[start:]
+    if period <= 0 or len(x) < period:
+        return out
+
+    seed = x[:period].mean()
+    out[start + period - 1] = seed
+    out[start + period:] = _ewm(x[period:], 1.0 / period, seed)
+    return out
+
+
+def _smooth(values, period, method):
+    if method == "wilder":
+        return wilder_smooth(values, period)
+    if method == "sma":
+        return sma(values, period)
+    raise ValueError(f"Unknown smoothing method: {method}")
+
+
+def rolling_std(values, period, ddof=1):
+    """
+    Rolling standard deviation
+
+    Args:
+        values: Input series
+        period (int): Window length
+        ddof (int): Delta degrees of freedom (1 matches pandas' rolling().std())
+
+    Returns:
+        np.ndarray: Standard deviations, NaN until the first full window
+    """
+    values = as_array(values)
+    out = np.full(len(values), np.nan)
+    start = _first_valid(values)
+    x = values[start:]
+    if period <= ddof or len(x) < period:
+        return out
+
+    out[start + period - 1:] = sliding_window_view(x, period).std(axis=1, ddof=ddof)
+    return out
+
+
+def returns(values):
+    """Simple returns (pct_change), NaN for the first value"""
+    values = as_array(values)
+    out = np.full(len(values), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[1:] = values[1:] / values[:-1] - 1
+    return out
+
+
+def rsi(close, period=14, method=DEFAULT_RSI_METHOD):
+    """
+    Relative Strength Index
+
+    Args:
+        close: Close prices
+        period (int): RSI period
+        method (str): 'wilder' (classic RSI) or 'sma' (simple average of gains and losses)
+
+    Returns:
+        np.ndarray: RSI between 0 and 100, NaN for the first `period` values
+    """
+    close = as_array(close)
+    out = np.full(len(close), np.nan)
+    if len(close) < 2:
+        return out
+
+    delta = np.diff(close)
+    avg_gain = _smooth(np.where(delta > 0, delta, 0.0), period, method)
+    avg_loss = _smooth(np.where(delta < 0, -delta, 0.0), period, method)
+
+    total = avg_gain + avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # All gains gives 100, a flat window sits in the middle
+        out[1:] = np.where(total > 0, 100.0 * avg_gain / total, 50.0)
+    out[1:][np.isnan(total)] = np.nan
+    return out
+
+
+def macd(close, fast_period=12, slow_period=26, signal_period=9):
+    """
+    Moving Average Convergence Divergence
+
+    Args:
+        close: Close prices
+        fast_period (int): Fast EMA span
+        slow_period (int): Slow EMA span
+        signal_period (int): Signal line EMA span
+
+    Returns:
+        tuple: (MACD line, signal line, histogram) as arrays
+    """
+    close = as_array(close)
+    macd_line = ema(close, fast_period) - ema(close, slow_period)
+    signal_line = ema(macd_line, signal_period)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def volume_ratio(volume, period=20):
+    """
+    Volume relative to its moving average
+
+    Args:
+        volume: Candle volumes
+        period (int): Averaging window
+
+    Returns:
+        np.ndarray: volume / SMA(volume), NaN until the first full window
+    """
+    volume = as_array(volume)
+    average = sma(volume, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(average > 0, volume / average, np.nan)
+
+
+def true_range(high, low, close):
+    """True range, the first candle uses its high-low range"""
+    high, low, close = as_array(high), as_array(low), as_array(close)
+    tr = high - low
+    if len(close) > 1:
+        previous_close = close[:-1]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high[1:] - previous_close),
+                                               np.abs(low[1:] - previous_close)))
+    return tr
+
+
+def atr(high, low, close, period=14, method=DEFAULT_RSI_METHOD):
+    """
+    Average True Range
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        period (int): Averaging period
+        method (str): 'wilder' or 'sma'
+
+    Returns:
+        np.ndarray: ATR values, NaN until the first full window
+    """
+    return _smooth(true_range(high, low, close), period, method)
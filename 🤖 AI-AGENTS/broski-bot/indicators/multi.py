@@ -0,0 +1,252 @@
+import numpy as np
+from indicators.kernels import (
+    DEFAULT_RSI_METHOD, _MAX_EWM_SCALE_LOG10, _ewm, _first_valid, as_array, wilder_smooth
+)
+
+
+def _periods(periods):
+    return np.asarray(periods, dtype=np.int64).reshape(-1)
+
+
+def _window_sums(values, periods):
+    """
+    Rolling sums for several window lengths from one cumulative sum
+
+    Returns:
+        np.ndarray: (len(periods), len(values)) sums, NaN until each window is full
+    """
+    periods = _periods(periods)
+    out = np.full((len(periods), len(values)), np.nan)
+    start = _first_valid(values)
+    x = values[start:]
+    if len(x) == 0:
+        return out
+
+    csum = np.concatenate(([0.0], np.cumsum(x)))
+    ends = np.arange(1, len(x) + 1)
+    begins = ends[None, :] - periods[:, None]
+    sums = csum[ends][None, :] - csum[np.maximum(begins, 0)]
+    sums[begins < 0] = np.nan
+    out[:, start:] = sums
+    return out
+
+
+def sma_multi(values, periods):
+    """
+    Simple moving averages for several periods in one pass
+
+    Args:
+        values: Input series
+        periods (list): Window lengths
+
+    Returns:
+        np.ndarray: (len(periods), len(values)) averages, NaN until each window is full
+    """
+    values = as_array(values)
+    start = _first_valid(values)
+    # Centre on the first value so the running sum stays small for price series
+    shift = values[start] if start < len(values) else 0.0
+    return _window_sums(values - shift, periods) / _periods(periods)[:, None] + shift
+
+
+def rolling_std_multi(values, periods, ddof=1):
+    """
+    Rolling standard deviations for several periods from shared cumulative sums
+
+    Args:
+        values: Input series
+        periods (list): Window lengths
+        ddof (int): Delta degrees of freedom
+
+    Returns:
+        np.ndarray: (len(periods), len(values)) standard deviations
+    """
+    values = as_array(values)
+    periods = _periods(periods)
+    start = _first_valid(values)
+    centred = values - (np.nanmean(values) if start < len(values) else 0.0)
+    sums = _window_sums(centred, periods)
+    sums_sq = _window_sums(centred * centred, periods)
+    n = periods[:, None].astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = (sums_sq - sums * sums / n) / (n - ddof)
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+def ema_multi(values, periods):
+    """
+    EMAs for several spans in one pass, matching indicators.ema row by row
+
+    Args:
+        values: Input series
+        periods (list): EMA spans
+
+    Returns:
+        np.ndarray: (len(periods), len(values)) EMA values
+    """
+    values = as_array(values)
+    periods = _periods(periods)
+    out = np.full((len(periods), len(values)), np.nan)
+    start = _first_valid(values)
+    x = values[start:]
+    if len(x) == 0:
+        return out
+
+    alphas = 2.0 / (periods + 1.0)
+    decays = 1.0 - alphas
+    # Block length is limited by the fastest decay (see kernels._ewm)
+    block = max(1, min(len(x), int(_MAX_EWM_SCALE_LOG10 / -np.log10(decays.min()))))
+    scale = decays[:, None] ** np.arange(block)[None, :]
+    inverse = 1.0 / scale
+
+    previous = np.full(len(periods), x[0])
+    for offset in range(0, len(x), block):
+        chunk = x[offset:offset + block]
+        size = len(chunk)
+        acc = np.cumsum(chunk[None, :] * inverse[:, :size], axis=1)
+        y = scale[:, :size] * (decays[:, None] * previous[:, None] + alphas[:, None] * acc)
+        out[:, start + offset:start + offset + size] = y
+        previous = y[:, -1]
+    return out
+
+
+def rsi_multi(close, periods, method=DEFAULT_RSI_METHOD):
+    """
+    RSI for several periods, sharing the price differences
+
+    Args:
+        close: Close prices
+        periods (list): RSI periods
+        method (str): 'wilder' or 'sma'
+
+    Returns:
+        np.ndarray: (len(periods), len(close)) RSI values
+    """
+    close = as_array(close)
+    periods = _periods(periods)
+    out = np.full((len(periods), len(close)), np.nan)
+    if len(close) < 2:
+        return out
+
+    delta = np.diff(close)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    if method == "sma":
+        avg_gain = _window_sums(gains, periods) / periods[:, None]
+        avg_loss = _window_sums(losses, periods) / periods[:, None]
+    elif method == "wilder":
+        # The seed position differs per period, so each row is its own recursion
+        avg_gain = np.vstack([wilder_smooth(gains, period) for period in periods])
+        avg_loss = np.vstack([wilder_smooth(losses, period) for period in periods])
+    else:
+        raise ValueError(f"Unknown smoothing method: {method}")
+
+    total = avg_gain + avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[:, 1:] = np.where(total > 0, 100.0 * avg_gain / total, 50.0)
+    out[:, 1:][np.isnan(total)] = np.nan
+    return out
+
+
+def volume_ratio_multi(volume, periods):
+    """
+    Volume relative to its moving average for several lookbacks
+
+    Returns:
+        np.ndarray: (len(periods), len(volume)) ratios
+    """
+    volume = as_array(volume)
+    average = sma_multi(volume, periods)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(average > 0, volume[None, :] / average, np.nan)
+
+
+# Multi-period kernel and the column it reads by default
+MULTI_KERNELS = {
+    'sma': (sma_multi, 'close'),
+    'ema': (ema_multi, 'close'),
+    'rolling_std': (rolling_std_multi, 'close'),
+    'rsi': (rsi_multi, 'close'),
+    'volume_ratio': (volume_ratio_multi, 'volume'),
+}
+
+
+class IndicatorTable:
+    """
+    Indicator rows for every distinct parameter value of a parameter sweep.
+
+    Each indicator is computed once per distinct period, all periods in one
+    multi-period pass, and every parameter combination that uses that period
+    reads the same row. Indicator cost grows with the number of distinct
+    values, not with the size of the grid.
+    """
+
+    def __init__(self, df):
+        """
+        Args:
+            df (pd.DataFrame): OHLCV data the sweep is evaluated on
+        """
+        self.index = df.index
+        self.columns = {column: as_array(df[column]) for column in df.columns
+                        if column in ('open', 'high', 'low', 'close', 'volume')}
+        self.rows = {}
+        self.macd_rows = {}
+
+    def _key(self, name, period, column, params):
+        return (name, int(period), column, tuple(sorted(params.items())))
+
+    def add(self, name, periods, column=None, **params):
+        """
+        Compute an indicator for all periods not in the table yet
+
+        Args:
+            name (str): 'sma', 'ema', 'rolling_std', 'rsi' or 'volume_ratio'
+            periods (list): Periods used anywhere in the sweep
+            column (str): Input column (default depends on the indicator)
+            **params: Extra kernel arguments (e.g. method='sma' for RSI)
+        """
+        kernel, default_column = MULTI_KERNELS[name]
+        column = column or default_column
+        missing = sorted({int(period) for period in periods
+                          if self._key(name, period, column, params) not in self.rows})
+        if not missing:
+            return
+
+        matrix = kernel(self.columns[column], missing, **params)
+        for period, row in zip(missing, matrix):
+            row.setflags(write=False)
+            self.rows[self._key(name, period, column, params)] = row
+
+    def get(self, name, period, column=None, **params):
+        """
+        Get one indicator row, computing it if it was not added up front
+
+        Returns:
+            np.ndarray: Read-only indicator values aligned with the candles
+        """
+        column = column or MULTI_KERNELS[name][1]
+        key = self._key(name, period, column, params)
+        if key not in self.rows:
+            self.add(name, [period], column, **params)
+        return self.rows[key]
+
+    def macd(self, fast_period, slow_period, signal_period):
+        """
+        MACD built from the table's EMA rows, matching indicators.macd
+
+        Returns:
+            tuple: (MACD line, signal line, histogram)
+        """
+        key = (int(fast_period), int(slow_period), int(signal_period))
+        if key not in self.macd_rows:
+            self.add('ema', [fast_period, slow_period])
+            line = self.get('ema', fast_period) - self.get('ema', slow_period)
+            signal = np.full(len(line), np.nan)
+            start = _first_valid(line)
+            if start < len(line):
+                signal[start:] = _ewm(line[start:], 2.0 / (signal_period + 1), line[start])
+            self.macd_rows[key] = (line, signal, line - signal)
+        return self.macd_rows[key]
+
+    def __len__(self):
+        return len(self.rows) + len(self.macd_rows)
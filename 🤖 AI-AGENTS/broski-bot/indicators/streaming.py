@@ -0,0 +1,414 @@
+import logging
+import numpy as np
+from indicators.kernels import DEFAULT_RSI_METHOD, as_array
+
+logger = logging.getLogger("BROski.Indicators")
+
+NAN = float('nan')
+
+
+class StreamingEMA:
+    """
+    Exponential moving average updated one value at a time
+
+    Seeded with the first value, like indicators.ema.
+    """
+
+    def __init__(self, period=None, alpha=None):
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.reset()
+
+    def reset(self):
+        self.value = NAN
+
+    def _next(self, x):
+        if np.isnan(self.value):
+            return x
+        return self.value + self.alpha * (x - self.value)
+
+    def update(self, x):
+        """Add a closed value and return the new EMA"""
+        self.value = self._next(x)
+        return self.value
+
+    def preview(self, x):
+        """EMA if `x` were added, without changing the state"""
+        return self._next(x)
+
+    def get_state(self):
+        return {'alpha': self.alpha, 'value': self.value}
+
+    def set_state(self, state):
+        self.alpha = state['alpha']
+        self.value = state['value']
+
+
+class StreamingWilder:
+    """
+    Wilder's smoothing updated one value at a time
+
+    The first `period` values are averaged, after that alpha = 1/period,
+    like indicators.wilder_smooth.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.value = NAN
+
+    def _next(self, x):
+        if self.count < self.period:
+            count = self.count + 1
+            total = self.total + x
+            return count, total, (total / self.period if count == self.period else NAN)
+        return self.count + 1, self.total, self.value + (x - self.value) / self.period
+
+    def update(self, x):
+        """Add a closed value and return the new smoothed value"""
+        self.count, self.total, self.value = self._next(x)
+        return self.value
+
+    def preview(self, x):
+        """Smoothed value if `x` were added, without changing the state"""
+        return self._next(x)[2]
+
+    def get_state(self):
+        return {'period': self.period, 'count': self.count, 'total': self.total, 'value': self.value}
+
+    def set_state(self, state):
+        self.period = state['period']
+        self.count = state['count']
+        self.total = state['total']
+        self.value = state['value']
+
+
+class RollingWindow:
+    """
+    Rolling mean and standard deviation over the last `period` values
+
+    Values live in a ring buffer with running sums, so an update costs the same
+    whatever the period. Sums are taken relative to the first value seen (to keep
+    them small for price series) and recomputed exactly once per lap of the buffer
+    so rounding never accumulates.
+    """
+
+    def __init__(self, period, ddof=1):
+        self.period = period
+        self.ddof = ddof
+        self.reset()
+
+    def reset(self):
+        self.buffer = np.zeros(self.period)
+        self.position = 0
+        self.count = 0
+        self.shift = NAN
+        self.sum = 0.0
+        self.sum_sq = 0.0
+
+    def _next(self, x):
+        """Sums after adding x (and evicting the oldest value once the buffer is full)"""
+        shift = x if np.isnan(self.shift) else self.shift
+        value = x - shift
+        total, total_sq = self.sum + value, self.sum_sq + value * value
+        if self.count >= self.period:
+            evicted = self.buffer[self.position]
+            total -= evicted
+            total_sq -= evicted * evicted
+        return shift, value, total, total_sq, min(self.count + 1, self.period)
+
+    def _stats(self, shift, total, total_sq, count):
+        if count < self.period:
+            return NAN, NAN
+        mean = total / count
+        if count <= self.ddof:
+            return mean + shift, NAN
+        variance = max(total_sq - total * mean, 0.0) / (count - self.ddof)
+        return mean + shift, variance ** 0.5
+
+    def update(self, x):
+        """
+        Add a closed value
+
+        Returns:
+            tuple: (mean, std), NaN until the window is full
+        """
+        self.shift, value, self.sum, self.sum_sq, count = self._next(x)
+        self.buffer[self.position] = value
+        self.position = (self.position + 1) % self.period
+        self.count += 1
+
+        if self.position == 0:
+            window = self.buffer[:count]
+            self.sum = float(window.sum())
+            self.sum_sq = float((window * window).sum())
+        return self._stats(self.shift, self.sum, self.sum_sq, count)
+
+    def preview(self, x):
+        """(mean, std) if `x` were added, without changing the state"""
+        shift, _, total, total_sq, count = self._next(x)
+        return self._stats(shift, total, total_sq, count)
+
+    def get_state(self):
+        return {'period': self.period, 'ddof': self.ddof, 'buffer': self.buffer.tolist(),
+                'position': self.position, 'count': self.count, 'shift': self.shift,
+                'sum': self.sum, 'sum_sq': self.sum_sq}
+
+    def set_state(self, state):
+        self.period = state['period']
+        self.ddof = state['ddof']
+        self.buffer = np.array(state['buffer'], dtype=np.float64)
+        self.position = state['position']
+        self.count = state['count']
+        self.shift = state['shift']
+        self.sum = state['sum']
+        self.sum_sq = state['sum_sq']
+
+
+class StreamingSMA(RollingWindow):
+    """Simple moving average updated one value at a time"""
+
+    def update(self, x):
+        return super().update(x)[0]
+
+    def preview(self, x):
+        return super().preview(x)[0]
+
+
+class StreamingRSI:
+    """
+    RSI updated one close at a time, matching indicators.rsi
+
+    Args:
+        period (int): RSI period
+        method (str): 'wilder' or 'sma'
+    """
+
+    def __init__(self, period=14, method=DEFAULT_RSI_METHOD):
+        if method not in ("wilder", "sma"):
+            raise ValueError(f"Unknown smoothing method: {method}")
+        self.period = period
+        self.method = method
+        smoother = StreamingWilder if method == "wilder" else StreamingSMA
+        self.gain = smoother(period)
+        self.loss = smoother(period)
+        self.previous_close = NAN
+
+    def reset(self):
+        self.previous_close = NAN
+        self.gain.reset()
+        self.loss.reset()
+
+    @staticmethod
+    def _rsi(avg_gain, avg_loss):
+        total = avg_gain + avg_loss
+        if np.isnan(total):
+            return NAN
+        return 100.0 * avg_gain / total if total > 0 else 50.0
+
+    def update(self, close):
+        """Add a closed candle's close and return the new RSI"""
+        if np.isnan(self.previous_close):
+            self.previous_close = close
+            return NAN
+        delta = close - self.previous_close
+        self.previous_close = close
+        return self._rsi(self.gain.update(max(delta, 0.0)), self.loss.update(max(-delta, 0.0)))
+
+    def preview(self, close):
+        """RSI if the forming candle closed at `close`, without changing the state"""
+        if np.isnan(self.previous_close):
+            return NAN
+        delta = close - self.previous_close
+        return self._rsi(self.gain.preview(max(delta, 0.0)), self.loss.preview(max(-delta, 0.0)))
+
+    def get_state(self):
+        return {'period': self.period, 'method': self.method, 'previous_close': self.previous_close,
+                'gain': self.gain.get_state(), 'loss': self.loss.get_state()}
+
+    def set_state(self, state):
+        self.__init__(state['period'], state['method'])
+        self.previous_close = state['previous_close']
+        self.gain.set_state(state['gain'])
+        self.loss.set_state(state['loss'])
+
+
+class StreamingMACD:
+    """
+    MACD updated one close at a time, matching indicators.macd
+
+    update and preview return (MACD line, signal line, histogram).
+    """
+
+    def __init__(self, fast_period=12, slow_period=26, signal_period=9):
+        self.fast = StreamingEMA(fast_period)
+        self.slow = StreamingEMA(slow_period)
+        self.signal = StreamingEMA(signal_period)
+
+    def reset(self):
+        self.fast.reset()
+        self.slow.reset()
+        self.signal.reset()
+
+    def update(self, close):
+        """Add a closed candle's close and return the new MACD values"""
+        line = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(line)
+        return line, signal, line - signal
+
+    def preview(self, close):
+        """MACD values if the forming candle closed at `close`, without changing the state"""
+        line = self.fast.preview(close) - self.slow.preview(close)
+        signal = self.signal.preview(line)
+        return line, signal, line - signal
+
+    def get_state(self):
+        return {'fast': self.fast.get_state(), 'slow': self.slow.get_state(),
+                'signal': self.signal.get_state()}
+
+    def set_state(self, state):
+        self.fast.set_state(state['fast'])
+        self.slow.set_state(state['slow'])
+        self.signal.set_state(state['signal'])
+
+
+def candle_times(df):
+    """
+    Candle open times of an OHLCV DataFrame as int64, or None if it has none
+
+    Uses the 'timestamp' column if there is one, otherwise a datetime index.
+    """
+    times = df['timestamp'] if 'timestamp' in df.columns else df.index
+    times = np.asarray(times)
+    if times.dtype.kind == 'M':
+        return times.astype('datetime64[ns]').astype(np.int64)
+    if 'timestamp' in df.columns and times.dtype.kind in 'iuf':
+        return times.astype(np.int64)
+    return None
+
+
+class IndicatorStream:
+    """
+    Keeps streaming indicators in step with an OHLCV DataFrame
+
+    Each call feeds only the candles that closed since the previous call and
+    previews the forming (last) candle, so the cost per cycle does not depend on
+    the window length. If the frame has no candle times, or goes back in time,
+    the indicators are rebuilt from the whole frame.
+    """
+
+    def __init__(self, indicators):
+        """
+        Args:
+            indicators (dict): Output name (or tuple of names for multi-value
+                indicators) -> (source column, streaming indicator)
+        """
+        self.indicators = indicators
+        self.last_time = None
+        self.closed_values = {}
+
+    def reset(self):
+        for _, indicator in self.indicators.values():
+            indicator.reset()
+        self.last_time = None
+        self.closed_values = {}
+
+    def _set_outputs(self, target, name, value):
+        if isinstance(name, tuple):
+            for key, item in zip(name, value):
+                target[key] = item
+        else:
+            target[name] = value
+
+    def update(self, df):
+        """
+        Bring the indicators up to date with df
+
+        Args:
+            df (pd.DataFrame): OHLCV data, oldest first, last row is the forming candle
+
+        Returns:
+            dict: Output name -> np.array([value at last closed candle, value at forming candle])
+        """
+        if len(df) < 2:
+            return {}
+
+        times = candle_times(df)
+        closed = len(df) - 1
+        start = 0
+        if times is None or self.last_time is None or times[closed - 1] < self.last_time:
+            self.reset()
+        else:
+            start = int(np.searchsorted(times[:closed], self.last_time, side='right'))
+            if start == 0 and times[0] > self.last_time:
+                logger.debug("Candles missing between indicator updates, continuing from the new window")
+
+        columns = {column: as_array(df[column]) for column, _ in self.indicators.values()}
+        for row in range(start, closed):
+            for name, (column, indicator) in self.indicators.items():
+                self._set_outputs(self.closed_values, name, indicator.update(columns[column][row]))
+        if times is not None:
+            self.last_time = times[closed - 1]
+
+        forming = {}
+        for name, (column, indicator) in self.indicators.items():
+            self._set_outputs(forming, name, indicator.preview(columns[column][closed]))
+
+        return {key: np.array([self.closed_values.get(key, NAN), value]) for key, value in forming.items()}
+
+    def get_state(self):
+        """JSON-serializable checkpoint of every indicator"""
+        return {
+            'last_time': None if self.last_time is None else int(self.last_time),
+            'closed_values': {key: float(value) for key, value in self.closed_values.items()},
+            'indicators': {str(name): indicator.get_state()
+                           for name, (_, indicator) in self.indicators.items()}
+        }
+
+    def set_state(self, state):
+        """Restore a checkpoint taken with get_state"""
+        self.last_time = state['last_time']
+        self.closed_values = dict(state['closed_values'])
+        for name, (_, indicator) in self.indicators.items():
+            indicator.set_state(state['indicators'][str(name)])
+
+
+class IndicatorStreams:
+    """
+    One IndicatorStream per (symbol, timeframe), created on first use
+
+    DataFrames from the candle store carry their symbol and timeframe in
+    df.attrs, so one strategy instance can watch many pairs. A frame without
+    them cannot be told apart from other series, so its indicators are
+    computed from that frame alone and no state is kept.
+    """
+
+    def __init__(self, factory):
+        """
+        Args:
+            factory (callable): Returns the indicators dict for a new IndicatorStream
+        """
+        self.factory = factory
+        self.streams = {}
+
+    def update(self, df):
+        """Update the stream for df's series, see IndicatorStream.update"""
+        symbol, timeframe = df.attrs.get('symbol'), df.attrs.get('timeframe')
+        if symbol is None or timeframe is None:
+            return IndicatorStream(self.factory()).update(df)
+
+        key = f"{symbol}|{timeframe}"
+        if key not in self.streams:
+            self.streams[key] = IndicatorStream(self.factory())
+        return self.streams[key].update(df)
+
+    def get_state(self):
+        return {key: stream.get_state() for key, stream in self.streams.items()}
+
+    def set_state(self, state):
+        for key, stream_state in state.items():
+            self.streams[key] = IndicatorStream(self.factory())
+            self.streams[key].set_state(stream_state)
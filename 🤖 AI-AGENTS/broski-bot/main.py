@@ -1,68 +1,212 @@
 import logging
 import time
 import os
-from config import Config
+import json
 from data_fetcher import DataFetcher
 from strategy_manager import StrategyManager
 from risk_manager import RiskManager
 from exchange_connector import ExchangeConnector
 from performance_tracker import PerformanceTracker
 from notification_service import NotificationService
+from config_watcher import ConfigWatcher
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("broski_bot.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger("BROski")
 
+# Stages of one bot cycle, in order, as reported in stage_timings
+CYCLE_STAGES = ('fetch', 'signals', 'risk', 'execution', 'tracking')
+
+# Sections that set up connections, caches and files when the bot starts;
+# changing them takes a restart
+RESTART_SECTIONS = ('exchange', 'market_data', 'logging')
+
+
+def load_config(path="config.json"):
+    """Load the bot configuration from a JSON file"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
 class BroskiBot:
-    def __init__(self):
+    def __init__(self, config=None, exchange=None, clock=None, sleep=None, config_path=None):
+        """
+        Initialize the bot and all of its components
+
+        Args:
+            config (dict): Bot configuration (loaded from config_path if not given)
+            exchange: Exchange client shared by the data fetcher and the exchange connector
+                (e.g. a MockExchange when replaying), created from the config if not given
+            clock (callable): Time source in seconds (default: time.time)
+            sleep (callable): Waits between cycles (default: time.sleep)
+            config_path (str): Config file to load and watch for changes between cycles
+                (default: config.json when no config is given, otherwise none)
+        """
         logger.info("Initializing BROski Crypto Bot...")
-        self.config = Config()
-        self.data_fetcher = DataFetcher(self.config)
-        self.exchange = ExchangeConnector(self.config)
+        if config is None:
+            config_path = config_path or "config.json"
+        self.config_watcher = ConfigWatcher(config_path) if config_path else None
+        self.config = config if config is not None else load_config(config_path)
+        self.clock = clock or time.time
+        self.sleep = sleep or time.sleep
+        self.cycle_interval = self.config["trading"].get("trade_interval_seconds", 60)
+
+        # One ticker cache for both, filled through the connector's rate-limited fetcher
+        self.exchange = ExchangeConnector(self.config, exchange_client=exchange, clock=clock)
+        self.data_fetcher = DataFetcher(self.config, exchange=exchange, ticker_cache=self.exchange.ticker_cache)
         self.risk_manager = RiskManager(self.config)
-        self.strategy_manager = StrategyManager(self.config, self.data_fetcher)
+        self.strategy_manager = StrategyManager(self.config)
         self.performance_tracker = PerformanceTracker(self.config)
         self.notification_service = NotificationService(self.config)
+
+        self.data_fetcher.clock = self.clock
+        self.exchange.clock = self.clock
+        self.risk_manager.clock = self.clock
+
+        # Seconds spent in each stage, one entry per cycle
+        self.stage_timings = {stage: [] for stage in CYCLE_STAGES}
+        self.cycles = 0
+        self.trade_counts = {'executed': 0, 'failed': 0}
         logger.info("BROski Crypto Bot initialized successfully!")
 
-    def run(self):
+    def apply_config(self, config):
+        """
+        Switch the running bot to a new configuration
+
+        Strategy, trading, risk and notification settings take effect from the
+        next cycle. The exchange client, market data caches and indicator state
+        are kept, so nothing has to warm up again; changes to RESTART_SECTIONS
+        are ignored with a warning.
+
+        Args:
+            config (dict): Validated bot configuration
+
+        Returns:
+            bool: True if the configuration was applied
+        """
+        config = dict(config)
+        for section in RESTART_SECTIONS:
+            if config.get(section) != self.config.get(section):
+                logger.warning(f"Changes to the {section} settings take effect after a restart")
+            if section in self.config:
+                config[section] = self.config[section]
+            else:
+                config.pop(section, None)
+
+        # The strategies are the only part that can fail to load, so they go first
+        if not self.strategy_manager.apply_config(config):
+            logger.error("Configuration change not applied")
+            return False
+
+        self.data_fetcher.config = config
+        self.exchange.config = config
+        self.risk_manager.apply_config(config)
+        self.performance_tracker.config = config
+        if config.get("notifications") != self.config.get("notifications"):
+            self.notification_service = NotificationService(config)
+        else:
+            self.notification_service.config = config
+
+        self.config = config
+        self.cycle_interval = config["trading"].get("trade_interval_seconds", 60)
+        logger.info(f"Configuration applied: {self.strategy_manager.active_strategy_name}, "
+                    f"auto-trade {'on' if config['trading'].get('auto_trade') else 'off'}")
+        return True
+
+    def reload_config(self):
+        """Apply the config file if it changed since the last cycle"""
+        if self.config_watcher is None:
+            return False
+        config = self.config_watcher.poll()
+        return config is not None and self.apply_config(config)
+
+    def _generate_signals(self, market_data):
+        """Signals for every pair in the market data, tagged with the pair and its price"""
+        signals = []
+        for pair, pair_data in market_data.get("pairs", {}).items():
+            df = pair_data.get("ohlcv")
+            if df is None or df.empty:
+                continue
+            for signal in self.strategy_manager.generate_signals(df):
+                signal.setdefault("symbol", pair)
+                if pair_data.get("price") is not None:
+                    signal.setdefault("price", pair_data["price"])
+                signals.append(signal)
+        return signals
+
+    def run_cycle(self):
+        """
+        Run one fetch, signal, risk, execution and tracking pass
+
+        Returns:
+            list: Execution results of the trades placed in this cycle
+        """
+        timings = {}
+        self.cycles += 1
+
+        # Fetch latest market data
+        start = time.perf_counter()
+        market_data = self.data_fetcher.get_latest_data()
+        timings['fetch'] = time.perf_counter() - start
+
+        # Generate trading signals
+        start = time.perf_counter()
+        signals = self._generate_signals(market_data)
+        timings['signals'] = time.perf_counter() - start
+
+        # Apply risk management rules
+        start = time.perf_counter()
+        filtered_signals = self.risk_manager.filter_signals(signals)
+        timings['risk'] = time.perf_counter() - start
+
+        # Execute trades
+        start = time.perf_counter()
+        results = [self.exchange.execute_trade(signal) for signal in filtered_signals]
+        timings['execution'] = time.perf_counter() - start
+
+        # Record trades and update performance metrics
+        start = time.perf_counter()
+        for execution_result in results:
+            self.trade_counts['executed' if execution_result.get('success') else 'failed'] += 1
+            self.performance_tracker.record_trade(execution_result)
+            self.notification_service.send_trade_notification(execution_result)
+        self.performance_tracker.update_metrics()
+        timings['tracking'] = time.perf_counter() - start
+
+        for stage in CYCLE_STAGES:
+            self.stage_timings[stage].append(timings[stage])
+        return results
+
+    def run(self, max_cycles=None):
+        """
+        Run the bot loop
+
+        Args:
+            max_cycles (int): Stop after this many cycles (default: run forever)
+        """
         logger.info("BROski Crypto Bot starting...")
-        
-        while True:
+
+        while max_cycles is None or self.cycles < max_cycles:
             try:
-                # Fetch latest market data
-                market_data = self.data_fetcher.get_latest_data()
-                
-                # Generate trading signals
-                signals = self.strategy_manager.generate_signals(market_data)
-                
-                # Apply risk management rules
-                filtered_signals = self.risk_manager.filter_signals(signals)
-                
-                # Execute trades
-                for signal in filtered_signals:
-                    execution_result = self.exchange.execute_trade(signal)
-                    self.performance_tracker.record_trade(execution_result)
-                    self.notification_service.send_trade_notification(execution_result)
-                
-                # Update performance metrics
-                self.performance_tracker.update_metrics()
-                
+                # Settings changed since the last cycle apply from this one
+                self.reload_config()
+                self.run_cycle()
+
                 # Sleep until next cycle
-                time.sleep(self.config.cycle_interval)
-                
+                self.sleep(self.cycle_interval)
+
             except Exception as e:
                 logger.error(f"Error in main loop: {e}")
                 self.notification_service.send_error_notification(str(e))
-                time.sleep(60)  # Wait before retrying
+                self.sleep(60)  # Wait before retrying
 
 if __name__ == "__main__":
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("broski_bot.log"),
+            logging.StreamHandler()
+        ]
+    )
     bot = BroskiBot()
     bot.run()
@@ -0,0 +1,238 @@
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from pathlib import Path
+
+logger = logging.getLogger("BROski.MarketCache")
+
+
+class MarketMetadataCache:
+    """
+    Disk cache for the exchange market list (ccxt load_markets).
+
+    The full MEXC market list is several megabytes, but the bot only ever needs
+    precision and limits for a handful of symbols. The list is saved to disk and
+    reused until it is older than the TTL; an expired copy is still used straight
+    away while a fresh one downloads in the background.
+
+    ccxt clients are not thread-safe, so the background download runs on a
+    separate client and the result is only handed to the trading client by the
+    next load() on the calling thread.
+    """
+
+    def __init__(self, exchange, cache_file="data/cache/markets.json", ttl_seconds=24 * 60 * 60,
+                 client_factory=None):
+        """
+        Initialize the market cache
+
+        Args:
+            exchange: ccxt exchange client (or anything with load_markets)
+            cache_file (str): Where the market list is saved
+            ttl_seconds (float): How long a saved market list stays fresh
+            client_factory (callable): Creates the separate client used for background
+                downloads; without one an expired list is refreshed on the calling thread
+        """
+        self.exchange = exchange
+        self.cache_file = Path(cache_file)
+        self.ttl_seconds = ttl_seconds
+        self.client_factory = client_factory
+
+        self.markets = {}
+        self.index = {}
+        self.updated_at = 0
+        self.lock = threading.Lock()
+        self.refresh_thread = None
+        self.pending = None
+
+    @classmethod
+    def from_config(cls, exchange, config):
+        """Create a market cache using the market_data section of config.json"""
+        market_config = config.get("market_data", {}) if isinstance(config, dict) else {}
+        exchange_name = config.get("exchange", {}).get("name", "mexc") if isinstance(config, dict) else "mexc"
+        default_file = "data/cache/markets.json" if exchange_name == "mexc" else f"data/cache/{exchange_name}_markets.json"
+        client_factory = None
+        if exchange_name != "mock":
+            client_factory = lambda: _create_refresh_client(config)
+        return cls(
+            exchange,
+            cache_file=market_config.get("markets_cache_file", default_file),
+            ttl_seconds=market_config.get("markets_ttl_hours", 24) * 60 * 60,
+            client_factory=client_factory
+        )
+
+    def _build_index(self, markets):
+        """Precompute the fields order sizing needs for every symbol"""
+        index = {}
+        for symbol, market in markets.items():
+            limits = market.get('limits') or {}
+            index[symbol] = {
+                'id': market.get('id'),
+                'base': market.get('base'),
+                'quote': market.get('quote'),
+                'active': market.get('active', True),
+                'precision': {
+                    'amount': (market.get('precision') or {}).get('amount'),
+                    'price': (market.get('precision') or {}).get('price'),
+                },
+                'limits': {
+                    key: {
+                        'min': (limits.get(key) or {}).get('min'),
+                        'max': (limits.get(key) or {}).get('max'),
+                    }
+                    for key in ('amount', 'price', 'cost')
+                }
+            }
+        return index
+
+    def _apply(self, markets, updated_at):
+        index = self._build_index(markets)
+        with self.lock:
+            self.markets = markets
+            self.index = index
+            self.updated_at = updated_at
+
+        # Hand the markets to ccxt so it doesn't download them again before placing orders
+        if hasattr(self.exchange, 'set_markets'):
+            try:
+                self.exchange.set_markets(markets)
+            except Exception as e:
+                logger.warning(f"Could not pass cached markets to exchange client: {str(e)}")
+
+    def _load_from_disk(self):
+        """Load the saved market list, returns False if there is none"""
+        if not self.cache_file.exists():
+            return False
+
+        try:
+            start = time.perf_counter()
+            with open(self.cache_file, 'r') as f:
+                cached = json.load(f)
+            self._apply(cached['markets'], cached['timestamp'])
+            logger.info(f"Loaded {len(self.markets)} markets from cache in "
+                        f"{(time.perf_counter() - start) * 1000:.0f}ms")
+            return True
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable market cache {self.cache_file}: {str(e)}")
+            return False
+
+    def _save_to_disk(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per writer, so processes refreshing at the same time can't interleave
+        fd, temp_file = tempfile.mkstemp(prefix=f".{self.cache_file.name}.", suffix=".tmp",
+                                         dir=self.cache_file.parent)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'timestamp': self.updated_at, 'markets': self.markets}, f, default=str)
+            os.replace(temp_file, self.cache_file)
+        except Exception:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+
+    def is_stale(self):
+        """Whether the loaded market list is older than the TTL"""
+        return time.time() - self.updated_at > self.ttl_seconds
+
+    @staticmethod
+    def _download(client):
+        try:
+            return client.load_markets(True)
+        except TypeError:
+            return client.load_markets()
+
+    def _store(self, markets, updated_at):
+        """Apply a downloaded market list and save it"""
+        self._apply(markets, updated_at)
+        try:
+            self._save_to_disk()
+        except Exception as e:
+            logger.error(f"Error saving market cache: {str(e)}")
+        logger.info(f"Refreshed {len(markets)} markets from exchange")
+
+    def refresh(self):
+        """
+        Download the market list with the trading client and save it
+
+        Returns:
+            dict: Markets keyed by symbol
+        """
+        markets = self._download(self.exchange)
+        self._store(markets, time.time())
+        return markets
+
+    def refresh_in_background(self):
+        """Start a background download on a separate client unless one is already running"""
+        if self.refresh_thread is not None and self.refresh_thread.is_alive():
+            return
+
+        if self.client_factory is None:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Market refresh failed: {str(e)}")
+            return
+
+        def run():
+            try:
+                markets = self._download(self.client_factory())
+                with self.lock:
+                    self.pending = (markets, time.time())
+            except Exception as e:
+                logger.error(f"Background market refresh failed: {str(e)}")
+
+        self.refresh_thread = threading.Thread(target=run, daemon=True)
+        self.refresh_thread.start()
+
+    def _apply_pending(self):
+        """Swap in a market list downloaded in the background"""
+        with self.lock:
+            pending, self.pending = self.pending, None
+        if pending is not None:
+            self._store(*pending)
+
+    def load(self):
+        """
+        Make the market list available, preferring the saved copy
+
+        Returns:
+            dict: Markets keyed by symbol
+        """
+        self._apply_pending()
+        if not self.markets and not self._load_from_disk():
+            return self.refresh()
+
+        if self.is_stale():
+            self.refresh_in_background()
+        return self.markets
+
+    def get_market(self, symbol):
+        """
+        Get the full ccxt market structure for a symbol
+
+        Returns:
+            dict: Market info, or None if the symbol is unknown
+        """
+        self.load()
+        return self.markets.get(symbol)
+
+    def get_symbol_info(self, symbol):
+        """
+        Get precision and min/max limits for a symbol from the precomputed index
+
+        Args:
+            symbol (str): Trading pair in format BASE/QUOTE
+
+        Returns:
+            dict: id, base, quote, active, precision and limits, or None if unknown
+        """
+        self.load()
+        return self.index.get(symbol)
+
+
+def _create_refresh_client(config):
+    # Imported here, exchange_connector imports this module
+    from exchange_connector import create_exchange_client
+    return create_exchange_client(config)
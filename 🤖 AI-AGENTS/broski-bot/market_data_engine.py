@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+import ccxt.async_support as ccxt_async
+from candle_store import CandleStore, timeframe_to_ms, exchange_time_ms
+from rate_limiter import get_limiter
+
+logger = logging.getLogger("BROski.MarketDataEngine")
+
+
+def create_async_exchange_client(config):
+    """
+    Create the asyncio ccxt client for the exchange named in the config
+
+    Throttling is left to the shared token-bucket limiter instead of ccxt.
+
+    Args:
+        config (dict): Bot configuration with an exchange section
+
+    Returns:
+        ccxt.async_support.Exchange: Async client
+    """
+    name = config['exchange'].get('name', 'mexc').lower()
+    exchange_class = getattr(ccxt_async, name, None)
+    if exchange_class is None:
+        raise ValueError(f"Exchange {name} has no asyncio client in ccxt")
+    return exchange_class({
+        'apiKey': config['exchange'].get('api_key', ''),
+        'secret': config['exchange'].get('api_secret', ''),
+        'enableRateLimit': False,
+    })
+
+
+class MarketDataEngine:
+    """
+    Fetches tickers and candles for many trading pairs and timeframes concurrently.
+
+    Uses ccxt's asyncio client, so requests for different pairs overlap instead of
+    running back to back. The process-wide token-bucket limiter keeps the request rate
+    inside the exchange limits and a semaphore caps how many requests are in flight at once.
+    """
+
+    def __init__(self, config, candle_store=None, max_concurrency=None):
+        """
+        Initialize the market data engine
+
+        Args:
+            config (dict): Bot configuration (config.json)
+            candle_store (CandleStore): Shared candle store, created from config if omitted
+            max_concurrency (int): Maximum number of concurrent exchange requests
+        """
+        self.config = config
+        market_config = config.get("market_data", {})
+        self.max_concurrency = max_concurrency or market_config.get("max_concurrency", 8)
+        self.candle_store = candle_store or CandleStore.from_config(config)
+        self.exchange = None
+        self.limiter = None
+
+        # The async client is bound to the loop it was created on, so keep one loop alive
+        self._loop = asyncio.new_event_loop()
+
+    def _create_exchange(self):
+        """Create the async exchange client (throttled by the shared limiter instead of ccxt)"""
+        return create_async_exchange_client(self.config)
+
+    async def _fetch_ticker(self, pair, semaphore):
+        """Fetch the ticker for one pair"""
+        async with semaphore:
+            try:
+                await self.limiter.acquire_async('public')
+                return await self.exchange.fetch_ticker(pair)
+            except Exception as e:
+                logger.error(f"Error fetching ticker for {pair}: {str(e)}")
+                return None
+
+    async def _fetch_page(self, pair, timeframe, since, page_limit, semaphore):
+        """Fetch one page of candles within the concurrency and rate limits"""
+        async with semaphore:
+            await self.limiter.acquire_async('public')
+            return await self.exchange.fetch_ohlcv(pair, timeframe, since=since, limit=page_limit)
+
+    async def _extend_history(self, pair, timeframe, limit, semaphore, page_limit, max_pages):
+        """Fetch older candles when more history is needed than is stored (CandleStore._extend_history)"""
+        shortfall = self.candle_store._history_shortfall(pair, timeframe, limit)
+        if shortfall is None:
+            return 0
+        first_ts, since = shortfall
+
+        older = []
+        for _ in range(max_pages):
+            ohlcv = await self._fetch_page(pair, timeframe, since, page_limit, semaphore)
+            ohlcv = [candle for candle in (ohlcv or []) if candle[0] < first_ts]
+            if not ohlcv:
+                break
+            older.extend(ohlcv)
+            newest = int(ohlcv[-1][0])
+            if newest <= since:
+                break
+            since = newest + 1
+
+        return self.candle_store._store_history(pair, timeframe, older, limit)
+
+    async def _sync_candles(self, pair, timeframe, limit, semaphore, page_limit=1000, max_pages=50):
+        """
+        Fetch candles newer than the local history for one pair/timeframe
+
+        Mirrors CandleStore.sync but awaits the exchange calls, including fetching
+        older candles when a strategy needs a longer warm-up than is stored.
+        """
+        added = 0
+        try:
+            last_ts = self.candle_store.last_timestamp(pair, timeframe)
+            if last_ts is None:
+                since = exchange_time_ms(self.exchange) - limit * timeframe_to_ms(timeframe)
+            else:
+                since = last_ts
+                await self._extend_history(pair, timeframe, limit, semaphore, page_limit, max_pages)
+
+            for _ in range(max_pages):
+                ohlcv = await self._fetch_page(pair, timeframe, since, page_limit, semaphore)
+                if not ohlcv:
+                    break
+
+                added += self.candle_store.append(pair, timeframe, ohlcv)
+
+                newest = int(ohlcv[-1][0])
+                # Stop once caught up with the current candle (pages may be capped below page_limit)
+                if newest <= since or newest + timeframe_to_ms(timeframe) > exchange_time_ms(self.exchange):
+                    break
+                since = newest
+        except Exception as e:
+            logger.error(f"Error fetching OHLCV data for {pair} ({timeframe}): {str(e)}")
+
+        return self.candle_store.to_dataframe(pair, timeframe, limit=limit)
+
+    async def fetch_market_data(self, pairs, timeframes, limit=100):
+        """
+        Fetch tickers and candles for every pair and timeframe concurrently
+
+        Args:
+            pairs (list): Trading pairs in format BASE/QUOTE
+            timeframes (list): Timeframes to fetch; the first one fills "ohlcv"
+            limit (int): Number of candles per series
+
+        Returns:
+            dict: Market data in the same "pairs" layout as DataFetcher.get_latest_data,
+                  with every requested timeframe under "timeframes"
+        """
+        if self.exchange is None:
+            self.exchange = self._create_exchange()
+            self.limiter = get_limiter(self.config['exchange'].get('name', 'mexc').lower(), self.exchange, self.config)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        start = time.perf_counter()
+
+        ticker_tasks = [self._fetch_ticker(pair, semaphore) for pair in pairs]
+        candle_keys = [(pair, timeframe) for pair in pairs for timeframe in timeframes]
+        candle_tasks = [self._sync_candles(pair, timeframe, limit, semaphore)
+                        for pair, timeframe in candle_keys]
+
+        results = await asyncio.gather(*ticker_tasks, *candle_tasks)
+        tickers = results[:len(pairs)]
+        candles = dict(zip(candle_keys, results[len(pairs):]))
+
+        market_data = {
+            "pairs": {},
+            "timestamp": datetime.now().isoformat()
+        }
+
+        for pair, ticker in zip(pairs, tickers):
+            frames = {timeframe: candles[(pair, timeframe)] for timeframe in timeframes}
+            market_data["pairs"][pair] = {
+                "price": ticker['last'] if ticker else None,
+                "ticker": ticker,
+                "ohlcv": frames[timeframes[0]],
+                "timeframes": frames
+            }
+
+        logger.debug(f"Fetched {len(pairs)} pairs x {len(timeframes)} timeframes "
+                     f"in {time.perf_counter() - start:.3f}s")
+        return market_data
+
+    def fetch(self, pairs, timeframes, limit=100):
+        """Blocking wrapper around fetch_market_data for the synchronous bot loop"""
+        return self._loop.run_until_complete(self.fetch_market_data(pairs, timeframes, limit))
+
+    def close(self):
+        """Close the exchange session and the event loop"""
+        if self.exchange is not None:
+            self._loop.run_until_complete(self.exchange.close())
+            self.exchange = None
+        self.limiter = None
+        self._loop.close()
@@ -0,0 +1,504 @@
+import os
+import sys
+import json
+import time
+import logging
+import secrets
+import threading
+from pathlib import Path
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+import ccxt
+from candle_store import CandleStore
+from rate_limiter import rate_limited
+
+logger = logging.getLogger("BROski.MarketDataHub")
+
+# How long a cached upstream response stays fresh (seconds)
+DEFAULT_TTLS = {
+    'fetch_ticker': 1.0,
+    'fetch_ohlcv': 5.0,
+    'fetch_order_book': 1.0,
+    'fetch_time': 1.0,
+    'load_markets': 3600.0,
+}
+
+# Only public market data goes through the hub; orders and balances stay on each bot's own session
+PUBLIC_METHODS = set(DEFAULT_TTLS)
+
+
+def get_hub_address(config):
+    """
+    Get the local address the hub listens on
+
+    A named pipe on Windows, a Unix socket file everywhere else.
+    """
+    hub_config = config.get("market_data_hub", {})
+    if hub_config.get("address"):
+        return hub_config["address"]
+    if sys.platform == "win32":
+        return r"\\.\pipe\broski_market_hub"
+    return os.path.abspath(os.path.join("data", "market_hub.sock"))
+
+
+def get_hub_authkey_file(config):
+    """Get the file holding the hub's generated shared secret"""
+    return config.get("market_data_hub", {}).get("authkey_file", os.path.join("data", "market_hub.key"))
+
+
+def get_hub_authkey(config, create=False):
+    """
+    Get the shared secret local clients use to talk to the hub
+
+    Uses market_data_hub.authkey if set, otherwise a random key kept in a file
+    only the owner can read. Clients pickle requests over the connection, so
+    the key is what keeps other local users out of the process that holds the
+    exchange API keys.
+
+    Args:
+        config (dict): Bot configuration
+        create (bool): Generate the key file if it does not exist (the hub does this)
+
+    Returns:
+        bytes: The key, or None if there is none yet and create is False
+
+    Raises:
+        PermissionError: If the key file can be read by other users
+    """
+    authkey = config.get("market_data_hub", {}).get("authkey")
+    if authkey:
+        return authkey.encode()
+
+    path = get_hub_authkey_file(config)
+    if not os.path.exists(path):
+        if not create:
+            return None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(secrets.token_hex(32))
+        logger.info(f"Generated market data hub key in {path}")
+
+    if sys.platform != "win32" and os.stat(path).st_mode & 0o077:
+        raise PermissionError(f"{path} can be read by other users, run: chmod 600 {path}")
+    with open(path, 'r') as f:
+        authkey = f.read().strip()
+    if not authkey:
+        raise ValueError(f"Market data hub key file {path} is empty")
+    return authkey.encode()
+
+
+class MarketDataHub:
+    """
+    Local market data hub.
+
+    Owns the single upstream exchange session and serves tickers, candles and
+    order books to every local process (bot, monitor, dashboard, tools). Repeat
+    requests inside the freshness window are answered from memory, and series that
+    clients keep asking for are refreshed in the background so reads stay instant.
+    """
+
+    def __init__(self, config, exchange=None):
+        """
+        Initialize the hub
+
+        Args:
+            config (dict): Bot configuration (config.json)
+            exchange: Upstream ccxt client, created from config if omitted
+        """
+        self.config = config
+        hub_config = config.get("market_data_hub", {})
+        self.address = get_hub_address(config)
+        # Refuses to start without a private key, see get_hub_authkey
+        self.authkey = get_hub_authkey(config, create=True)
+        self.ttls = {**DEFAULT_TTLS, **hub_config.get("ttl_seconds", {})}
+        self.poll_interval = hub_config.get("poll_interval_seconds", 1.0)
+        self.subscription_timeout = hub_config.get("subscription_timeout_seconds", 300)
+
+        # Upstream calls wait for the process-wide limiter rather than ccxt's own throttle
+        self.exchange = exchange or rate_limited(ccxt.mexc({
+            'apiKey': config['exchange']['api_key'],
+            'secret': config['exchange']['api_secret'],
+            'enableRateLimit': False,
+        }), config)
+
+        # The hub keeps its own candle history so it never shares files with clients
+        self.candle_store = CandleStore(hub_config.get("candle_store_dir", "data/hub_candles"))
+
+        self.cache = {}
+        self.synced = {}
+        self.subscriptions = {}
+        self.cache_lock = threading.Lock()
+        # One lock per (method, symbol): concurrent requests for one series wait for a
+        # single upstream call, requests for other series go ahead in parallel
+        self.upstream_locks = {}
+        self.running = False
+
+        # Client threads update the counters concurrently
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            'client_requests': 0,
+            'upstream_calls': 0,
+            'clients': 0
+        }
+
+    def _count(self, stat, amount=1):
+        with self.stats_lock:
+            self.stats[stat] += amount
+
+    def _cache_key(self, method, args, kwargs):
+        return json.dumps([method, list(args), kwargs], sort_keys=True, default=str)
+
+    def _subscription(self, method, args, kwargs):
+        """
+        Key and call for keeping a request's series warm
+
+        Polling clients move `since` forward on every OHLCV request, but they
+        follow the same series, so it is left out of the subscription.
+        """
+        if method == 'fetch_ohlcv':
+            kwargs = {key: value for key, value in kwargs.items() if key != 'since'}
+        return self._cache_key(method, args, kwargs), (method, tuple(args), kwargs)
+
+    def _upstream_lock(self, method, args):
+        key = (method, args[0] if args else None)
+        with self.cache_lock:
+            if key not in self.upstream_locks:
+                self.upstream_locks[key] = threading.Lock()
+            return self.upstream_locks[key]
+
+    def _fetch_upstream(self, method, args, kwargs):
+        """Call the exchange, or the candle store for OHLCV requests"""
+        if method != 'fetch_ohlcv':
+            self._count('upstream_calls')
+            return getattr(self.exchange, method)(*args, **kwargs)
+
+        symbol = args[0]
+        timeframe = args[1] if len(args) > 1 else kwargs.get('timeframe', '1m')
+        since = kwargs.get('since')
+        limit = kwargs.get('limit') or 100
+
+        # Clients page with different `since` values, so sync each series at most once per TTL
+        series = (symbol, timeframe)
+        if time.time() - self.synced.get(series, 0) >= self.ttls['fetch_ohlcv']:
+            self._count('upstream_calls')
+            self.candle_store.sync(self.exchange, symbol, timeframe, limit=max(limit, 100))
+            self.synced[series] = time.time()
+
+        columns = self.candle_store.read(symbol, timeframe, since=since)
+
+        # The store cannot answer for history older than it holds, ask the exchange directly
+        if len(columns['timestamp']) < limit and (since is None or len(columns['timestamp']) == 0
+                                                  or columns['timestamp'][0] > since):
+            self._count('upstream_calls')
+            return self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+
+        rows = [[int(ts), float(o), float(h), float(l), float(c), float(v)]
+                for ts, o, h, l, c, v in zip(columns['timestamp'], columns['open'], columns['high'],
+                                             columns['low'], columns['close'], columns['volume'])]
+        return rows[:limit] if since is not None else rows[-limit:]
+
+    def handle_request(self, method, args=(), kwargs=None):
+        """
+        Serve one client request, from cache when fresh
+
+        Args:
+            method (str): ccxt method name (must be a public market data call)
+            args (list): Positional arguments for the call
+            kwargs (dict): Keyword arguments for the call
+
+        Returns:
+            The ccxt response
+        """
+        kwargs = kwargs or {}
+        if method not in PUBLIC_METHODS:
+            raise ValueError(f"Method not served by market data hub: {method}")
+
+        self._count('client_requests')
+        key = self._cache_key(method, args, kwargs)
+        ttl = self.ttls.get(method, 1.0)
+
+        subscription_key, (_, sub_args, sub_kwargs) = self._subscription(method, args, kwargs)
+        with self.cache_lock:
+            self.subscriptions[subscription_key] = (method, sub_args, sub_kwargs, time.time())
+            cached = self.cache.get(key)
+        if cached and time.time() - cached[0] < ttl:
+            return cached[1]
+
+        with self._upstream_lock(method, args):
+            # Another client may have refreshed it while we waited
+            cached = self.cache.get(key)
+            if cached and time.time() - cached[0] < ttl:
+                return cached[1]
+
+            result = self._fetch_upstream(method, args, kwargs)
+
+        with self.cache_lock:
+            self.cache[key] = (time.time(), result)
+        return result
+
+    def _refresh_subscriptions(self):
+        """Keep series that clients are actively reading warm in the background"""
+        while self.running:
+            now = time.time()
+            with self.cache_lock:
+                # Forget series nobody has asked for in a while, and responses nobody reused
+                for key in [k for k, sub in self.subscriptions.items()
+                            if now - sub[3] > self.subscription_timeout]:
+                    del self.subscriptions[key]
+                for key in [k for k, cached in self.cache.items()
+                            if now - cached[0] > self.subscription_timeout]:
+                    del self.cache[key]
+                subscriptions = list(self.subscriptions.items())
+
+            for key, (method, args, kwargs, _) in subscriptions:
+                cached = self.cache.get(key)
+                if cached and now - cached[0] < self.ttls.get(method, 1.0):
+                    continue
+                try:
+                    with self._upstream_lock(method, args):
+                        result = self._fetch_upstream(method, args, kwargs)
+                    with self.cache_lock:
+                        self.cache[key] = (time.time(), result)
+                except Exception as e:
+                    logger.error(f"Error refreshing {method}{args}: {str(e)}")
+
+            time.sleep(self.poll_interval)
+
+    def _serve_client(self, conn):
+        """Answer requests from one connected client until it disconnects"""
+        self._count('clients')
+        try:
+            while self.running:
+                try:
+                    request = conn.recv()
+                except EOFError:
+                    break
+
+                try:
+                    result = self.handle_request(request['method'], request.get('args', ()),
+                                                 request.get('kwargs'))
+                    conn.send({'ok': True, 'result': result})
+                except Exception as e:
+                    conn.send({'ok': False, 'error': str(e), 'type': type(e).__name__})
+        finally:
+            self._count('clients', -1)
+            conn.close()
+
+    def serve_forever(self):
+        """Start listening for local clients (blocks until stopped)"""
+        if isinstance(self.address, str) and not self.address.startswith("\\\\"):
+            Path(self.address).parent.mkdir(parents=True, exist_ok=True)
+            if os.path.exists(self.address):
+                os.remove(self.address)  # Stale socket from a previous run
+
+        self.running = True
+        threading.Thread(target=self._refresh_subscriptions, daemon=True).start()
+
+        with Listener(self.address, authkey=self.authkey) as listener:
+            logger.info(f"Market data hub listening on {self.address}")
+            while self.running:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    logger.error(f"Error accepting hub client: {str(e)}")
+                    continue
+                threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+
+    def stop(self):
+        """Stop serving clients"""
+        self.running = False
+
+
+class MarketDataClient:
+    """
+    Client for the local market data hub.
+
+    Offers the read-only subset of the ccxt interface the bot uses, so it can be
+    passed anywhere an exchange client is used for market data.
+
+    If the hub goes away the client reconnects with exponential backoff. After
+    `max_failures` failed attempts in a row it serves calls from the direct
+    exchange client instead, and switches back once the hub answers again.
+    """
+
+    def __init__(self, address, authkey, fallback=None, max_failures=3, backoff_seconds=1.0,
+                 max_backoff_seconds=30.0):
+        """
+        Connect to a running hub
+
+        Args:
+            address: Hub address (see get_hub_address)
+            authkey (bytes): Shared secret (see get_hub_authkey)
+            fallback (callable): Creates the direct, rate-limited exchange client to use while
+                the hub is down (None to raise ccxt.NetworkError instead)
+            max_failures (int): Failed connection attempts in a row before falling back
+            backoff_seconds (float): Wait before the first reconnect attempt, doubled on each failure
+            max_backoff_seconds (float): Longest wait between reconnect attempts
+        """
+        self.name = "MEXC (market data hub)"
+        self.address = address
+        self.authkey = authkey
+        self.fallback = fallback
+        self.max_failures = max_failures
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+
+        self._conn = Client(address, authkey=authkey)
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.next_attempt = 0.0
+        self.direct = None
+
+    def _disconnect(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+
+    def _connection_failed(self, error):
+        self._disconnect()
+        self.failures += 1
+        delay = min(self.backoff_seconds * 2 ** (self.failures - 1), self.max_backoff_seconds)
+        self.next_attempt = time.monotonic() + delay
+        logger.warning(f"Market data hub unavailable ({type(error).__name__}: {error}), "
+                       f"retrying in {delay:.0f}s")
+
+    def _request(self, method, args, kwargs):
+        """Send one request to the hub, returns None if the hub can't be reached"""
+        # A connection that was up may just be stale after a hub restart, so reconnect once right away
+        attempts = 2 if self._conn is not None else 1
+        for _ in range(attempts):
+            if self._conn is None:
+                if time.monotonic() < self.next_attempt:
+                    return None
+                try:
+                    self._conn = Client(self.address, authkey=self.authkey)
+                except (OSError, EOFError, AuthenticationError) as e:
+                    self._connection_failed(e)
+                    return None
+                logger.info(f"Reconnected to market data hub at {self.address}")
+
+            try:
+                self._conn.send({'method': method, 'args': list(args), 'kwargs': kwargs})
+                response = self._conn.recv()
+            except (OSError, EOFError) as e:
+                self._disconnect()
+                error = e
+                continue
+
+            if self.failures:
+                logger.info("Market data hub is back, no longer using the direct exchange client")
+            self.failures = 0
+            return response
+
+        self._connection_failed(error)
+        return None
+
+    def _call(self, method, *args, **kwargs):
+        with self._lock:
+            response = self._request(method, args, kwargs)
+            if response is None and self.fallback is not None and self.failures >= self.max_failures:
+                if self.direct is None:
+                    logger.warning("Market data hub is down, using the direct exchange client")
+                    self.direct = self.fallback()
+                direct = self.direct
+            else:
+                direct = None
+
+        if response is None:
+            if direct is None:
+                raise ccxt.NetworkError(f"Market data hub at {self.address} is unavailable")
+            return getattr(direct, method)(*args, **kwargs)
+
+        if response['ok']:
+            return response['result']
+
+        # Re-raise as the matching ccxt error so callers' except clauses keep working
+        error_class = getattr(ccxt, response.get('type', ''), None)
+        if not (isinstance(error_class, type) and issubclass(error_class, Exception)):
+            error_class = ccxt.ExchangeError
+        raise error_class(response['error'])
+
+    def fetch_ticker(self, symbol):
+        return self._call('fetch_ticker', symbol)
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None):
+        return self._call('fetch_ohlcv', symbol, timeframe, since=since, limit=limit)
+
+    def fetch_order_book(self, symbol, limit=None):
+        return self._call('fetch_order_book', symbol, limit=limit)
+
+    def fetch_time(self):
+        return self._call('fetch_time')
+
+    def load_markets(self, reload=False):
+        return self._call('load_markets')
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+
+def _create_direct_client(config):
+    # Imported here, exchange_connector imports this module
+    from exchange_connector import create_exchange_client
+    return create_exchange_client(config)
+
+
+def connect_market_data(config):
+    """
+    Connect to the local market data hub if one is running
+
+    Args:
+        config (dict): Bot configuration
+
+    Returns:
+        MarketDataClient: Connected client, or None if the hub is disabled or not running
+    """
+    hub_config = config.get("market_data_hub", {})
+    if not hub_config.get("enabled", True):
+        return None
+    if config.get("exchange", {}).get("name", "mexc").lower() == "mock":
+        return None  # Offline runs must never see live data
+
+    try:
+        authkey = get_hub_authkey(config)
+        if authkey is None:
+            return None  # The hub has never run here
+        client = MarketDataClient(
+            get_hub_address(config), authkey,
+            fallback=lambda: _create_direct_client(config),
+            max_failures=hub_config.get("max_failures_before_fallback", 3),
+            backoff_seconds=hub_config.get("reconnect_backoff_seconds", 1.0),
+            max_backoff_seconds=hub_config.get("max_reconnect_backoff_seconds", 30.0)
+        )
+        logger.info(f"Using market data hub at {client.address}")
+        return client
+    except PermissionError as e:
+        logger.warning(f"Not using the market data hub: {str(e)}")
+        return None
+    except AuthenticationError:
+        logger.warning("Market data hub rejected our key, connecting to the exchange directly")
+        return None
+    except (OSError, EOFError, ValueError):
+        return None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    with open("config.json", 'r') as f:
+        hub_config = json.load(f)
+
+    hub = MarketDataHub(hub_config)
+    try:
+        hub.serve_forever()
+    except KeyboardInterrupt:
+        hub.stop()
+        logger.info(f"Market data hub stopped. Stats: {hub.stats}")
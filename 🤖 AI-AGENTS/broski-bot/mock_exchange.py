@@ -0,0 +1,461 @@
+import json
+import time
+import logging
+import argparse
+from collections import Counter
+import numpy as np
+import ccxt
+from candle_store import CandleStore, timeframe_to_ms
+from resampler import resample_ohlcv
+from ticker_cache import TickerCache
+
+logger = logging.getLogger("BROski.MockExchange")
+
+
+def generate_candles(count=5000, timeframe='1m', start_price=1.0, volatility=0.002, seed=42, end_time=None):
+    """
+    Generate a reproducible random-walk candle series for tests and benchmarks
+
+    Returns:
+        np.ndarray: (count, 6) array of [timestamp, open, high, low, close, volume]
+    """
+    rng = np.random.default_rng(seed)
+    period = timeframe_to_ms(timeframe)
+    end_time = end_time or int(time.time() * 1000) // period * period
+    timestamps = end_time - period * np.arange(count - 1, -1, -1)
+
+    closes = start_price * np.exp(np.cumsum(rng.normal(0, volatility, count)))
+    opens = np.concatenate(([start_price], closes[:-1]))
+    spread = np.abs(rng.normal(0, volatility / 2, count)) * closes
+    highs = np.maximum(opens, closes) + spread
+    lows = np.minimum(opens, closes) - spread
+    volumes = rng.uniform(100, 1000, count)
+
+    return np.column_stack([timestamps, opens, highs, lows, closes, volumes]).astype(np.float64)
+
+
+class MockExchange:
+    """
+    Offline stand-in for the ccxt MEXC client.
+
+    Replays recorded candles (from a fixture file or the candle store) on a
+    simulated clock, derives tickers and order books from them, fills orders
+    against the replayed price and counts every call. Implements the subset of
+    the ccxt interface the bot uses, so it can be passed anywhere a ccxt client is.
+    """
+
+    def __init__(self, candles, speed=1.0, latency_ms=0, start_time=None, balances=None,
+                 fee_rate=0.001, spread=0.0005, slippage=0.0):
+        """
+        Initialize the mock exchange
+
+        Args:
+            candles (dict): (symbol, timeframe) -> (N, 6) candle array to replay
+            speed (float): Simulated seconds per real second, 0 to only move the clock with advance()
+            latency_ms (float): Delay added to every call
+            start_time (int): Simulated start time in ms (defaults to 500 candles into the data)
+            balances (dict): Starting free balance per currency
+            fee_rate (float): Trading fee as a fraction of the order cost
+            spread (float): Bid/ask distance from the last price as a fraction
+            slippage (float): Extra price impact applied to market orders as a fraction
+        """
+        self.id = 'mock'
+        self.name = 'MEXC (mock)'
+        self.rateLimit = 1
+        self.candles = {key: np.asarray(value, dtype=np.float64) for key, value in candles.items()}
+        self.speed = speed
+        self.latency = latency_ms / 1000
+        self.fee_rate = fee_rate
+        self.spread = spread
+        self.slippage = slippage
+
+        self.balances = {currency: float(amount) for currency, amount in (balances or {'USDT': 1000.0}).items()}
+        self.used = {}
+        self.orders = {}
+        self.order_counter = 0
+        self.call_counts = Counter()
+        self.markets = None
+
+        if start_time is None:
+            base = self.candles[self._base_key(next(iter(self.candles))[0])]
+            start_time = int(base[min(500, len(base) - 1), 0])
+        self.sim_start = int(start_time)
+        self.wall_start = time.monotonic()
+        self.offset_ms = 0
+
+    @classmethod
+    def from_fixture(cls, path, **kwargs):
+        """Create a mock exchange replaying a fixture saved with save_fixture"""
+        with np.load(path) as fixture:
+            keys = json.loads(str(fixture['keys']))
+            candles = {(symbol, timeframe): fixture[name] for name, (symbol, timeframe) in keys.items()}
+        return cls(candles, **kwargs)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create a mock exchange from the exchange.mock section of config.json
+
+        Replays the fixture file if one is configured, otherwise the candles already
+        in the candle store, otherwise generated candles for the configured pair.
+        """
+        mock_config = config.get('exchange', {}).get('mock', {})
+        options = {
+            'speed': mock_config.get('speed', 1.0),
+            'latency_ms': mock_config.get('latency_ms', 0),
+            'balances': mock_config.get('balances'),
+            'fee_rate': mock_config.get('fee_rate', 0.001),
+            'slippage': mock_config.get('slippage', 0.0),
+        }
+
+        if mock_config.get('fixture'):
+            return cls.from_fixture(mock_config['fixture'], **options)
+
+        trading = config.get('trading', {})
+        symbol = f"{trading.get('base_symbol', 'PI')}/{trading.get('quote_symbol', 'USDT')}"
+        timeframe = mock_config.get('timeframe', '1m')
+
+        store = CandleStore(mock_config.get('candle_store_dir', 'data/candles'))
+        columns = store.read(symbol, timeframe)
+        if len(columns['timestamp']):
+            candles = np.column_stack([np.asarray(columns[c], dtype=np.float64)
+                                       for c in ('timestamp', 'open', 'high', 'low', 'close', 'volume')])
+        else:
+            candles = generate_candles(timeframe=timeframe, seed=mock_config.get('seed', 42))
+        return cls({(symbol, timeframe): candles}, **options)
+
+    @staticmethod
+    def save_fixture(path, candle_store, symbols, timeframes):
+        """
+        Record candles from the candle store into a fixture file
+
+        Args:
+            path (str): Output .npz file
+            candle_store (CandleStore): Source of the candles
+            symbols (list): Trading pairs to record
+            timeframes (list): Timeframes to record
+        """
+        arrays, keys = {}, {}
+        for symbol in symbols:
+            for timeframe in timeframes:
+                columns = candle_store.read(symbol, timeframe)
+                name = f"{symbol.replace('/', '_')}__{timeframe}"
+                arrays[name] = np.column_stack([np.asarray(columns[c], dtype=np.float64)
+                                                for c in ('timestamp', 'open', 'high', 'low', 'close', 'volume')])
+                keys[name] = [symbol, timeframe]
+        np.savez_compressed(path, keys=json.dumps(keys), **arrays)
+
+    # Simulated clock
+
+    def now(self):
+        """Current simulated time in ms"""
+        return self.sim_start + self.offset_ms + int((time.monotonic() - self.wall_start) * 1000 * self.speed)
+
+    def milliseconds(self):
+        """Simulated time, same name as ccxt's clock helper"""
+        return self.now()
+
+    def advance(self, seconds):
+        """Move the simulated clock forward"""
+        self.offset_ms += int(seconds * 1000)
+        self._match_orders()
+
+    def _call(self, method):
+        self.call_counts[method] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _base_key(self, symbol):
+        keys = [key for key in self.candles if key[0] == symbol]
+        if not keys:
+            raise ValueError(f"No recorded candles for {symbol}")
+        return min(keys, key=lambda key: timeframe_to_ms(key[1]))
+
+    def _series(self, symbol, timeframe):
+        """Candles for a timeframe, resampled from the finest recorded one if needed"""
+        if (symbol, timeframe) not in self.candles:
+            base = self.candles[self._base_key(symbol)]
+            columns = dict(zip(('timestamp', 'open', 'high', 'low', 'close', 'volume'), base.T))
+            columns['timestamp'] = base[:, 0].astype(np.int64)
+            self.candles[(symbol, timeframe)] = resample_ohlcv(columns, timeframe)
+        return self.candles[(symbol, timeframe)]
+
+    def _price_index(self, symbol):
+        """Row of the base candle trading at the simulated time"""
+        base = self.candles[self._base_key(symbol)]
+        return max(int(np.searchsorted(base[:, 0], self.now(), side='right')) - 1, 0)
+
+    def _last_price(self, symbol, index=None):
+        base = self.candles[self._base_key(symbol)]
+        return float(base[self._price_index(symbol) if index is None else index, 4])
+
+    def _book_levels(self, symbol, index, depth):
+        """Bid and ask levels around the close of base candle `index`, as {price: size}"""
+        last = self._last_price(symbol, index)
+        levels = np.arange(1, depth + 1)
+        return ({last * (1 - self.spread * i): 100.0 * i for i in levels},
+                {last * (1 + self.spread * i): 100.0 * i for i in levels})
+
+    # Market data
+
+    def fetch_time(self):
+        self._call('fetch_time')
+        return self.now()
+
+    def load_markets(self, reload=False):
+        self._call('load_markets')
+        if self.markets is None or reload:
+            self.markets = {}
+            for symbol in {key[0] for key in self.candles}:
+                base, quote = symbol.split('/')
+                self.markets[symbol] = {
+                    'id': symbol.replace('/', ''), 'symbol': symbol, 'base': base, 'quote': quote,
+                    'active': True, 'precision': {'amount': 2, 'price': 6},
+                    'limits': {'amount': {'min': 0.01, 'max': None}, 'price': {'min': None, 'max': None},
+                               'cost': {'min': 1.0, 'max': None}}
+                }
+        return self.markets
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = markets
+
+    def set_sandbox_mode(self, enabled):
+        pass
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params=None):
+        self._call('fetch_ohlcv')
+        candles = self._series(symbol, timeframe)
+        end = int(np.searchsorted(candles[:, 0], self.now(), side='right'))
+        start = int(np.searchsorted(candles[:, 0], since, side='left')) if since is not None else 0
+        limit = limit or 500
+        if since is None:
+            start = max(end - limit, 0)
+        rows = candles[start:min(end, start + limit)].copy()
+
+        # A derived candle still forming at the simulated time must not contain later base candles
+        base_key = self._base_key(symbol)
+        if len(rows) and timeframe != base_key[1] and rows[-1, 0] + timeframe_to_ms(timeframe) > self.now():
+            base = self.candles[base_key]
+            inside = base[(base[:, 0] >= rows[-1, 0]) & (base[:, 0] <= self.now())]
+            rows[-1, 1:] = [inside[0, 1], inside[:, 2].max(), inside[:, 3].min(), inside[-1, 4], inside[:, 5].sum()]
+
+        return [[int(row[0])] + row[1:].tolist() for row in rows]
+
+    def fetch_ticker(self, symbol, params=None):
+        self._call('fetch_ticker')
+        self._match_orders()
+        last = self._last_price(symbol)
+        return {
+            'symbol': symbol, 'timestamp': self.now(), 'last': last, 'close': last,
+            'bid': last * (1 - self.spread), 'ask': last * (1 + self.spread)
+        }
+
+    def fetch_order_book(self, symbol, limit=None, params=None):
+        self._call('fetch_order_book')
+        # The book changes with every base candle, whose row number serves as the update sequence
+        index = self._price_index(symbol)
+        bids, asks = self._book_levels(symbol, index, limit or 20)
+        return {
+            'symbol': symbol, 'timestamp': self.now(), 'nonce': index,
+            'bids': [list(level) for level in bids.items()],
+            'asks': [list(level) for level in asks.items()],
+        }
+
+    def fetch_order_book_deltas(self, symbol, since, limit=None, params=None):
+        """
+        Level updates that turn the book at nonce `since` into the current one
+
+        Stands in for an exchange's depth update stream, so the local order book
+        can be kept current incrementally when replaying and in tests.
+
+        Returns:
+            dict: previous_nonce, nonce and the changed 'bids'/'asks' levels, size 0 removes a level
+        """
+        self._call('fetch_order_book_deltas')
+        index = self._price_index(symbol)
+        update = {'symbol': symbol, 'timestamp': self.now(), 'previous_nonce': since, 'nonce': index,
+                  'bids': [], 'asks': []}
+        if since == index:
+            return update
+
+        depth = limit or 20
+        for side, old, new in zip(('bids', 'asks'), self._book_levels(symbol, since, depth),
+                                  self._book_levels(symbol, index, depth)):
+            update[side] = ([[price, 0.0] for price in old if price not in new]
+                            + [[price, size] for price, size in new.items() if old.get(price) != size])
+        return update
+
+    # Account and orders
+
+    def fetch_balance(self, params=None):
+        self._call('fetch_balance')
+        currencies = set(self.balances) | set(self.used)
+        balance = {'free': {}, 'used': {}, 'total': {}}
+        for currency in currencies:
+            free, used = self.balances.get(currency, 0.0), self.used.get(currency, 0.0)
+            balance[currency] = {'free': free, 'used': used, 'total': free + used}
+            balance['free'][currency], balance['used'][currency], balance['total'][currency] = free, used, free + used
+        return balance
+
+    def _fill(self, order, price):
+        base, quote = order['symbol'].split('/')
+        cost = order['amount'] * price
+        fee = cost * self.fee_rate
+
+        if order['side'] == 'buy':
+            self.used[quote] = self.used.get(quote, 0.0) - order['reserved']
+            self.balances[quote] = self.balances.get(quote, 0.0) + order['reserved'] - cost - fee
+            self.balances[base] = self.balances.get(base, 0.0) + order['amount']
+        else:
+            self.used[base] = self.used.get(base, 0.0) - order['reserved']
+            self.balances[quote] = self.balances.get(quote, 0.0) + cost - fee
+            self.balances[base] = self.balances.get(base, 0.0) + order['reserved'] - order['amount']
+
+        order.update({'status': 'closed', 'filled': order['amount'], 'remaining': 0.0, 'price': price,
+                      'average': price, 'cost': cost, 'fee': {'currency': quote, 'cost': fee}})
+
+    def _match_orders(self):
+        """Fill open limit orders the replayed price has crossed"""
+        for order in self.orders.values():
+            if order['status'] != 'open':
+                continue
+            last = self._last_price(order['symbol'])
+            if (order['side'] == 'buy' and last <= order['price']) or (order['side'] == 'sell' and last >= order['price']):
+                self._fill(order, order['price'])
+
+    def create_order(self, symbol, type, side, amount, price=None, params=None):
+        self._call('create_order')
+
+        base, quote = symbol.split('/')
+        last = self._last_price(symbol)
+        fill_price = last * (1 + self.slippage) if side == 'buy' else last * (1 - self.slippage)
+        order_price = price if type == 'limit' else fill_price
+
+        # Reserve funds like the exchange would
+        if side == 'buy':
+            reserved = amount * order_price * (1 + self.fee_rate)
+            currency = quote
+        else:
+            reserved = amount
+            currency = base
+        if self.balances.get(currency, 0.0) < reserved:
+            raise ccxt.InsufficientFunds(f"mock: insufficient {currency} balance")
+        self.balances[currency] -= reserved
+        self.used[currency] = self.used.get(currency, 0.0) + reserved
+
+        self.order_counter += 1
+        order = {
+            'id': f"mock-{self.order_counter}", 'symbol': symbol, 'type': type, 'side': side,
+            'amount': amount, 'price': order_price, 'status': 'open', 'filled': 0.0, 'remaining': amount,
+            'timestamp': self.now(), 'reserved': reserved, 'info': {}
+        }
+        self.orders[order['id']] = order
+
+        if type == 'market':
+            self._fill(order, fill_price)
+        else:
+            self._match_orders()
+        return dict(order)
+
+    def create_market_buy_order(self, symbol, amount, params=None):
+        return self.create_order(symbol, 'market', 'buy', amount)
+
+    def create_market_sell_order(self, symbol, amount, params=None):
+        return self.create_order(symbol, 'market', 'sell', amount)
+
+    def create_limit_buy_order(self, symbol, amount, price, params=None):
+        return self.create_order(symbol, 'limit', 'buy', amount, price)
+
+    def create_limit_sell_order(self, symbol, amount, price, params=None):
+        return self.create_order(symbol, 'limit', 'sell', amount, price)
+
+    def fetch_order(self, id, symbol=None, params=None):
+        self._call('fetch_order')
+        return dict(self.orders[id])
+
+    def fetch_open_orders(self, symbol=None, since=None, limit=None, params=None):
+        self._call('fetch_open_orders')
+        self._match_orders()
+        return [dict(order) for order in self.orders.values()
+                if order['status'] == 'open' and (symbol is None or order['symbol'] == symbol)]
+
+    def cancel_order(self, id, symbol=None, params=None):
+        self._call('cancel_order')
+        order = self.orders[id]
+        if order['status'] == 'open':
+            base, quote = order['symbol'].split('/')
+            currency = quote if order['side'] == 'buy' else base
+            self.used[currency] -= order['reserved']
+            self.balances[currency] += order['reserved']
+            order['status'] = 'canceled'
+        return dict(order)
+
+    def cancel_all_orders(self, symbol=None, params=None):
+        self._call('cancel_all_orders')
+        return [self.cancel_order(order['id']) for order in list(self.orders.values())
+                if order['status'] == 'open' and (symbol is None or order['symbol'] == symbol)]
+
+    def close(self):
+        pass
+
+
+def benchmark(config, cycles=100, cycle_seconds=60):
+    """
+    Run DataFetcher cycles against the mock exchange on a manually advanced clock
+
+    Call volume depends only on the config and the number of cycles, so it is
+    reproducible between runs and machines.
+
+    Returns:
+        dict: Cycle latency statistics and API calls per method
+    """
+    from data_fetcher import DataFetcher
+
+    config = json.loads(json.dumps(config))
+    config.setdefault('exchange', {})['name'] = 'mock'
+    config['exchange'].setdefault('mock', {})['speed'] = 0
+    config.setdefault('market_data', {})['async_engine'] = False
+    config['market_data'].setdefault('candle_store_dir', 'data/mock_candles')
+
+    exchange = MockExchange.from_config(config)
+    clock = lambda: exchange.now() / 1000
+    # A private ticker cache on the simulated clock, so runs don't share tickers
+    ticker_cache = TickerCache(exchange.fetch_ticker, config['market_data'].get('ticker_ttl_seconds', 0.5), clock)
+    fetcher = DataFetcher(config, exchange=exchange, ticker_cache=ticker_cache)
+    fetcher.clock = clock
+
+    latencies = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        fetcher.get_latest_data()
+        latencies.append(time.perf_counter() - start)
+        exchange.advance(cycle_seconds)
+
+    latencies = np.array(latencies) * 1000
+    return {
+        'cycles': cycles,
+        'mean_ms': float(latencies.mean()),
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'max_ms': float(latencies.max()),
+        'api_calls': dict(exchange.call_counts),
+        'api_calls_per_cycle': sum(exchange.call_counts.values()) / cycles
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    parser = argparse.ArgumentParser(description='BROski Mock Exchange Benchmark')
+    parser.add_argument('--config', type=str, default='config.json', help='Config file to benchmark')
+    parser.add_argument('--cycles', type=int, default=100, help='Number of bot cycles to run')
+    parser.add_argument('--cycle-seconds', type=int, default=60, help='Simulated seconds between cycles')
+    parser.add_argument('--fixture', type=str, help='Fixture file to replay')
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        bench_config = json.load(f)
+    if args.fixture:
+        bench_config.setdefault('exchange', {}).setdefault('mock', {})['fixture'] = args.fixture
+
+    print(json.dumps(benchmark(bench_config, args.cycles, args.cycle_seconds), indent=2))
@@ -266,7 +266,8 @@ class MonitorLogger:
                 
                 # Apply optimization if significant improvement
                 if results.get('improvement', {}).get('pnl_increase', 0) > 5:
-                    if optimizer.update_strategy_config(results['optimized_params']):
+                    if optimizer.update_strategy_config(results['optimized_params'], workers=results.get('workers'),
+                                                        method=results.get('method')):
                         self.log(f"✅ Applied optimized parameters to config")
                         return True
             
@@ -0,0 +1,235 @@
+import time
+import logging
+import numpy as np
+
+logger = logging.getLogger("BROski.OrderBook")
+
+
+class _BookSide:
+    """
+    One side of the book as price-sorted numpy arrays (ascending price).
+
+    Cumulative size and notional are rebuilt lazily after changes, so depth and
+    VWAP queries are a binary search over them.
+    """
+
+    def __init__(self):
+        self.prices = np.empty(0)
+        self.sizes = np.empty(0)
+        self._cum_size = None
+        self._cum_notional = None
+
+    def load(self, levels):
+        # Levels may carry extra fields (e.g. order count), only price and size are kept
+        if len(levels):
+            levels = np.asarray(levels, dtype=np.float64).reshape(len(levels), -1)[:, :2]
+        else:
+            levels = np.empty((0, 2))
+        levels = levels[levels[:, 1] > 0]
+        order = np.argsort(levels[:, 0], kind='stable')
+        self.prices = levels[order, 0].copy()
+        self.sizes = levels[order, 1].copy()
+        self._cum_size = None
+
+    def set(self, price, size):
+        """Set the size at a price level, 0 removes the level"""
+        index = int(np.searchsorted(self.prices, price))
+        exists = index < len(self.prices) and self.prices[index] == price
+
+        if size <= 0:
+            if exists:
+                self.prices = np.delete(self.prices, index)
+                self.sizes = np.delete(self.sizes, index)
+        elif exists:
+            self.sizes[index] = size
+        else:
+            self.prices = np.insert(self.prices, index, price)
+            self.sizes = np.insert(self.sizes, index, size)
+        self._cum_size = None
+
+    def cumulative(self, best_first_reversed):
+        """Cumulative size and notional walking away from the best price"""
+        if self._cum_size is None:
+            prices, sizes = self.prices, self.sizes
+            if best_first_reversed:
+                prices, sizes = prices[::-1], sizes[::-1]
+            self._cum_size = np.cumsum(sizes)
+            self._cum_notional = np.cumsum(prices * sizes)
+        return self._cum_size, self._cum_notional
+
+
+class LocalOrderBook:
+    """
+    Locally maintained order book for one symbol.
+
+    Seeded from a REST snapshot and answers best price, depth and fill estimate
+    queries from sorted arrays. Level updates are applied with apply_deltas;
+    DataFetcher feeds them from the exchange client's update feed when it has
+    one (the mock exchange does) and otherwise re-seeds the book from a new
+    snapshot when it gets old.
+    """
+
+    def __init__(self, symbol, clock=time.time):
+        """
+        Initialize an empty order book
+
+        Args:
+            symbol (str): Trading pair in format BASE/QUOTE
+            clock (callable): Time source in seconds (replaced by the simulated clock when replaying)
+        """
+        self.symbol = symbol
+        self.clock = clock
+        self.bids = _BookSide()
+        self.asks = _BookSide()
+        self.nonce = None
+        self.timestamp = None
+        self.updated_at = 0
+
+    def apply_snapshot(self, order_book):
+        """
+        Replace the book with a full snapshot
+
+        Args:
+            order_book (dict): ccxt order book with 'bids' and 'asks' as [[price, size], ...]
+        """
+        self.bids.load(order_book.get('bids', []))
+        self.asks.load(order_book.get('asks', []))
+        self.nonce = order_book.get('nonce')
+        self.timestamp = order_book.get('timestamp')
+        self.updated_at = self.clock()
+
+    def apply_deltas(self, bids=(), asks=(), nonce=None, timestamp=None):
+        """
+        Apply level updates
+
+        Args:
+            bids (list): [[price, size, ...], ...] for the bid side, size 0 removes the level
+            asks (list): [[price, size, ...], ...] for the ask side, size 0 removes the level
+            nonce (int): Update sequence number; updates older than the book are ignored
+
+        Returns:
+            bool: False if the update was stale and ignored
+        """
+        if nonce is not None and self.nonce is not None and nonce <= self.nonce:
+            logger.debug(f"Ignoring stale {self.symbol} update {nonce} (book at {self.nonce})")
+            return False
+
+        for level in bids:
+            self.bids.set(float(level[0]), float(level[1]))
+        for level in asks:
+            self.asks.set(float(level[0]), float(level[1]))
+
+        if nonce is not None:
+            self.nonce = nonce
+        self.timestamp = timestamp or self.timestamp
+        self.updated_at = self.clock()
+        return True
+
+    def age(self):
+        """Seconds since the book was last updated"""
+        return self.clock() - self.updated_at
+
+    def best_bid(self):
+        """Highest bid as (price, size), or None if the side is empty"""
+        if len(self.bids.prices) == 0:
+            return None
+        return float(self.bids.prices[-1]), float(self.bids.sizes[-1])
+
+    def best_ask(self):
+        """Lowest ask as (price, size), or None if the side is empty"""
+        if len(self.asks.prices) == 0:
+            return None
+        return float(self.asks.prices[0]), float(self.asks.sizes[0])
+
+    def mid_price(self):
+        """Midpoint between best bid and best ask"""
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread_percentage(self):
+        """Bid/ask spread as a percentage of the mid price"""
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (ask[0] - bid[0]) / ((ask[0] + bid[0]) / 2) * 100
+
+    def depth_at(self, side, price):
+        """
+        Total size available at prices at least as good as `price`
+
+        Args:
+            side (str): 'bids' or 'asks'
+            price (float): Price limit
+
+        Returns:
+            float: Cumulative size from the best price up to and including `price`
+        """
+        if side == 'bids':
+            # Bids at or above the price, i.e. from the top of the ascending array
+            cum_size, _ = self.bids.cumulative(best_first_reversed=True)
+            count = len(self.bids.prices) - int(np.searchsorted(self.bids.prices, price, side='left'))
+        else:
+            cum_size, _ = self.asks.cumulative(best_first_reversed=False)
+            count = int(np.searchsorted(self.asks.prices, price, side='right'))
+        return float(cum_size[count - 1]) if count > 0 else 0.0
+
+    def vwap_to_size(self, side, size):
+        """
+        Average fill price for a market order of `size`
+
+        Args:
+            side (str): 'buy' (walks the asks) or 'sell' (walks the bids)
+            size (float): Order size in base currency
+
+        Returns:
+            float: Volume-weighted average price, or None if the book is too thin
+        """
+        if side == 'buy':
+            book, reverse = self.asks, False
+        else:
+            book, reverse = self.bids, True
+        if size <= 0 or len(book.prices) == 0:
+            return None
+
+        cum_size, cum_notional = book.cumulative(best_first_reversed=reverse)
+        index = int(np.searchsorted(cum_size, size, side='left'))
+        if index >= len(cum_size):
+            return None
+
+        prices = book.prices[::-1] if reverse else book.prices
+        filled_before = cum_size[index - 1] if index else 0.0
+        notional_before = cum_notional[index - 1] if index else 0.0
+        notional = notional_before + (size - filled_before) * prices[index]
+        return float(notional / size)
+
+    def slippage_percentage(self, side, size):
+        """Expected slippage of a market order versus the best price, in percent"""
+        best = self.best_ask() if side == 'buy' else self.best_bid()
+        vwap = self.vwap_to_size(side, size)
+        if best is None or vwap is None:
+            return None
+        return abs(vwap - best[0]) / best[0] * 100
+
+    def to_ccxt(self, limit=None):
+        """
+        Export the book in ccxt's order book format
+
+        Args:
+            limit (int): Number of levels per side
+
+        Returns:
+            dict: {'symbol', 'bids', 'asks', 'timestamp', 'nonce'} with bids best first
+        """
+        bids = np.column_stack([self.bids.prices[::-1], self.bids.sizes[::-1]])
+        asks = np.column_stack([self.asks.prices, self.asks.sizes])
+        if limit is not None:
+            bids, asks = bids[:limit], asks[:limit]
+        return {
+            'symbol': self.symbol,
+            'bids': bids.tolist(),
+            'asks': asks.tolist(),
+            'timestamp': self.timestamp,
+            'nonce': self.nonce
+        }
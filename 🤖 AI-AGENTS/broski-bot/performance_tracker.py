@@ -80,8 +80,9 @@ class PerformanceTracker:
         }
         
         # Create logs directory if it doesn't exist
-        if not os.path.exists('logs'):
-            os.makedirs('logs')
+        self.log_directory = config.get('logging', {}).get('log_directory', 'logs')
+        if not os.path.exists(self.log_directory):
+            os.makedirs(self.log_directory)
         
         # Load any existing trade history
         self._load_trades()
@@ -91,7 +92,7 @@ class PerformanceTracker:
     def _load_trades(self):
         """Load trades from file if it exists"""
         try:
-            trade_file = os.path.join('logs', 'trade_history.json')
+            trade_file = os.path.join(self.log_directory, 'trade_history.json')
             if os.path.exists(trade_file):
                 with open(trade_file, 'r') as f:
                     self.trades = json.load(f)
@@ -108,7 +109,7 @@ class PerformanceTracker:
     def _save_trades(self):
         """Save trades to file"""
         try:
-            trade_file = os.path.join('logs', 'trade_history.json')
+            trade_file = os.path.join(self.log_directory, 'trade_history.json')
             with open(trade_file, 'w') as f:
                 json.dump(self.trades, f, indent=4)
             logger.debug("Trade history saved to file")
@@ -0,0 +1,342 @@
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger("BROski.RateLimiter")
+
+# Token cost of one call per endpoint class
+DEFAULT_WEIGHTS = {
+    'public': 1,    # Tickers, candles, order books, server time
+    'private': 2,   # Balances, open orders, account info
+    'order': 1,     # Placing and cancelling orders
+}
+
+# Lower number wins when several callers are waiting for tokens
+PRIORITIES = {
+    'order': 0,
+    'private': 1,
+    'public': 2,
+}
+
+# ccxt calls that need the account keys; other fetch_* calls are public market data
+PRIVATE_METHODS = {
+    'fetch_balance', 'fetch_order', 'fetch_orders', 'fetch_open_orders', 'fetch_closed_orders',
+    'fetch_my_trades', 'fetch_deposits', 'fetch_withdrawals', 'fetch_ledger',
+}
+ORDER_PREFIXES = ('create_', 'cancel_', 'edit_')
+
+
+def endpoint_for(method: str) -> Optional[str]:
+    """
+    Endpoint class of a ccxt method
+
+    Args:
+        method: ccxt method name (e.g. 'fetch_ticker')
+
+    Returns:
+        Optional[str]: 'public', 'private' or 'order', or None if the method makes no request
+    """
+    if method in PRIVATE_METHODS:
+        return 'private'
+    if method.startswith(ORDER_PREFIXES):
+        return 'order'
+    if method.startswith('fetch_') or method == 'load_markets':
+        return 'public'
+    return None
+
+
+class TokenBucketLimiter:
+    """
+    Weighted token-bucket rate limiter shared by everything talking to one exchange.
+
+    Tokens refill continuously at the exchange's published request rate and the
+    bucket holds up to `burst` tokens, so short bursts of cheap public calls go
+    through immediately instead of being spaced out. A slice of the bucket is
+    reserved for orders: other calls can't dig into it, and while an order is
+    waiting no lower-priority call is allowed to take tokens at all.
+    """
+
+    def __init__(self, rate_per_second: float = 10.0, burst: Optional[float] = None,
+                 weights: Optional[Dict[str, float]] = None, order_reserve: float = 0.2):
+        """
+        Initialize the limiter
+
+        Args:
+            rate_per_second: Tokens added per second
+            burst: Bucket capacity (defaults to one second of tokens)
+            weights: Token cost per endpoint class, merged over DEFAULT_WEIGHTS
+            order_reserve: Fraction of the bucket only orders may use
+
+        Raises:
+            ValueError: If the rate is not positive or the reserve is not a fraction below 1
+        """
+        if rate_per_second <= 0:
+            raise ValueError(f"rate_per_second must be positive, got {rate_per_second}")
+        if not 0 <= order_reserve < 1:
+            raise ValueError(f"order_reserve must be at least 0 and below 1, got {order_reserve}")
+
+        self.rate = float(rate_per_second)
+        self.capacity = float(burst if burst is not None else max(self.rate, 1.0))
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+
+        # Every call must fit above the order reserve, or it would wait forever
+        heaviest = max(self.weights.values())
+        needed = heaviest / (1 - order_reserve)
+        if self.capacity < needed:
+            logger.warning(f"Rate limit burst {self.capacity:g} leaves no room for a weight {heaviest:g} call "
+                           f"above the order reserve, raising it to {needed:g}")
+            self.capacity = needed
+        self.reserve = self.capacity * order_reserve
+
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.condition = threading.Condition()
+        self.waiting = {endpoint: 0 for endpoint in PRIORITIES}
+
+        self.metrics = {
+            endpoint: {'calls': 0, 'waited_calls': 0, 'total_wait': 0.0, 'max_wait': 0.0, 'last_wait': 0.0}
+            for endpoint in PRIORITIES
+        }
+
+    @classmethod
+    def from_exchange(cls, exchange, config: Optional[Dict[str, Any]] = None) -> "TokenBucketLimiter":
+        """
+        Create a limiter from a ccxt client's published rate limit
+
+        ccxt exposes `rateLimit` as the minimum milliseconds between requests.
+        Values in the exchange section's "rate_limit" config override it.
+
+        Args:
+            exchange: ccxt exchange client
+            config: Bot configuration
+
+        Returns:
+            TokenBucketLimiter: Configured limiter
+        """
+        limit_config = (config or {}).get('exchange', {}).get('rate_limit', {})
+
+        rate_limit_ms = getattr(exchange, 'rateLimit', None) or 100
+        rate = limit_config.get('requests_per_second', 1000.0 / rate_limit_ms)
+
+        return cls(
+            rate_per_second=rate,
+            burst=limit_config.get('burst'),
+            weights=limit_config.get('weights'),
+            order_reserve=limit_config.get('order_reserve', 0.2)
+        )
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def _blocked_by_priority(self, endpoint):
+        priority = PRIORITIES.get(endpoint, PRIORITIES['public'])
+        return any(count and PRIORITIES[other] < priority for other, count in self.waiting.items())
+
+    def _floor(self, endpoint):
+        # Orders may drain the whole bucket, everything else stops at the reserve
+        return 0.0 if endpoint == 'order' else self.reserve
+
+    def _available(self, endpoint):
+        return self.tokens - self._floor(endpoint)
+
+    def _cost(self, endpoint, weight):
+        cost = weight if weight is not None else self.weights.get(endpoint, 1)
+        # A call heavier than the usable bucket waits for a full bucket instead of forever
+        return min(cost, self.capacity - self._floor(endpoint))
+
+    def try_acquire(self, endpoint: str = 'public', weight: Optional[float] = None) -> bool:
+        """
+        Take tokens if they are available right now, without waiting
+
+        Args:
+            endpoint: Endpoint class ('public', 'private' or 'order')
+            weight: Token cost, defaults to the endpoint class weight
+
+        Returns:
+            bool: True if the call may proceed
+        """
+        if endpoint not in PRIORITIES:
+            endpoint = 'public'
+        cost = self._cost(endpoint, weight)
+        with self.condition:
+            self._refill()
+            if self._blocked_by_priority(endpoint) or self._available(endpoint) < cost:
+                return False
+            self.tokens -= cost
+            self._record(endpoint, 0.0)
+            return True
+
+    def acquire(self, endpoint: str = 'public', weight: Optional[float] = None) -> float:
+        """
+        Wait until tokens are available and take them
+
+        Args:
+            endpoint: Endpoint class ('public', 'private' or 'order')
+            weight: Token cost, defaults to the endpoint class weight
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        if endpoint not in PRIORITIES:
+            endpoint = 'public'
+        cost = self._cost(endpoint, weight)
+        start = time.monotonic()
+        waited = False
+
+        with self.condition:
+            self.waiting[endpoint] += 1
+            try:
+                while True:
+                    self._refill()
+                    shortfall = cost - self._available(endpoint)
+                    if not self._blocked_by_priority(endpoint) and shortfall <= 0:
+                        break
+                    # Sleep until enough tokens should have refilled (or a higher-priority caller is done)
+                    waited = True
+                    self.condition.wait(timeout=max(shortfall, 0.0) / self.rate or 0.01)
+
+                self.tokens -= cost
+            finally:
+                self.waiting[endpoint] -= 1
+                self.condition.notify_all()
+
+            wait = time.monotonic() - start if waited else 0.0
+            self._record(endpoint, wait)
+
+        if wait > 1.0:
+            logger.debug(f"Waited {wait:.2f}s for rate limit ({endpoint})")
+        return wait
+
+    async def acquire_async(self, endpoint: str = 'public', weight: Optional[float] = None) -> float:
+        """asyncio variant of acquire that never blocks the event loop"""
+        import asyncio
+
+        if endpoint not in PRIORITIES:
+            endpoint = 'public'
+        cost = self._cost(endpoint, weight)
+        start = time.monotonic()
+        waited = False
+
+        while True:
+            with self.condition:
+                self._refill()
+                shortfall = cost - self._available(endpoint)
+                if not self._blocked_by_priority(endpoint) and shortfall <= 0:
+                    self.tokens -= cost
+                    wait = time.monotonic() - start if waited else 0.0
+                    self._record(endpoint, wait)
+                    return wait
+            waited = True
+            await asyncio.sleep(max(shortfall / self.rate, 0.005))
+
+    def _record(self, endpoint, wait):
+        stats = self.metrics[endpoint]
+        stats['calls'] += 1
+        stats['last_wait'] = wait
+        if wait > 0:
+            stats['waited_calls'] += 1
+            stats['total_wait'] += wait
+            stats['max_wait'] = max(stats['max_wait'], wait)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get wait-time metrics per endpoint class
+
+        Returns:
+            Dict[str, Any]: Calls, waits and average wait per endpoint plus bucket state
+        """
+        with self.condition:
+            self._refill()
+            endpoints = {}
+            for endpoint, stats in self.metrics.items():
+                endpoints[endpoint] = {
+                    **stats,
+                    'avg_wait': stats['total_wait'] / stats['calls'] if stats['calls'] else 0.0
+                }
+            return {
+                'rate_per_second': self.rate,
+                'capacity': self.capacity,
+                'tokens': round(self.tokens, 3),
+                'waiting': dict(self.waiting),
+                'endpoints': endpoints
+            }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str, exchange=None, config: Optional[Dict[str, Any]] = None) -> TokenBucketLimiter:
+    """
+    Get the limiter shared by every client of one exchange in this process
+
+    Args:
+        name: Exchange name (e.g. 'mexc')
+        exchange: ccxt client used to read the published rate limit on first use
+        config: Bot configuration
+
+    Returns:
+        TokenBucketLimiter: Shared limiter
+    """
+    with _limiters_lock:
+        if name not in _limiters:
+            if exchange is not None:
+                _limiters[name] = TokenBucketLimiter.from_exchange(exchange, config)
+            else:
+                _limiters[name] = TokenBucketLimiter()
+            limiter = _limiters[name]
+            logger.info(f"Rate limiter for {name}: {limiter.rate:.1f} tokens/s, burst {limiter.capacity:.0f}")
+        return _limiters[name]
+
+
+class RateLimitedClient:
+    """
+    A ccxt client whose API calls wait for the shared limiter first
+
+    Clients created outside ExchangeConnector are wrapped in this so they share
+    its token bucket instead of throttling themselves with ccxt's enableRateLimit.
+    Attributes and helpers that make no request (markets, amount_to_precision, ...)
+    pass straight through to the wrapped client.
+    """
+
+    def __init__(self, exchange, limiter: TokenBucketLimiter):
+        """
+        Args:
+            exchange: ccxt client, created with enableRateLimit off
+            limiter: Limiter shared with the other clients of the exchange
+        """
+        object.__setattr__(self, 'client', exchange)
+        object.__setattr__(self, 'limiter', limiter)
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        endpoint = endpoint_for(name)
+        if endpoint is None or not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self.limiter.acquire(endpoint)
+            return attr(*args, **kwargs)
+        return call
+
+    def __setattr__(self, name, value):
+        setattr(self.client, name, value)
+
+
+def rate_limited(exchange, config: Optional[Dict[str, Any]] = None, name: Optional[str] = None) -> RateLimitedClient:
+    """
+    Wrap a ccxt client so its calls go through the process-wide limiter
+
+    Args:
+        exchange: ccxt client, created with enableRateLimit off
+        config: Bot configuration
+        name: Limiter name, defaults to the exchange name in the config
+
+    Returns:
+        RateLimitedClient: The wrapped client
+    """
+    name = name or (config or {}).get('exchange', {}).get('name', 'mexc').lower()
+    return RateLimitedClient(exchange, get_limiter(name, exchange, config))
@@ -0,0 +1,132 @@
+import json
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+import numpy as np
+from main import BroskiBot, CYCLE_STAGES
+from mock_exchange import MockExchange
+
+logger = logging.getLogger("BROski.Replay")
+
+
+def replay_config(config, work_dir, fixture=None):
+    """
+    Copy of the bot configuration for a replay run
+
+    Switches to the mock exchange on a manually advanced clock, turns on order
+    placement (fills are simulated by the mock), turns off notifications and
+    keeps candles, market metadata and trade history in work_dir so the real
+    files are never touched.
+    """
+    config = json.loads(json.dumps(config))
+    work_dir = Path(work_dir)
+
+    exchange = config.setdefault('exchange', {})
+    exchange['name'] = 'mock'
+    mock = exchange.setdefault('mock', {})
+    mock['speed'] = 0
+    mock['latency_ms'] = 0
+    if fixture:
+        mock['fixture'] = fixture
+    # Replay the strategy's own candles unless a finer series is configured
+    active_strategy = config['strategies']['active_strategy']
+    mock.setdefault('timeframe', config['strategies'][active_strategy].get('timeframe', '1m'))
+
+    config.setdefault('trading', {})['auto_trade'] = True
+    market_data = config.setdefault('market_data', {})
+    market_data['async_engine'] = False
+    market_data['candle_store_dir'] = str(work_dir / 'candles')
+    market_data['markets_cache_file'] = str(work_dir / 'markets.json')
+    config.setdefault('logging', {})['log_directory'] = str(work_dir / 'logs')
+    for channel in ('telegram', 'email'):
+        config.setdefault('notifications', {}).setdefault(channel, {})['enabled'] = False
+    return config
+
+
+def _stage_stats(seconds):
+    seconds = np.array(seconds) * 1000
+    if not len(seconds):
+        return {'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'total_s': 0.0}
+    return {
+        'mean_ms': float(seconds.mean()),
+        'p50_ms': float(np.percentile(seconds, 50)),
+        'p95_ms': float(np.percentile(seconds, 95)),
+        'total_s': float(seconds.sum() / 1000)
+    }
+
+
+def replay(config, cycles=None, cycle_seconds=None, fixture=None):
+    """
+    Run the full BroskiBot loop over recorded candles as fast as possible
+
+    The bot is the production one: DataFetcher, StrategyManager, RiskManager,
+    ExchangeConnector and PerformanceTracker, all sharing one MockExchange.
+    Its clock only moves when the bot sleeps, so a cycle takes as long as the
+    code needs and no longer. Runs until `cycles` or the end of the candles.
+
+    Args:
+        config (dict): Bot configuration (not modified)
+        cycles (int): Maximum number of cycles (default: until the end of the data)
+        cycle_seconds (float): Simulated seconds between cycles (default: trading.trade_interval_seconds)
+        fixture (str): Fixture file to replay instead of the candle store
+
+    Returns:
+        dict: Cycle counts and speed, per-stage timing, trades, API calls and final balance
+    """
+    with tempfile.TemporaryDirectory(prefix="broski_replay_") as work_dir:
+        config = replay_config(config, work_dir, fixture)
+        exchange = MockExchange.from_config(config)
+        clock = lambda: exchange.now() / 1000
+
+        bot = BroskiBot(config, exchange=exchange, clock=clock, sleep=exchange.advance)
+        if cycle_seconds:
+            bot.cycle_interval = cycle_seconds
+
+        symbol = bot.exchange.get_trading_symbol()
+        sim_start = exchange.now()
+        sim_end = int(exchange.candles[exchange._base_key(symbol)][-1, 0])
+        available = max((sim_end - sim_start) // int(bot.cycle_interval * 1000), 0)
+        cycles = available if cycles is None else min(cycles, available)
+
+        wall_start = time.perf_counter()
+        bot.run(max_cycles=cycles)
+        wall_seconds = time.perf_counter() - wall_start
+
+        api_calls = dict(exchange.call_counts)
+        simulated_seconds = (exchange.now() - sim_start) / 1000
+        price = bot.exchange.get_price(symbol)
+        base, quote = symbol.split('/')
+        balance = {currency: exchange.balances.get(currency, 0.0) + exchange.used.get(currency, 0.0)
+                   for currency in (base, quote)}
+
+    return {
+        'cycles': bot.cycles,
+        'simulated_days': simulated_seconds / 86400,
+        'wall_seconds': wall_seconds,
+        'cycles_per_second': bot.cycles / wall_seconds if wall_seconds else 0.0,
+        'speedup': simulated_seconds / wall_seconds if wall_seconds else 0.0,
+        'stages': {stage: _stage_stats(bot.stage_timings[stage]) for stage in CYCLE_STAGES},
+        'trades': bot.trade_counts['executed'],
+        'failed_trades': bot.trade_counts['failed'],
+        'api_calls': api_calls,
+        'balance': balance,
+        'equity': balance[quote] + balance[base] * price
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    parser = argparse.ArgumentParser(description='Replay recorded candles through the full BROski bot loop')
+    parser.add_argument('--config', type=str, default='config.json', help='Config file to replay')
+    parser.add_argument('--cycles', type=int, help='Number of bot cycles to run (default: until the data ends)')
+    parser.add_argument('--cycle-seconds', type=float, help='Simulated seconds between cycles')
+    parser.add_argument('--fixture', type=str, help='Fixture file to replay instead of the candle store')
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        replay_bot_config = json.load(f)
+
+    print(json.dumps(replay(replay_bot_config, args.cycles, args.cycle_seconds, args.fixture), indent=2))
@@ -0,0 +1,189 @@
+import time
+import logging
+import numpy as np
+import pandas as pd
+from candle_store import COLUMNS, timeframe_to_ms
+
+logger = logging.getLogger("BROski.Resampler")
+
+# Exchanges start weekly candles on Monday, the unix epoch was a Thursday
+WEEK_OFFSET_MS = 4 * 24 * 60 * 60 * 1000
+
+
+def bucket_start(timestamps, timeframe):
+    """
+    Get the start time of the candle each timestamp belongs to
+
+    Args:
+        timestamps (np.ndarray): Timestamps in milliseconds
+        timeframe (str): Target timeframe
+
+    Returns:
+        np.ndarray: Bucket start timestamps in milliseconds
+    """
+    period = timeframe_to_ms(timeframe)
+    offset = WEEK_OFFSET_MS if timeframe.endswith('w') else 0
+    return timestamps - (timestamps - offset) % period
+
+
+def resample_ohlcv(columns, timeframe):
+    """
+    Aggregate sorted candles into a higher timeframe
+
+    Args:
+        columns (dict): Column name -> array, as returned by CandleStore.read
+        timeframe (str): Target timeframe
+
+    Returns:
+        np.ndarray: (N, 6) array of [timestamp, open, high, low, close, volume] per bucket
+    """
+    timestamps = np.asarray(columns['timestamp'], dtype=np.int64)
+    if len(timestamps) == 0:
+        return np.empty((0, 6))
+
+    buckets = bucket_start(timestamps, timeframe)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.append(starts[1:], len(buckets)) - 1
+
+    return np.column_stack([
+        buckets[starts].astype(np.float64),
+        np.asarray(columns['open'])[starts],
+        np.maximum.reduceat(np.asarray(columns['high']), starts),
+        np.minimum.reduceat(np.asarray(columns['low']), starts),
+        np.asarray(columns['close'])[ends],
+        np.add.reduceat(np.asarray(columns['volume']), starts),
+    ])
+
+
+class TimeframeResampler:
+    """
+    Derives every higher timeframe from one stored base series (1m by default).
+
+    Only the base timeframe is ever downloaded. Closed higher-timeframe candles
+    are computed once and cached; later calls only aggregate the base candles of
+    the still forming bucket. API usage is the same however many timeframes the
+    strategies read.
+
+    A bucket counts as closed once a newer base candle is stored, or once the
+    clock has passed its end by one base period. Until then its last base
+    candle may still be forming and be overwritten by the next sync, so the
+    bucket is aggregated again on every call.
+    """
+
+    def __init__(self, candle_store, base_timeframe='1m', clock=time.time):
+        """
+        Initialize the resampler
+
+        Args:
+            candle_store (CandleStore): Store holding the base series
+            base_timeframe (str): The only timeframe fetched from the exchange
+            clock (callable): Time source in seconds (replaced by the simulated clock when replaying)
+        """
+        self.candle_store = candle_store
+        self.base_timeframe = base_timeframe
+        self.base_ms = timeframe_to_ms(base_timeframe)
+        self.clock = clock
+
+        # (symbol, timeframe) -> (closed candles array, start of the first bucket not yet closed)
+        self.closed = {}
+
+    def ratio(self, timeframe):
+        """Number of base candles in one candle of `timeframe`"""
+        period = timeframe_to_ms(timeframe)
+        if period < self.base_ms or period % self.base_ms:
+            raise ValueError(f"Cannot derive {timeframe} candles from {self.base_timeframe}")
+        return period // self.base_ms
+
+    def sync(self, exchange, symbol, timeframes, limit=100):
+        """
+        Bring the base series up to date with enough history for every timeframe
+
+        Args:
+            exchange: ccxt exchange client
+            symbol (str): Trading pair
+            timeframes (list): Timeframes that will be read
+            limit (int): Number of candles needed per timeframe
+
+        Returns:
+            int: Number of new base candles stored
+        """
+        if isinstance(timeframes, str):
+            timeframes = [timeframes]
+        base_limit = limit * max(self.ratio(timeframe) for timeframe in timeframes)
+
+        first_before = self._first_timestamp(symbol)
+        added = self.candle_store.sync(exchange, symbol, self.base_timeframe, limit=base_limit)
+        if self._first_timestamp(symbol) != first_before:
+            # Older history was merged in, cached candles no longer start at the beginning
+            self.invalidate(symbol)
+        return added
+
+    def _first_timestamp(self, symbol):
+        timestamps = self.candle_store.read(symbol, self.base_timeframe)['timestamp']
+        return int(timestamps[0]) if len(timestamps) else None
+
+    def _update_closed(self, symbol, timeframe):
+        """Aggregate base candles since the last closed bucket, returns the forming candle"""
+        key = (symbol, timeframe)
+        closed, next_start = self.closed.get(key, (np.empty((0, 6)), None))
+
+        columns = self.candle_store.read(symbol, self.base_timeframe, since=next_start)
+        candles = resample_ohlcv(columns, timeframe)
+        if next_start is None and len(candles) and int(columns['timestamp'][0]) > int(candles[0, 0]):
+            # Stored history starts mid-bucket, that first candle would be incomplete
+            candles = candles[1:]
+        if len(candles) == 0:
+            return None
+
+        # Every bucket before the last has a newer base candle after it. The last one
+        # is closed only once its final base candle has closed and been synced again.
+        bucket_end = int(candles[-1, 0]) + timeframe_to_ms(timeframe)
+        last_closed = self.clock() * 1000 >= bucket_end + self.base_ms
+        new_closed = candles if last_closed else candles[:-1]
+        forming = None if last_closed else candles[-1]
+
+        if len(new_closed):
+            closed = np.concatenate([closed, new_closed])
+            next_start = int(new_closed[-1, 0]) + timeframe_to_ms(timeframe)
+        elif next_start is None:
+            next_start = int(candles[0, 0])
+
+        self.closed[key] = (closed, next_start)
+        return forming
+
+    def get(self, symbol, timeframe, limit=None):
+        """
+        Get candles for any timeframe as the OHLCV DataFrame used across the bot
+
+        Args:
+            symbol (str): Trading pair
+            timeframe (str): Timeframe to derive (the base timeframe is read directly)
+            limit (int): Only return the newest `limit` candles
+
+        Returns:
+            pd.DataFrame: OHLCV data indexed by timestamp, the last row may be a forming candle
+        """
+        if timeframe == self.base_timeframe:
+            return self.candle_store.to_dataframe(symbol, timeframe, limit=limit)
+
+        self.ratio(timeframe)
+        forming = self._update_closed(symbol, timeframe)
+        closed = self.closed.get((symbol, timeframe), (np.empty((0, 6)), None))[0]
+
+        candles = closed if forming is None else np.vstack([closed, forming])
+        if limit is not None:
+            candles = candles[-limit:]
+
+        df = pd.DataFrame(candles[:, 1:], columns=list(COLUMNS[1:]),
+                          index=pd.to_datetime(candles[:, 0].astype(np.int64), unit='ms'))
+        df.index.name = 'timestamp'
+        df.attrs.update(symbol=symbol, timeframe=timeframe)
+        return df
+
+    def invalidate(self, symbol=None):
+        """Drop cached closed candles, e.g. after older history was merged into the store"""
+        if symbol is None:
+            self.closed.clear()
+        else:
+            for key in [key for key in self.closed if key[0] == symbol]:
+                del self.closed[key]
@@ -0,0 +1,222 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import numpy as np
+from pathlib import Path
+
+logger = logging.getLogger("BROski.ResultStore")
+
+# Part of every data fingerprint. Bump it when a change to the backtester or the
+# strategy signals makes stored results stale, so they are computed again.
+RESULTS_VERSION = 1
+
+# Result fields stored in their own columns, so reports can sort and filter on them
+RESULT_COLUMNS = ('trades', 'win_rate', 'pnl', 'max_drawdown')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    strategy TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    data_key TEXT NOT NULL,
+    params TEXT NOT NULL,
+    symbol TEXT,
+    timeframe TEXT,
+    candles INTEGER,
+    trades INTEGER,
+    win_rate REAL,
+    pnl REAL,
+    max_drawdown REAL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (strategy, data_key, params_hash)
+)
+"""
+
+
+def _canonical(value):
+    """JSON-ready value where 30, 30.0 and np.float64(30) all look the same"""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def params_hash(params):
+    """
+    Canonical hash of a parameter set
+
+    Key order and int/float spelling don't change the hash.
+    """
+    text = json.dumps(_canonical(params), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def data_fingerprint(history, settings=None):
+    """
+    Fingerprint of the candles (and backtest settings) a result was computed on
+
+    Hashes the candle times and OHLCV values themselves, so a revised candle
+    gives a new fingerprint even when the range is the same, plus RESULTS_VERSION
+    so results from older backtest code are not reused.
+
+    Args:
+        history (pd.DataFrame): OHLCV data, the exact rows that were backtested
+        settings (dict): Anything else the results depend on (fees, stop loss, ...)
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha1()
+    digest.update(json.dumps([RESULTS_VERSION, history.attrs.get('symbol'), history.attrs.get('timeframe'),
+                              len(history), _canonical(settings or {})], sort_keys=True).encode())
+    digest.update(np.ascontiguousarray(history.index.asi8 if hasattr(history.index, 'asi8')
+                                       else np.asarray(history.index)).tobytes())
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        if column in history.columns:
+            digest.update(np.ascontiguousarray(history[column].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+class ResultStore:
+    """
+    Persistent backtest results in SQLite.
+
+    Results are keyed by strategy name, parameter hash and data fingerprint, so
+    an optimizer run only backtests parameter sets it has not already scored on
+    the same candles, and reports can read earlier sweeps without re-running them.
+    """
+
+    def __init__(self, path="data/optimization/backtest_results.db"):
+        """
+        Initialize the result store
+
+        Args:
+            path (str): SQLite database file (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(_SCHEMA)
+        self.connection.commit()
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0}
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a result store using the optimization section of config.json"""
+        return cls(config.get("optimization", {}).get("result_store", "data/optimization/backtest_results.db"))
+
+    def get_many(self, strategy, data_key, hashes):
+        """
+        Look up stored results
+
+        Args:
+            strategy (str): Strategy name
+            data_key (str): Data fingerprint
+            hashes (list): Parameter hashes to look up
+
+        Returns:
+            dict: Parameter hash -> result dict (only hashes that are stored)
+        """
+        found = {}
+        hashes = list(hashes)
+        with self.lock:
+            # SQLite limits the number of bound parameters per statement
+            for offset in range(0, len(hashes), 500):
+                batch = hashes[offset:offset + 500]
+                rows = self.connection.execute(
+                    f"SELECT params_hash, params, {', '.join(RESULT_COLUMNS)} FROM results "
+                    f"WHERE strategy = ? AND data_key = ? AND params_hash IN ({', '.join('?' * len(batch))})",
+                    (strategy, data_key, *batch)
+                ).fetchall()
+                for row in rows:
+                    found[row[0]] = {'params': json.loads(row[1]), **dict(zip(RESULT_COLUMNS, row[2:]))}
+            self.stats['hits'] += len(found)
+            self.stats['misses'] += len(hashes) - len(found)
+        return found
+
+    def put_many(self, strategy, data_key, entries, symbol=None, timeframe=None, candles=None):
+        """
+        Store results
+
+        Args:
+            strategy (str): Strategy name
+            data_key (str): Data fingerprint
+            entries (list): (parameter hash, result dict with 'params') pairs
+            symbol (str): Trading pair, for reports
+            timeframe (str): Timeframe, for reports
+            candles (int): Number of candles backtested, for reports
+        """
+        now = time.time()
+        rows = [
+            (strategy, key, data_key, json.dumps(_canonical(result['params']), sort_keys=True),
+             symbol, timeframe, candles, *(result.get(column) for column in RESULT_COLUMNS), now)
+            for key, result in entries
+        ]
+        with self.lock:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO results (strategy, params_hash, data_key, params, symbol, timeframe, "
+                f"candles, {', '.join(RESULT_COLUMNS)}, created_at) VALUES ({', '.join('?' * 12)})",
+                rows
+            )
+            self.connection.commit()
+            self.stats['stored'] += len(rows)
+
+    def latest_data_key(self, strategy):
+        """Data fingerprint of the most recently stored result for a strategy, or None"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT data_key FROM results WHERE strategy = ? ORDER BY created_at DESC LIMIT 1", (strategy,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def top_results(self, strategy, data_key=None, order_by='pnl', limit=10):
+        """
+        Best stored results for a strategy
+
+        Args:
+            strategy (str): Strategy name
+            data_key (str): Only results on these candles (default: the latest data the strategy was tested on)
+            order_by (str): One of RESULT_COLUMNS, sorted high to low
+            limit (int): Number of results
+
+        Returns:
+            list: Result dicts with params, symbol, timeframe and candles
+        """
+        if order_by not in RESULT_COLUMNS:
+            raise ValueError(f"Cannot order results by {order_by}")
+        data_key = data_key or self.latest_data_key(strategy)
+        if data_key is None:
+            return []
+
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT params, symbol, timeframe, candles, {', '.join(RESULT_COLUMNS)} FROM results "
+                f"WHERE strategy = ? AND data_key = ? ORDER BY {order_by} DESC LIMIT ?",
+                (strategy, data_key, limit)
+            ).fetchall()
+        return [
+            {'params': json.loads(row[0]), 'symbol': row[1], 'timeframe': row[2], 'candles': row[3],
+             **dict(zip(RESULT_COLUMNS, row[4:]))}
+            for row in rows
+        ]
+
+    def count(self, strategy=None):
+        """Number of stored results (for one strategy if given)"""
+        with self.lock:
+            if strategy:
+                return self.connection.execute("SELECT COUNT(*) FROM results WHERE strategy = ?",
+                                               (strategy,)).fetchone()[0]
+            return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -1,3 +1,4 @@
+import time
 import logging
 from datetime import datetime, timedelta
 
@@ -16,6 +17,31 @@ class RiskManager:
         Args:
             config (dict): Risk management configuration
         """
+        self.apply_config(config)
+        
+        # Track open positions and daily trades
+        self.open_positions = []
+        self.daily_trades = []
+        
+        # Track total account exposure
+        self.total_exposure = 0.0
+        self.exposure_percentage = 0.0
+        
+        # Time source for the daily trade window (replaced by the simulated clock when replaying)
+        self.clock = time.time
+        
+        logger.info(f"Risk Manager initialized with SL: {self.stop_loss_percentage}%, TP: {self.take_profit_percentage}%")
+    
+    def apply_config(self, config):
+        """
+        Take risk limits from a (new) configuration
+        
+        Open positions and the daily trade count are kept, so changed limits
+        apply to the trades already made today.
+        
+        Args:
+            config (dict): Bot configuration
+        """
         self.config = config
         self.risk_config = config.get("risk_management", {})
         
@@ -25,16 +51,7 @@ class RiskManager:
         self.max_daily_trades = self.risk_config.get("max_daily_trades", 10)
         self.max_open_positions = self.risk_config.get("max_open_positions", 3)
         self.max_position_size = config["trading"].get("max_position_size", 100.0)
-        
-        # Track open positions and daily trades
-        self.open_positions = []
-        self.daily_trades = []
-        
-        # Track total account exposure
-        self.total_exposure = 0.0
         self.max_exposure_percentage = self.risk_config.get("max_exposure_percentage", 50.0)
-        
-        logger.info(f"Risk Manager initialized with SL: {self.stop_loss_percentage}%, TP: {self.take_profit_percentage}%")
     
     def update_portfolio(self, positions, account_balance):
         """
@@ -55,7 +72,7 @@ class RiskManager:
     
     def clean_daily_trades(self):
         """Remove trades older than 24 hours from daily trades tracking"""
-        current_time = datetime.now()
+        current_time = datetime.fromtimestamp(self.clock())
         cutoff_time = current_time - timedelta(days=1)
         self.daily_trades = [trade for trade in self.daily_trades if trade["timestamp"] > cutoff_time]
     
@@ -153,7 +170,7 @@ class RiskManager:
             # Track this trade for daily limits
             if signal["type"] in ["buy", "sell"]:
                 self.daily_trades.append({
-                    "timestamp": datetime.now(),
+                    "timestamp": datetime.fromtimestamp(self.clock()),
                     "type": signal["type"],
                     "price": signal.get("price", 0),
                     "size": position_size
@@ -123,16 +123,20 @@ def run_trading_loop(config, exchange):
     
     logger.info(f"Starting trading loop for {symbol} on {timeframe} timeframe")
     
+    # Read market data through the shared hub when it is running
+    from market_data_hub import connect_market_data
+    market_data = connect_market_data(config) or exchange
+    
     while True:  # Trading loop
         try:
             # Now timeframe is defined before being used
             logger.info(f"Fetching {timeframe} candles for {symbol}...")
             
             # Get candlestick data
-            candles = exchange.fetch_ohlcv(symbol, timeframe)
+            candles = market_data.fetch_ohlcv(symbol, timeframe)
             
             # Get current price
-            ticker = exchange.fetch_ticker(symbol)
+            ticker = market_data.fetch_ticker(symbol)
             current_price = ticker['last']
             
             logger.info(f"Current price: {current_price}")
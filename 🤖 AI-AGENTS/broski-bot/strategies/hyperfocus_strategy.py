@@ -1,7 +1,9 @@
 import logging
 import numpy as np
 import pandas as pd
+import indicators
 from datetime import datetime
+from strategies.signals import signal_batch, signal_records
 
 logger = logging.getLogger("BROski.HyperFocus")
 
@@ -13,13 +15,15 @@ class HyperFocusStrategy:
     
     def __init__(self, config):
         """Initialize HyperFocus strategy with configuration"""
-        self.config = config.get("hyperfocus_strategy", {})
+        # Either the strategy's own settings or a dict holding them under its name
+        self.config = config.get("hyperfocus_strategy", config)
         
         # Primary indicator settings (RSI)
         self.timeframe = self.config.get("timeframe", "15m")
         self.rsi_period = self.config.get("rsi_period", 14)
         self.rsi_overbought = self.config.get("rsi_overbought", 70)
         self.rsi_oversold = self.config.get("rsi_oversold", 30)
+        self.rsi_method = self.config.get("rsi_method", indicators.DEFAULT_RSI_METHOD)
         
         # Secondary indicator settings (MACD)
         self.fast_period = self.config.get("fast_period", 12)
@@ -38,8 +42,37 @@ class HyperFocusStrategy:
         self.require_confirmation = self.config.get("require_confirmation", True)
         self.smart_exit = self.config.get("smart_exit", True)
         
+        # Indicators the signal checks read, kept up to date candle by candle for each watched pair
+        self.streams = indicators.IndicatorStreams(self._create_stream_indicators)
+        
         logger.info("HyperFocus strategy initialized")
     
+    def _create_stream_indicators(self):
+        return {
+            'rsi': ('close', indicators.StreamingRSI(self.rsi_period, self.rsi_method)),
+            ('macd_line', 'signal_line', 'macd_histogram'): (
+                'close', indicators.StreamingMACD(self.fast_period, self.slow_period, self.signal_period)
+            ),
+            'ma_fast': ('close', indicators.StreamingSMA(self.ma_fast)),
+            'ma_slow': ('close', indicators.StreamingSMA(self.ma_slow)),
+            'volume_sma': ('volume', indicators.StreamingSMA(self.volume_lookback)),
+        }
+    
+    def latest_indicators(self, df):
+        """
+        Indicators for the last closed and the forming candle
+        
+        Only candles that closed since the previous call are processed.
+        
+        Returns:
+            pd.DataFrame: The last two rows of df with the signal indicator columns
+        """
+        recent = df.iloc[-2:].copy()
+        for column, values in self.streams.update(df).items():
+            recent[column] = values
+        recent['volume_ratio'] = recent['volume'] / recent['volume_sma']
+        return recent
+    
     def calculate_indicators(self, df):
         """Calculate all indicators needed for the strategy"""
         # Make sure we have enough data
@@ -47,37 +80,34 @@ class HyperFocusStrategy:
             logger.warning("Not enough data for HyperFocus strategy indicators")
             return df
         
+        # Shared with every other component computing the same indicators on these candles
+        cache = indicators.get_indicator_cache()
+        
         # Calculate RSI
-        delta = df['close'].diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        avg_gain = gain.rolling(window=self.rsi_period).mean()
-        avg_loss = loss.rolling(window=self.rsi_period).mean()
-        rs = avg_gain / avg_loss
-        df['rsi'] = 100 - (100 / (1 + rs))
+        df['rsi'] = cache.get(df, 'rsi', period=self.rsi_period, method=self.rsi_method)
         
         # Calculate MACD
-        ema_fast = df['close'].ewm(span=self.fast_period, adjust=False).mean()
-        ema_slow = df['close'].ewm(span=self.slow_period, adjust=False).mean()
-        df['macd_line'] = ema_fast - ema_slow
-        df['signal_line'] = df['macd_line'].ewm(span=self.signal_period, adjust=False).mean()
-        df['macd_histogram'] = df['macd_line'] - df['signal_line']
+        df['macd_line'], df['signal_line'], df['macd_histogram'] = cache.get(
+            df, 'macd', fast_period=self.fast_period, slow_period=self.slow_period,
+            signal_period=self.signal_period
+        )
         
         # Calculate Moving Averages
-        df['ma_fast'] = df['close'].rolling(window=self.ma_fast).mean()
-        df['ma_slow'] = df['close'].rolling(window=self.ma_slow).mean()
+        df['ma_fast'] = cache.get(df, 'sma', period=self.ma_fast)
+        df['ma_slow'] = cache.get(df, 'sma', period=self.ma_slow)
         
         # Calculate Volume indicators
-        df['volume_sma'] = df['volume'].rolling(window=self.volume_lookback).mean()
+        df['volume_sma'] = cache.get(df, 'sma', column='volume', period=self.volume_lookback)
         df['volume_ratio'] = df['volume'] / df['volume_sma']
         
         # Calculate Price Action indicators
         df['high_low_range'] = df['high'] - df['low']
-        df['range_sma'] = df['high_low_range'].rolling(window=14).mean()
+        df['range_sma'] = cache.get(df, 'sma', column='high_low_range', period=14)
         df['volatility'] = df['high_low_range'] / df['range_sma']
         
         # Additional trend strength indicator
-        df['trend_strength'] = (df['close'] - df['close'].rolling(window=20).mean()) / df['close'].rolling(window=20).std()
+        df['trend_strength'] = ((df['close'] - cache.get(df, 'sma', period=20))
+                                / cache.get(df, 'rolling_std', period=20))
         
         return df
     
@@ -140,6 +170,77 @@ class HyperFocusStrategy:
         
         return False, f"Volume insufficient ({volume_ratio:.2f}x)"
     
+    def signals_from_indicators(self, rsi, macd_line, signal_line, ma_fast, ma_slow, volume_ratio):
+        """
+        Evaluate the HyperFocus rules on every bar at once
+        
+        Same rules as generate_signals, applied to whole indicator arrays, so
+        optimizers and backtests can score a parameter set without a per-bar loop.
+        
+        Args:
+            rsi, macd_line, signal_line, ma_fast, ma_slow, volume_ratio: Aligned indicator arrays
+            
+        Returns:
+            tuple: (signal array with 1 = buy, -1 = sell, 0 = none; confirmation count array)
+        """
+        def previous(values):
+            shifted = np.empty_like(values)
+            shifted[0] = np.nan
+            shifted[1:] = values[:-1]
+            return shifted
+        
+        with np.errstate(invalid='ignore'):
+            prev_rsi = previous(rsi)
+            rsi_buy = (prev_rsi < self.rsi_oversold) & (rsi >= self.rsi_oversold)
+            rsi_sell = (prev_rsi > self.rsi_overbought) & (rsi <= self.rsi_overbought)
+            
+            prev_macd, prev_signal = previous(macd_line), previous(signal_line)
+            macd_buy = (prev_macd < prev_signal) & (macd_line > signal_line)
+            macd_sell = (prev_macd > prev_signal) & (macd_line < signal_line)
+            
+            prev_fast, prev_slow = previous(ma_fast), previous(ma_slow)
+            ma_buy = (prev_fast < prev_slow) & (ma_fast > ma_slow)
+            ma_sell = (prev_fast > prev_slow) & (ma_fast < ma_slow)
+            
+            volume_confirmed = volume_ratio > self.volume_factor
+        
+        confirmations = np.where(
+            rsi_buy, macd_buy.astype(np.int8) + ma_buy + volume_confirmed,
+            np.where(rsi_sell, macd_sell.astype(np.int8) + ma_sell + volume_confirmed, 0)
+        )
+        confirmed = (confirmations >= 1) | (not self.require_confirmation)
+        signals = np.where(rsi_buy & confirmed, 1, np.where(rsi_sell & confirmed, -1, 0)).astype(np.int8)
+        return signals, confirmations
+    
+    def _signal_batch(self, rsi, macd_line, signal_line, ma_fast, ma_slow, volume_ratio):
+        signals, confirmations = self.signals_from_indicators(rsi, macd_line, signal_line, ma_fast, ma_slow, volume_ratio)
+        confirmations = np.where(signals != 0, confirmations, 0)
+        return signal_batch(signals, np.minimum(confirmations / 3.0, 1.0), confirmations)
+    
+    def generate_signals_batch(self, df):
+        """
+        Signals for every bar of df in one pass
+        
+        Args:
+            df (pd.DataFrame): OHLCV data
+            
+        Returns:
+            np.ndarray: Signal array (type, strength, confirmations) aligned with df
+        """
+        cache = indicators.get_indicator_cache()
+        macd_line, signal_line, _ = cache.get(df, 'macd', fast_period=self.fast_period,
+                                              slow_period=self.slow_period, signal_period=self.signal_period)
+        volume_sma = cache.get(df, 'sma', column='volume', period=self.volume_lookback)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = indicators.as_array(df['volume']) / volume_sma
+        return self._signal_batch(
+            cache.get(df, 'rsi', period=self.rsi_period, method=self.rsi_method),
+            macd_line, signal_line,
+            cache.get(df, 'sma', period=self.ma_fast),
+            cache.get(df, 'sma', period=self.ma_slow),
+            volume_ratio
+        )
+    
     def generate_signals(self, df):
         """Generate trading signals using the HyperFocus strategy"""
         signals = []
@@ -148,61 +249,41 @@ class HyperFocusStrategy:
             logger.warning("No data available for signal generation")
             return signals
             
-        # Ensure we have calculated all necessary indicators
-        df = self.calculate_indicators(df)
-        
         # We need at least one previous candle to compare
         if len(df) < 2:
             logger.warning("Not enough data for signal generation")
             return signals
         
-        # Get the current candle index (last row)
-        index = len(df) - 1
+        # Only the last closed and the forming candle are compared
+        df = self.latest_indicators(df)
         
-        # Check primary signal (RSI)
-        primary_signal, primary_reason = self.check_rsi_signal(df, index)
+        # Same rules as generate_signals_batch, on those two candles
+        batch = self._signal_batch(*(df[column].to_numpy() for column in
+                                     ('rsi', 'macd_line', 'signal_line', 'ma_fast', 'ma_slow', 'volume_ratio')))
+        index = len(df) - 1
         
-        if primary_signal:
-            # Check for confirmation signals
+        for signal in signal_records(batch, df, rows=[index]):
+            primary_signal = signal['type']
+            _, primary_reason = self.check_rsi_signal(df, index)
+            
+            # Describe the confirming indicators
             macd_signal, macd_reason = self.check_macd_signal(df, index)
             ma_signal, ma_reason = self.check_ma_signal(df, index)
             volume_confirmed, volume_reason = self.check_volume_confirmation(df, index, primary_signal)
+            confirmation_text = [reason for confirmed, reason in (
+                (macd_signal == primary_signal, macd_reason),
+                (ma_signal == primary_signal, ma_reason),
+                (volume_confirmed, volume_reason)
+            ) if confirmed]
+            
+            signal['primary_reason'] = primary_reason
+            signal['confirmation_details'] = ", ".join(confirmation_text) if confirmation_text else "No confirmations"
+            
+            if primary_signal == "buy":
+                logger.info(f"🟢 BUY signal: {primary_reason}, Confirmations: {signal['confirmations']}/3")
+            else:
+                logger.info(f"🔴 SELL signal: {primary_reason}, Confirmations: {signal['confirmations']}/3")
             
-            # Determine confirmation strength
-            confirmations = 0
-            confirmation_text = []
-            
-            if macd_signal == primary_signal:
-                confirmations += 1
-                confirmation_text.append(macd_reason)
-                
-            if ma_signal == primary_signal:
-                confirmations += 1
-                confirmation_text.append(ma_reason)
-                
-            if volume_confirmed:
-                confirmations += 1
-                confirmation_text.append(volume_reason)
-            
-            # Generate signal if we have enough confirmations
-            if (not self.require_confirmation) or (confirmations >= 1):
-                confirmation_str = ", ".join(confirmation_text) if confirmation_text else "No confirmations"
-                
-                signal = {
-                    'type': primary_signal,
-                    'price': df['close'].iloc[index],
-                    'timestamp': df.index[index],
-                    'primary_reason': primary_reason,
-                    'confirmations': confirmations,
-                    'confirmation_details': confirmation_str,
-                    'strength': min(confirmations / 3.0, 1.0)  # Signal strength 0-1
-                }
-                
-                if primary_signal == "buy":
-                    logger.info(f"🟢 BUY signal: {primary_reason}, Confirmations: {confirmations}/3")
-                else:
-                    logger.info(f"🔴 SELL signal: {primary_reason}, Confirmations: {confirmations}/3")
-                
-                signals.append(signal)
+            signals.append(signal)
         
         return signals
@@ -15,11 +15,10 @@ project_root = Path(__file__).resolve().parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+import indicators
+from strategies.signals import signal_batch, signal_records
 
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("BROski-LiteML")
 
 class LiteMLStrategy:
@@ -63,30 +62,32 @@ class LiteMLStrategy:
             logger.warning("Model or scaler file not found")
             return False
     
-    def prepare_data(self, df):
-        """Prepare data for prediction"""
-        # Make sure df has all necessary columns 
+    def add_features(self, df):
+        """Add the model's feature columns that are missing from df"""
+        cache = indicators.get_indicator_cache()
+        
         if 'ma_5' not in df.columns:
-            df['ma_5'] = df['close'].rolling(window=5).mean()
+            df['ma_5'] = cache.get(df, 'sma', period=5)
         
         if 'ma_20' not in df.columns:
-            df['ma_20'] = df['close'].rolling(window=20).mean()
+            df['ma_20'] = cache.get(df, 'sma', period=20)
         
         if 'volatility' not in df.columns:
-            df['volatility'] = df['close'].pct_change().rolling(window=20).std()
+            df['volatility'] = indicators.rolling_std(cache.get(df, 'returns'), 20)
         
         if 'rsi' not in df.columns:
-            # Calculate RSI
-            delta = df['close'].diff()
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            avg_gain = gain.rolling(window=14).mean()
-            avg_loss = loss.rolling(window=14).mean()
-            rs = avg_gain / avg_loss
-            df['rsi'] = 100 - (100 / (1 + rs))
+            # Saved models were trained on the simple-average RSI, not Wilder's
+            df['rsi'] = cache.get(df, 'rsi', period=14, method='sma')
         
         if 'momentum' not in df.columns:
             df['momentum'] = df['close'] - df['close'].shift(10)
+        
+        return df
+    
+    def prepare_data(self, df):
+        """Prepare data for prediction"""
+        # Make sure df has all necessary columns 
+        df = self.add_features(df)
             
         # Drop NaN values
         df = df.dropna()
@@ -113,6 +114,50 @@ class LiteMLStrategy:
             logger.error(f"Error during prediction: {str(e)}")
             return 0.5
     
+    def predict_all(self, df):
+        """
+        Model confidence for every bar in one call
+        
+        Returns:
+            np.ndarray: Probability of a price rise per bar, NaN where features are incomplete
+        """
+        df = self.add_features(df.copy())
+        features = df[self.feature_columns].values
+        complete = ~np.isnan(features).any(axis=1)
+        predictions = np.full(len(df), np.nan)
+        if self.model is None or not complete.any():
+            return predictions
+        
+        features = features[complete]
+        if self.scaler:
+            features = self.scaler.transform(features)
+        predictions[complete] = self.model.predict_proba(features)[:, 1]
+        return predictions
+    
+    def signals_from_predictions(self, predictions):
+        """
+        Apply the confidence thresholds to predictions for every bar
+        
+        Returns:
+            np.ndarray: 1 = buy, -1 = sell, 0 = no signal, per bar
+        """
+        with np.errstate(invalid='ignore'):
+            buy = predictions >= self.confidence_threshold
+            sell = predictions <= (1 - self.confidence_threshold)
+        return np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8)
+    
+    def generate_signals_batch(self, df):
+        """
+        Signals for every bar of df with one model call
+        
+        Args:
+            df (pd.DataFrame): OHLCV data
+            
+        Returns:
+            np.ndarray: Signal array (type, strength, confirmations) aligned with df
+        """
+        return signal_batch(self.signals_from_predictions(self.predict_all(df)))
+    
     def generate_signals(self, df):
         """Generate trading signals based on ML predictions"""
         signals = []
@@ -130,25 +175,17 @@ class LiteMLStrategy:
             
             logger.info(f"ML prediction: {prediction:.4f} (threshold: {self.confidence_threshold})")
             
-            # Logic for buy/sell signals based on confidence threshold
-            if prediction >= self.confidence_threshold:
-                signals.append({
-                    'type': 'buy',
-                    'price': df['close'].iloc[-1],
-                    'confidence': prediction,
-                    'timestamp': df.index[-1]
-                })
-                logger.info(f"🟢 BUY signal generated with confidence {prediction:.4f}")
-                
-            elif prediction <= (1 - self.confidence_threshold):
-                signals.append({
-                    'type': 'sell',
-                    'price': df['close'].iloc[-1],
-                    'confidence': 1 - prediction,
-                    'timestamp': df.index[-1]
-                })
-                logger.info(f"🔴 SELL signal generated with confidence {1-prediction:.4f}")
-            else:
+            # Same thresholds as generate_signals_batch, on the latest candle
+            batch = signal_batch(self.signals_from_predictions(np.array([prediction])))
+            signals = signal_records(batch, df.iloc[-1:])
+            for signal in signals:
+                if signal['type'] == 'buy':
+                    signal['confidence'] = prediction
+                    logger.info(f"🟢 BUY signal generated with confidence {prediction:.4f}")
+                else:
+                    signal['confidence'] = 1 - prediction
+                    logger.info(f"🔴 SELL signal generated with confidence {1-prediction:.4f}")
+            if not signals:
                 logger.info(f"⚪ No signal - prediction {prediction:.4f} within uncertainty range")
                 
             return signals
@@ -168,27 +205,7 @@ class LiteMLStrategy:
             logger.info("Training lightweight ML model...")
             
             # Calculate features
-            if 'ma_5' not in df.columns:
-                df['ma_5'] = df['close'].rolling(window=5).mean()
-            
-            if 'ma_20' not in df.columns:
-                df['ma_20'] = df['close'].rolling(window=20).mean()
-            
-            if 'volatility' not in df.columns:
-                df['volatility'] = df['close'].pct_change().rolling(window=20).std()
-            
-            if 'rsi' not in df.columns:
-                # Calculate RSI
-                delta = df['close'].diff()
-                gain = delta.where(delta > 0, 0)
-                loss = -delta.where(delta < 0, 0)
-                avg_gain = gain.rolling(window=14).mean()
-                avg_loss = loss.rolling(window=14).mean()
-                rs = avg_gain / avg_loss
-                df['rsi'] = 100 - (100 / (1 + rs))
-            
-            if 'momentum' not in df.columns:
-                df['momentum'] = df['close'] - df['close'].shift(10)
+            df = self.add_features(df)
                 
             # Create target: 1 if price goes up in next 10 periods, else 0
             df['target'] = (df['close'].shift(-10) > df['close']).astype(int)
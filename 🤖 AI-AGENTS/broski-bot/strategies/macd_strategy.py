@@ -1,6 +1,8 @@
 import logging
 import numpy as np
 import pandas as pd
+import indicators
+from strategies.signals import signal_batch, signal_records
 
 logger = logging.getLogger("BROski.MACDStrategy")
 
@@ -18,40 +20,53 @@ class MACDStrategy:
         self.slow_period = config.get("slow_period", 26)
         self.signal_period = config.get("signal_period", 9)
         
+        # MACD kept up to date candle by candle for each watched pair
+        self.streams = indicators.IndicatorStreams(lambda: {
+            ('macd_line', 'signal_line', 'macd_histogram'): (
+                'close', indicators.StreamingMACD(self.fast_period, self.slow_period, self.signal_period)
+            )
+        })
+        
     def calculate_macd(self, prices):
         """Calculate MACD indicator"""
-        # Calculate EMA with fast period
-        ema_fast = self._calculate_ema(prices, self.fast_period)
-        
-        # Calculate EMA with slow period
-        ema_slow = self._calculate_ema(prices, self.slow_period)
-        
-        # Calculate MACD line (fast EMA - slow EMA)
-        macd_line = ema_fast - ema_slow
-        
-        # Calculate signal line (EMA of MACD line)
-        signal_line = self._calculate_ema(macd_line, self.signal_period)
-        
-        # Calculate histogram (MACD line - signal line)
-        histogram = macd_line - signal_line
-        
-        return macd_line, signal_line, histogram
+        return indicators.macd(prices, self.fast_period, self.slow_period, self.signal_period)
     
-    def _calculate_ema(self, prices, period):
-        """Calculate Exponential Moving Average"""
-        ema = np.zeros_like(prices)
+    def signals_from_macd(self, macd_line, signal_line):
+        """
+        Evaluate the crossover rules on every bar at once
         
-        # Start with SMA for the first period
-        ema[:period] = np.mean(prices[:period])
-        
-        # Calculate EMA using the formula: EMA_today = (Price_today * k) + (EMA_yesterday * (1-k))
-        # where k = 2 / (period + 1)
-        k = 2.0 / (period + 1)
+        Args:
+            macd_line (np.ndarray): MACD line
+            signal_line (np.ndarray): Signal line
+            
+        Returns:
+            np.ndarray: 1 = buy, -1 = sell, 0 = no signal, per bar
+        """
+        previous_macd = np.concatenate(([np.nan], macd_line[:-1]))
+        previous_signal = np.concatenate(([np.nan], signal_line[:-1]))
+        with np.errstate(invalid='ignore'):
+            buy = (macd_line > signal_line) & (previous_macd <= previous_signal)
+            sell = (macd_line < signal_line) & (previous_macd >= previous_signal)
+        return np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8)
+    
+    def generate_signals_batch(self, df):
+        """
+        Signals for every bar of df in one pass
         
-        for i in range(period, len(prices)):
-            ema[i] = prices[i] * k + ema[i-1] * (1-k)
+        Args:
+            df (pd.DataFrame): OHLCV data, 'macd_line' and 'signal_line' columns are used if present
             
-        return ema
+        Returns:
+            np.ndarray: Signal array (type, strength, confirmations) aligned with df
+        """
+        if 'macd_line' in df.columns and 'signal_line' in df.columns:
+            macd_line, signal_line = indicators.as_array(df['macd_line']), indicators.as_array(df['signal_line'])
+        else:
+            macd_line, signal_line, _ = indicators.get_indicator_cache().get(
+                df, 'macd', fast_period=self.fast_period, slow_period=self.slow_period,
+                signal_period=self.signal_period
+            )
+        return signal_batch(self.signals_from_macd(macd_line, signal_line))
     
     def generate_signals(self, df):
         """Generate trading signals based on MACD crossovers"""
@@ -62,44 +77,28 @@ class MACDStrategy:
             return signals
             
         try:
-            # Calculate MACD indicators if not already in the dataframe
-            if 'macd_line' not in df.columns or 'signal_line' not in df.columns:
-                prices = df['close'].values
-                macd_line, signal_line, histogram = self.calculate_macd(prices)
-                
-                df['macd_line'] = macd_line
-                df['signal_line'] = signal_line
-                df['macd_histogram'] = histogram
-            
-            # Get the latest values
-            current_macd = df['macd_line'].iloc[-1]
-            current_signal = df['signal_line'].iloc[-1]
-            previous_macd = df['macd_line'].iloc[-2]
-            previous_signal = df['signal_line'].iloc[-2]
+            # Use MACD already in the dataframe, otherwise update it incrementally
+            if 'macd_line' in df.columns and 'signal_line' in df.columns:
+                previous_macd, current_macd = df['macd_line'].iloc[-2], df['macd_line'].iloc[-1]
+                previous_signal, current_signal = df['signal_line'].iloc[-2], df['signal_line'].iloc[-1]
+            else:
+                values = self.streams.update(df)
+                previous_macd, current_macd = values['macd_line']
+                previous_signal, current_signal = values['signal_line']
             
             logger.info(f"Current MACD: {current_macd:.6f}, Signal: {current_signal:.6f}")
             
-            # Check for bullish crossover (MACD crosses above signal line)
-            if current_macd > current_signal and previous_macd <= previous_signal:
-                signals.append({
-                    'type': 'buy',
-                    'price': df['close'].iloc[-1],
-                    'macd': current_macd,
-                    'signal': current_signal,
-                    'timestamp': df.index[-1]
-                })
-                logger.info(f"🟢 BUY signal generated (MACD: {current_macd:.6f} crossed above Signal: {current_signal:.6f})")
-                
-            # Check for bearish crossover (MACD crosses below signal line)
-            elif current_macd < current_signal and previous_macd >= previous_signal:
-                signals.append({
-                    'type': 'sell',
-                    'price': df['close'].iloc[-1],
-                    'macd': current_macd,
-                    'signal': current_signal,
-                    'timestamp': df.index[-1]
-                })
-                logger.info(f"🔴 SELL signal generated (MACD: {current_macd:.6f} crossed below Signal: {current_signal:.6f})")
+            # Same rules as generate_signals_batch, on the last closed and the forming candle
+            batch = signal_batch(self.signals_from_macd(np.array([previous_macd, current_macd]),
+                                                        np.array([previous_signal, current_signal])))
+            signals = signal_records(batch, df.iloc[-2:], rows=[1])
+            for signal in signals:
+                signal['macd'] = current_macd
+                signal['signal'] = current_signal
+                if signal['type'] == 'buy':
+                    logger.info(f"🟢 BUY signal generated (MACD: {current_macd:.6f} crossed above Signal: {current_signal:.6f})")
+                else:
+                    logger.info(f"🔴 SELL signal generated (MACD: {current_macd:.6f} crossed below Signal: {current_signal:.6f})")
                 
             return signals
             
@@ -0,0 +1,298 @@
+import logging
+import numpy as np
+import pandas as pd
+import indicators
+from candle_store import COLUMNS, timeframe_to_ms
+from resampler import resample_ohlcv
+from strategies.hyperfocus_strategy import HyperFocusStrategy
+
+logger = logging.getLogger("BROski.MultiTimeframe")
+
+NAN = float('nan')
+
+# Indicators read on every higher timeframe
+TREND_COLUMNS = ('rsi', 'macd_line', 'signal_line', 'ma_fast', 'ma_slow')
+
+
+def candle_times_ms(df):
+    """Candle open times in milliseconds, from a datetime index or 'timestamp' column, or None"""
+    times = np.asarray(df['timestamp'] if 'timestamp' in df.columns else df.index)
+    if times.dtype.kind == 'M':
+        return times.astype('datetime64[ms]').astype(np.int64)
+    if 'timestamp' in df.columns and times.dtype.kind in 'iuf':
+        return times.astype(np.int64)
+    return None
+
+
+def trend_votes(rsi, macd_line, signal_line, ma_fast, ma_slow):
+    """
+    Trend direction of a timeframe from its RSI, MACD and moving averages
+
+    A timeframe is bullish when at least two of RSI above 50, MACD above its
+    signal line and the fast MA above the slow MA hold, bearish when at least
+    two of the opposites hold. Not-yet-defined indicators vote for neither.
+
+    Returns:
+        np.ndarray: 1 = bullish, -1 = bearish, 0 = neither, per value
+    """
+    with np.errstate(invalid='ignore'):
+        bullish = ((np.asarray(rsi) > 50).astype(np.int8) + (np.asarray(macd_line) > np.asarray(signal_line))
+                   + (np.asarray(ma_fast) > np.asarray(ma_slow)))
+        bearish = ((np.asarray(rsi) < 50).astype(np.int8) + (np.asarray(macd_line) < np.asarray(signal_line))
+                   + (np.asarray(ma_fast) < np.asarray(ma_slow)))
+    return np.where(bullish >= 2, 1, np.where(bearish >= 2, -1, 0)).astype(np.int8)
+
+
+class TimeframeTrend:
+    """
+    Higher-timeframe indicators kept up to date from base candles
+
+    Each update aggregates only the base candles from the start of the last
+    bucket seen, and the streaming indicators only advance when a bucket
+    closes, so the cost per cycle does not depend on the window length. The
+    values returned are those of the last complete bucket, counting the
+    forming base candle as complete like the live HyperFocus rules do.
+    """
+
+    def __init__(self, timeframe, base_ms, factory):
+        """
+        Args:
+            timeframe (str): Higher timeframe, a multiple of the base timeframe
+            base_ms (int): Base candle length in milliseconds
+            factory (callable): Returns the streaming indicators dict (output name -> indicator)
+        """
+        self.timeframe = timeframe
+        self.period_ms = timeframe_to_ms(timeframe)
+        self.base_ms = base_ms
+        self.factory = factory
+        self.reset()
+
+    def reset(self):
+        self.indicators = self.factory()
+        self.closed_values = {column: NAN for column in TREND_COLUMNS}
+        # Start of the newest bucket, not fed to the indicators yet
+        self.forming_start = None
+        self.last_time = None
+
+    def _set_outputs(self, target, name, value):
+        if isinstance(name, tuple):
+            for key, item in zip(name, value):
+                target[key] = item
+        else:
+            target[name] = value
+
+    def update(self, times, columns):
+        """
+        Bring the timeframe up to date with the base candles
+
+        Args:
+            times (np.ndarray): Base candle open times in milliseconds, oldest first
+            columns (dict): Base OHLCV column name -> array aligned with times
+
+        Returns:
+            dict: Indicator name -> value at the last complete bucket
+        """
+        if self.last_time is not None and (times[-1] < self.last_time or
+                                           (self.forming_start is not None and times[0] > self.forming_start)):
+            # The window went back in time or skipped candles, start over from it
+            self.reset()
+
+        start = 0
+        if self.forming_start is not None:
+            start = int(np.searchsorted(times, self.forming_start, side='left'))
+        recent = {column: values[start:] for column, values in columns.items()}
+        recent['timestamp'] = times[start:]
+        candles = resample_ohlcv(recent, self.timeframe)
+        if self.forming_start is None and len(candles) and times[0] > candles[0, 0]:
+            # The window starts mid-bucket, that first candle would be incomplete
+            candles = candles[1:]
+        if len(candles) == 0:
+            return dict(self.closed_values)
+
+        for candle in candles[:-1]:
+            for name, indicator in self.indicators.items():
+                self._set_outputs(self.closed_values, name, indicator.update(candle[4]))
+        self.forming_start = int(candles[-1, 0])
+        self.last_time = int(times[-1])
+
+        if self.last_time + self.base_ms < self.forming_start + self.period_ms:
+            return dict(self.closed_values)
+        latest = {}
+        for name, indicator in self.indicators.items():
+            self._set_outputs(latest, name, indicator.preview(candles[-1, 4]))
+        return latest
+
+
+class MultiTimeframeHyperFocusStrategy(HyperFocusStrategy):
+    """
+    HyperFocus with trend confirmation from higher timeframes
+
+    HyperFocus signals on the base timeframe are only taken when enough of the
+    higher timeframes (15m, 1h and 4h by default) trend the same way by RSI,
+    MACD and moving averages. Every higher timeframe is aggregated from the
+    base candles the strategy already receives, so it costs no extra API calls.
+    """
+
+    def __init__(self, config):
+        """Initialize the multi-timeframe strategy with configuration"""
+        super().__init__(config.get("multi_timeframe_strategy", config))
+        self.timeframe = self.config.get("timeframe", "5m")
+        self.base_ms = timeframe_to_ms(self.timeframe)
+
+        self.confirmation_timeframes = []
+        for timeframe in self.config.get("confirmation_timeframes", ["15m", "1h", "4h"]):
+            period = timeframe_to_ms(timeframe)
+            if period <= self.base_ms or period % self.base_ms:
+                logger.error(f"Cannot derive {timeframe} candles from {self.timeframe}, timeframe ignored")
+                continue
+            self.confirmation_timeframes.append(timeframe)
+
+        # Higher timeframes that must trend with the signal (default: a majority)
+        self.min_timeframes_agreeing = self.config.get("min_timeframes_agreeing",
+                                                       len(self.confirmation_timeframes) // 2 + 1)
+
+        # (series, timeframe) -> TimeframeTrend, created on first use
+        self.trends = {}
+
+        logger.info(f"Multi-timeframe HyperFocus on {self.timeframe}, confirming on "
+                    f"{', '.join(self.confirmation_timeframes)}")
+
+    def _create_trend_indicators(self):
+        return {
+            'rsi': indicators.StreamingRSI(self.rsi_period, self.rsi_method),
+            ('macd_line', 'signal_line', 'macd_histogram'): indicators.StreamingMACD(
+                self.fast_period, self.slow_period, self.signal_period
+            ),
+            'ma_fast': indicators.StreamingSMA(self.ma_fast),
+            'ma_slow': indicators.StreamingSMA(self.ma_slow),
+        }
+
+    def _timeframe_candles(self, df, times, timeframe):
+        """Complete higher-timeframe candles of df as an OHLCV DataFrame, for the indicator cache"""
+        columns = {column: indicators.as_array(df[column]) for column in COLUMNS[1:]}
+        columns['timestamp'] = times
+        candles = resample_ohlcv(columns, timeframe)
+        if len(candles) and times[0] > candles[0, 0]:
+            candles = candles[1:]
+        higher = pd.DataFrame(candles[:, 1:], columns=list(COLUMNS[1:]),
+                              index=pd.to_datetime(candles[:, 0].astype(np.int64), unit='ms'))
+        higher.attrs.update(symbol=df.attrs.get('symbol'), timeframe=timeframe)
+        return higher
+
+    def timeframe_votes(self, df):
+        """
+        Trend of every higher timeframe at every bar of df
+
+        Each bar sees the last higher-timeframe candle that was complete when
+        the bar closed, never a later one.
+
+        Returns:
+            dict: Timeframe -> trend array (1, -1, 0) aligned with df
+        """
+        times = candle_times_ms(df)
+        closes = times + self.base_ms
+        cache = indicators.get_indicator_cache()
+        votes = {}
+        for timeframe in self.confirmation_timeframes:
+            higher = self._timeframe_candles(df, times, timeframe)
+            if higher.empty:
+                votes[timeframe] = np.zeros(len(df), dtype=np.int8)
+                continue
+            macd_line, signal_line, _ = cache.get(higher, 'macd', fast_period=self.fast_period,
+                                                  slow_period=self.slow_period, signal_period=self.signal_period)
+            trend = trend_votes(
+                cache.get(higher, 'rsi', period=self.rsi_period, method=self.rsi_method),
+                macd_line, signal_line,
+                cache.get(higher, 'sma', period=self.ma_fast),
+                cache.get(higher, 'sma', period=self.ma_slow)
+            )
+            ends = candle_times_ms(higher) + timeframe_to_ms(timeframe)
+            last_complete = np.searchsorted(ends, closes, side='right') - 1
+            votes[timeframe] = np.where(last_complete >= 0, trend[np.maximum(last_complete, 0)], 0).astype(np.int8)
+        return votes
+
+    def _confirm(self, batch, votes):
+        """Keep the base signals enough higher timeframes agree with, and grade them"""
+        types = batch['type']
+        agreeing = np.zeros(len(batch), dtype=np.int8)
+        for trend in votes.values():
+            agreeing += (trend == types) & (types != 0)
+        confirmed = agreeing >= self.min_timeframes_agreeing
+        batch['type'] = np.where(confirmed, types, 0)
+        batch['confirmations'] = np.where(batch['type'] != 0, batch['confirmations'] + agreeing, 0)
+        batch['strength'] = np.where(
+            batch['type'] != 0, np.minimum(batch['confirmations'] / (3.0 + len(votes)), 1.0), 0.0
+        )
+        return batch
+
+    def generate_signals_batch(self, df):
+        """
+        Signals for every bar of df in one pass
+
+        Args:
+            df (pd.DataFrame): OHLCV data on the base timeframe
+
+        Returns:
+            np.ndarray: Signal array (type, strength, confirmations) aligned with df
+        """
+        batch = super().generate_signals_batch(df)
+        if not self.confirmation_timeframes or candle_times_ms(df) is None:
+            return batch
+        return self._confirm(batch, self.timeframe_votes(df))
+
+    def latest_votes(self, df):
+        """
+        Trend of every higher timeframe at the forming candle
+
+        Only base candles since the previous call are aggregated. Frames without
+        a symbol and timeframe in df.attrs are aggregated in full every call, so
+        different series never share trend state.
+
+        Returns:
+            dict: Timeframe -> 1 (bullish), -1 (bearish) or 0
+        """
+        times = candle_times_ms(df)
+        if times is None:
+            return {}
+        columns = {column: indicators.as_array(df[column]) for column in COLUMNS[1:]}
+        symbol, series_timeframe = df.attrs.get('symbol'), df.attrs.get('timeframe')
+        series = None if symbol is None or series_timeframe is None else f"{symbol}|{series_timeframe}"
+
+        votes = {}
+        for timeframe in self.confirmation_timeframes:
+            if series is None:
+                trend = TimeframeTrend(timeframe, self.base_ms, self._create_trend_indicators)
+            else:
+                trend = self.trends.get((series, timeframe))
+                if trend is None:
+                    trend = self.trends[(series, timeframe)] = TimeframeTrend(
+                        timeframe, self.base_ms, self._create_trend_indicators)
+            values = trend.update(times, columns)
+            votes[timeframe] = int(trend_votes(*(np.array([values[column]]) for column in TREND_COLUMNS))[0])
+        return votes
+
+    def generate_signals(self, df):
+        """Generate HyperFocus signals confirmed on the higher timeframes"""
+        if df is None or len(df) < 2:
+            return super().generate_signals(df)
+
+        # Kept up to date every cycle, so each update only sees the newest candles
+        votes = self.latest_votes(df)
+        signals = []
+        for signal in super().generate_signals(df):
+            direction = 1 if signal['type'] == 'buy' else -1
+            agreeing = [timeframe for timeframe, trend in votes.items() if trend == direction]
+            if len(agreeing) < self.min_timeframes_agreeing:
+                logger.info(f"{signal['type'].upper()} signal not confirmed on higher timeframes "
+                            f"({len(agreeing)}/{len(votes)} agree)")
+                continue
+
+            signal['confirmations'] += len(agreeing)
+            signal['strength'] = min(signal['confirmations'] / (3.0 + len(votes)), 1.0)
+            signal['timeframes'] = {timeframe: {1: 'bullish', -1: 'bearish'}.get(trend, 'neutral')
+                                    for timeframe, trend in votes.items()}
+            details = [] if signal['confirmation_details'] == "No confirmations" else [signal['confirmation_details']]
+            signal['confirmation_details'] = ", ".join(details + [f"{'/'.join(agreeing)} trend agrees"])
+            logger.info(f"Confirmed on {len(agreeing)}/{len(votes)} higher timeframes ({', '.join(agreeing)})")
+            signals.append(signal)
+        return signals
@@ -1,6 +1,8 @@
 import logging
 import numpy as np
 import pandas as pd
+import indicators
+from strategies.signals import signal_batch, signal_records
 
 logger = logging.getLogger("BROski.RSIStrategy")
 
@@ -17,47 +19,48 @@ class RSIStrategy:
         self.rsi_period = config.get("rsi_period", 14)
         self.rsi_overbought = config.get("rsi_overbought", 70)
         self.rsi_oversold = config.get("rsi_oversold", 30)
+        self.rsi_method = config.get("rsi_method", indicators.DEFAULT_RSI_METHOD)
+        
+        # RSI kept up to date candle by candle for each watched pair
+        self.streams = indicators.IndicatorStreams(
+            lambda: {'rsi': ('close', indicators.StreamingRSI(self.rsi_period, self.rsi_method))}
+        )
         
     def calculate_rsi(self, prices):
         """Calculate RSI indicator"""
-        deltas = np.diff(prices)
-        seed = deltas[:self.rsi_period+1]
-        
-        # Calculate gains and losses
-        up = seed[seed >= 0].sum() / self.rsi_period
-        down = -seed[seed < 0].sum() / self.rsi_period
+        return indicators.rsi(prices, self.rsi_period, self.rsi_method)
+    
+    def signals_from_rsi(self, rsi):
+        """
+        Evaluate the RSI rules on every bar at once
         
-        if down == 0:
-            rs = float('inf')
-        else:
-            rs = up / down
+        Args:
+            rsi (np.ndarray): RSI values
             
-        rsi = np.zeros_like(prices)
-        rsi[:self.rsi_period+1] = 100. - (100. / (1. + rs))
+        Returns:
+            np.ndarray: 1 = buy, -1 = sell, 0 = no signal, per bar
+        """
+        previous = np.concatenate(([np.nan], rsi[:-1]))
+        with np.errstate(invalid='ignore'):
+            buy = (rsi < self.rsi_oversold) & (previous >= self.rsi_oversold)
+            sell = (rsi > self.rsi_overbought) & (previous <= self.rsi_overbought)
+        return np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8)
+    
+    def generate_signals_batch(self, df):
+        """
+        Signals for every bar of df in one pass
         
-        # Calculate RSI for the rest of the data
-        for i in range(self.rsi_period+1, len(prices)):
-            delta = deltas[i-1]
-            
-            if delta > 0:
-                upval = delta
-                downval = 0
-            else:
-                upval = 0
-                downval = -delta
-                
-            # Use exponential moving average
-            up = (up * (self.rsi_period-1) + upval) / self.rsi_period
-            down = (down * (self.rsi_period-1) + downval) / self.rsi_period
+        Args:
+            df (pd.DataFrame): OHLCV data, an 'rsi' column is used if present
             
-            if down == 0:
-                rs = float('inf')
-            else:
-                rs = up / down
-                
-            rsi[i] = 100. - (100. / (1. + rs))
-            
-        return rsi
+        Returns:
+            np.ndarray: Signal array (type, strength, confirmations) aligned with df
+        """
+        if 'rsi' in df.columns:
+            rsi = indicators.as_array(df['rsi'])
+        else:
+            rsi = indicators.get_indicator_cache().get(df, 'rsi', period=self.rsi_period, method=self.rsi_method)
+        return signal_batch(self.signals_from_rsi(rsi))
     
     def generate_signals(self, df):
         """Generate trading signals based on RSI values"""
@@ -68,37 +71,23 @@ class RSIStrategy:
             return signals
             
         try:
-            # Calculate RSI if not already in the dataframe
-            if 'rsi' not in df.columns:
-                prices = df['close'].values
-                rsi_values = self.calculate_rsi(prices)
-                df['rsi'] = rsi_values
-            
-            # Get the latest RSI value
-            latest_rsi = df['rsi'].iloc[-1]
-            previous_rsi = df['rsi'].iloc[-2]
+            # Use RSI already in the dataframe, otherwise update it incrementally
+            if 'rsi' in df.columns:
+                previous_rsi, latest_rsi = df['rsi'].iloc[-2], df['rsi'].iloc[-1]
+            else:
+                previous_rsi, latest_rsi = self.streams.update(df)['rsi']
             
             logger.info(f"Current RSI: {latest_rsi:.2f}, Previous RSI: {previous_rsi:.2f}")
             
-            # Generate buy signal if RSI crosses below oversold threshold
-            if latest_rsi < self.rsi_oversold and previous_rsi >= self.rsi_oversold:
-                signals.append({
-                    'type': 'buy',
-                    'price': df['close'].iloc[-1],
-                    'rsi': latest_rsi,
-                    'timestamp': df.index[-1]
-                })
-                logger.info(f"🟢 BUY signal generated (RSI: {latest_rsi:.2f} < {self.rsi_oversold})")
-                
-            # Generate sell signal if RSI crosses above overbought threshold
-            elif latest_rsi > self.rsi_overbought and previous_rsi <= self.rsi_overbought:
-                signals.append({
-                    'type': 'sell',
-                    'price': df['close'].iloc[-1],
-                    'rsi': latest_rsi,
-                    'timestamp': df.index[-1]
-                })
-                logger.info(f"🔴 SELL signal generated (RSI: {latest_rsi:.2f} > {self.rsi_overbought})")
+            # Same rules as generate_signals_batch, on the last closed and the forming candle
+            batch = signal_batch(self.signals_from_rsi(np.array([previous_rsi, latest_rsi])))
+            signals = signal_records(batch, df.iloc[-2:], rows=[1])
+            for signal in signals:
+                signal['rsi'] = latest_rsi
+                if signal['type'] == 'buy':
+                    logger.info(f"🟢 BUY signal generated (RSI: {latest_rsi:.2f} < {self.rsi_oversold})")
+                else:
+                    logger.info(f"🔴 SELL signal generated (RSI: {latest_rsi:.2f} > {self.rsi_overbought})")
                 
             return signals
             
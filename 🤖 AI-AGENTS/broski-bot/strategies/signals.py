@@ -0,0 +1,61 @@
+import numpy as np
+
+# One record per bar: 1 = buy, -1 = sell, 0 = no signal; strength 0-1 (NaN when the
+# strategy does not grade its signals); number of confirming indicators
+SIGNAL_DTYPE = np.dtype([('type', np.int8), ('strength', np.float64), ('confirmations', np.int8)])
+
+SIGNAL_NAMES = {1: 'buy', -1: 'sell'}
+
+
+def signal_batch(types, strength=None, confirmations=None):
+    """
+    Build a signal array from per-bar rule results
+
+    Args:
+        types (np.ndarray): 1 = buy, -1 = sell, 0 = no signal, per bar
+        strength (np.ndarray): Signal strength 0-1 per bar (default NaN)
+        confirmations (np.ndarray): Confirming indicators per bar (default 0)
+
+    Returns:
+        np.ndarray: Structured array with SIGNAL_DTYPE
+    """
+    batch = np.zeros(len(types), dtype=SIGNAL_DTYPE)
+    batch['type'] = types
+    batch['strength'] = np.nan if strength is None else strength
+    if confirmations is not None:
+        batch['confirmations'] = confirmations
+    return batch
+
+
+def signal_strength(batch):
+    """Strength column of a signal array, or None if the strategy does not grade its signals"""
+    strength = batch['strength']
+    return None if np.isnan(strength).all() else strength
+
+
+def signal_records(batch, df, rows=None):
+    """
+    Signal dicts, in the format generate_signals returns, for the bars that have a signal
+
+    Args:
+        batch (np.ndarray): Signal array aligned with df
+        df (pd.DataFrame): OHLCV data the signals were computed on
+        rows (np.ndarray): Only these bars (default: all)
+
+    Returns:
+        list: One dict per signal with type, price, timestamp and, when set, strength and confirmations
+    """
+    rows = np.flatnonzero(batch['type']) if rows is None else [row for row in rows if batch['type'][row]]
+    close = df['close'].to_numpy()
+    records = []
+    for row in rows:
+        record = {
+            'type': SIGNAL_NAMES[int(batch['type'][row])],
+            'price': close[row],
+            'timestamp': df.index[row]
+        }
+        if not np.isnan(batch['strength'][row]):
+            record['strength'] = float(batch['strength'][row])
+            record['confirmations'] = int(batch['confirmations'][row])
+        records.append(record)
+    return records
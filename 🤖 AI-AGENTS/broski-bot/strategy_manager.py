@@ -1,15 +1,26 @@
 import logging
-import importlib
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pandas as pd
 import numpy as np
+from strategies.signals import signal_batch, signal_records, SIGNAL_NAMES
+from strategy_registry import get_strategy_registry
 
 logger = logging.getLogger("BROski.StrategyManager")
 
+# How ensemble signals are combined: the active strategy trades and the others
+# run in shadow, or the members vote with their weights
+VOTING_MODES = ("active", "weighted")
+
 class StrategyManager:
     """
     Manages trading strategies for BROski Bot
+    
+    Besides the active strategy, any set of strategies listed in
+    strategies.ensemble is evaluated on the same candles. Their indicators come
+    from the shared indicator cache, so an RSI or MACD used by several members
+    is computed once, and the members run in a thread pool.
     """
     
     def __init__(self, config):
@@ -19,34 +30,26 @@ class StrategyManager:
         self.active_strategy = None
         self.load_active_strategy()
         
+        # Strategies evaluated side by side with the active one
+        self.ensemble = {}
+        self.executor = None
+        self.last_votes = {}
+        self.load_ensemble()
+    
+    def _create_strategy(self, strategy_name):
+        """Import (on first use) and instantiate a strategy by its config name"""
+        return get_strategy_registry().create(strategy_name, self.config["strategies"].get(strategy_name, {}))
+        
     def load_active_strategy(self):
         """Load the active strategy based on configuration"""
         try:
             logger.info(f"Loading strategy: {self.active_strategy_name}")
             
-            # Map strategy names to module paths
-            strategy_map = {
-                "rsi_strategy": ("strategies.rsi_strategy", "RSIStrategy"),
-                "macd_strategy": ("strategies.macd_strategy", "MACDStrategy"),
-                "ml_strategy": ("strategies.lite_ml_strategy", "LiteMLStrategy"),
-                "hyperfocus_strategy": ("strategies.hyperfocus_strategy", "HyperFocusStrategy")
-            }
-            
-            if self.active_strategy_name not in strategy_map:
+            if self.active_strategy_name not in get_strategy_registry():
                 logger.error(f"Unknown strategy: {self.active_strategy_name}")
                 return False
             
-            # Get module and class name
-            module_path, class_name = strategy_map[self.active_strategy_name]
-            
-            # Import the module
-            module = importlib.import_module(module_path)
-            
-            # Get the strategy class
-            strategy_class = getattr(module, class_name)
-            
-            # Instantiate the strategy
-            self.active_strategy = strategy_class(self.config["strategies"][self.active_strategy_name])
+            self.active_strategy = self._create_strategy(self.active_strategy_name)
             
             logger.info(f"Successfully loaded {self.active_strategy_name}")
             return True
@@ -61,14 +64,177 @@ class StrategyManager:
             logger.error(f"Error loading strategy: {str(e)}")
             return False
     
+    def load_ensemble(self, loaded=None):
+        """
+        Load the strategies listed in strategies.ensemble
+        
+        The active strategy is always a member. Members that fail to load or
+        have no batch signal method are left out with an error in the log.
+        
+        Args:
+            loaded (dict): Strategy name -> instance that can be reused as is
+        """
+        loaded = loaded or {}
+        ensemble_config = self.config["strategies"].get("ensemble", {})
+        self.voting = ensemble_config.get("voting", "active")
+        if self.voting not in VOTING_MODES:
+            logger.error(f"Unknown ensemble voting mode: {self.voting}, using 'active'")
+            self.voting = "active"
+        self.weights = ensemble_config.get("weights", {})
+        self.threshold = ensemble_config.get("threshold", 0.5)
+        
+        self.ensemble = {}
+        if self.active_strategy is not None:
+            self.ensemble[self.active_strategy_name] = self.active_strategy
+        for strategy_name in ensemble_config.get("strategies", []):
+            if strategy_name in self.ensemble:
+                continue
+            try:
+                strategy = loaded.get(strategy_name) or self._create_strategy(strategy_name)
+            except Exception as e:
+                logger.error(f"Could not load ensemble strategy {strategy_name}: {str(e)}")
+                continue
+            if not hasattr(strategy, 'generate_signals_batch'):
+                logger.error(f"Ensemble strategy {strategy_name} has no generate_signals_batch")
+                continue
+            self.ensemble[strategy_name] = strategy
+        
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        workers = ensemble_config.get("workers", len(self.ensemble))
+        if len(self.ensemble) > 1 and workers > 1:
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="BROski-Ensemble")
+        
+        if len(self.ensemble) > 1:
+            logger.info(f"Ensemble of {', '.join(self.ensemble)} ({self.voting} voting)")
+    
+    def apply_config(self, config):
+        """
+        Switch to a new configuration between cycles
+        
+        Only strategies whose settings changed are rebuilt; the others keep
+        their state. Indicators come from the shared indicator cache, so a
+        rebuilt strategy computes nothing that is already cached for its
+        parameters. If the new active strategy cannot be loaded, nothing
+        changes.
+        
+        Args:
+            config (dict): Validated bot configuration
+            
+        Returns:
+            bool: True if the new configuration is in use
+        """
+        old_config = self.config
+        old_strategies = old_config["strategies"]
+        new_strategies = config["strategies"]
+        loaded = {name: strategy for name, strategy in self.ensemble.items()
+                  if old_strategies.get(name) == new_strategies.get(name)}
+        
+        active_strategy_name = new_strategies["active_strategy"]
+        active_strategy = loaded.get(active_strategy_name)
+        if active_strategy is None:
+            try:
+                self.config = config
+                active_strategy = self._create_strategy(active_strategy_name)
+            except Exception as e:
+                self.config = old_config
+                logger.error(f"Keeping {self.active_strategy_name}, could not load {active_strategy_name}: {str(e)}")
+                return False
+            logger.info(f"Loaded {active_strategy_name} with new settings")
+        
+        self.config = config
+        self.active_strategy_name = active_strategy_name
+        self.active_strategy = active_strategy
+        if old_strategies != new_strategies:
+            self.load_ensemble(loaded)
+        return True
+    
+    def required_indicators(self):
+        """(kernel name, params) pairs the loaded strategies read from the indicator cache"""
+        names = list(self.ensemble) or [self.active_strategy_name]
+        return get_strategy_registry().required_indicators(names, self.config["strategies"])
+    
+    def warmup_candles(self):
+        """Candles the loaded strategies need before they can signal"""
+        names = list(self.ensemble) or [self.active_strategy_name]
+        return get_strategy_registry().warmup_candles(names, self.config["strategies"])
+    
+    def evaluate(self, df, names=None):
+        """
+        Signal arrays of ensemble members on the same candles
+        
+        Args:
+            df (pd.DataFrame): OHLCV data
+            names (list): Members to evaluate (default: all)
+            
+        Returns:
+            dict: Strategy name -> signal array (type, strength, confirmations)
+        """
+        names = [name for name in (names or self.ensemble) if name in self.ensemble]
+        if self.executor is not None and len(names) > 1:
+            batches = self.executor.map(lambda name: self.ensemble[name].generate_signals_batch(df), names)
+        else:
+            batches = (self.ensemble[name].generate_signals_batch(df) for name in names)
+        return dict(zip(names, batches))
+    
+    def combine(self, batches):
+        """
+        Combine member signal arrays with the configured voting mode
+        
+        'active' returns the active strategy's signals. 'weighted' adds up the
+        members' votes (buy = +weight, sell = -weight) and signals when the
+        result reaches `threshold` of the total weight either way; strength is
+        that share and confirmations the number of members that agree.
+        
+        Returns:
+            np.ndarray: Combined signal array
+        """
+        if self.voting == "active":
+            return batches[self.active_strategy_name]
+        
+        weights = np.array([float(self.weights.get(name, 1.0)) for name in batches])
+        types = np.vstack([batch['type'] for batch in batches.values()]).astype(np.float64)
+        score = weights @ types / weights.sum()
+        combined = np.where(score >= self.threshold, 1, np.where(score <= -self.threshold, -1, 0))
+        agreeing = ((types == combined) & (combined != 0)).sum(axis=0)
+        return signal_batch(combined, np.where(combined != 0, np.abs(score), 0.0), agreeing)
+    
+    def generate_signals_batch(self, df):
+        """Ensemble signals for every bar of df, see combine"""
+        return self.combine(self.evaluate(df))
+    
+    def _record_votes(self, batches):
+        """Remember and log what every member says about the latest candle"""
+        self.last_votes = {name: SIGNAL_NAMES.get(int(batch['type'][-1])) for name, batch in batches.items()}
+        for name, vote in self.last_votes.items():
+            if vote and name != self.active_strategy_name:
+                logger.info(f"Ensemble member {name} signals {vote.upper()}")
+    
     def generate_signals(self, df):
-        """Generate signals using the active strategy"""
+        """Generate signals using the active strategy, or the ensemble vote"""
         if self.active_strategy is None:
             logger.error("No active strategy loaded")
             return []
         
         try:
-            return self.active_strategy.generate_signals(df)
+            if len(self.ensemble) < 2 or len(df) == 0:
+                return self.active_strategy.generate_signals(df)
+            
+            if self.voting == "active":
+                # The others run in shadow
+                shadows = [name for name in self.ensemble if name != self.active_strategy_name]
+                self._record_votes(self.evaluate(df, shadows))
+                return self.active_strategy.generate_signals(df)
+            
+            batches = self.evaluate(df)
+            self._record_votes(batches)
+            signals = signal_records(self.combine(batches), df, rows=[len(df) - 1])
+            for signal in signals:
+                signal['votes'] = dict(self.last_votes)
+                logger.info(f"Ensemble {signal['type'].upper()} signal: {signal['confirmations']}/{len(batches)} "
+                            f"strategies agree")
+            return signals
         except Exception as e:
             logger.error(f"Error generating signals: {str(e)}")
             return []
@@ -78,7 +244,10 @@ class StrategyManager:
         return {
             "name": self.active_strategy_name,
             "config": self.config["strategies"][self.active_strategy_name],
-            "status": "active" if self.active_strategy is not None else "error"
+            "status": "active" if self.active_strategy is not None else "error",
+            "ensemble": list(self.ensemble),
+            "voting": self.voting,
+            "last_votes": dict(self.last_votes)
         }
     
     def set_strategy(self, strategy_name):
@@ -86,6 +255,7 @@ class StrategyManager:
         if strategy_name in self.config["strategies"]:
             self.active_strategy_name = strategy_name
             self.load_active_strategy()
+            self.load_ensemble()
             return True
         else:
             logger.error(f"Unknown strategy: {strategy_name}")
@@ -1,11 +1,99 @@
 import os
 import json
+import time
+import signal
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 import matplotlib.pyplot as plt
+from sklearn.ensemble import ExtraTreesRegressor
 from sklearn.model_selection import ParameterGrid
+from backtester import Backtester
+from candle_store import COLUMNS, CandleStore
+from config_watcher import atomic_write_json
+from indicators import DEFAULT_RSI_METHOD
+from indicators.multi import IndicatorTable
+from result_store import ResultStore, data_fingerprint, params_hash
+from strategies.hyperfocus_strategy import HyperFocusStrategy
+
+# HyperFocus settings that change its signals, the identity of a parameter set in the result store
+HYPERFOCUS_SIGNAL_PARAMS = (
+    'rsi_period', 'rsi_overbought', 'rsi_oversold', 'rsi_method',
+    'fast_period', 'slow_period', 'signal_period',
+    'ma_fast', 'ma_slow', 'volume_factor', 'volume_lookback', 'require_confirmation'
+)
+
+# Strategies built with an empty config, to read default settings from
+_default_strategies = {}
+
+# Candles, indicator rows and backtester of the running sweep, set once in each worker process
+_sweep = {}
+
+
+def _load_shared_history(config, symbol, timeframe, first_timestamp, length):
+    """
+    OHLCV DataFrame over the candle store's memory-mapped columns
+
+    The columns are not copied, so worker processes read the same pages as the
+    parent and row slices of the result stay views.
+    """
+    columns = CandleStore.from_config(config).read(symbol, timeframe, since=first_timestamp)
+    history = pd.DataFrame({column: columns[column][:length] for column in COLUMNS[1:]},
+                           index=pd.to_datetime(np.asarray(columns['timestamp'][:length]), unit='ms'),
+                           copy=False)
+    history.index.name = 'timestamp'
+    history.attrs.update(symbol=symbol, timeframe=timeframe)
+    return history
+
+
+def _init_sweep_worker(config, symbol, timeframe, first_timestamp, length, param_grid, base_params):
+    """
+    Load the sweep's candles in a worker process
+
+    Candles are read from the candle store's memory-mapped column files rather
+    than pickled from the parent, so every worker shares the same page cache.
+    """
+    # Ctrl+C is handled by the parent, which cancels the remaining chunks
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    history = _load_shared_history(config, symbol, timeframe, first_timestamp, length)
+
+    _sweep.update(
+        history=history,
+        table=StrategyOptimizer.build_indicator_table(history, param_grid, base_params),
+        backtester=Backtester.from_config(config),
+        base_params=base_params
+    )
+
+
+def _evaluate_sweep_chunk(param_sets):
+    """Backtest a chunk of parameter sets in a worker process"""
+    results = []
+    for params in param_sets:
+        result = StrategyOptimizer._evaluate_hyperfocus(
+            _sweep['table'], _sweep['history'], _sweep['backtester'], {**_sweep['base_params'], **params}
+        )
+        result['params'] = params
+        results.append(result)
+    return results
+
+
+def _run_walk_forward_fold(config, symbol, timeframe, first_timestamp, length, fold, base_params, search):
+    """Optimize and test one walk-forward fold in a worker process"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    history = _load_shared_history(config, symbol, timeframe, first_timestamp, length)
+    optimizer = StrategyOptimizer()
+    optimizer.param_grid = search['param_grid']
+    optimizer.adaptive_space = search['adaptive_space']
+    optimizer.use_result_store = search['use_result_store']
+    store = optimizer.open_result_store(config)
+    try:
+        return optimizer.run_fold(config, history, fold, base_params, search['method'], store)
+    finally:
+        if store is not None:
+            store.close()
+
 
 class StrategyOptimizer:
     """
@@ -26,6 +114,40 @@ class StrategyOptimizer:
         self.trade_history_file = "logs/trade_history.json"
         self.market_data_file = "data/market_data.csv"
         self.optimization_log = "data/optimization/hyperfocus_optimization.json"
+        self.walk_forward_log = "data/optimization/hyperfocus_walk_forward.json"
+        self.walk_forward_equity_file = "data/optimization/walk_forward_equity.csv"
+        
+        # Backtest results are reused across runs unless this is switched off
+        self.use_result_store = True
+        
+        # Candle history needed before parameters are scored
+        self.min_history = 500
+        
+        # Parameter grid for exhaustive optimization
+        self.param_grid = {
+            'rsi_period': [12, 14, 16],
+            'rsi_overbought': [68, 70, 72, 75],
+            'rsi_oversold': [25, 28, 30, 32],
+            'ma_fast': [15, 20, 25],
+            'ma_slow': [45, 50, 55],
+            'volume_factor': [1.3, 1.5, 1.8],
+            'volume_lookback': [15, 20, 25]
+        }
+        
+        # Wider space searched by successive halving, too large to test exhaustively
+        self.adaptive_space = {
+            'rsi_period': [10, 12, 14, 16, 18, 21],
+            'rsi_overbought': [65, 68, 70, 72, 75, 78],
+            'rsi_oversold': [22, 25, 28, 30, 32, 35],
+            'fast_period': [8, 10, 12, 14],
+            'slow_period': [21, 26, 30, 34],
+            'signal_period': [7, 9, 11],
+            'ma_fast': [10, 15, 20, 25, 30],
+            'ma_slow': [40, 45, 50, 55, 60, 100],
+            'volume_factor': [1.2, 1.3, 1.5, 1.8, 2.0],
+            'volume_lookback': [10, 15, 20, 25, 30],
+            'require_confirmation': [True, False]
+        }
         
         # Metrics to track for optimization
         self.metric_columns = [
@@ -174,10 +296,17 @@ class StrategyOptimizer:
             print(f"Error analyzing performance: {e}")
             return {"error": str(e)}
     
-    def optimize_hyperfocus(self):
+    def optimize_hyperfocus(self, workers=None, progress=None, cancel_event=None, method=None):
         """
         Optimize HyperFocus strategy parameters based on historical performance
         
+        Args:
+            workers (int): Worker processes (default: optimization.workers in config.json, else all cores)
+            progress (callable): Called as progress(tested, total) whenever results arrive
+            cancel_event (threading.Event): Set it to stop early and keep the best result so far
+            method (str): 'grid' (every combination of param_grid) or 'halving' (successive
+                halving over adaptive_space), default optimization.method in config.json
+            
         Returns:
             Dictionary with optimized parameters
         """
@@ -194,44 +323,55 @@ class StrategyOptimizer:
         # Analyze recent performance with current settings
         current_performance = self.analyze_performance(days=30)
         
-        # Parameter grid for testing
-        param_grid = {
-            'rsi_period': [12, 14, 16],
-            'rsi_overbought': [68, 70, 72, 75],
-            'rsi_oversold': [25, 28, 30, 32],
-            'ma_fast': [15, 20, 25],
-            'ma_slow': [45, 50, 55],
-            'volume_factor': [1.3, 1.5, 1.8],
-            'volume_lookback': [15, 20, 25]
-        }
-        
-        # Get trade history for backtesting
-        if not os.path.exists(self.trade_history_file) or not os.path.exists(self.market_data_file):
+        # Score parameters on the stored candle history
+        timeframe = current_params.get("timeframe", "15m")
+        symbol, history = self.load_history(config, timeframe)
+        # The newest candles are held out so validate_parameters can test the result on unseen data
+        history = history.iloc[:self.holdout_start(config, len(history))]
+        if len(history) < self.min_history:
             return {
                 "error": "Insufficient data for optimization",
-                "recommendation": "Continue collecting data in monitor mode"
+                "recommendation": f"Download history first (python backfill.py --symbol {symbol} --timeframes {timeframe})"
             }
         
-        # Load market data if available (in practice, this would be loaded from an actual file)
-        try:
-            market_data = pd.read_csv(self.market_data_file)
-        except:
-            # If we don't have market data file yet, we'll generate a recommendation based on metrics
-            return self._generate_recommendations(current_params, current_performance)
+        optimization_config = config.get("optimization", {})
+        method = method or optimization_config.get("method", "grid")
+        workers = workers or optimization_config.get("workers") or os.cpu_count() or 1
+        started = time.perf_counter()
+        search = {}
+        store = self.open_result_store(config)
         
-        # Perform optimization (simplified version)
-        results = []
-        for params in ParameterGrid(param_grid):
-            # In a real implementation, this would run a backtest with the parameters
-            # Here we'll just generate a simulated result
-            simulated_result = {
-                'params': params,
-                'win_rate': np.random.uniform(40, 70),  # Simulated win rate
-                'pnl': np.random.uniform(-100, 300)     # Simulated P&L
-            }
-            results.append(simulated_result)
+        if method == "halving":
+            results, cancelled, search = self.successive_halving(
+                config, history, self.adaptive_space, current_params,
+                candidates=optimization_config.get("candidates", 243),
+                eta=optimization_config.get("eta", 3),
+                guided=optimization_config.get("guided", False),
+                seed=optimization_config.get("seed", 0),
+                progress=progress, cancel_event=cancel_event, store=store
+            )
+        else:
+            total = len(ParameterGrid(self.param_grid))
+            results = []
+            cancelled = False
+            sweep = self.sweep_hyperfocus(config, history, self.param_grid, current_params, workers, store)
+            try:
+                for chunk in sweep:
+                    results.extend(chunk)
+                    if progress:
+                        progress(len(results), total)
+                    if cancel_event is not None and cancel_event.is_set():
+                        cancelled = True
+                        break
+            except KeyboardInterrupt:
+                cancelled = True
+            finally:
+                sweep.close()
+        
+        if not results:
+            return {"error": "Optimization cancelled before any parameters were tested"}
         
-        # Find best parameters (in a real implementation, this would use actual backtest results)
+        # Find best parameters
         best_result = max(results, key=lambda x: x['pnl'])
         
         # Save optimization log
@@ -240,6 +380,14 @@ class StrategyOptimizer:
             'current_parameters': current_params,
             'current_performance': current_performance,
             'tested_parameters': len(results),
+            'cancelled': cancelled,
+            'method': method,
+            'search': search,
+            'candles': len(history),
+            'optimized_to': str(history.index[-1]),
+            'workers': workers,
+            'cached_results': store.stats['hits'] if store else 0,
+            'duration_seconds': round(time.perf_counter() - started, 2),
             'best_parameters': best_result['params'],
             'best_performance': {
                 'win_rate': best_result['win_rate'],
@@ -255,12 +403,655 @@ class StrategyOptimizer:
         return {
             'current_params': current_params,
             'optimized_params': best_result['params'],
+            'tested_parameters': len(results),
+            'cancelled': cancelled,
+            'method': method,
+            'workers': workers,
             'improvement': {
                 'pnl_increase': best_result['pnl'] - current_performance.get('total_pnl', 0),
                 'win_rate_increase': best_result['win_rate'] - current_performance.get('win_rate', 0)
             }
         }
     
+    def open_result_store(self, config):
+        """Result store for this run, or None when caching is switched off"""
+        if not self.use_result_store or not config.get("optimization", {}).get("cache_results", True):
+            return None
+        return ResultStore.from_config(config)
+    
+    @staticmethod
+    def _result_key(base_params, params):
+        """
+        Result store hash of the HyperFocus settings a parameter set backtests with
+        
+        Settings left out of the config count with the strategy's default value.
+        """
+        if 'hyperfocus' not in _default_strategies:
+            _default_strategies['hyperfocus'] = HyperFocusStrategy({})
+        defaults = _default_strategies['hyperfocus']
+        merged = {**base_params, **params}
+        return params_hash({name: merged.get(name, getattr(defaults, name)) for name in HYPERFOCUS_SIGNAL_PARAMS})
+    
+    @staticmethod
+    def _data_key(history, config, start=0, stop=None):
+        """
+        Result store fingerprint of a backtest window and the settings it trades with
+        
+        Candles before `start` are included because they warm up the indicators.
+        """
+        backtester = Backtester.from_config(config)
+        risk = backtester.risk_manager
+        settings = {
+            'start': start,
+            'fee_rate': backtester.fee_rate,
+            'slippage': backtester.slippage,
+            'initial_balance': backtester.initial_balance,
+            'stop_loss_percentage': risk.stop_loss_percentage,
+            'take_profit_percentage': risk.take_profit_percentage,
+            'max_daily_trades': risk.max_daily_trades,
+            'trade_amount': config.get("trading", {}).get("trade_amount", 10.0),
+            'max_position_size': risk.max_position_size
+        }
+        return data_fingerprint(history.iloc[:stop], settings)
+    
+    def _split_cached(self, store, data_key, base_params, param_sets):
+        """
+        Separate parameter sets with stored results from those still to backtest
+        
+        Returns:
+            tuple: (stored results, parameter sets to backtest)
+        """
+        keys = [self._result_key(base_params, params) for params in param_sets]
+        stored = store.get_many("hyperfocus_strategy", data_key, keys)
+        cached = [{**stored[key], 'params': params} for key, params in zip(keys, param_sets) if key in stored]
+        missing = [params for key, params in zip(keys, param_sets) if key not in stored]
+        return cached, missing
+    
+    def _store_results(self, store, data_key, base_params, results, history, candles):
+        store.put_many("hyperfocus_strategy", data_key,
+                       [(self._result_key(base_params, result['params']), result) for result in results],
+                       symbol=history.attrs.get('symbol'), timeframe=history.attrs.get('timeframe'),
+                       candles=candles)
+    
+    def sweep_hyperfocus(self, config, history, param_grid, base_params, workers=1, store=None):
+        """
+        Backtest every parameter combination, yielding results as they complete
+        
+        With more than one worker the grid is split into chunks that run in a
+        process pool. Closing the generator cancels the chunks that have not
+        started yet. With a result store, combinations already backtested on
+        the same candles are read from it instead and new results are added.
+        
+        Args:
+            config (dict): Bot configuration
+            history (pd.DataFrame): Candles from load_history
+            param_grid (dict): Parameter name -> candidate values
+            base_params (dict): Values for parameters not in the grid
+            workers (int): Number of worker processes
+            store (ResultStore): Optional store of earlier results
+            
+        Yields:
+            list: Results (trades, win_rate, pnl, max_drawdown, params) of one finished chunk
+        """
+        param_sets = list(ParameterGrid(param_grid))
+        if store is None:
+            yield from self._run_sweep(config, history, param_grid, base_params, param_sets, workers)
+            return
+        
+        data_key = self._data_key(history, config)
+        cached, param_sets = self._split_cached(store, data_key, base_params, param_sets)
+        if cached:
+            yield cached
+        if not param_sets:
+            return
+        
+        sweep = self._run_sweep(config, history, param_grid, base_params, param_sets, workers)
+        try:
+            for results in sweep:
+                self._store_results(store, data_key, base_params, results, history, len(history))
+                yield results
+        finally:
+            sweep.close()
+    
+    def _run_sweep(self, config, history, param_grid, base_params, param_sets, workers):
+        """Backtest param_sets in-process or in a process pool, see sweep_hyperfocus"""
+        # Several chunks per worker keep the pool busy and results flowing
+        chunk_size = max(1, len(param_sets) // (workers * 8))
+        chunks = [param_sets[i:i + chunk_size] for i in range(0, len(param_sets), chunk_size)]
+        
+        if workers <= 1 or len(chunks) == 1:
+            table = self.build_indicator_table(history, param_grid, base_params)
+            backtester = Backtester.from_config(config)
+            for chunk in chunks:
+                results = []
+                for params in chunk:
+                    result = self._evaluate_hyperfocus(table, history, backtester, {**base_params, **params})
+                    result['params'] = params
+                    results.append(result)
+                yield results
+            return
+        
+        symbol, timeframe = history.attrs['symbol'], history.attrs['timeframe']
+        first_timestamp = history.index[0].value // 1_000_000
+        pool = ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=_init_sweep_worker,
+            initargs=(config, symbol, timeframe, first_timestamp, len(history), param_grid, base_params)
+        )
+        futures = [pool.submit(_evaluate_sweep_chunk, chunk) for chunk in chunks]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    def _sample_params(self, space, count, rng, seen):
+        """Draw up to `count` parameter sets from space that are not in `seen`"""
+        names = sorted(space)
+        samples = []
+        for _ in range(count * 20):
+            if len(samples) >= count:
+                break
+            params = {name: space[name][rng.integers(len(space[name]))] for name in names}
+            key = tuple(params[name] for name in names)
+            if key not in seen:
+                seen.add(key)
+                samples.append(params)
+        return samples
+    
+    def _propose_params(self, space, scored, count, rng, seen):
+        """
+        Pick promising parameter sets with a model of the results so far
+        
+        A random forest is fitted to (parameters -> pnl) of the scored sets and
+        the best predicted sets of a large random sample are returned.
+        """
+        names = sorted(space)
+        
+        def encode(param_sets):
+            return np.array([[float(params[name]) for name in names] for params in param_sets])
+        
+        model = ExtraTreesRegressor(n_estimators=100, min_samples_leaf=2, random_state=0)
+        model.fit(encode([result['params'] for result in scored]), [result['pnl'] for result in scored])
+        
+        pool = self._sample_params(space, count * 20, rng, set(seen))
+        if not pool:
+            return []
+        ranked = np.argsort(-model.predict(encode(pool)))
+        proposals = [pool[i] for i in ranked[:count]]
+        seen.update(tuple(params[name] for name in names) for params in proposals)
+        return proposals
+    
+    def successive_halving(self, config, history, space, base_params, candidates=243, eta=3,
+                           guided=False, seed=None, progress=None, cancel_event=None, table=None, stop=None,
+                           store=None):
+        """
+        Adaptive parameter search by successive halving
+        
+        Candidates are first backtested on the newest slice of history, the best
+        1/eta of them move on to a slice eta times longer, and so on until the
+        survivors are tested on the full history. Every rung reads the same
+        indicator rows (computed once over the full history), so short slices
+        still have properly warmed-up indicators.
+        
+        Args:
+            config (dict): Bot configuration
+            history (pd.DataFrame): Candles from load_history
+            space (dict): Parameter name -> candidate values
+            base_params (dict): Values for parameters not in the space
+            candidates (int): Parameter sets tested on the first rung
+            eta (int): Reduction factor between rungs
+            guided (bool): Draw half of the first rung from a model fitted to the other half
+            seed (int): Random seed for reproducible searches
+            progress (callable): Called as progress(backtests done, backtests planned)
+            cancel_event (threading.Event): Set it to stop after the current backtest
+            table (IndicatorTable): Indicator rows over history, built here if not given
+            stop (int): Only search candles before this row (default: all of history)
+            store (ResultStore): Optional store of earlier results, reused per rung
+            
+        Returns:
+            tuple: (results on the longest rung reached, cancelled flag, search summary dict)
+        """
+        rng = np.random.default_rng(seed)
+        if table is None:
+            table = self.build_indicator_table(history, space, base_params)
+        backtester = Backtester.from_config(config)
+        stop = stop or len(history)
+        
+        # Rung lengths grow by eta up to the full history, the shortest still holds min_history candles
+        rungs = 1
+        while candidates // eta ** rungs >= 1 and stop // eta ** rungs >= self.min_history:
+            rungs += 1
+        lengths = [stop // eta ** (rungs - 1 - rung) for rung in range(rungs)]
+        planned = sum(max(1, candidates // eta ** rung) for rung in range(rungs))
+        
+        seen = set()
+        done = 0
+        backtests = 0
+        candles_tested = 0
+        cancelled = False
+        
+        def evaluate(param_sets, length):
+            nonlocal done, backtests, candles_tested, cancelled
+            results = []
+            if store is not None:
+                data_key = self._data_key(history, config, start=stop - length, stop=stop)
+                cached, param_sets = self._split_cached(store, data_key, base_params, param_sets)
+                done += len(cached)
+            
+            for params in param_sets:
+                if cancel_event is not None and cancel_event.is_set():
+                    cancelled = True
+                    break
+                result = self._evaluate_hyperfocus(table, history, backtester, {**base_params, **params},
+                                                   start=stop - length, stop=stop)
+                result['params'] = params
+                results.append(result)
+                done += 1
+                backtests += 1
+                candles_tested += length
+                if progress:
+                    progress(done, planned)
+            
+            if store is None:
+                return results
+            self._store_results(store, data_key, base_params, results, history, length)
+            return cached + results
+        
+        if guided:
+            results = evaluate(self._sample_params(space, candidates // 2, rng, seen), lengths[0])
+            if results and not cancelled:
+                proposals = self._propose_params(space, results, candidates - len(results), rng, seen)
+                results += evaluate(proposals, lengths[0])
+        else:
+            results = evaluate(self._sample_params(space, candidates, rng, seen), lengths[0])
+        
+        for length in lengths[1:]:
+            if cancelled:
+                break
+            survivors = sorted(results, key=lambda x: x['pnl'], reverse=True)[:max(1, len(results) // eta)]
+            promoted = evaluate([result['params'] for result in survivors], length)
+            if cancelled and len(promoted) < len(survivors):
+                # Keep the complete shorter rung rather than a partial longer one
+                break
+            results = promoted
+        
+        search = {
+            'rungs': lengths,
+            'eta': eta,
+            'guided': guided,
+            'backtests': backtests,
+            'cached_results': done - backtests,
+            'candles_tested': candles_tested,
+            # Share of the candles an exhaustive search of the same space would backtest
+            'budget_fraction': candles_tested / (len(ParameterGrid(space)) * stop)
+        }
+        return results, cancelled, search
+    
+    def walk_forward_folds(self, length, folds=5, train_ratio=4):
+        """
+        Rolling train/test windows over `length` candles
+        
+        Each test window is followed by the next one, and every train window
+        holds `train_ratio` test windows of candles right before its test window.
+        
+        Returns:
+            list: Dicts with train_start, train_stop and test_stop row numbers
+        """
+        test_length = length // (folds + train_ratio)
+        train_length = test_length * train_ratio
+        return [
+            {
+                'fold': fold,
+                'train_start': fold * test_length,
+                'train_stop': fold * test_length + train_length,
+                'test_stop': fold * test_length + train_length + test_length
+            }
+            for fold in range(folds)
+        ]
+    
+    def run_fold(self, config, history, fold, base_params, method="grid", store=None):
+        """
+        Optimize on one fold's train window and backtest the winner on its test window
+        
+        The fold works on a view of history with its own indicator table, built
+        once over train and test candles so the test window starts warmed up.
+        With a result store, parameter sets already backtested on the same train
+        window are read from it instead.
+        
+        Returns:
+            dict: Fold bounds, chosen params, train result, test stats and test equity curve
+        """
+        window = history.iloc[fold['train_start']:fold['test_stop']]
+        train_length = fold['train_stop'] - fold['train_start']
+        space = self.adaptive_space if method == "halving" else self.param_grid
+        table = self.build_indicator_table(window, space, base_params)
+        backtester = Backtester.from_config(config)
+        optimization_config = config.get("optimization", {})
+        
+        if method == "halving":
+            results, _, _ = self.successive_halving(
+                config, window, space, base_params,
+                candidates=optimization_config.get("candidates", 243),
+                eta=optimization_config.get("eta", 3),
+                guided=optimization_config.get("guided", False),
+                seed=fold['fold'], table=table, stop=train_length, store=store
+            )
+        else:
+            param_sets = list(ParameterGrid(space))
+            cached = []
+            if store is not None:
+                data_key = self._data_key(window, config, stop=train_length)
+                cached, param_sets = self._split_cached(store, data_key, base_params, param_sets)
+            results = []
+            for params in param_sets:
+                result = self._evaluate_hyperfocus(table, window, backtester, {**base_params, **params},
+                                                   stop=train_length)
+                result['params'] = params
+                results.append(result)
+            if store is not None:
+                self._store_results(store, data_key, base_params, results, window, train_length)
+            results = cached + results
+        best = max(results, key=lambda x: x['pnl'])
+        
+        signals, strength = self._hyperfocus_signals(table, {**base_params, **best['params']})
+        test = backtester.run(window.iloc[train_length:], signals[train_length:], strength[train_length:])
+        return {
+            **fold,
+            'train_from': str(window.index[0]),
+            'test_from': str(window.index[train_length]),
+            'test_to': str(window.index[-1]),
+            'params': best['params'],
+            'train': {key: value for key, value in best.items() if key != 'params'},
+            'test': test['stats'],
+            'equity': test['equity']
+        }
+    
+    def walk_forward(self, workers=None, method=None, progress=None):
+        """
+        Walk-forward optimization of the HyperFocus strategy
+        
+        History is split into rolling train/test folds. Each fold is optimized on
+        its train window and traded out of sample on the following test window;
+        the folds run in parallel worker processes that read the candles from the
+        candle store's memory maps. The test equity curves are chained into one
+        out-of-sample curve.
+        
+        Args:
+            workers (int): Worker processes (default: optimization.workers in config.json, else all cores)
+            method (str): 'grid' or 'halving' search inside each fold
+            progress (callable): Called as progress(folds done, folds) as folds finish
+            
+        Returns:
+            dict: Per-fold results and out-of-sample summary, or an error
+        """
+        config = self.load_config()
+        current_params = config.get("strategies", {}).get("hyperfocus_strategy", {})
+        if not current_params:
+            return {"error": "HyperFocus strategy not found in config"}
+        
+        optimization_config = config.get("optimization", {})
+        walk_forward_config = optimization_config.get("walk_forward", {})
+        method = method or optimization_config.get("method", "grid")
+        workers = workers or optimization_config.get("workers") or os.cpu_count() or 1
+        
+        timeframe = current_params.get("timeframe", "15m")
+        symbol, history = self.load_history(config, timeframe)
+        folds = self.walk_forward_folds(len(history), walk_forward_config.get("folds", 5),
+                                        walk_forward_config.get("train_ratio", 4))
+        if not folds or folds[0]['train_stop'] < self.min_history:
+            return {
+                "error": "Insufficient data for walk-forward optimization",
+                "recommendation": f"Download history first (python backfill.py --symbol {symbol} --timeframes {timeframe})"
+            }
+        
+        started = time.perf_counter()
+        results = []
+        if workers <= 1:
+            store = self.open_result_store(config)
+            for fold in folds:
+                results.append(self.run_fold(config, history, fold, current_params, method, store))
+                if progress:
+                    progress(len(results), len(folds))
+        else:
+            search = {'method': method, 'param_grid': self.param_grid, 'adaptive_space': self.adaptive_space,
+                      'use_result_store': self.use_result_store}
+            first_timestamp = history.index[0].value // 1_000_000
+            with ProcessPoolExecutor(max_workers=min(workers, len(folds))) as pool:
+                futures = [
+                    pool.submit(_run_walk_forward_fold, config, symbol, timeframe, first_timestamp,
+                                len(history), fold, current_params, search)
+                    for fold in folds
+                ]
+                for future in as_completed(futures):
+                    results.append(future.result())
+                    if progress:
+                        progress(len(results), len(folds))
+        results.sort(key=lambda x: x['fold'])
+        
+        # Chain the test windows: each one starts from the balance the previous one ended with
+        initial_balance = Backtester.from_config(config).initial_balance
+        balance = initial_balance
+        curves = []
+        for result in results:
+            equity = result.pop('equity')
+            curves.append(equity / initial_balance * balance)
+            balance = curves[-1].iloc[-1]
+        oos_equity = pd.concat(curves)
+        drawdown = 1 - oos_equity / oos_equity.cummax()
+        
+        train_pnl = sum(result['train']['pnl'] for result in results)
+        test_pnl = sum(result['test']['total_pnl'] for result in results)
+        train_candles = sum(result['train_stop'] - result['train_start'] for result in results)
+        test_candles = sum(result['test_stop'] - result['train_stop'] for result in results)
+        
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'method': method,
+            'workers': workers,
+            'duration_seconds': round(time.perf_counter() - started, 2),
+            'folds': results,
+            'out_of_sample': {
+                'return_percentage': float((balance / initial_balance - 1) * 100),
+                'pnl': float(test_pnl),
+                'trades': sum(result['test']['trades'] for result in results),
+                'max_drawdown_percentage': float(drawdown.max() * 100),
+                'profitable_folds': sum(result['test']['total_pnl'] > 0 for result in results),
+                # Out-of-sample profit per candle relative to in-sample profit per candle
+                'efficiency': float((test_pnl / test_candles) / (train_pnl / train_candles)) if train_pnl > 0 else None
+            }
+        }
+        
+        with open(self.walk_forward_log, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        oos_equity.rename('equity').to_csv(self.walk_forward_equity_file, header=True)
+        
+        return report
+    
+    def validate_parameters(self, params=None, workers=None, method=None):
+        """
+        Check out of sample that optimizing the HyperFocus parameters pays off
+        
+        Runs a walk-forward optimization and accepts when the stitched
+        out-of-sample return reaches optimization.walk_forward.min_return_percentage.
+        Parameters from optimize_hyperfocus must also reach it on the holdout
+        candles that optimization never saw. Fold searches and holdout
+        backtests reuse stored results.
+        
+        Args:
+            params (dict): Candidate HyperFocus parameters (e.g. from optimize_hyperfocus)
+            workers (int): Worker processes for the walk-forward folds
+            method (str): 'grid' or 'halving' search inside each fold
+        
+        Returns:
+            tuple: (accepted, walk-forward report with the parameters' holdout results under 'holdout')
+        """
+        report = self.walk_forward(workers=workers, method=method)
+        if 'error' in report:
+            return False, report
+        
+        config = self.load_config()
+        min_return = config.get("optimization", {}).get("walk_forward", {}).get("min_return_percentage", 0.0)
+        accepted = report['out_of_sample']['return_percentage'] >= min_return
+        if params:
+            report['holdout'] = self.test_holdout(config, params)
+            if report['holdout'] is None:
+                print("No holdout candles (optimization.walk_forward.holdout_ratio is 0), "
+                      "optimized parameters are only checked through the walk-forward run")
+            else:
+                accepted = accepted and report['holdout']['return_percentage'] >= min_return
+        return accepted, report
+    
+    @staticmethod
+    def holdout_start(config, length):
+        """
+        First row of the holdout: the newest walk_forward.holdout_ratio of `length` candles
+        
+        optimize_hyperfocus searches only the rows before it, so test_holdout
+        trades the optimized parameters on candles they were not fitted to.
+        """
+        ratio = config.get("optimization", {}).get("walk_forward", {}).get("holdout_ratio", 0.2)
+        return length - int(length * ratio)
+    
+    def test_holdout(self, config, params):
+        """
+        Backtest one parameter set on the holdout candles
+        
+        The holdout is the end of the history optimize_hyperfocus leaves out
+        (see holdout_start), traded from the initial balance with indicators
+        warmed up on the candles before it.
+        
+        Args:
+            config (dict): Bot configuration
+            params (dict): HyperFocus parameters to test
+        
+        Returns:
+            dict: Return, P&L, trades and the holdout range, or None if there is no holdout
+        """
+        base_params = config.get("strategies", {}).get("hyperfocus_strategy", {})
+        _, history = self.load_history(config, base_params.get("timeframe", "15m"))
+        start, stop = self.holdout_start(config, len(history)), len(history)
+        if start >= stop:
+            return None
+        
+        backtester = Backtester.from_config(config)
+        store = self.open_result_store(config)
+        cached = []
+        if store is not None:
+            data_key = self._data_key(history, config, start=start, stop=stop)
+            cached, _ = self._split_cached(store, data_key, base_params, [params])
+        if cached:
+            result = cached[0]
+        else:
+            table = self.build_indicator_table(history, {}, {**base_params, **params})
+            result = self._evaluate_hyperfocus(table, history, backtester, {**base_params, **params},
+                                               start=start, stop=stop)
+            result['params'] = params
+            if store is not None:
+                self._store_results(store, data_key, base_params, [result], history, stop - start)
+        
+        return {
+            'params': params,
+            'test_from': str(history.index[start]),
+            'test_to': str(history.index[-1]),
+            'candles': stop - start,
+            'return_percentage': float(result['pnl'] / backtester.initial_balance * 100),
+            'pnl': float(result['pnl']),
+            'trades': result['trades'],
+            'win_rate': result['win_rate']
+        }
+    
+    def load_history(self, config, timeframe):
+        """
+        Load the stored candle history parameters are evaluated on
+        
+        History ends at the last optimization.history_alignment_hours boundary
+        (default 24) before the newest candle. Candles stored in between don't
+        move the range, so every run in the same period backtests exactly the
+        same candles and reuses the results stored by the others.
+        
+        Returns:
+            tuple: (symbol, OHLCV DataFrame), the DataFrame is empty if nothing is stored
+        """
+        trading = config.get("trading", {})
+        symbol = f"{trading.get('base_symbol', 'BTC')}/{trading.get('quote_symbol', 'USDT')}"
+        history = CandleStore.from_config(config).to_dataframe(symbol, timeframe)
+        
+        alignment_ms = int(config.get("optimization", {}).get("history_alignment_hours", 24) * 3_600_000)
+        if alignment_ms > 0 and len(history):
+            times = history.index.values.astype('datetime64[ms]').astype(np.int64)
+            end = times[-1] - times[-1] % alignment_ms
+            history = history.iloc[:int(np.searchsorted(times, end, side='left'))]
+        return symbol, history
+    
+    @staticmethod
+    def build_indicator_table(history, param_grid, base_params):
+        """
+        Compute every indicator the grid needs, once per distinct period
+        
+        Args:
+            history (pd.DataFrame): OHLCV data
+            param_grid (dict): Parameter name -> candidate values
+            base_params (dict): Values for parameters not in the grid
+            
+        Returns:
+            IndicatorTable: Rows shared by all parameter combinations
+        """
+        def values(name, default):
+            return param_grid.get(name, [base_params.get(name, default)])
+        
+        table = IndicatorTable(history)
+        table.add('rsi', values('rsi_period', 14), method=base_params.get("rsi_method", DEFAULT_RSI_METHOD))
+        table.add('sma', list(values('ma_fast', 20)) + list(values('ma_slow', 50)))
+        table.add('volume_ratio', values('volume_lookback', 20))
+        table.add('ema', list(values('fast_period', 12)) + list(values('slow_period', 26)))
+        return table
+    
+    @staticmethod
+    def _hyperfocus_signals(table, params):
+        """
+        HyperFocus signals for every candle from precomputed indicator rows
+        
+        Returns:
+            tuple: (signals, signal strength 0-1)
+        """
+        strategy = HyperFocusStrategy({"hyperfocus_strategy": params})
+        macd_line, signal_line, _ = table.macd(strategy.fast_period, strategy.slow_period, strategy.signal_period)
+        signals, confirmations = strategy.signals_from_indicators(
+            table.get('rsi', strategy.rsi_period, method=strategy.rsi_method),
+            macd_line, signal_line,
+            table.get('sma', strategy.ma_fast), table.get('sma', strategy.ma_slow),
+            table.get('volume_ratio', strategy.volume_lookback)
+        )
+        return signals, np.minimum(confirmations / 3.0, 1.0)
+    
+    @staticmethod
+    def _evaluate_hyperfocus(table, history, backtester, params, start=0, stop=None):
+        """
+        Backtest one HyperFocus parameter set on precomputed indicator rows
+        
+        Args:
+            table (IndicatorTable): Indicator rows over the full history
+            history (pd.DataFrame): Candles the table was built from
+            backtester (Backtester): Simulation settings
+            params (dict): HyperFocus parameters
+            start (int): First candle to trade, earlier candles only warm up the indicators
+            stop (int): Candle to stop trading at (default: end of history)
+        
+        Returns:
+            dict: trades, win_rate (%), pnl (quote currency) and max_drawdown (%)
+        """
+        signals, strength = StrategyOptimizer._hyperfocus_signals(table, params)
+        stats = backtester.run(history.iloc[start:stop], signals[start:stop], strength[start:stop])['stats']
+        return {
+            'trades': stats['trades'],
+            'win_rate': stats['win_rate'],
+            'pnl': stats['total_pnl'],
+            'max_drawdown': stats['max_drawdown_percentage']
+        }
+    
     def _generate_recommendations(self, current_params, performance):
         """
         Generate strategy recommendations based on available metrics
@@ -289,16 +1080,28 @@ class StrategyOptimizer:
             'note': "Recommendations based on limited data. Continue collecting data for better optimization."
         }
     
-    def update_strategy_config(self, optimized_params):
+    def update_strategy_config(self, optimized_params, validate=True, workers=None, method=None):
         """
         Update the strategy configuration with optimized parameters
         
         Args:
             optimized_params: Dictionary with optimized parameter values
+            validate: Only apply them if they, and a walk-forward run, are profitable out of sample
+            workers: Worker processes for the validation (default: optimization.workers in config.json)
+            method: Search method for the validation folds, use the one the parameters were found with
             
         Returns:
             True if successful, False otherwise
         """
+        if validate:
+            accepted, report = self.validate_parameters(optimized_params, workers=workers, method=method)
+            if not accepted:
+                reason = report.get('error') or f"walk-forward return {report['out_of_sample']['return_percentage']:.2f}%"
+                if report.get('holdout'):
+                    reason += f", holdout return {report['holdout']['return_percentage']:.2f}%"
+                print(f"Optimized parameters failed walk-forward validation ({reason}), config not updated")
+                return False
+        
         try:
             # Load current config
             with open(self.config_file, 'r') as f:
@@ -312,9 +1115,8 @@ class StrategyOptimizer:
             # Add timestamp of optimization
             config["strategies"]["hyperfocus_strategy"]["last_optimized"] = datetime.now().isoformat()
             
-            # Save updated config
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            # Save updated config (a running bot applies it before its next cycle)
+            atomic_write_json(self.config_file, config)
             
             return True
             
@@ -409,9 +1211,14 @@ class StrategyOptimizer:
                     </tr>
                 """
             
-            # Finish report
             report_content += """
                 </table>
+            """
+            report_content += self._backtest_results_report_section()
+            report_content += self._walk_forward_report_section(report_dir, timestamp)
+            
+            # Finish report
+            report_content += """
                 
                 <h2>Recommendations</h2>
                 <p>Based on the analysis, the following adjustments are recommended:</p>
@@ -438,6 +1245,102 @@ class StrategyOptimizer:
             print(f"Error generating performance report: {e}")
             return None
     
+    def _backtest_results_report_section(self, limit=10):
+        """HTML table of the best HyperFocus parameter sets in the result store"""
+        config = self.load_config()
+        path = config.get("optimization", {}).get("result_store", "data/optimization/backtest_results.db")
+        if not os.path.exists(path):
+            return ""
+        
+        store = ResultStore(path)
+        try:
+            results = store.top_results("hyperfocus_strategy", limit=limit)
+            stored = store.count("hyperfocus_strategy")
+        finally:
+            store.close()
+        if not results:
+            return ""
+        
+        names = sorted({name for result in results for name in result['params']})
+        header = "".join(f"<th>{name}</th>" for name in names)
+        rows = "".join(
+            "<tr>" + "".join(f"<td>{result['params'].get(name, '')}</td>" for name in names)
+            + f"<td>{result['trades']}</td><td>{result['win_rate']:.1f}%</td>"
+            f"<td>{result['pnl']:.2f}</td><td>{result['max_drawdown']:.2f}%</td></tr>"
+            for result in results
+        )
+        
+        return f"""
+                <h2>Best Backtested Parameters</h2>
+                <p>Top {len(results)} of {stored} stored HyperFocus backtests on
+                   {results[0]['symbol']} {results[0]['timeframe']} ({results[0]['candles']} candles)</p>
+                <table>
+                    <tr>{header}<th>Trades</th><th>Win Rate</th><th>P&L</th><th>Max Drawdown</th></tr>
+                    {rows}
+                </table>
+            """
+    
+    def _walk_forward_report_section(self, report_dir, timestamp):
+        """HTML for the latest walk-forward run, with its out-of-sample equity chart"""
+        if not os.path.exists(self.walk_forward_log):
+            return ""
+        
+        with open(self.walk_forward_log, 'r') as f:
+            walk_forward = json.load(f)
+        summary = walk_forward['out_of_sample']
+        
+        chart = ""
+        if os.path.exists(self.walk_forward_equity_file):
+            equity = pd.read_csv(self.walk_forward_equity_file, index_col=0, parse_dates=True)['equity']
+            chart_file = f"walk_forward_equity_{timestamp}.png"
+            plt.figure(figsize=(10, 5))
+            plt.plot(equity.index, equity.values, 'b-')
+            for fold in walk_forward['folds']:
+                plt.axvline(pd.Timestamp(fold['test_from']), color='gray', linestyle=':', linewidth=1)
+            plt.title('Walk-Forward Out-of-Sample Equity')
+            plt.xlabel('Date')
+            plt.ylabel('Balance')
+            plt.grid(True)
+            plt.savefig(f"{report_dir}/{chart_file}")
+            plt.close()
+            chart = f'<img src="{chart_file}" alt="Walk-forward equity">'
+        
+        rows = "".join(
+            f"""
+                    <tr>
+                        <td>{fold['fold'] + 1}</td>
+                        <td>{fold['test_from']} - {fold['test_to']}</td>
+                        <td>{fold['train']['pnl']:.2f}</td>
+                        <td>{fold['test']['total_pnl']:.2f}</td>
+                        <td>{fold['test']['trades']}</td>
+                        <td>{fold['test']['max_drawdown_percentage']:.2f}%</td>
+                    </tr>"""
+            for fold in walk_forward['folds']
+        )
+        
+        return f"""
+                <h2>Walk-Forward Validation</h2>
+                <p>{walk_forward['symbol']} {walk_forward['timeframe']}, {len(walk_forward['folds'])} folds
+                   ({walk_forward['method']} search), run {walk_forward['timestamp']}</p>
+                <div class="metric {'good' if summary['return_percentage'] > 0 else 'bad'}">
+                    <h3>Out-of-Sample Return</h3>
+                    <p>{summary['return_percentage']:.2f}% over {summary['trades']} trades,
+                       max drawdown {summary['max_drawdown_percentage']:.2f}%,
+                       {summary['profitable_folds']}/{len(walk_forward['folds'])} profitable folds</p>
+                </div>
+                {chart}
+                <table>
+                    <tr>
+                        <th>Fold</th>
+                        <th>Test Window</th>
+                        <th>Train P&L</th>
+                        <th>Test P&L</th>
+                        <th>Test Trades</th>
+                        <th>Test Drawdown</th>
+                    </tr>{rows}
+                </table>
+            """
+    
     def create_strategy_visualizations(self):
         """Create visualizations of strategy performance"""
         try:
@@ -519,24 +1422,54 @@ if __name__ == "__main__":
     parser.add_argument('--apply-optimal', action='store_true', help='Apply optimized parameters to config')
     parser.add_argument('--report', action='store_true', help='Generate performance report')
     parser.add_argument('--days', type=int, default=30, help='Number of days for analysis')
+    parser.add_argument('--workers', type=int, help='Worker processes for optimization (default: all cores)')
+    parser.add_argument('--method', choices=['grid', 'halving'], help='Search method (default: optimization.method in config, else grid)')
+    parser.add_argument('--walk-forward', action='store_true', help='Validate the optimization out of sample on rolling folds')
+    parser.add_argument('--no-cache', action='store_true', help='Backtest every parameter set even if a stored result exists')
     
     args = parser.parse_args()
     
     optimizer = StrategyOptimizer()
+    optimizer.use_result_store = not args.no_cache
     
     if args.optimize:
-        print("Running HyperFocus strategy optimization...")
-        results = optimizer.optimize_hyperfocus()
+        print("Running HyperFocus strategy optimization... (Ctrl+C stops early and keeps the best so far)")
+        
+        def show_progress(tested, total):
+            print(f"\r  Tested {tested}/{total} parameter sets", end="", flush=True)
+        
+        results = optimizer.optimize_hyperfocus(workers=args.workers, progress=show_progress, method=args.method)
+        print()
+        if results.get('cancelled'):
+            print(f"Optimization stopped after {results['tested_parameters']} parameter sets")
         print(f"Optimization complete!")
         print(f"Current parameters: {results.get('current_params', 'N/A')}")
         print(f"Optimized parameters: {results.get('optimized_params', 'N/A')}")
         
         if args.apply_optimal and 'optimized_params' in results:
-            if optimizer.update_strategy_config(results['optimized_params']):
+            if optimizer.update_strategy_config(results['optimized_params'], workers=args.workers,
+                                                method=args.method):
                 print("✅ Successfully updated strategy configuration with optimized parameters!")
             else:
                 print("❌ Failed to update configuration!")
     
+    if args.walk_forward:
+        print("Running HyperFocus walk-forward optimization...")
+        report = optimizer.walk_forward(
+            workers=args.workers, method=args.method,
+            progress=lambda done, total: print(f"\r  Finished {done}/{total} folds", end="", flush=True)
+        )
+        print()
+        if 'error' in report:
+            print(f"❌ {report['error']}")
+        else:
+            summary = report['out_of_sample']
+            for fold in report['folds']:
+                print(f"  Fold {fold['fold'] + 1}: test {fold['test_from']} - {fold['test_to']}, "
+                      f"P&L {fold['test']['total_pnl']:.2f}, params {fold['params']}")
+            print(f"Out-of-sample return: {summary['return_percentage']:.2f}% "
+                  f"(max drawdown {summary['max_drawdown_percentage']:.2f}%)")
+    
     if args.report:
         print(f"Generating performance report for the last {args.days} days...")
         report_path = optimizer.generate_performance_report(args.days)
@@ -0,0 +1,241 @@
+import logging
+import importlib
+import threading
+from importlib import metadata
+from candle_store import timeframe_to_ms
+from indicators import DEFAULT_RSI_METHOD
+
+logger = logging.getLogger("BROski.StrategyRegistry")
+
+# Installed packages add strategies under this entry point group, e.g.
+#   [project.entry-points."broski.strategies"]
+#   breakout_strategy = "broski_breakout.strategy:BreakoutStrategy"
+ENTRY_POINT_GROUP = "broski.strategies"
+
+
+class StrategyInfo:
+    """
+    A registered strategy: where its class lives and what it needs
+
+    The class is imported on first use. Required indicators and warm-up length
+    come from the metadata given at registration, so answering them does not
+    import the strategy; a plugin registered without metadata is asked through
+    its class (`required_indicators(config)` and `warmup(config)` static methods).
+    """
+
+    def __init__(self, name, target, indicators=None, warmup=None, description=""):
+        """
+        Args:
+            name (str): Strategy name used in config.json
+            target (str): "module:Class" path of the strategy class
+            indicators (callable): Strategy config -> list of (kernel name, params) pairs,
+                as passed to IndicatorCache.get
+            warmup (callable): Strategy config -> candles needed before the first signal
+            description (str): One line for listings
+        """
+        self.name = name
+        self.target = target
+        self.indicators = indicators
+        self.warmup = warmup
+        self.description = description
+        self.strategy_class = None
+
+    @property
+    def loaded(self):
+        return self.strategy_class is not None
+
+    def load(self):
+        """Import the strategy module and return the class"""
+        if self.strategy_class is None:
+            module_path, class_name = self.target.split(":")
+            module = importlib.import_module(module_path)
+            self.strategy_class = getattr(module, class_name)
+            logger.debug(f"Imported strategy {self.name} from {module_path}")
+        return self.strategy_class
+
+    def required_indicators(self, config):
+        """(kernel name, params) pairs the strategy reads from the indicator cache"""
+        indicators = self.indicators or getattr(self.load(), "required_indicators", None)
+        return list(indicators(config)) if indicators else []
+
+    def warmup_candles(self, config):
+        """Candles the strategy needs before it can signal"""
+        warmup = self.warmup or getattr(self.load(), "warmup", None)
+        return int(warmup(config)) if warmup else 0
+
+
+class StrategyRegistry:
+    """
+    Catalogue of the strategies the bot can run
+
+    Built-in strategies are registered below with their metadata; installed
+    plugins are found through the broski.strategies entry point group the
+    first time the catalogue is read. No strategy module is imported until a
+    strategy is created (or a plugin without metadata is asked for it).
+    """
+
+    def __init__(self):
+        self.strategies = {}
+        self.discovered = False
+        self.lock = threading.Lock()
+
+    def register(self, name, target, indicators=None, warmup=None, description=""):
+        """
+        Add a strategy to the catalogue (replacing one with the same name)
+
+        Args:
+            name (str): Strategy name used in config.json
+            target (str): "module:Class" path of the strategy class
+            indicators (callable): Strategy config -> list of (kernel name, params) pairs
+            warmup (callable): Strategy config -> candles needed before the first signal
+            description (str): One line for listings
+        """
+        self.strategies[name] = StrategyInfo(name, target, indicators, warmup, description)
+
+    def discover(self):
+        """Register strategies published by installed packages (once)"""
+        with self.lock:
+            if self.discovered:
+                return
+            self.discovered = True
+            try:
+                entry_points = metadata.entry_points()
+                if hasattr(entry_points, "select"):
+                    entry_points = entry_points.select(group=ENTRY_POINT_GROUP)
+                else:
+                    entry_points = entry_points.get(ENTRY_POINT_GROUP, [])
+            except Exception as e:
+                logger.error(f"Could not read strategy entry points: {str(e)}")
+                return
+            for entry_point in entry_points:
+                if entry_point.name in self.strategies:
+                    logger.warning(f"Ignoring plugin strategy {entry_point.name}, the name is taken")
+                    continue
+                self.register(entry_point.name, entry_point.value)
+                logger.info(f"Found plugin strategy {entry_point.name} ({entry_point.value})")
+
+    def names(self):
+        """Names of all registered strategies"""
+        self.discover()
+        return list(self.strategies)
+
+    def __contains__(self, name):
+        self.discover()
+        return name in self.strategies
+
+    def get(self, name):
+        """StrategyInfo for a strategy name"""
+        self.discover()
+        if name not in self.strategies:
+            raise ValueError(f"Unknown strategy: {name}")
+        return self.strategies[name]
+
+    def create(self, name, config):
+        """
+        Import (on first use) and instantiate a strategy
+
+        Args:
+            name (str): Strategy name
+            config (dict): The strategy's settings from config.json
+
+        Returns:
+            The strategy instance
+        """
+        return self.get(name).load()(config)
+
+    def required_indicators(self, names, strategies_config):
+        """
+        Indicators needed by a set of strategies, without duplicates
+
+        Args:
+            names (list): Strategy names
+            strategies_config (dict): The strategies section of config.json
+
+        Returns:
+            list: (kernel name, params) pairs, as passed to IndicatorCache.get
+        """
+        required = []
+        for name in names:
+            for indicator in self.get(name).required_indicators(strategies_config.get(name, {})):
+                if indicator not in required:
+                    required.append(indicator)
+        return required
+
+    def warmup_candles(self, names, strategies_config):
+        """Candles every one of the strategies needs before it can signal"""
+        return max((self.get(name).warmup_candles(strategies_config.get(name, {})) for name in names), default=0)
+
+
+def _rsi(config):
+    return ("rsi", {"period": config.get("rsi_period", 14), "method": config.get("rsi_method", DEFAULT_RSI_METHOD)})
+
+
+def _macd(config):
+    return ("macd", {"fast_period": config.get("fast_period", 12), "slow_period": config.get("slow_period", 26),
+                     "signal_period": config.get("signal_period", 9)})
+
+
+def _hyperfocus_indicators(config):
+    return [
+        _rsi(config),
+        _macd(config),
+        ("sma", {"period": config.get("ma_fast", 20)}),
+        ("sma", {"period": config.get("ma_slow", 50)}),
+        ("sma", {"column": "volume", "period": config.get("volume_lookback", 20)}),
+    ]
+
+
+def _hyperfocus_warmup(config):
+    return max(config.get("rsi_period", 14), config.get("slow_period", 26), config.get("ma_slow", 50)) + 10
+
+
+def _multi_timeframe_warmup(config):
+    # The highest timeframe needs a full HyperFocus warm-up of its own candles
+    base_ms = timeframe_to_ms(config.get("timeframe", "5m"))
+    ratio = max((timeframe_to_ms(timeframe) // base_ms
+                 for timeframe in config.get("confirmation_timeframes", ["15m", "1h", "4h"])), default=1)
+    return max(ratio, 1) * _hyperfocus_warmup(config)
+
+
+_registry = StrategyRegistry()
+_registry.register(
+    "rsi_strategy", "strategies.rsi_strategy:RSIStrategy",
+    indicators=lambda config: [_rsi(config)],
+    warmup=lambda config: config.get("rsi_period", 14) + 10,
+    description="RSI crossing its oversold/overbought levels"
+)
+_registry.register(
+    "macd_strategy", "strategies.macd_strategy:MACDStrategy",
+    indicators=lambda config: [_macd(config)],
+    warmup=lambda config: config.get("slow_period", 26) + config.get("signal_period", 9),
+    description="MACD line crossing its signal line"
+)
+_registry.register(
+    "hyperfocus_strategy", "strategies.hyperfocus_strategy:HyperFocusStrategy",
+    indicators=_hyperfocus_indicators,
+    warmup=_hyperfocus_warmup,
+    description="RSI with MACD, moving average and volume confirmations"
+)
+_registry.register(
+    "multi_timeframe_strategy", "strategies.multi_timeframe_strategy:MultiTimeframeHyperFocusStrategy",
+    indicators=_hyperfocus_indicators,
+    warmup=_multi_timeframe_warmup,
+    description="HyperFocus confirmed by the trend on higher timeframes"
+)
+_registry.register(
+    "ml_strategy", "strategies.lite_ml_strategy:LiteMLStrategy",
+    indicators=lambda config: [("rsi", {"period": 14, "method": "sma"}), ("sma", {"period": 5}),
+                               ("sma", {"period": 20}), ("returns", {})],
+    warmup=lambda config: 30,
+    description="scikit-learn model on price, volume and indicator features"
+)
+
+
+def get_strategy_registry():
+    """The process-wide strategy registry"""
+    return _registry
+
+
+def register_strategy(name, target, indicators=None, warmup=None, description=""):
+    """Add a strategy to the process-wide registry, see StrategyRegistry.register"""
+    _registry.register(name, target, indicators, warmup, description)
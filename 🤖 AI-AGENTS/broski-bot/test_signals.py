@@ -1,10 +1,15 @@
-import pandas as pd
 import numpy as np
 import json
 import ccxt
 import matplotlib.pyplot as plt
 from pathlib import Path
 from colorama import init, Fore, Style
+from candle_store import CandleStore
+from resampler import TimeframeResampler
+from market_data_hub import connect_market_data
+from strategy_manager import StrategyManager
+from strategies.signals import signal_records
+import indicators
 
 # Add path fixing for imports
 import sys
@@ -34,8 +39,8 @@ def load_config():
 def fetch_data(config, limit=100):
     """Fetch historical data from MEXC"""
     try:
-        # Setup exchange
-        exchange = ccxt.mexc({
+        # Setup exchange (the shared hub's session if it is running)
+        exchange = connect_market_data(config) or ccxt.mexc({
             'apiKey': config['exchange']['api_key'],
             'secret': config['exchange']['api_secret'],
             'enableRateLimit': True,
@@ -52,13 +57,20 @@ def fetch_data(config, limit=100):
         timeframe = strategy_config["timeframe"]
         
         print(f"{Fore.CYAN}Fetching {timeframe} candles for {symbol}...{Style.RESET_ALL}")
-        ohlcv = exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
         
-        df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df.set_index('timestamp', inplace=True)
-        
-        print(f"{Fore.GREEN}Fetched {len(df)} candles{Style.RESET_ALL}")
+        # Only candles newer than the local history are downloaded
+        store = CandleStore.from_config(config)
+        base_timeframe = config.get("market_data", {}).get("base_timeframe")
+        if base_timeframe:
+            # Derive the strategy timeframe from the base series
+            resampler = TimeframeResampler(store, base_timeframe)
+            added = resampler.sync(exchange, symbol, timeframe, limit=limit)
+            df = resampler.get(symbol, timeframe, limit=limit)
+        else:
+            added = store.sync(exchange, symbol, timeframe, limit=limit)
+            df = store.to_dataframe(symbol, timeframe, limit=limit)
+        
+        print(f"{Fore.GREEN}Fetched {added} new candles, {len(df)} loaded{Style.RESET_ALL}")
         return df, symbol, active_strategy, strategy_config
     except Exception as e:
         print(f"{Fore.RED}Error fetching data: {str(e)}{Style.RESET_ALL}")
@@ -70,15 +82,8 @@ def calculate_indicators(df, active_strategy, strategy_config):
         if active_strategy == "rsi_strategy":
             # Calculate RSI
             rsi_period = strategy_config["rsi_period"]
-            delta = df['close'].diff()
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            
-            avg_gain = gain.rolling(window=rsi_period).mean()
-            avg_loss = loss.rolling(window=rsi_period).mean()
-            
-            rs = avg_gain / avg_loss
-            df['rsi'] = 100 - (100 / (1 + rs))
+            rsi_method = strategy_config.get("rsi_method", indicators.DEFAULT_RSI_METHOD)
+            df['rsi'] = indicators.get_indicator_cache().get(df, 'rsi', period=rsi_period, method=rsi_method)
             
             print(f"{Fore.CYAN}Current RSI: {df['rsi'].iloc[-1]:.2f}{Style.RESET_ALL}")
             
@@ -88,10 +93,10 @@ def calculate_indicators(df, active_strategy, strategy_config):
             slow = strategy_config["slow_period"]
             signal_period = strategy_config["signal_period"]
             
-            df['ema_fast'] = df['close'].ewm(span=fast, adjust=False).mean()
-            df['ema_slow'] = df['close'].ewm(span=slow, adjust=False).mean()
+            df['ema_fast'] = indicators.ema(df['close'], fast)
+            df['ema_slow'] = indicators.ema(df['close'], slow)
             df['macd_line'] = df['ema_fast'] - df['ema_slow']
-            df['signal_line'] = df['macd_line'].ewm(span=signal_period, adjust=False).mean()
+            df['signal_line'] = indicators.ema(df['macd_line'], signal_period)
             df['macd_histogram'] = df['macd_line'] - df['signal_line']
             
             print(f"{Fore.CYAN}Current MACD Line: {df['macd_line'].iloc[-1]:.6f}{Style.RESET_ALL}")
@@ -104,56 +109,17 @@ def calculate_indicators(df, active_strategy, strategy_config):
 
 def find_signals(df, active_strategy, strategy_config):
     """Find trading signals in historical data"""
-    signals = []
-    
     try:
-        if active_strategy == "rsi_strategy":
-            overbought = strategy_config["rsi_overbought"]
-            oversold = strategy_config["rsi_oversold"]
-            
-            for i in range(1, len(df)):
-                # Buy signal - RSI crosses above oversold
-                if df['rsi'].iloc[i-1] < oversold and df['rsi'].iloc[i] >= oversold:
-                    signals.append({
-                        'timestamp': df.index[i],
-                        'type': 'BUY',
-                        'price': df['close'].iloc[i],
-                        'rsi': df['rsi'].iloc[i]
-                    })
-                
-                # Sell signal - RSI crosses below overbought
-                elif df['rsi'].iloc[i-1] > overbought and df['rsi'].iloc[i] <= overbought:
-                    signals.append({
-                        'timestamp': df.index[i],
-                        'type': 'SELL',
-                        'price': df['close'].iloc[i],
-                        'rsi': df['rsi'].iloc[i]
-                    })
-        
-        elif active_strategy == "macd_strategy":
-            for i in range(1, len(df)):
-                # Buy signal - MACD crosses above signal line
-                if df['macd_line'].iloc[i-1] < df['signal_line'].iloc[i-1] and \
-                   df['macd_line'].iloc[i] > df['signal_line'].iloc[i]:
-                    signals.append({
-                        'timestamp': df.index[i],
-                        'type': 'BUY',
-                        'price': df['close'].iloc[i],
-                        'macd': df['macd_line'].iloc[i],
-                        'signal': df['signal_line'].iloc[i]
-                    })
-                
-                # Sell signal - MACD crosses below signal line
-                elif df['macd_line'].iloc[i-1] > df['signal_line'].iloc[i-1] and \
-                     df['macd_line'].iloc[i] < df['signal_line'].iloc[i]:
-                    signals.append({
-                        'timestamp': df.index[i],
-                        'type': 'SELL',
-                        'price': df['close'].iloc[i],
-                        'macd': df['macd_line'].iloc[i],
-                        'signal': df['signal_line'].iloc[i]
-                    })
-        
+        # The strategy's own rules, evaluated on every candle in one pass
+        strategy = StrategyManager({
+            "strategies": {"active_strategy": active_strategy, active_strategy: strategy_config}
+        }).active_strategy
+        if strategy is None:
+            return []
+        
+        signals = signal_records(strategy.generate_signals_batch(df), df)
+        for signal in signals:
+            signal['type'] = signal['type'].upper()
         return signals
     except Exception as e:
         print(f"{Fore.RED}Error finding signals: {str(e)}{Style.RESET_ALL}")
@@ -0,0 +1,110 @@
+import asyncio
+from collections import Counter
+import numpy as np
+import pytest
+import rate_limiter
+from backfill import HistoricalBackfill
+from candle_store import CandleStore
+from mock_exchange import generate_candles
+
+HOUR = 3_600_000
+END = 1_700_000_000_000 // HOUR * HOUR
+
+
+class FakeExchange:
+    """Async exchange serving candles in [since, since + limit periods), like MEXC's startTime/endTime"""
+
+    rateLimit = 1
+
+    def __init__(self, candles, empty_pages=None, short_pages=None):
+        self.candles = candles
+        self.now = int(candles[-1, 0]) + HOUR // 2
+        self.empty_pages = Counter(empty_pages or {})
+        self.short_pages = dict(short_pages or {})
+        self.calls = []
+
+    def milliseconds(self):
+        return self.now
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls.append(since)
+        if self.empty_pages[since] > 0:
+            self.empty_pages[since] -= 1
+            return []
+        timestamps = self.candles[:, 0]
+        page = self.candles[(timestamps >= since) & (timestamps < since + limit * HOUR)]
+        return page[:self.short_pages.pop(since, len(page))].tolist()
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def candles():
+    return generate_candles(count=500, timeframe="1h", seed=6, end_time=END)
+
+
+@pytest.fixture
+def backfill(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    return HistoricalBackfill({"exchange": {}}, candle_store=CandleStore(tmp_path / "candles"),
+                              checkpoint_dir=tmp_path / "checkpoints", chunk_size=100)
+
+
+def run(backfill, monkeypatch, exchange, start_ms, end_ms):
+    monkeypatch.setattr(backfill, "_create_exchange", lambda: exchange)
+    return asyncio.run(backfill.backfill_async("PI/USDT", ["1h"], start_ms, end_ms))
+
+
+def test_backfill_downloads_the_whole_range(backfill, monkeypatch, candles):
+    start, end = int(candles[0, 0]), int(candles[-1, 0]) + HOUR
+
+    assert run(backfill, monkeypatch, FakeExchange(candles), start, end) == {"1h": 500}
+    np.testing.assert_array_equal(backfill.candle_store.read("PI/USDT", "1h")["timestamp"], candles[:, 0])
+
+
+def test_empty_page_is_retried_instead_of_checkpointed(backfill, monkeypatch, candles):
+    start, end = int(candles[0, 0]), int(candles[-1, 0]) + HOUR
+    gap = start + 200 * HOUR
+
+    assert run(backfill, monkeypatch, FakeExchange(candles, {gap: 1}), start, end) == {"1h": 0}
+    assert not backfill._checkpoint_path("PI/USDT", "1h", gap).exists()
+    assert backfill._checkpoint_path("PI/USDT", "1h", start).exists()
+
+    # The second run only fetches the failed chunk
+    exchange = FakeExchange(candles)
+    assert run(backfill, monkeypatch, exchange, start, end) == {"1h": 500}
+    assert exchange.calls == [gap]
+    assert backfill.candle_store.length("PI/USDT", "1h") == 500
+
+
+def test_short_response_is_retried(backfill, monkeypatch, candles):
+    start, end = int(candles[0, 0]), int(candles[-1, 0]) + HOUR
+    # The exchange stops halfway through the first chunk, then returns an empty page
+    exchange = FakeExchange(candles, empty_pages={start + 49 * HOUR + 1: 1}, short_pages={start: 50})
+
+    assert run(backfill, monkeypatch, exchange, start, end) == {"1h": 0}
+    assert not backfill._checkpoint_path("PI/USDT", "1h", start).exists()
+
+
+def test_interior_gaps_in_the_store_are_downloaded(backfill, monkeypatch, candles):
+    store = backfill.candle_store
+    store.append("PI/USDT", "1h", np.vstack([candles[:100], candles[150:300], candles[320:]]).tolist())
+
+    start, end = int(candles[0, 0]), int(candles[-1, 0]) + HOUR
+    assert backfill._missing_ranges("PI/USDT", "1h", start, end) == [
+        (int(candles[100, 0]), int(candles[150, 0])),
+        (int(candles[300, 0]), int(candles[320, 0])),
+    ]
+
+    assert run(backfill, monkeypatch, FakeExchange(candles), start, end) == {"1h": 70}
+    np.testing.assert_array_equal(store.read("PI/USDT", "1h")["timestamp"], candles[:, 0])
+    assert backfill._missing_ranges("PI/USDT", "1h", start, end) == []
+
+
+def test_chunks_before_the_listing_are_not_retried_forever(backfill, monkeypatch, candles):
+    listed = int(candles[0, 0])
+    start, end = listed - 250 * HOUR, int(candles[-1, 0]) + HOUR
+
+    assert run(backfill, monkeypatch, FakeExchange(candles), start, end) == {"1h": 500}
+    assert backfill.candle_store.read("PI/USDT", "1h")["timestamp"][0] == listed
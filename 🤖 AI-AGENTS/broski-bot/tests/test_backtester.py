@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtester import Backtester
+
+DAY_MS = 86_400_000
+START = 19_676 * DAY_MS
+FIVE_MINUTES = 300_000
+
+
+@pytest.fixture
+def config():
+    return {
+        "trading": {"trade_amount": 100.0, "max_position_size": 1000.0},
+        "risk_management": {"stop_loss_percentage": 2.0, "take_profit_percentage": 5.0,
+                            "max_daily_trades": 2, "max_open_positions": 1}
+    }
+
+
+def candles(closes, opens=None, highs=None, lows=None, times=None):
+    """OHLCV frame with a narrow range around each close unless given"""
+    closes = np.asarray(closes, dtype=float)
+    opens = closes if opens is None else np.asarray(opens, dtype=float)
+    highs = np.maximum(opens, closes) * 1.005 if highs is None else np.asarray(highs, dtype=float)
+    lows = np.minimum(opens, closes) * 0.995 if lows is None else np.asarray(lows, dtype=float)
+    times = START + FIVE_MINUTES * np.arange(len(closes)) if times is None else np.asarray(times)
+    return pd.DataFrame({"open": opens, "high": highs, "low": lows, "close": closes,
+                         "volume": np.full(len(closes), 100.0)},
+                        index=pd.to_datetime(times, unit="ms"))
+
+
+def signals(length, buys=(), sells=()):
+    values = np.zeros(length, dtype=int)
+    values[list(buys)] = 1
+    values[list(sells)] = -1
+    return values
+
+
+def test_signal_exit_pnl_matches_manual_calculation(config):
+    df = candles([1.0, 1.0, 1.02, 1.03, 1.0])
+    fee_rate, slippage = 0.001, 0.001
+
+    result = Backtester(config, fee_rate=fee_rate, slippage=slippage).run(df, signals(5, [1], [3]))
+
+    entry = 1.0 * (1 + slippage)
+    exit_ = 1.03 * (1 - slippage)
+    quantity = 100.0 / entry
+    pnl = quantity * (exit_ - entry) - quantity * (entry + exit_) * fee_rate
+    [trade] = result["trades"]
+    assert trade["exit_reason"] == "signal"
+    assert trade["entry_price"] == pytest.approx(entry)
+    assert trade["exit_price"] == pytest.approx(exit_)
+    assert trade["amount"] == pytest.approx(quantity)
+    assert trade["pnl"] == pytest.approx(pnl)
+    assert trade["entry_time"] == df.index[1]
+    assert trade["exit_time"] == df.index[3]
+    assert result["stats"]["total_pnl"] == pytest.approx(pnl)
+    assert result["equity"].iloc[-1] == pytest.approx(1000.0 + pnl)
+    assert result["equity"].iloc[0] == pytest.approx(1000.0)
+
+
+def test_position_is_marked_to_the_close_while_open(config):
+    df = candles([1.0, 1.0, 1.02, 1.03, 1.0])
+
+    result = Backtester(config, fee_rate=0.0, slippage=0.0).run(df, signals(5, [1], [3]))
+
+    # 100 units bought at 1.0 are worth 102 at bar 2
+    assert result["equity"].iloc[2] == pytest.approx(1002.0)
+
+
+@pytest.mark.parametrize("open_, low, exit_price", [(1.0, 0.97, 0.98), (0.95, 0.94, 0.95)])
+def test_stop_loss_fills_at_the_stop_or_a_lower_open(config, open_, low, exit_price):
+    df = candles([1.0, 1.0, 0.96, 1.0], opens=[1.0, 1.0, open_, 1.0],
+                 highs=[1.0, 1.0, 1.0, 1.0], lows=[1.0, 1.0, low, 1.0])
+
+    result = Backtester(config, fee_rate=0.0, slippage=0.0).run(df, signals(4, [1], [3]))
+
+    [trade] = result["trades"]
+    assert trade["exit_reason"] == "stop_loss"
+    assert trade["exit_price"] == pytest.approx(exit_price)
+    assert trade["exit_time"] == df.index[2]
+
+
+@pytest.mark.parametrize("open_, exit_price", [(1.0, 1.05), (1.08, 1.08)])
+def test_take_profit_fills_at_the_target_or_a_higher_open(config, open_, exit_price):
+    df = candles([1.0, 1.0, 1.04, 1.0], opens=[1.0, 1.0, open_, 1.0],
+                 highs=[1.0, 1.0, 1.09, 1.0], lows=[1.0, 1.0, 1.0, 1.0])
+
+    result = Backtester(config, fee_rate=0.0, slippage=0.0).run(df, signals(4, [1]))
+
+    [trade] = result["trades"]
+    assert trade["exit_reason"] == "take_profit"
+    assert trade["exit_price"] == pytest.approx(exit_price)
+
+
+def test_stop_loss_wins_when_both_levels_are_in_one_candle(config):
+    df = candles([1.0, 1.0, 1.0], highs=[1.0, 1.0, 1.06], lows=[1.0, 1.0, 0.97])
+
+    result = Backtester(config, fee_rate=0.0, slippage=0.0).run(df, signals(3, [1]))
+
+    assert result["trades"][0]["exit_reason"] == "stop_loss"
+
+
+def test_open_position_closes_at_end_of_data(config):
+    df = candles([1.0, 1.0, 1.01, 1.02])
+
+    result = Backtester(config, fee_rate=0.0, slippage=0.0).run(df, signals(4, [1]))
+
+    [trade] = result["trades"]
+    assert trade["exit_reason"] == "end_of_data"
+    assert trade["exit_price"] == pytest.approx(1.02)
+    assert trade["pnl"] == pytest.approx(2.0)
+
+
+def test_daily_trade_limit(config):
+    # Six round trips on the first day, two more on the next
+    times = np.concatenate([START + FIVE_MINUTES * np.arange(12),
+                            START + DAY_MS + FIVE_MINUTES * np.arange(4)])
+    df = candles(np.ones(16), times=times)
+    buys, sells = [0, 2, 4, 6, 8, 10, 12, 14], [1, 3, 5, 7, 9, 11, 13, 15]
+
+    result = Backtester(config).run(df, signals(16, buys, sells))
+
+    assert [df.index.get_loc(trade["entry_time"]) for trade in result["trades"]] == [0, 2, 12, 14]
+    assert result["stats"]["trades"] == 4
+
+
+def test_signal_strength_scales_position_size(config):
+    df = candles([1.0, 1.0, 1.0, 1.0])
+    strength = np.array([0.0, 0.5, 0.0, 0.0])
+
+    result = Backtester(config, fee_rate=0.0, slippage=0.0).run(df, signals(4, [1], [3]), strength)
+
+    assert result["trades"][0]["amount"] == pytest.approx(75.0)
+
+
+def test_no_signals(config):
+    df = candles([1.0, 1.01, 1.02])
+
+    result = Backtester(config).run(df, signals(3))
+
+    assert result["trades"] == []
+    assert result["stats"]["trades"] == 0
+    assert (result["equity"] == 1000.0).all()
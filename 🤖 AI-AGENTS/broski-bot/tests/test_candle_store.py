@@ -0,0 +1,127 @@
+import ccxt
+import numpy as np
+import pytest
+from candle_store import CandleStore
+from mock_exchange import MockExchange, generate_candles
+
+MINUTE = 60_000
+END = 1_700_000_000_000 // MINUTE * MINUTE
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CandleStore(tmp_path / "candles")
+
+
+@pytest.fixture
+def candles():
+    return generate_candles(count=1000, timeframe="1m", seed=5, end_time=END)
+
+
+def test_append_keeps_only_newer_candles_and_updates_the_forming_one(store, candles):
+    assert store.append("PI/USDT", "1m", candles[:10].tolist()) == 10
+
+    forming = candles[9].copy()
+    forming[4] = 99.0
+    assert store.append("PI/USDT", "1m", np.vstack([candles[5:9], forming, candles[10:12]]).tolist()) == 2
+
+    stored = store.read("PI/USDT", "1m")
+    assert len(stored["timestamp"]) == 12
+    assert stored["close"][9] == 99.0
+    assert store.last_timestamp("PI/USDT", "1m") == int(candles[11, 0])
+
+
+def test_interrupted_write_is_truncated_to_complete_candles(store, candles):
+    store.append("PI/USDT", "1m", candles[:10].tolist())
+    with open(store._column_path("PI/USDT", "1m", "close"), "ab") as f:
+        f.write(np.float64(1.0).tobytes())
+
+    assert store.length("PI/USDT", "1m") == 10
+    store.append("PI/USDT", "1m", candles[10:11].tolist())
+
+    assert store.length("PI/USDT", "1m") == 11
+    assert store.read("PI/USDT", "1m")["close"][-1] == candles[10, 4]
+
+
+def test_merge_fills_older_and_overlapping_candles(store, candles):
+    store.append("PI/USDT", "1m", candles[50:100].tolist())
+
+    revised = candles[40:60].copy()
+    revised[:, 4] += 1.0
+    assert store.merge("PI/USDT", "1m", revised) == 10
+
+    stored = store.read("PI/USDT", "1m")
+    np.testing.assert_array_equal(stored["timestamp"], candles[40:100, 0].astype(np.int64))
+    np.testing.assert_allclose(stored["close"][:20], revised[:, 4])
+
+
+def test_sync_backfills_then_extends_history(store, candles):
+    exchange = MockExchange({("PI/USDT", "1m"): candles}, speed=0)
+
+    store.sync(exchange, "PI/USDT", "1m", limit=100)
+    assert store.length("PI/USDT", "1m") >= 100
+    assert store.last_timestamp("PI/USDT", "1m") == int(candles[500, 0])
+
+    store.sync(exchange, "PI/USDT", "1m", limit=300)
+    stored = store.read("PI/USDT", "1m")
+    assert len(stored["timestamp"]) >= 300
+    assert np.all(np.diff(stored["timestamp"]) == MINUTE)
+
+
+@pytest.fixture
+def fetcher(tmp_path, candles):
+    from data_fetcher import DataFetcher
+    from ticker_cache import TickerCache
+
+    exchange = MockExchange({("PI/USDT", "1m"): candles}, speed=0)
+    config = {
+        "exchange": {"name": "mock", "api_key": "", "api_secret": ""},
+        "trading": {"base_symbol": "PI", "quote_symbol": "USDT"},
+        "strategies": {"active_strategy": "rsi_strategy", "rsi_strategy": {"timeframe": "1m"}},
+        "market_data": {"async_engine": False, "candle_store_dir": str(tmp_path / "fetcher"),
+                        "markets_cache_file": str(tmp_path / "markets.json")}
+    }
+    fetcher = DataFetcher(config, exchange=exchange, ticker_cache=TickerCache(exchange.fetch_ticker, 0))
+    fetcher.clock = lambda: exchange.now() / 1000
+    return fetcher, exchange
+
+
+def fail_ohlcv(monkeypatch, exchange):
+    failures = []
+
+    def fetch_ohlcv(*args, **kwargs):
+        failures.append(args)
+        raise ccxt.NetworkError("unreachable")
+
+    monkeypatch.setattr(exchange, "fetch_ohlcv", fetch_ohlcv)
+    return failures
+
+
+def test_failed_sync_is_retried_on_the_next_call(fetcher, monkeypatch):
+    fetcher, exchange = fetcher
+    fetched = fetcher.get_historical_prices("PI/USDT", "1m", limit=50)
+    assert len(fetched) == 50
+
+    exchange.advance(60)
+    failures = fail_ohlcv(monkeypatch, exchange)
+    served = fetcher.get_historical_prices("PI/USDT", "1m", limit=50)
+    fetcher.get_historical_prices("PI/USDT", "1m", limit=50)
+
+    # Stored candles are still recent enough to serve, but each call tries the exchange again
+    assert served.index[-1] == fetched.index[-1]
+    assert len(failures) == 2
+    assert fetcher.ohlcv_cache["PI/USDT_1m"] is fetched
+
+
+def test_stale_candles_are_not_served(fetcher, monkeypatch):
+    fetcher, exchange = fetcher
+    fetcher.get_historical_prices("PI/USDT", "1m", limit=50)
+
+    fail_ohlcv(monkeypatch, exchange)
+    exchange.advance(5 * 60)
+
+    assert fetcher.get_historical_prices("PI/USDT", "1m", limit=50).empty
+    assert fetcher._calculate_indicators("PI/USDT", "1m", "rsi_strategy") == {}
+
+    monkeypatch.undo()
+    assert len(fetcher.get_historical_prices("PI/USDT", "1m", limit=50)) == 50
@@ -0,0 +1,84 @@
+import json
+import os
+import pytest
+from config_watcher import ConfigWatcher, atomic_write_json, validate_config
+
+
+def valid_config(**trading):
+    return {
+        "exchange": {"name": "mexc"},
+        "trading": {"base_symbol": "PI", "quote_symbol": "USDT", "trade_amount": 10, **trading},
+        "strategies": {"active_strategy": "rsi_strategy", "rsi_strategy": {"rsi_period": 14}},
+        "risk_management": {"stop_loss_percentage": 2.0}
+    }
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "config.json"
+    atomic_write_json(str(path), valid_config())
+    return path
+
+
+def change(path, text):
+    """Rewrite the file with a modification time that is certainly new"""
+    mtime = os.stat(path).st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+
+
+def test_unchanged_file_is_not_reported(path):
+    assert ConfigWatcher(str(path)).poll() is None
+
+
+def test_valid_change_is_returned_once(path):
+    watcher = ConfigWatcher(str(path))
+
+    change(path, json.dumps(valid_config(trade_amount=25)))
+
+    assert watcher.poll()["trading"]["trade_amount"] == 25
+    assert watcher.poll() is None
+
+
+@pytest.mark.parametrize("text", [
+    '{"exchange": {"name": "mexc"}, "trading": {',
+    json.dumps({"exchange": {}, "trading": {"base_symbol": "PI", "quote_symbol": "USDT"}}),
+    json.dumps(valid_config(trade_amount=-5)),
+])
+def test_broken_or_invalid_change_is_ignored(path, text):
+    watcher = ConfigWatcher(str(path))
+
+    change(path, text)
+
+    assert watcher.poll() is None
+    # Fixing the file is picked up on the next poll
+    change(path, json.dumps(valid_config(trade_amount=30)))
+    assert watcher.poll()["trading"]["trade_amount"] == 30
+
+
+def test_missing_file_is_ignored(tmp_path):
+    watcher = ConfigWatcher(str(tmp_path / "missing.json"))
+
+    assert watcher.poll() is None
+
+
+def test_validation_reports_every_problem():
+    config = valid_config(trade_amount=True, trade_interval_seconds=0)
+    config["strategies"]["active_strategy"] = "macd_strategy"
+    config["strategies"]["rsi_strategy"]["rsi_period"] = 14.5
+
+    problems = validate_config(config)
+
+    assert len(problems) == 4
+    assert validate_config(valid_config()) == []
+    assert validate_config([]) == ["Configuration is not a JSON object"]
+
+
+def test_atomic_write_replaces_the_file_and_keeps_its_permissions(path):
+    os.chmod(path, 0o600)
+
+    atomic_write_json(str(path), {"written": True})
+
+    assert json.loads(path.read_text()) == {"written": True}
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert [entry.name for entry in path.parent.iterdir()] == ["config.json"]
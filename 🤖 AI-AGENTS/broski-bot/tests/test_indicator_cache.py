@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from indicators import kernels
+from indicators.cache import IndicatorCache, series_fingerprint
+from mock_exchange import generate_candles
+
+
+def frame(candles, attrs=True):
+    df = pd.DataFrame(candles[:, 1:], columns=["open", "high", "low", "close", "volume"])
+    if attrs:
+        df.index = pd.to_datetime(candles[:, 0], unit="ms")
+        df.attrs.update(symbol="PI/USDT", timeframe="1m")
+    return df
+
+
+@pytest.fixture
+def candles():
+    return generate_candles(count=300, timeframe="1m", seed=7)
+
+
+def test_same_candles_hit_the_cache(candles):
+    cache = IndicatorCache()
+
+    first = cache.get(frame(candles), "rsi", period=14)
+    second = cache.get(frame(candles), "rsi", period=14)
+
+    assert second is first
+    assert cache.stats["hits"] == 1
+    assert not first.flags.writeable
+
+
+def test_revised_interior_candle_is_a_different_series(candles):
+    cache = IndicatorCache()
+    cache.get(frame(candles), "sma", period=20)
+
+    revised = candles.copy()
+    revised[150, 4] *= 1.1
+    result = cache.get(frame(revised), "sma", period=20)
+
+    assert cache.stats["misses"] == 2
+    np.testing.assert_allclose(result, kernels.sma(frame(revised)["close"], period=20), equal_nan=True)
+
+
+def test_frames_without_attrs_only_match_on_equal_candles(candles):
+    cache = IndicatorCache()
+    other = generate_candles(count=300, timeframe="1m", seed=8)
+    # Same length, RangeIndex and last row, different history
+    other[-1] = candles[-1]
+
+    assert series_fingerprint(frame(candles, attrs=False)) != series_fingerprint(frame(other, attrs=False))
+    first = cache.get(frame(candles, attrs=False), "ema", period=10)
+    second = cache.get(frame(other, attrs=False), "ema", period=10)
+    assert not np.allclose(first, second, equal_nan=True)
+    assert cache.get(frame(candles, attrs=False), "ema", period=10) is first
+
+
+def test_volume_indicators_see_revised_volume(candles):
+    cache = IndicatorCache()
+    cache.get(frame(candles), "volume_ratio", period=20)
+
+    revised = candles.copy()
+    revised[100, 5] *= 3
+
+    cache.get(frame(revised), "volume_ratio", period=20)
+    assert cache.stats["misses"] == 2
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+from mock_exchange import generate_candles
+from strategies.lite_ml_strategy import LiteMLStrategy
+
+
+def test_features_match_what_saved_models_were_trained_on(tmp_path):
+    candles = generate_candles(count=300, timeframe="1h", seed=10)
+    df = pd.DataFrame(candles[:, 1:], columns=["open", "high", "low", "close", "volume"])
+
+    features = LiteMLStrategy({"model_path": str(tmp_path / "missing.pkl")}).add_features(df.copy())
+
+    # Simple-average RSI, as computed when the models were trained
+    delta = df["close"].diff()
+    rs = delta.clip(lower=0).rolling(14).mean() / (-delta.clip(upper=0)).rolling(14).mean()
+    expected_rsi = 100 - 100 / (1 + rs)
+    np.testing.assert_allclose(features["rsi"][14:], expected_rsi[14:])
+    np.testing.assert_allclose(features["ma_20"][19:], df["close"].rolling(20).mean()[19:])
+    np.testing.assert_allclose(features["volatility"][21:], df["close"].pct_change().rolling(20).std()[21:])
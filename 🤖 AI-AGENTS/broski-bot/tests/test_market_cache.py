@@ -0,0 +1,80 @@
+import json
+import threading
+import time
+import pytest
+from market_cache import MarketMetadataCache
+
+
+class Client:
+    """Minimal ccxt-like client recording which thread touched it"""
+
+    def __init__(self, markets):
+        self.markets = markets
+        self.threads = set()
+        self.set_markets_calls = []
+        self.downloads = 0
+
+    def load_markets(self, reload=False):
+        self.threads.add(threading.get_ident())
+        self.downloads += 1
+        return self.markets
+
+    def set_markets(self, markets):
+        self.threads.add(threading.get_ident())
+        self.set_markets_calls.append(markets)
+
+
+def market(symbol, amount=0.01):
+    base, quote = symbol.split("/")
+    return {"id": symbol.replace("/", ""), "base": base, "quote": quote, "active": True,
+            "precision": {"amount": amount, "price": 0.0001},
+            "limits": {"amount": {"min": 1, "max": None}, "cost": {"min": 5}}}
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return tmp_path / "markets.json"
+
+
+def test_first_load_downloads_and_saves(cache_file):
+    client = Client({"PI/USDT": market("PI/USDT")})
+    cache = MarketMetadataCache(client, cache_file=cache_file)
+
+    assert cache.get_symbol_info("PI/USDT")["precision"]["amount"] == 0.01
+    assert json.loads(cache_file.read_text())["markets"] == client.markets
+
+    # A new cache reads the saved copy without calling the exchange
+    other = Client({})
+    assert MarketMetadataCache(other, cache_file=cache_file).get_market("PI/USDT")["id"] == "PIUSDT"
+    assert other.downloads == 0
+    assert other.set_markets_calls == [client.markets]
+
+
+def test_background_refresh_never_touches_the_trading_client_off_thread(cache_file):
+    cache_file.write_text(json.dumps({"timestamp": time.time() - 100, "markets": {"PI/USDT": market("PI/USDT")}}))
+    trading = Client({})
+    refresh = Client({"PI/USDT": market("PI/USDT", amount=0.1)})
+    cache = MarketMetadataCache(trading, cache_file=cache_file, ttl_seconds=10, client_factory=lambda: refresh)
+
+    # The expired copy is served straight away while the new list downloads
+    assert cache.get_symbol_info("PI/USDT")["precision"]["amount"] == 0.01
+    cache.refresh_thread.join(2)
+    assert refresh.threads and threading.get_ident() not in refresh.threads
+    assert trading.threads == {threading.get_ident()}
+
+    # The next lookup swaps the new list in on the calling thread
+    assert cache.get_symbol_info("PI/USDT")["precision"]["amount"] == 0.1
+    assert trading.set_markets_calls[-1] == refresh.markets
+    assert trading.threads == {threading.get_ident()}
+    assert not cache.is_stale()
+    assert json.loads(cache_file.read_text())["markets"] == refresh.markets
+
+
+def test_without_a_client_factory_an_expired_list_is_refreshed_in_place(cache_file):
+    cache_file.write_text(json.dumps({"timestamp": time.time() - 100, "markets": {"PI/USDT": market("PI/USDT")}}))
+    client = Client({"PI/USDT": market("PI/USDT", amount=0.1)})
+    cache = MarketMetadataCache(client, cache_file=cache_file, ttl_seconds=10)
+
+    assert cache.get_symbol_info("PI/USDT")["precision"]["amount"] == 0.1
+    assert cache.refresh_thread is None
+    assert client.threads == {threading.get_ident()}
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+import market_data_engine
+import rate_limiter
+from candle_store import CandleStore
+from market_data_engine import MarketDataEngine, create_async_exchange_client
+from mock_exchange import MockExchange, generate_candles
+
+MINUTE = 60_000
+END = 1_700_000_000_000 // MINUTE * MINUTE
+
+
+class AsyncMock:
+    """Async facade over MockExchange, like a ccxt.async_support client"""
+
+    rateLimit = 1
+
+    def __init__(self, exchange):
+        self.exchange = exchange
+
+    def milliseconds(self):
+        return self.exchange.milliseconds()
+
+    async def fetch_ticker(self, symbol):
+        return self.exchange.fetch_ticker(symbol)
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        return self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def candles():
+    return generate_candles(count=1000, timeframe="1m", seed=9, end_time=END)
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch, candles):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    exchange = MockExchange({("PI/USDT", "1m"): candles}, speed=0)
+    config = {"exchange": {"name": "mexc", "api_key": "", "api_secret": ""}, "market_data": {}}
+    engine = MarketDataEngine(config, candle_store=CandleStore(tmp_path / "candles"))
+    monkeypatch.setattr(engine, "_create_exchange", lambda: AsyncMock(exchange))
+    yield engine, exchange
+    engine.close()
+
+
+def test_engine_backfills_and_returns_every_timeframe(engine, candles):
+    engine, exchange = engine
+
+    data = engine.fetch(["PI/USDT"], ["1m"], limit=100)
+
+    pair = data["pairs"]["PI/USDT"]
+    assert pair["price"] == candles[500, 4]
+    assert len(pair["ohlcv"]) == 100
+    assert pair["ohlcv"].index[-1].value // 1_000_000 == int(candles[500, 0])
+
+
+def test_engine_extends_history_for_longer_warmups(engine, candles):
+    engine, exchange = engine
+    engine.fetch(["PI/USDT"], ["1m"], limit=100)
+    exchange.advance(60)
+
+    data = engine.fetch(["PI/USDT"], ["1m"], limit=400)
+
+    stored = engine.candle_store.read("PI/USDT", "1m")["timestamp"]
+    assert len(data["pairs"]["PI/USDT"]["ohlcv"]) == 400
+    assert np.all(np.diff(stored) == MINUTE)
+    assert stored[-1] == int(candles[501, 0])
+
+
+def test_engine_stops_asking_once_the_exchange_has_no_older_candles(engine, candles):
+    engine, exchange = engine
+    engine.fetch(["PI/USDT"], ["1m"], limit=100)
+
+    engine.fetch(["PI/USDT"], ["1m"], limit=2000)
+    calls = exchange.call_counts["fetch_ohlcv"]
+    engine.fetch(["PI/USDT"], ["1m"], limit=2000)
+
+    assert engine.candle_store.length("PI/USDT", "1m") == 501
+    # Only the newest candles are requested again
+    assert exchange.call_counts["fetch_ohlcv"] == calls + 1
+
+
+def test_async_client_follows_the_configured_exchange(monkeypatch):
+    class FakeBinance:
+        def __init__(self, options):
+            self.options = options
+
+    monkeypatch.setattr(market_data_engine.ccxt_async, "binance", FakeBinance, raising=False)
+
+    client = create_async_exchange_client({"exchange": {"name": "Binance", "api_key": "key"}})
+
+    assert isinstance(client, FakeBinance)
+    assert client.options == {"apiKey": "key", "secret": "", "enableRateLimit": False}
+    with pytest.raises(ValueError):
+        create_async_exchange_client({"exchange": {"name": "no_such_exchange"}})
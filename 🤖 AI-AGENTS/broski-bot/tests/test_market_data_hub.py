@@ -0,0 +1,197 @@
+import threading
+import time
+import ccxt
+import pytest
+import market_data_hub
+from market_data_hub import MarketDataClient, MarketDataHub
+from mock_exchange import MockExchange, generate_candles
+
+
+class SlowExchange:
+    """Counts upstream calls and takes a while to answer each one"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def fetch_ticker(self, symbol):
+        self.calls.append(("fetch_ticker", symbol))
+        time.sleep(self.delay)
+        return {"symbol": symbol, "last": 1.0}
+
+
+@pytest.fixture
+def hub_config(tmp_path):
+    return {
+        "exchange": {"name": "mexc", "api_key": "", "api_secret": ""},
+        "market_data_hub": {"authkey": "test", "candle_store_dir": str(tmp_path / "hub_candles"),
+                            "ttl_seconds": {"fetch_ticker": 60, "fetch_ohlcv": 60}}
+    }
+
+
+def test_repeat_requests_are_served_from_cache(hub_config):
+    exchange = SlowExchange()
+    hub = MarketDataHub(hub_config, exchange=exchange)
+
+    for _ in range(3):
+        assert hub.handle_request("fetch_ticker", ["PI/USDT"]) == {"symbol": "PI/USDT", "last": 1.0}
+
+    assert exchange.calls == [("fetch_ticker", "PI/USDT")]
+    assert hub.stats["client_requests"] == 3
+    assert hub.stats["upstream_calls"] == 1
+
+
+def test_private_methods_are_refused(hub_config):
+    hub = MarketDataHub(hub_config, exchange=SlowExchange())
+    with pytest.raises(ValueError):
+        hub.handle_request("fetch_balance")
+
+
+def test_different_symbols_are_fetched_in_parallel(hub_config):
+    exchange = SlowExchange(delay=0.3)
+    hub = MarketDataHub(hub_config, exchange=exchange)
+    symbols = [f"COIN{i}/USDT" for i in range(4)]
+    threads = [threading.Thread(target=hub.handle_request, args=("fetch_ticker", [symbol])) for symbol in symbols]
+
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - start < 0.9
+    assert sorted(symbol for _, symbol in exchange.calls) == symbols
+
+
+def test_concurrent_requests_for_one_symbol_share_one_upstream_call(hub_config):
+    exchange = SlowExchange(delay=0.2)
+    hub = MarketDataHub(hub_config, exchange=exchange)
+    threads = [threading.Thread(target=hub.handle_request, args=("fetch_ticker", ["PI/USDT"])) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(exchange.calls) == 1
+
+
+def test_polling_with_a_moving_since_keeps_one_subscription(hub_config):
+    end_time = 1_700_000_000_000 // 60_000 * 60_000
+    candles = generate_candles(count=2000, timeframe="1m", seed=1, end_time=end_time)
+    exchange = MockExchange({("PI/USDT", "1m"): candles}, speed=0, start_time=end_time)
+    hub = MarketDataHub(hub_config, exchange=exchange)
+
+    for minutes in range(5):
+        since = end_time - (100 - minutes) * 60_000
+        rows = hub.handle_request("fetch_ohlcv", ["PI/USDT", "1m"], {"since": since, "limit": 50})
+        assert rows[0][0] == since
+
+    assert len(hub.subscriptions) == 1
+    [(method, args, kwargs, _)] = hub.subscriptions.values()
+    assert (method, args, kwargs) == ("fetch_ohlcv", ("PI/USDT", "1m"), {"limit": 50})
+
+
+class FakeHub:
+    """Stands in for the hub process behind multiprocessing connections"""
+
+    def __init__(self):
+        self.up = True
+        self.requests = 0
+
+    def connect(self, address, authkey=None):
+        if not self.up:
+            raise ConnectionRefusedError("hub is not running")
+        return FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, hub):
+        self.hub = hub
+        self.pending = None
+
+    def send(self, request):
+        if not self.hub.up:
+            raise BrokenPipeError("hub went away")
+        self.hub.requests += 1
+        self.pending = {"ok": True, "result": {"symbol": request["args"][0], "source": "hub"}}
+
+    def recv(self):
+        return self.pending
+
+    def close(self):
+        pass
+
+
+class DirectClient:
+    def fetch_ticker(self, symbol):
+        return {"symbol": symbol, "source": "direct"}
+
+
+@pytest.fixture
+def fake_hub(monkeypatch):
+    hub = FakeHub()
+    monkeypatch.setattr(market_data_hub, "Client", hub.connect)
+    return hub
+
+
+def test_client_reconnects_after_a_hub_restart(fake_hub):
+    client = MarketDataClient("hub", b"key", fallback=DirectClient)
+    assert client.fetch_ticker("PI/USDT")["source"] == "hub"
+
+    # The hub restarts between two calls: the old connection is dead, a new one works
+    client._conn.hub = FakeHub()
+    client._conn.hub.up = False
+
+    assert client.fetch_ticker("PI/USDT")["source"] == "hub"
+    assert client.failures == 0
+
+
+def test_client_falls_back_after_repeated_failures_and_returns_to_the_hub(fake_hub):
+    client = MarketDataClient("hub", b"key", fallback=DirectClient, max_failures=3, backoff_seconds=0.01,
+                              max_backoff_seconds=0.02)
+    fake_hub.up = False
+
+    # Failures below the threshold surface as network errors
+    with pytest.raises(ccxt.NetworkError):
+        client.fetch_ticker("PI/USDT")
+    for _ in range(2):
+        time.sleep(0.03)
+        try:
+            client.fetch_ticker("PI/USDT")
+        except ccxt.NetworkError:
+            pass
+    assert client.failures == 3
+    assert client.fetch_ticker("PI/USDT")["source"] == "direct"
+
+    fake_hub.up = True
+    time.sleep(0.03)
+    assert client.fetch_ticker("PI/USDT")["source"] == "hub"
+    assert client.failures == 0
+
+
+def test_reconnects_back_off(fake_hub):
+    client = MarketDataClient("hub", b"key", backoff_seconds=10)
+    fake_hub.up = False
+
+    for _ in range(3):
+        with pytest.raises(ccxt.NetworkError):
+            client.fetch_ticker("PI/USDT")
+    fake_hub.up = True
+
+    # Still inside the backoff window, the hub is not tried again yet
+    with pytest.raises(ccxt.NetworkError):
+        client.fetch_ticker("PI/USDT")
+    assert client.failures == 1
+    assert fake_hub.requests == 0
+
+
+@pytest.mark.parametrize("error_type, error_class", [("NetworkError", ccxt.NetworkError),
+                                                     ("KeyError", ccxt.ExchangeError)])
+def test_hub_errors_are_raised_as_ccxt_errors(fake_hub, monkeypatch, error_type, error_class):
+    client = MarketDataClient("hub", b"key")
+    monkeypatch.setattr(FakeConnection, "recv", lambda self: {"ok": False, "error": "failed", "type": error_type})
+
+    with pytest.raises(error_class):
+        client.fetch_ticker("PI/USDT")
+    assert client.failures == 0
@@ -0,0 +1,104 @@
+import ccxt
+import numpy as np
+import pytest
+from candle_store import CandleStore
+from mock_exchange import MockExchange, generate_candles
+
+MINUTE = 60_000
+END = 1_700_000_000_000 // MINUTE * MINUTE
+
+
+@pytest.fixture
+def candles():
+    return generate_candles(count=1000, timeframe="1m", seed=3, end_time=END)
+
+
+@pytest.fixture
+def exchange(candles):
+    return MockExchange({("PI/USDT", "1m"): candles}, speed=0, balances={"USDT": 1000.0, "PI": 100.0},
+                        fee_rate=0.001, spread=0.0)
+
+
+def test_candles_stop_at_the_simulated_time(exchange, candles):
+    start = int(candles[500, 0])
+
+    rows = exchange.fetch_ohlcv("PI/USDT", "1m", limit=10)
+    assert [row[0] for row in rows] == list(range(start - 9 * MINUTE, start + MINUTE, MINUTE))
+
+    exchange.advance(120)
+    assert exchange.fetch_ohlcv("PI/USDT", "1m", limit=1)[0][0] == start + 2 * MINUTE
+    assert exchange.fetch_ticker("PI/USDT")["last"] == candles[502, 4]
+
+
+def test_derived_forming_candle_excludes_later_base_candles(exchange, candles):
+    # Move into the middle of a 5m bucket
+    now = exchange.now()
+    exchange.advance(((5 * MINUTE - now % (5 * MINUTE)) + 2 * MINUTE) / 1000)
+    now = exchange.now()
+    bucket = now // (5 * MINUTE) * (5 * MINUTE)
+
+    row = exchange.fetch_ohlcv("PI/USDT", "5m", limit=1)[-1]
+
+    inside = candles[(candles[:, 0] >= bucket) & (candles[:, 0] <= now)]
+    assert row[0] == bucket
+    assert len(inside) == 3
+    assert row[1:] == pytest.approx([inside[0, 1], inside[:, 2].max(), inside[:, 3].min(), inside[-1, 4],
+                                     inside[:, 5].sum()])
+
+
+def test_market_orders_fill_at_the_last_price_with_fees(exchange):
+    price = exchange.fetch_ticker("PI/USDT")["last"]
+
+    order = exchange.create_market_buy_order("PI/USDT", 10.0)
+
+    assert order["status"] == "closed"
+    balance = exchange.fetch_balance()
+    assert balance["PI"]["free"] == pytest.approx(110.0)
+    assert balance["USDT"]["free"] == pytest.approx(1000.0 - 10.0 * price * 1.001)
+    assert balance["USDT"]["used"] == pytest.approx(0.0)
+
+
+def test_limit_orders_fill_once_the_price_crosses(exchange, candles):
+    last = exchange.fetch_ticker("PI/USDT")["last"]
+    future = candles[501:, 4]
+    target = float(future.min())
+    assert target < last
+
+    order = exchange.create_limit_buy_order("PI/USDT", 1.0, target)
+    assert order["status"] == "open"
+    assert exchange.fetch_balance()["USDT"]["used"] == pytest.approx(target * 1.001)
+
+    minutes = int(np.argmin(future)) + 1
+    exchange.advance(minutes * 60)
+    assert exchange.fetch_order(order["id"])["status"] == "closed"
+    assert exchange.fetch_balance()["PI"]["free"] == pytest.approx(101.0)
+
+
+def test_cancel_releases_reserved_funds(exchange):
+    order = exchange.create_limit_sell_order("PI/USDT", 5.0, 1000.0)
+    assert exchange.fetch_balance()["PI"]["free"] == pytest.approx(95.0)
+
+    exchange.cancel_order(order["id"])
+
+    assert exchange.fetch_balance()["PI"]["free"] == pytest.approx(100.0)
+    assert exchange.fetch_open_orders() == []
+
+
+def test_insufficient_funds(exchange):
+    with pytest.raises(ccxt.InsufficientFunds):
+        exchange.create_market_sell_order("PI/USDT", 1000.0)
+
+
+def test_fixture_round_trip_and_call_counts(tmp_path, candles):
+    store = CandleStore(tmp_path / "candles")
+    store.append("PI/USDT", "1m", candles.tolist())
+    path = str(tmp_path / "fixture.npz")
+    MockExchange.save_fixture(path, store, ["PI/USDT"], ["1m"])
+
+    exchange = MockExchange.from_fixture(path, speed=0)
+    exchange.load_markets()
+    exchange.fetch_ohlcv("PI/USDT", "1m")
+    exchange.fetch_ohlcv("PI/USDT", "15m")
+
+    np.testing.assert_array_equal(exchange.candles[("PI/USDT", "1m")], candles)
+    assert dict(exchange.call_counts) == {"load_markets": 1, "fetch_ohlcv": 2}
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+from mock_exchange import generate_candles
+from strategies.multi_timeframe_strategy import MultiTimeframeHyperFocusStrategy, trend_votes
+
+FIVE_MINUTES = 300_000
+END = 1_700_000_000_000 // 14_400_000 * 14_400_000
+
+
+def settings(**overrides):
+    return {"multi_timeframe_strategy": {
+        "timeframe": "5m", "confirmation_timeframes": ["15m", "1h"],
+        "rsi_period": 5, "fast_period": 3, "slow_period": 6, "signal_period": 3, "ma_fast": 3, "ma_slow": 6,
+        **overrides
+    }}
+
+
+@pytest.fixture
+def df():
+    candles = generate_candles(count=1500, timeframe="5m", volatility=0.01, seed=12, end_time=END)
+    df = pd.DataFrame(candles[:, 1:], columns=["open", "high", "low", "close", "volume"],
+                      index=pd.to_datetime(candles[:, 0], unit="ms"))
+    df.attrs.update(symbol="PI/USDT", timeframe="5m")
+    return df
+
+
+def test_trend_needs_two_of_three_indicators():
+    votes = trend_votes(rsi=[60, 60, 40, np.nan], macd_line=[1, 0, 0, 1], signal_line=[0, 1, 1, 0],
+                        ma_fast=[1, 1, 0, np.nan], ma_slow=[0, 2, 1, np.nan])
+
+    assert votes.tolist() == [1, -1, -1, 0]
+
+
+def test_timeframes_that_cannot_be_derived_are_ignored():
+    strategy = MultiTimeframeHyperFocusStrategy(settings(confirmation_timeframes=["1m", "5m", "7m", "1h"]))
+
+    assert strategy.confirmation_timeframes == ["1h"]
+    assert strategy.min_timeframes_agreeing == 1
+
+
+def test_votes_never_see_a_higher_timeframe_candle_before_it_closes(df):
+    strategy = MultiTimeframeHyperFocusStrategy(settings())
+    full = strategy.timeframe_votes(df)
+
+    for end in (400, 411, 412, 1000):
+        truncated = strategy.timeframe_votes(df.iloc[:end])
+        for timeframe, votes in truncated.items():
+            np.testing.assert_array_equal(votes, full[timeframe][:end])
+
+
+def test_streamed_votes_match_the_batch_every_cycle(df):
+    strategy = MultiTimeframeHyperFocusStrategy(settings())
+    batch = MultiTimeframeHyperFocusStrategy(settings())
+
+    for end in range(300, len(df), 7):
+        window = df.iloc[:end]
+        expected = {timeframe: int(votes[-1]) for timeframe, votes in batch.timeframe_votes(window).items()}
+        assert strategy.latest_votes(window) == expected
+
+
+def test_signals_need_the_higher_timeframes_to_agree(df):
+    base = MultiTimeframeHyperFocusStrategy(settings(confirmation_timeframes=[]))
+    confirmed = MultiTimeframeHyperFocusStrategy(settings())
+    impossible = MultiTimeframeHyperFocusStrategy(settings(min_timeframes_agreeing=3))
+
+    base_signals = base.generate_signals_batch(df)["type"]
+    signals = confirmed.generate_signals_batch(df)["type"]
+
+    assert np.count_nonzero(base_signals) > np.count_nonzero(signals) > 0
+    # Confirmation only removes signals, it never adds or flips one
+    assert np.all((signals == 0) | (signals == base_signals))
+    assert not np.any(impossible.generate_signals_batch(df)["type"])
@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+from order_book import LocalOrderBook
+
+
+def make_book(bids, asks, nonce=None):
+    book = LocalOrderBook("PI/USDT", clock=lambda: 0.0)
+    book.apply_snapshot({"bids": bids, "asks": asks, "nonce": nonce})
+    return book
+
+
+def test_snapshot_sorts_levels_and_drops_empty_ones():
+    book = make_book([[0.9, 1.0], [1.0, 2.0], [0.95, 0.0]], [[1.2, 1.0], [1.1, 3.0]])
+
+    assert book.best_bid() == (1.0, 2.0)
+    assert book.best_ask() == (1.1, 3.0)
+    assert book.to_ccxt()["bids"] == [[1.0, 2.0], [0.9, 1.0]]
+    assert book.mid_price() == pytest.approx(1.05)
+
+
+def test_snapshot_levels_with_extra_fields():
+    # Some exchanges send [price, size, order count]
+    book = make_book([[1.0, 2.0, 5], [0.9, 1.0, 1], [0.95, 4.0, 2]], [[1.1, 1.0, 3]])
+
+    assert book.to_ccxt()["bids"] == [[1.0, 2.0], [0.95, 4.0], [0.9, 1.0]]
+    assert book.to_ccxt()["asks"] == [[1.1, 1.0]]
+
+
+def test_deltas_update_insert_and_remove_levels():
+    book = make_book([[1.0, 2.0], [0.9, 1.0]], [[1.1, 1.0]], nonce=1)
+
+    assert book.apply_deltas(bids=[[0.9, 0, 7], [0.97, 5.0, 2]], asks=[[1.1, 4.0, 1], [1.2, 3.0, 1]], nonce=2)
+
+    assert book.to_ccxt()["bids"] == [[1.0, 2.0], [0.97, 5.0]]
+    assert book.to_ccxt()["asks"] == [[1.1, 4.0], [1.2, 3.0]]
+
+
+def test_stale_deltas_are_ignored():
+    book = make_book([[1.0, 2.0]], [[1.1, 1.0]], nonce=5)
+
+    assert not book.apply_deltas(bids=[[1.0, 9.0]], nonce=5)
+    assert book.best_bid() == (1.0, 2.0)
+
+
+def test_depth_and_fill_estimates():
+    book = make_book([[1.0, 2.0], [0.9, 3.0]], [[1.1, 1.0], [1.2, 2.0]])
+
+    assert book.depth_at("asks", 1.15) == 1.0
+    assert book.depth_at("asks", 1.2) == 3.0
+    assert book.depth_at("bids", 0.95) == 2.0
+    assert book.depth_at("bids", 0.9) == 5.0
+
+    assert book.vwap_to_size("buy", 2.0) == pytest.approx((1.1 + 1.2) / 2)
+    assert book.vwap_to_size("sell", 3.0) == pytest.approx((2 * 1.0 + 0.9) / 3)
+    assert book.vwap_to_size("buy", 10.0) is None
+    assert book.slippage_percentage("buy", 1.0) == pytest.approx(0.0)
+
+
+@pytest.fixture
+def mock_fetcher(tmp_path):
+    from data_fetcher import DataFetcher
+    from mock_exchange import MockExchange, generate_candles
+    from ticker_cache import TickerCache
+
+    def create(**market_data):
+        exchange = MockExchange({("PI/USDT", "1m"): generate_candles(count=1000, seed=4)}, speed=0)
+        config = {
+            "exchange": {"name": "mock", "api_key": "", "api_secret": ""},
+            "trading": {"base_symbol": "PI", "quote_symbol": "USDT"},
+            "strategies": {"active_strategy": "rsi_strategy", "rsi_strategy": {"timeframe": "1m"}},
+            "market_data": {"async_engine": False, "candle_store_dir": str(tmp_path / "candles"),
+                            "markets_cache_file": str(tmp_path / "markets.json"), "order_book_depth": 10,
+                            **market_data}
+        }
+        fetcher = DataFetcher(config, exchange=exchange, ticker_cache=TickerCache(exchange.fetch_ticker, 0))
+        fetcher.clock = lambda: exchange.now() / 1000
+        return fetcher, exchange
+    return create
+
+
+def test_order_book_requests_fetch_live_by_default(mock_fetcher):
+    fetcher, exchange = mock_fetcher()
+
+    fetcher.get_order_book("PI/USDT")
+    fetcher.get_order_book("PI/USDT")
+
+    assert exchange.call_counts["fetch_order_book"] == 2
+    assert fetcher.order_books == {}
+
+
+def test_local_order_book_follows_the_update_feed(mock_fetcher):
+    fetcher, exchange = mock_fetcher(local_order_book=True)
+    first = fetcher.get_order_book("PI/USDT", limit=10)
+
+    for _ in range(5):
+        exchange.advance(60)
+        book = fetcher.get_order_book("PI/USDT", limit=10)
+        expected = exchange.fetch_order_book("PI/USDT", limit=10)
+        np.testing.assert_allclose(book["bids"], expected["bids"])
+        np.testing.assert_allclose(book["asks"], expected["asks"])
+        assert book["nonce"] == expected["nonce"]
+
+    assert book["bids"] != first["bids"]
+    # One snapshot to seed the book, updates after that (plus the comparison snapshots)
+    assert exchange.call_counts["fetch_order_book_deltas"] == 5
+    assert exchange.call_counts["fetch_order_book"] == 1 + 5
+
+
+def test_local_order_book_reseeds_after_a_gap(mock_fetcher, monkeypatch):
+    fetcher, exchange = mock_fetcher(local_order_book=True)
+    book = fetcher.get_local_order_book("PI/USDT")
+    exchange.advance(60)
+
+    # The feed's updates start after a nonce the book never saw
+    feed = exchange.fetch_order_book_deltas
+    monkeypatch.setattr(exchange, "fetch_order_book_deltas",
+                        lambda symbol, since, limit=None: {**feed(symbol, since, limit), "previous_nonce": since + 1})
+    fetcher.get_local_order_book("PI/USDT")
+
+    assert exchange.call_counts["fetch_order_book"] == 2
+    assert book.nonce == exchange.fetch_order_book("PI/USDT")["nonce"]
@@ -0,0 +1,123 @@
+import asyncio
+import time
+import pytest
+from rate_limiter import RateLimitedClient, TokenBucketLimiter, endpoint_for
+
+
+def run_with_timeout(function, timeout=2.0):
+    """Call function, failing instead of hanging if it blocks"""
+    start = time.monotonic()
+    result = function()
+    assert time.monotonic() - start < timeout
+    return result
+
+
+@pytest.mark.parametrize("rate, burst", [(0.5, None), (1.0, None), (10.0, 1)])
+def test_capacity_fits_the_heaviest_call_above_the_reserve(rate, burst):
+    limiter = TokenBucketLimiter(rate_per_second=rate, burst=burst)
+
+    assert limiter.capacity - limiter.reserve >= max(limiter.weights.values())
+    # A full bucket serves a private call right away
+    assert limiter.try_acquire("private")
+
+
+def test_slow_limiter_does_not_hang_data_calls():
+    limiter = TokenBucketLimiter(rate_per_second=1.0)
+    limiter.tokens = 0.0
+
+    wait = run_with_timeout(lambda: limiter.acquire("public"), timeout=3.0)
+
+    assert wait > 0
+
+
+def test_oversized_calls_wait_for_a_full_bucket_instead_of_forever():
+    limiter = TokenBucketLimiter(rate_per_second=100.0, burst=5, order_reserve=0.2)
+
+    run_with_timeout(lambda: limiter.acquire("public", weight=50))
+    run_with_timeout(lambda: limiter.acquire("order", weight=50))
+
+
+@pytest.mark.parametrize("options", [{"rate_per_second": 0}, {"rate_per_second": -1},
+                                     {"order_reserve": 1.0}, {"order_reserve": -0.1}])
+def test_invalid_settings(options):
+    with pytest.raises(ValueError):
+        TokenBucketLimiter(**options)
+
+
+def test_order_reserve_is_kept_for_orders():
+    limiter = TokenBucketLimiter(rate_per_second=0.001, burst=10, order_reserve=0.2)
+
+    taken = 0
+    while limiter.try_acquire("public"):
+        taken += 1
+
+    assert taken == 8
+    assert limiter.try_acquire("order")
+    assert limiter.try_acquire("order")
+    assert not limiter.try_acquire("order")
+
+
+def test_burst_then_refill_rate():
+    limiter = TokenBucketLimiter(rate_per_second=50.0, burst=5, order_reserve=0.0)
+    for _ in range(5):
+        assert limiter.acquire("public") == 0.0
+
+    wait = limiter.acquire("public")
+
+    assert 0.005 < wait < 0.2
+    metrics = limiter.get_metrics()["endpoints"]["public"]
+    assert metrics["calls"] == 6
+    assert metrics["waited_calls"] == 1
+
+
+def test_acquire_async():
+    limiter = TokenBucketLimiter(rate_per_second=50.0, burst=2, weights={"private": 1}, order_reserve=0.0)
+
+    async def calls():
+        return [await limiter.acquire_async("public") for _ in range(3)]
+
+    waits = asyncio.run(calls())
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] > 0
+
+
+@pytest.mark.parametrize("method, endpoint", [
+    ("fetch_ticker", "public"), ("fetch_ohlcv", "public"), ("load_markets", "public"),
+    ("fetch_balance", "private"), ("fetch_open_orders", "private"),
+    ("create_order", "order"), ("cancel_order", "order"), ("amount_to_precision", None),
+])
+def test_endpoint_for(method, endpoint):
+    assert endpoint_for(method) == endpoint
+
+
+class DummyClient:
+    name = "dummy"
+    markets = {"PI/USDT": {}}
+
+    def fetch_ticker(self, symbol):
+        return {"symbol": symbol}
+
+    def fetch_balance(self):
+        return {}
+
+    def create_order(self, *args):
+        return {"id": "1"}
+
+    def amount_to_precision(self, symbol, amount):
+        return str(amount)
+
+
+def test_rate_limited_client_counts_calls_per_endpoint():
+    limiter = TokenBucketLimiter(rate_per_second=1000.0)
+    client = RateLimitedClient(DummyClient(), limiter)
+
+    assert client.fetch_ticker("PI/USDT") == {"symbol": "PI/USDT"}
+    client.fetch_balance()
+    client.create_order("PI/USDT", "market", "buy", 1.0)
+    client.amount_to_precision("PI/USDT", 1.0)
+    client.markets = {}
+
+    endpoints = limiter.get_metrics()["endpoints"]
+    assert {name: stats["calls"] for name, stats in endpoints.items()} == {"public": 1, "private": 1, "order": 1}
+    assert client.client.markets == {}
@@ -0,0 +1,81 @@
+import pytest
+from candle_store import CandleStore
+from mock_exchange import MockExchange, generate_candles
+from replay import replay
+
+CYCLES = 300
+
+
+@pytest.fixture
+def fixture_file(tmp_path):
+    """Generated 15m candles recorded into a replay fixture"""
+    store = CandleStore(tmp_path / "candles")
+    store.append("PI/USDT", "15m", generate_candles(timeframe="15m", seed=7).tolist())
+    path = tmp_path / "fixture.npz"
+    MockExchange.save_fixture(str(path), store, ["PI/USDT"], ["15m"])
+    return str(path)
+
+
+@pytest.fixture
+def config():
+    return {
+        "exchange": {
+            "name": "mexc",
+            "api_key": "",
+            "api_secret": "",
+            "mock": {"balances": {"USDT": 1000.0, "PI": 100.0}}
+        },
+        "trading": {
+            "base_symbol": "PI",
+            "quote_symbol": "USDT",
+            "trade_amount": 10.0,
+            "max_position_size": 50,
+            "trade_interval_seconds": 900,
+            "auto_trade": False
+        },
+        "risk_management": {
+            "stop_loss_percentage": 2.0,
+            "take_profit_percentage": 5.0,
+            "max_daily_trades": 10,
+            "max_open_positions": 3
+        },
+        "strategies": {
+            "active_strategy": "rsi_strategy",
+            "rsi_strategy": {"enabled": True, "timeframe": "15m", "rsi_period": 14,
+                             "rsi_overbought": 70, "rsi_oversold": 30},
+            "hyperfocus_strategy": {"enabled": True, "timeframe": "15m"}
+        },
+        "logging": {"level": "WARNING", "save_to_file": False}
+    }
+
+
+@pytest.mark.parametrize("strategy, trades", [("rsi_strategy", 14), ("hyperfocus_strategy", 2)])
+def test_replay_call_counts_and_trades(config, fixture_file, tmp_path, monkeypatch, strategy, trades):
+    monkeypatch.chdir(tmp_path)
+    config["strategies"]["active_strategy"] = strategy
+
+    result = replay(config, cycles=CYCLES, fixture=fixture_file)
+
+    assert result["cycles"] == CYCLES
+    assert result["trades"] == trades
+    assert result["failed_trades"] == 0
+    # Connect and load markets once, then one candle sync and one shared ticker per cycle
+    assert result["api_calls"] == {
+        "fetch_time": 1,
+        "load_markets": 1,
+        "fetch_ohlcv": CYCLES,
+        "fetch_ticker": CYCLES,
+        "create_order": trades
+    }
+
+
+def test_replay_is_reproducible(config, fixture_file, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    first = replay(config, cycles=100, fixture=fixture_file)
+    second = replay(config, cycles=100, fixture=fixture_file)
+
+    assert first["api_calls"] == second["api_calls"]
+    assert first["trades"] == second["trades"]
+    assert first["balance"] == second["balance"]
+    assert first["equity"] == pytest.approx(second["equity"])
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+from candle_store import CandleStore
+from mock_exchange import generate_candles
+from resampler import TimeframeResampler, bucket_start, resample_ohlcv
+
+MINUTE = 60_000
+START = 1_700_000_000_000 // (60 * MINUTE) * (60 * MINUTE)
+
+
+class Clock:
+    def __init__(self, ms):
+        self.ms = ms
+
+    def __call__(self):
+        return self.ms / 1000
+
+
+def candle(minute, close=1.0, volume=1.0):
+    return [START + minute * MINUTE, close, close, close, close, volume]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CandleStore(tmp_path / "candles")
+
+
+def test_resample_matches_pandas():
+    candles = generate_candles(count=600, timeframe="1m", seed=5, end_time=START + 599 * MINUTE)
+    columns = dict(zip(("timestamp", "open", "high", "low", "close", "volume"), candles.T))
+    columns["timestamp"] = candles[:, 0].astype(np.int64)
+
+    result = resample_ohlcv(columns, "15m")
+
+    df = pd.DataFrame(candles[:, 1:], columns=["open", "high", "low", "close", "volume"],
+                      index=pd.to_datetime(candles[:, 0].astype(np.int64), unit="ms"))
+    expected = df.resample("15min").agg({"open": "first", "high": "max", "low": "min", "close": "last",
+                                         "volume": "sum"})
+    np.testing.assert_allclose(result[:, 1:], expected.to_numpy())
+    assert result[0, 0] == START
+
+
+def test_weekly_buckets_start_on_monday():
+    # 2023-11-15 was a Wednesday
+    wednesday = int(pd.Timestamp("2023-11-15 12:00").value // 1_000_000)
+    [start] = bucket_start(np.array([wednesday]), "1w")
+    assert pd.Timestamp(start, unit="ms") == pd.Timestamp("2023-11-13")
+
+
+def test_forming_bucket_follows_updates_to_its_last_candle(store):
+    clock = Clock(START + 4 * MINUTE + 30_000)
+    resampler = TimeframeResampler(store, "1m", clock=clock)
+    store.append("PI/USDT", "1m", [candle(minute) for minute in range(5)])
+
+    assert resampler.get("PI/USDT", "5m").iloc[-1]["close"] == 1.0
+
+    # The final 1m candle was still forming, the next sync overwrites it
+    store.append("PI/USDT", "1m", [candle(4, close=9.0, volume=100.0)])
+    clock.ms = START + 5 * MINUTE + 10_000
+    row = resampler.get("PI/USDT", "5m").iloc[-1]
+
+    assert row["close"] == 9.0
+    assert row["volume"] == 104.0
+    assert resampler.closed[("PI/USDT", "5m")][0].shape == (0, 6)
+
+
+def test_bucket_closes_once_a_newer_candle_is_stored(store):
+    clock = Clock(START + 5 * MINUTE + 30_000)
+    resampler = TimeframeResampler(store, "1m", clock=clock)
+    store.append("PI/USDT", "1m", [candle(minute) for minute in range(5)])
+    resampler.get("PI/USDT", "5m")
+
+    store.append("PI/USDT", "1m", [candle(4, close=9.0, volume=100.0), candle(5, close=2.0)])
+    df = resampler.get("PI/USDT", "5m")
+
+    assert list(df["close"]) == [9.0, 2.0]
+    closed = resampler.closed[("PI/USDT", "5m")][0]
+    assert closed[:, 4].tolist() == [9.0]
+
+
+def test_bucket_closes_once_the_clock_passes_its_end(store):
+    clock = Clock(START + 6 * MINUTE)
+    resampler = TimeframeResampler(store, "1m", clock=clock)
+    store.append("PI/USDT", "1m", [candle(minute) for minute in range(5)])
+
+    resampler.get("PI/USDT", "5m")
+
+    assert resampler.closed[("PI/USDT", "5m")][0][:, 0].tolist() == [START]
+
+
+def test_history_starting_mid_bucket_drops_the_partial_bucket(store):
+    resampler = TimeframeResampler(store, "1m", clock=Clock(START + 20 * MINUTE))
+    store.append("PI/USDT", "1m", [candle(minute) for minute in range(2, 15)])
+
+    df = resampler.get("PI/USDT", "5m")
+
+    assert list(df.index) == list(pd.to_datetime([START + 5 * MINUTE, START + 10 * MINUTE], unit="ms"))
+    assert df.attrs == {"symbol": "PI/USDT", "timeframe": "5m"}
+
+
+def test_timeframes_must_be_multiples_of_the_base(store):
+    resampler = TimeframeResampler(store, "5m")
+    assert resampler.ratio("1h") == 12
+    with pytest.raises(ValueError):
+        resampler.ratio("1m")
+    with pytest.raises(ValueError):
+        resampler.ratio("7m")
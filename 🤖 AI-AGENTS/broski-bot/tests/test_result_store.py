@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+import result_store
+from mock_exchange import generate_candles
+from result_store import ResultStore, data_fingerprint, params_hash
+
+
+def history(seed=11):
+    candles = generate_candles(count=200, timeframe="1h", seed=seed)
+    df = pd.DataFrame(candles[:, 1:], columns=["open", "high", "low", "close", "volume"],
+                      index=pd.to_datetime(candles[:, 0], unit="ms"))
+    df.attrs.update(symbol="PI/USDT", timeframe="1h")
+    return df
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(tmp_path / "results.db")
+    yield store
+    store.close()
+
+
+def result(params, pnl):
+    return {"params": params, "trades": 4, "win_rate": 50.0, "pnl": pnl, "max_drawdown": 1.5}
+
+
+def test_params_hash_ignores_key_order_and_number_spelling():
+    assert params_hash({"rsi_period": 14, "oversold": 30}) == params_hash({"oversold": 30.0, "rsi_period": np.int64(14)})
+    assert params_hash({"rsi_period": 14}) != params_hash({"rsi_period": 15})
+
+
+def test_fingerprint_changes_with_candles_settings_and_version(monkeypatch):
+    df = history()
+    key = data_fingerprint(df, {"fee": 0.001})
+
+    assert data_fingerprint(history(), {"fee": 0.001}) == key
+    assert data_fingerprint(df, {"fee": 0.002}) != key
+
+    revised = df.copy()
+    revised.iloc[100, revised.columns.get_loc("close")] *= 1.01
+    assert data_fingerprint(revised, {"fee": 0.001}) != key
+
+    monkeypatch.setattr(result_store, "RESULTS_VERSION", result_store.RESULTS_VERSION + 1)
+    assert data_fingerprint(df, {"fee": 0.001}) != key
+
+
+def test_results_round_trip_per_strategy_and_data(store):
+    params = [{"rsi_period": period} for period in (10, 14, 20)]
+    entries = [(params_hash(p), result(p, pnl)) for p, pnl in zip(params, (5.0, -2.0, 12.5))]
+    store.put_many("rsi_strategy", "data-a", entries, symbol="PI/USDT", timeframe="1h", candles=200)
+
+    found = store.get_many("rsi_strategy", "data-a", [params_hash(p) for p in params] + ["unknown"])
+    assert found[params_hash(params[2])] == {"params": {"rsi_period": 20.0}, "trades": 4, "win_rate": 50.0,
+                                             "pnl": 12.5, "max_drawdown": 1.5}
+    assert len(found) == 3
+    assert store.stats == {"hits": 3, "misses": 1, "stored": 3}
+
+    assert store.get_many("rsi_strategy", "data-b", [params_hash(params[0])]) == {}
+    assert store.get_many("macd_strategy", "data-a", [params_hash(params[0])]) == {}
+
+
+def test_top_results_read_the_latest_data(store, monkeypatch):
+    clock = iter(range(1, 100))
+    monkeypatch.setattr(result_store.time, "time", lambda: next(clock))
+    store.put_many("rsi_strategy", "old", [(params_hash({"p": 1}), result({"p": 1}, 50.0))])
+    store.put_many("rsi_strategy", "new", [(params_hash({"p": p}), result({"p": p}, float(p))) for p in range(5)],
+                   symbol="PI/USDT", timeframe="1h", candles=200)
+
+    top = store.top_results("rsi_strategy", limit=2)
+    assert [entry["pnl"] for entry in top] == [4.0, 3.0]
+    assert top[0]["symbol"] == "PI/USDT" and top[0]["candles"] == 200
+    assert store.top_results("rsi_strategy", data_key="old")[0]["pnl"] == 50.0
+    assert store.count("rsi_strategy") == 6
+    with pytest.raises(ValueError):
+        store.top_results("rsi_strategy", order_by="params; DROP TABLE results")
+
+
+def test_lookups_are_batched_below_the_sqlite_parameter_limit(store):
+    entries = [(params_hash({"p": p}), result({"p": p}, float(p))) for p in range(1200)]
+    store.put_many("rsi_strategy", "data", entries)
+
+    assert len(store.get_many("rsi_strategy", "data", [key for key, _ in entries])) == 1200
+
+
+def test_results_survive_reopening(tmp_path):
+    store = ResultStore(tmp_path / "results.db")
+    store.put_many("rsi_strategy", "data", [(params_hash({"p": 1}), result({"p": 1}, 1.0))])
+    store.close()
+
+    reopened = ResultStore(tmp_path / "results.db")
+    assert reopened.count() == 1
+    reopened.close()
@@ -0,0 +1,127 @@
+import json
+import pytest
+from backtester import Backtester
+from candle_store import CandleStore
+from mock_exchange import generate_candles
+from strategy_optimizer import StrategyOptimizer
+
+DAY_MS = 86_400_000
+
+
+@pytest.fixture
+def config():
+    return {
+        "exchange": {"name": "mexc", "api_key": "", "api_secret": ""},
+        "trading": {"base_symbol": "PI", "quote_symbol": "USDT", "trade_amount": 10.0, "max_position_size": 50},
+        "risk_management": {"stop_loss_percentage": 2.0, "take_profit_percentage": 5.0, "max_daily_trades": 10,
+                            "max_open_positions": 3},
+        "strategies": {
+            "active_strategy": "hyperfocus_strategy",
+            "hyperfocus_strategy": {"enabled": True, "timeframe": "15m", "rsi_period": 14, "rsi_overbought": 70,
+                                    "rsi_oversold": 30, "ma_fast": 20, "ma_slow": 50, "volume_factor": 1.5,
+                                    "volume_lookback": 20, "require_confirmation": False}
+        },
+        "market_data": {"candle_store_dir": "data/candles"},
+        "optimization": {"workers": 1, "method": "grid", "history_alignment_hours": 0,
+                         "walk_forward": {"folds": 3, "train_ratio": 3, "min_return_percentage": -100.0,
+                                          "holdout_ratio": 0.25}}
+    }
+
+
+@pytest.fixture
+def optimizer(tmp_path, monkeypatch, config):
+    """Optimizer working in a temporary directory with 3000 stored 15m candles"""
+    monkeypatch.chdir(tmp_path)
+    candles = generate_candles(count=3000, timeframe="15m", volatility=0.01, seed=11, end_time=300 * DAY_MS)
+    CandleStore("data/candles").append("PI/USDT", "15m", candles.tolist())
+
+    optimizer = StrategyOptimizer()
+    optimizer.param_grid = {"rsi_oversold": [25, 35], "rsi_overbought": [65, 75]}
+
+    def write_config():
+        with open("config.json", "w") as f:
+            json.dump(config, f)
+    optimizer.write_config = write_config
+    write_config()
+    return optimizer
+
+
+def optimization_record():
+    with open("data/optimization/hyperfocus_optimization.json") as f:
+        return json.load(f)
+
+
+def test_optimization_leaves_out_the_holdout(optimizer, config):
+    _, history = optimizer.load_history(config, "15m")
+
+    result = optimizer.optimize_hyperfocus()
+
+    record = optimization_record()
+    assert record["candles"] == 2250
+    assert record["optimized_to"] == str(history.index[2249])
+    assert result["tested_parameters"] == 4
+
+
+def test_holdout_trades_only_the_held_out_candles(optimizer, config):
+    _, history = optimizer.load_history(config, "15m")
+    params = {"rsi_oversold": 35, "rsi_overbought": 65}
+
+    holdout = optimizer.test_holdout(config, params)
+
+    assert holdout["test_from"] == str(history.index[2250])
+    assert holdout["test_to"] == str(history.index[-1])
+    assert holdout["candles"] == 750
+    base_params = config["strategies"]["hyperfocus_strategy"]
+    table = optimizer.build_indicator_table(history, {}, {**base_params, **params})
+    expected = optimizer._evaluate_hyperfocus(table, history, Backtester.from_config(config),
+                                              {**base_params, **params}, start=2250)
+    assert holdout["pnl"] == pytest.approx(expected["pnl"])
+    assert holdout["trades"] == expected["trades"]
+
+    # Served from the result store the second time
+    assert optimizer.test_holdout(config, params) == holdout
+
+
+def test_validation_requires_the_holdout_return(optimizer, config):
+    params = optimizer.optimize_hyperfocus()["optimized_params"]
+
+    accepted, report = optimizer.validate_parameters(params)
+    assert accepted
+    assert report["holdout"]["candles"] == 750
+
+    config["optimization"]["walk_forward"]["min_return_percentage"] = report["holdout"]["return_percentage"] + 1
+    optimizer.write_config()
+    accepted, _ = optimizer.validate_parameters(params)
+    assert not accepted
+    assert not optimizer.update_strategy_config(params)
+
+
+def test_no_holdout(optimizer, config):
+    config["optimization"]["walk_forward"]["holdout_ratio"] = 0
+    optimizer.write_config()
+
+    optimizer.optimize_hyperfocus()
+    accepted, report = optimizer.validate_parameters({"rsi_oversold": 25})
+
+    assert optimization_record()["candles"] == 3000
+    assert report["holdout"] is None
+    assert accepted
+
+
+def test_walk_forward_folds_are_contiguous(optimizer):
+    folds = optimizer.walk_forward_folds(3000, folds=3, train_ratio=3)
+
+    test_length = 3000 // 6
+    assert [(fold["train_start"], fold["train_stop"], fold["test_stop"]) for fold in folds] == [
+        (0, 3 * test_length, 4 * test_length),
+        (test_length, 4 * test_length, 5 * test_length),
+        (2 * test_length, 5 * test_length, 6 * test_length),
+    ]
+
+
+def test_repeat_optimization_reuses_stored_results(optimizer):
+    first = optimizer.optimize_hyperfocus()
+    second = optimizer.optimize_hyperfocus()
+
+    assert optimization_record()["cached_results"] == 4
+    assert second["optimized_params"] == first["optimized_params"]
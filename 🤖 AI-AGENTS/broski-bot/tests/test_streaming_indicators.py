@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+import indicators
+from mock_exchange import generate_candles
+
+WINDOW = 100
+
+
+def candle_frame(seed=42, count=400, symbol=None, timeframe="5m"):
+    candles = generate_candles(count=count, timeframe=timeframe, seed=seed, end_time=1_700_000_000_000)
+    df = pd.DataFrame(candles, columns=["timestamp", "open", "high", "low", "close", "volume"])
+    df.index = pd.to_datetime(df.pop("timestamp"), unit="ms")
+    if symbol:
+        df.attrs.update(symbol=symbol, timeframe=timeframe)
+    return df
+
+
+def windows(df):
+    """Sliding windows ending at every candle, like the live loop's fetches"""
+    for end in range(WINDOW, len(df) + 1):
+        window = df.iloc[end - WINDOW:end]
+        window.attrs = dict(df.attrs)
+        yield end - 1, window
+
+
+def stream_indicators():
+    return {
+        "rsi": ("close", indicators.StreamingRSI(14)),
+        ("macd_line", "signal_line", "macd_histogram"): ("close", indicators.StreamingMACD(12, 26, 9)),
+        "sma": ("close", indicators.StreamingSMA(20)),
+        "volume_sma": ("volume", indicators.StreamingSMA(20)),
+    }
+
+
+def batch_indicators(df):
+    close = df["close"].to_numpy()
+    line, signal, histogram = indicators.macd(close, 12, 26, 9)
+    return {
+        "rsi": indicators.rsi(close, 14),
+        "macd_line": line,
+        "signal_line": signal,
+        "macd_histogram": histogram,
+        "sma": indicators.sma(close, 20),
+        "volume_sma": indicators.sma(df["volume"].to_numpy(), 20),
+    }
+
+
+def test_streams_match_batch_over_sliding_windows():
+    df = candle_frame(symbol="PI/USDT")
+    expected = batch_indicators(df)
+    streams = indicators.IndicatorStreams(stream_indicators)
+
+    for last, window in windows(df):
+        values = streams.update(window)
+        for key, batch in expected.items():
+            # Last closed candle and the forming one
+            np.testing.assert_allclose(values[key], batch[last - 1:last + 1], rtol=1e-9, err_msg=key)
+
+
+def test_stream_resumes_after_candles_are_skipped():
+    df = candle_frame(symbol="PI/USDT")
+    streams = indicators.IndicatorStreams(stream_indicators)
+    streams.update(df.iloc[:WINDOW])
+
+    values = streams.update(df.iloc[WINDOW + 50:2 * WINDOW + 50])
+
+    # Missed candles are not replayed, but the forming candle is still previewed
+    assert set(values) == set(batch_indicators(df))
+    assert np.isfinite(values["rsi"]).all()
+
+
+def test_frames_without_series_attrs_do_not_share_state():
+    first = candle_frame(seed=1)
+    second = candle_frame(seed=2)
+    streams = indicators.IndicatorStreams(stream_indicators)
+
+    streams.update(first)
+    values = streams.update(second)
+
+    assert streams.streams == {}
+    np.testing.assert_allclose(values["rsi"], batch_indicators(second)["rsi"][-2:], rtol=1e-9)
+
+
+def test_interleaved_symbols_stay_independent():
+    frames = {symbol: candle_frame(seed=seed, symbol=symbol) for seed, symbol in ((3, "PI/USDT"), (4, "BTC/USDT"))}
+    expected = {symbol: batch_indicators(df) for symbol, df in frames.items()}
+    streams = indicators.IndicatorStreams(stream_indicators)
+
+    for (last, pi_window), (_, btc_window) in zip(windows(frames["PI/USDT"]), windows(frames["BTC/USDT"])):
+        for symbol, window in (("PI/USDT", pi_window), ("BTC/USDT", btc_window)):
+            values = streams.update(window)
+            np.testing.assert_allclose(values["rsi"], expected[symbol]["rsi"][last - 1:last + 1], rtol=1e-9)
+
+    assert sorted(streams.streams) == ["BTC/USDT|5m", "PI/USDT|5m"]
+
+
+def test_state_round_trip():
+    df = candle_frame(symbol="PI/USDT")
+    streams = indicators.IndicatorStreams(stream_indicators)
+    streams.update(df.iloc[:300])
+
+    restored = indicators.IndicatorStreams(stream_indicators)
+    restored.set_state(streams.get_state())
+
+    for key, value in restored.update(df).items():
+        np.testing.assert_allclose(value, batch_indicators(df)[key][-2:], rtol=1e-9, err_msg=key)
+
+
+@pytest.mark.parametrize("method", ["wilder", "sma"])
+def test_rsi_methods_match_batch(method):
+    df = candle_frame(symbol="PI/USDT")
+    streams = indicators.IndicatorStreams(lambda: {"rsi": ("close", indicators.StreamingRSI(14, method))})
+    expected = indicators.rsi(df["close"].to_numpy(), 14, method)
+
+    for last, window in windows(df):
+        np.testing.assert_allclose(streams.update(window)["rsi"], expected[last - 1:last + 1], rtol=1e-9)
@@ -0,0 +1,102 @@
+import threading
+import pytest
+import ticker_cache
+from ticker_cache import TickerCache, get_ticker_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    monkeypatch.setattr(ticker_cache, "_caches", {})
+
+
+def test_ticker_is_reused_within_the_freshness_window():
+    clock = FakeClock()
+    calls = []
+    cache = TickerCache(lambda symbol: calls.append(symbol) or {"last": len(calls)}, ttl_seconds=0.5, clock=clock)
+
+    assert cache.get_price("PI/USDT") == 1
+    clock.now = 0.4
+    assert cache.get_price("PI/USDT") == 1
+    clock.now = 0.5
+    assert cache.get_price("PI/USDT") == 2
+    assert cache.stats == {"hits": 1, "coalesced": 0, "fetches": 2}
+
+
+def test_concurrent_requests_share_one_fetch():
+    release = threading.Event()
+    calls = []
+
+    def fetch(symbol):
+        calls.append(symbol)
+        release.wait(2)
+        return {"last": 1.5}
+
+    cache = TickerCache(fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_price("PI/USDT"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while cache.stats["fetches"] + cache.stats["coalesced"] < 5:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert calls == ["PI/USDT"]
+    assert results == [1.5] * 5
+
+
+def test_waiting_callers_get_the_fetch_error():
+    release = threading.Event()
+
+    def fetch(symbol):
+        release.wait(2)
+        raise ConnectionError("down")
+
+    cache = TickerCache(fetch)
+    errors = []
+
+    def get():
+        try:
+            cache.get("PI/USDT")
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=get) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    while cache.stats["fetches"] + cache.stats["coalesced"] < 3:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(errors) == 3
+    assert not cache.in_flight
+
+
+def test_registry_shares_one_cache_per_exchange_whatever_the_fetcher():
+    first = get_ticker_cache("mexc", lambda symbol: {"last": 1.0})
+    second = get_ticker_cache("MEXC", lambda symbol: {"last": 2.0})
+
+    assert second is first
+    assert second.get_price("PI/USDT") == 1.0
+    assert len(ticker_cache._caches) == 1
+
+
+def test_registry_keeps_exchanges_and_accounts_apart():
+    fetch = lambda symbol: {"last": 1.0}
+
+    mexc = get_ticker_cache("mexc", fetch)
+
+    assert get_ticker_cache("binance", fetch) is not mexc
+    assert get_ticker_cache("mexc", fetch, account="second") is not mexc
+    assert get_ticker_cache("mexc", fetch, account="second") is get_ticker_cache("mexc", fetch, account="second")
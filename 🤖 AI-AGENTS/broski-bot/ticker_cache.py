@@ -0,0 +1,123 @@
+import time
+import logging
+import threading
+
+logger = logging.getLogger("BROski.TickerCache")
+
+
+class _Flight:
+    """One in-progress ticker request that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class TickerCache:
+    """
+    Sub-second ticker cache with single-flight request coalescing.
+
+    Callers asking for the same symbol within the freshness window get the
+    cached ticker. If a request for that symbol is already in progress, they wait
+    for it and share its result instead of sending their own.
+    """
+
+    def __init__(self, fetch_ticker, ttl_seconds=0.5, clock=time.monotonic):
+        """
+        Initialize the ticker cache
+
+        Args:
+            fetch_ticker (callable): Function fetching a ticker for a symbol from the exchange
+            ttl_seconds (float): How long a ticker is reused
+            clock (callable): Time source in seconds (replaced by the simulated clock when replaying)
+        """
+        self.fetch_ticker = fetch_ticker
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.tickers = {}
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'coalesced': 0, 'fetches': 0}
+
+    def get(self, symbol):
+        """
+        Get a fresh ticker for a symbol
+
+        Args:
+            symbol (str): Trading pair in format BASE/QUOTE
+
+        Returns:
+            dict: ccxt ticker
+        """
+        with self.lock:
+            cached = self.tickers.get(symbol)
+            if cached and self.clock() - cached[0] < self.ttl_seconds:
+                self.stats['hits'] += 1
+                return cached[1]
+
+            flight = self.in_flight.get(symbol)
+            leader = flight is None
+            if leader:
+                flight = self.in_flight[symbol] = _Flight()
+                self.stats['fetches'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self.fetch_ticker(symbol)
+            with self.lock:
+                self.tickers[symbol] = (self.clock(), flight.result)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[symbol]
+            flight.done.set()
+
+    def put(self, symbol, ticker):
+        """Store a ticker fetched elsewhere (e.g. by the async engine)"""
+        if ticker:
+            with self.lock:
+                self.tickers[symbol] = (self.clock(), ticker)
+
+    def get_price(self, symbol):
+        """Get the last traded price for a symbol"""
+        return self.get(symbol)['last']
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_ticker_cache(name, fetch_ticker, ttl_seconds=0.5, account=None):
+    """
+    Get the ticker cache shared by every component trading on the same exchange
+
+    Caches are keyed by exchange name (and account, for processes trading several
+    accounts). The first caller's fetch function and freshness window are used;
+    later callers get the same cache whatever fetcher they pass, since a ticker
+    is the same market data whichever client requested it.
+
+    Args:
+        name (str): Exchange name (e.g. 'mexc')
+        fetch_ticker (callable): Function fetching a ticker for a symbol, used if the cache is created now
+        ttl_seconds (float): Freshness window if the cache is created now
+        account (str): Optional account identifier (e.g. the API key)
+
+    Returns:
+        TickerCache: Shared cache
+    """
+    key = (name.lower(), account)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = TickerCache(fetch_ticker, ttl_seconds)
+        return _caches[key]
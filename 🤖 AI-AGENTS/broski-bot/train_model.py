@@ -2,12 +2,12 @@
 
 import os
 import numpy as np
-import pandas as pd
 import json
 import logging
 from pathlib import Path
 import matplotlib.pyplot as plt
 import pickle
+from datetime import datetime, timedelta
 
 # ML Imports
 from sklearn.preprocessing import MinMaxScaler
@@ -16,7 +16,9 @@ import tensorflow as tf # type: ignore
 from tensorflow.keras.models import Sequential # type: ignore
 from tensorflow.keras.layers import LSTM, Dense, Dropout, Bidirectional # type: ignore
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint # type: ignore
-import ccxt
+import indicators
+from candle_store import CandleStore
+from backfill import HistoricalBackfill
 
 # Add path fixing for imports
 import sys
@@ -63,21 +65,20 @@ class MLModelTrainer:
     def download_training_data(self):
         """Downloads price data and logs the process"""
         try:
-            exchange = ccxt.mexc({'enableRateLimit': True})
             base = self.config["trading"]["base_symbol"]
             quote = self.config["trading"]["quote_symbol"]
             symbol = f"{base}/{quote}"
+            training_days = self.config.get("ml_training", {}).get("history_days", 365)
 
-            logger.info(f"Fetching data for {symbol}...")
-            ohlcv = exchange.fetch_ohlcv(symbol, '1h', limit=2000)
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            # Only the candles older or newer than what the candle store already holds are downloaded
+            logger.info(f"Fetching {training_days} days of 1h data for {symbol}...")
+            store = CandleStore.from_config(self.config)
+            start = datetime.now() - timedelta(days=training_days)
+            HistoricalBackfill(self.config, candle_store=store).backfill(symbol, ['1h'], start)
 
-            # Save dataset
-            data_path = "data/historical_prices.csv"
-            df.to_csv(data_path)
-            logger.info(f"Data saved to {data_path}")
+            # The store may hold more history than the training window
+            df = store.to_dataframe(symbol, '1h', since=int(start.timestamp() * 1000))
+            logger.info(f"Loaded {len(df)} candles from {store.root}")
 
             return df
 
@@ -87,14 +88,15 @@ class MLModelTrainer:
 
     def preprocess_data(self, df):
         """Preprocess data for training"""
-        df["returns"] = df["close"].pct_change()
-        df["ma_5"] = df["close"].rolling(window=5).mean()
-        df["ma_20"] = df["close"].rolling(window=20).mean()
-        df["volatility"] = df["returns"].rolling(window=20).std()
+        close = indicators.as_array(df["close"])
+        df["returns"] = indicators.returns(close)
+        df["ma_5"] = indicators.sma(close, 5)
+        df["ma_20"] = indicators.sma(close, 20)
+        df["volatility"] = indicators.rolling_std(df["returns"], 20)
         df["momentum_10"] = df["close"].diff(10)
-        # Additional technical indicators
+        # Additional technical indicators, computed the way existing models were trained
         df['ema_10'] = df['close'].ewm(span=10).mean()
-        df['rsi_14'] = self.calculate_rsi(df['close'], window=14)
+        df['rsi_14'] = indicators.rsi(close, 14, method='sma')
 
         df.dropna(inplace=True)
 
@@ -121,16 +123,6 @@ class MLModelTrainer:
 
         return X_train, y_train, X_test, y_test
 
-    def calculate_rsi(self, series, window=14):
-        delta = series.diff()
-        gain = (delta.where(delta > 0, 0)).fillna(0)
-        loss = (-delta.where(delta < 0, 0)).fillna(0)
-        avg_gain = gain.rolling(window).mean()
-        avg_loss = loss.rolling(window).mean()
-        rs = avg_gain / avg_loss
-        rsi = 100 - 100 / (1 + rs)
-        return rsi
-
     def create_sequences(self, data):
         X = []
         y = []